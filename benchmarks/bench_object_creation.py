@@ -0,0 +1,51 @@
+# -*- coding: utf-8 -*-
+"""
+Benchmark for the creation of many small SpikeTrain and AnalogSignal objects,
+as done by the readers based on neo.rawio.
+
+Compares the normal constructors, which check and convert their arguments,
+with the trusted constructors used by the proxy objects, and times a full
+non-lazy read of a block with ExampleIO.
+
+Usage::
+
+    python benchmarks/bench_object_creation.py
+"""
+
+import timeit
+
+import numpy as np
+import quantities as pq
+
+from neo.core import AnalogSignal, SpikeTrain
+from neo.io import ExampleIO
+
+
+def run(number=5000):
+    times = np.sort(np.random.uniform(0, 10, 100))
+    t_start, t_stop = 0. * pq.s, 10. * pq.s
+    sig = np.random.randn(1000, 1).astype('float32')
+    sampling_rate = 1000. * pq.Hz
+
+    cases = [
+        ('SpikeTrain()', lambda: SpikeTrain(
+            times, t_stop, units='s', t_start=t_start, copy=False)),
+        ('SpikeTrain._from_validated()', lambda: SpikeTrain._from_validated(
+            times, t_stop, units=pq.s, t_start=t_start)),
+        ('AnalogSignal()', lambda: AnalogSignal(
+            sig, units='uV', t_start=t_start, sampling_rate=sampling_rate,
+            copy=False)),
+        ('AnalogSignal._from_validated()', lambda: AnalogSignal._from_validated(
+            sig, units=pq.uV, t_start=t_start, sampling_rate=sampling_rate)),
+    ]
+    for label, func in cases:
+        t = timeit.timeit(func, number=number)
+        print('%-32s %10.0f objects/s' % (label, number / t))
+
+    reader = ExampleIO('fake.fake')
+    t = timeit.timeit(lambda: reader.read_block(lazy=False), number=20) / 20
+    print('%-32s %10.2f ms per block' % ('ExampleIO.read_block()', t * 1e3))
+
+
+if __name__ == '__main__':
+    run()
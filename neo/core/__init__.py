@@ -23,6 +23,10 @@ Classes:
 
 .. autoclass:: SpikeTrain
 
+Functions:
+
+.. autofunction:: copy_on_write
+
 """
 
 # needed for python 3 compatibility
@@ -41,6 +45,8 @@ from neo.core.epoch import Epoch
 
 from neo.core.spiketrain import SpikeTrain
 
+from neo.core.dataobject import copy_on_write
+
 # Block should always be first in this list
 objectlist = [Block, Segment, ChannelIndex,
               AnalogSignal, IrregularlySampledSignal,
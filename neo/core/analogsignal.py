@@ -27,7 +27,7 @@ import numpy as np
 import quantities as pq
 
 from neo.core.baseneo import BaseNeo, MergeError, merge_annotations
-from neo.core.dataobject import DataObject
+from neo.core.dataobject import DataObject, _validated_dimensionality
 from neo.core.channelindex import ChannelIndex
 from copy import copy, deepcopy
 
@@ -209,13 +209,38 @@ class AnalogSignal(BaseSignal):
         DataObject.__init__(self, name=name, file_origin=file_origin, description=description,
                             array_annotations=array_annotations, **annotations)
 
+    @classmethod
+    def _from_validated(cls, signal, units, t_start, sampling_rate, name=None,
+                        file_origin=None, description=None, array_annotations=None,
+                        annotations=None):
+        '''
+        Trusted constructor for readers creating many :class:`AnalogSignal` objects from
+        data that is already consistent, e.g. coming from a :class:`BaseRawIO` header.
+
+        Unlike the normal constructor this does not copy, rescale or cast :attr:`signal`
+        and does not check :attr:`t_start`, :attr:`sampling_rate`, annotations and array
+        annotations. The caller is responsible for that:
+          * :attr:`signal` is a 2D numpy array (its dtype is kept)
+          * :attr:`units` is preferably a quantity or a dimensionality
+          * :attr:`t_start` and :attr:`sampling_rate` are quantities
+          * annotations and array annotations are valid (one value per channel)
+        '''
+        dim = _validated_dimensionality(units)
+        obj = pq.Quantity(signal, units=dim, copy=False).view(cls)
+        obj._t_start = t_start
+        obj._sampling_rate = sampling_rate
+        obj._init_validated(name=name, description=description, file_origin=file_origin,
+                            array_annotations=array_annotations, annotations=annotations)
+        return obj
+
     def __reduce__(self):
         '''
         Map the __new__ function onto _new_AnalogSignalArray, so that pickle
-        works
+        works. The data is given as a plain array and is not copied when
+        unpickled, so with pickle protocol 5 it can be an out-of-band buffer.
         '''
-        return _new_AnalogSignalArray, (self.__class__, np.array(self), self.units, self.dtype,
-                                        True, self.t_start, self.sampling_rate,
+        return _new_AnalogSignalArray, (self.__class__, self.view(np.ndarray), self.units,
+                                        self.dtype, False, self.t_start, self.sampling_rate,
                                         self.sampling_period, self.name, self.file_origin,
                                         self.description, self.array_annotations,
                                         self.annotations, self.channel_index, self.segment)
@@ -278,12 +303,12 @@ class AnalogSignal(BaseSignal):
                     obj = obj.reshape(-1, 1)
                 if self.channel_index:
                     obj.channel_index = self.channel_index.__getitem__(k)
-                obj.array_annotate(**deepcopy(self.array_annotations_at_index(k)))
+                self._slice_array_annotations(obj, k)
         elif isinstance(i, slice):
             obj = super(AnalogSignal, self).__getitem__(i)
             if i.start:
                 obj.t_start = self.t_start + i.start * self.sampling_period
-            obj.array_annotations = deepcopy(self.array_annotations)
+            self._slice_array_annotations(obj, slice(None))
         elif isinstance(i, np.ndarray):
             # Indexing of an AnalogSignal is only consistent if the resulting number of
             # samples is the same for each trace. The time axis for these samples is not
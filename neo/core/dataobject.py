@@ -5,8 +5,11 @@ used by all :module:`neo.core` classes that can contain data (i.e. are not conta
 It contains basic functionality that is shared among all those data objects.
 
 """
+from contextlib import contextmanager
 from copy import deepcopy
+import threading
 import warnings
+import weakref
 
 import quantities as pq
 import numpy as np
@@ -130,6 +133,256 @@ def _normalize_array_annotations(value, length):
     return value
 
 
+_copy_on_write_state = threading.local()
+
+
+@contextmanager
+def copy_on_write():
+    """
+    Context manager in which deep copies of data objects do not copy their data.
+
+    Inside the context, :func:`copy.deepcopy` of a data object (including the
+    deep copies made by :meth:`time_slice` and when deep copying a container
+    such as a :class:`Block`) returns an object that shares the data buffer of
+    the original. Both objects are made read-only; the first time the copy
+    is modified through item assignment or an in-place operator it silently
+    gets its own copy of the data, and before the original is modified this
+    way each of its copies gets its own copy of the data, so the other
+    objects are never affected.
+    Writing into the shared buffer by other means (e.g. through
+    :attr:`magnitude` or a numpy function with an `out` argument) raises a
+    ValueError instead.
+
+    Example::
+
+        >>> with copy_on_write():
+        ...     trial_block = deepcopy(block)
+    """
+    depth = getattr(_copy_on_write_state, 'depth', 0)
+    _copy_on_write_state.depth = depth + 1
+    try:
+        yield
+    finally:
+        _copy_on_write_state.depth = depth
+
+
+def _copy_on_write_enabled():
+    """
+    Return True when called inside a :func:`copy_on_write` context.
+    """
+    return getattr(_copy_on_write_state, 'depth', 0) > 0
+
+
+def _validated_dimensionality(units):
+    """
+    Return the dimensionality of units, without parsing it again when units is already a
+    quantity or a dimensionality.
+    """
+    if isinstance(units, pq.dimensionality.Dimensionality):
+        return units
+    if hasattr(units, 'dimensionality'):
+        return units.dimensionality
+    return pq.quantity.validate_dimensionality(units)
+
+
+class _SharedData(object):
+    """
+    The data objects sharing a data buffer because of :func:`copy_on_write`.
+
+    The originals keep the buffer: before one of them is modified, each
+    copy is given its own data. A copy that is modified is given its own
+    data, the other objects still share the buffer. Once no copy shares the
+    buffer any more, the originals get their writeable flag back.
+    """
+
+    def __init__(self):
+        # weak references to the originals with their writeable flag
+        self.originals = []
+        # weak references to the copies, by id
+        self.copies = {}
+
+    def is_copy(self, obj):
+        ref = self.copies.get(id(obj))
+        return ref is not None and ref() is obj
+
+    def add_original(self, obj):
+        if obj.__dict__.get('_shared_data') is self:
+            return
+        self.originals.append((weakref.ref(obj), obj.flags.writeable))
+        obj.flags.writeable = False
+        obj.__dict__['_shared_data'] = self
+
+    def add_copy(self, obj):
+        self.copies[id(obj)] = weakref.ref(obj, self._copy_released)
+        obj.flags.writeable = False
+        obj.__dict__['_shared_data'] = self
+
+    def absorb(self, other):
+        """
+        Take the objects of other, another group sharing the same buffer.
+        """
+        for ref, writeable in other.originals:
+            obj = ref()
+            if obj is not None:
+                self.originals.append((ref, writeable))
+                obj.__dict__['_shared_data'] = self
+        for key, ref in other.copies.items():
+            obj = ref()
+            if obj is not None:
+                self.copies[key] = weakref.ref(obj, self._copy_released)
+                obj.__dict__['_shared_data'] = self
+        other.originals = []
+        other.copies.clear()
+
+    def _copy_released(self, ref):
+        # a copy sharing the buffer was garbage collected
+        for key, other in list(self.copies.items()):
+            if other is ref:
+                del self.copies[key]
+                if not self.copies:
+                    self.release()
+
+    def unshare(self, obj):
+        """
+        Let obj be modified without changing the other objects.
+        """
+        if self.is_copy(obj):
+            del self.copies[id(obj)]
+            _own_data(obj)
+            if not self.copies:
+                self.release()
+            return
+        for ref in list(self.copies.values()):
+            copy = ref()
+            if copy is not None:
+                _own_data(copy)
+        self.copies.clear()
+        self.release()
+
+    def release(self):
+        """
+        Give the originals their writeable flag back, once no copy shares
+        their buffer.
+        """
+        # an original is only writeable again once the array it is a view of
+        # is writeable, so the bases of the views are done first
+        pending = []
+        for ref, writeable in self.originals:
+            original = ref()
+            if original is not None and original.__dict__.get('_shared_data') is self:
+                del original.__dict__['_shared_data']
+                if writeable:
+                    pending.append(original)
+        self.originals = []
+        while pending:
+            remaining = []
+            for original in pending:
+                try:
+                    original.flags.writeable = True
+                except ValueError:
+                    remaining.append(original)
+            if len(remaining) == len(pending):
+                break
+            pending = remaining
+
+
+def _data_object_chain(obj):
+    """
+    Return obj and the data objects it is a view of.
+    """
+    chain = []
+    while isinstance(obj, DataObject):
+        chain.append(obj)
+        obj = obj.base
+    return chain
+
+
+def _can_share_data(obj):
+    """
+    Return False if obj is a copy sharing a buffer or a view of such a copy,
+    which can not be the original of another copy.
+    """
+    for other in _data_object_chain(obj):
+        shared = other.__dict__.get('_shared_data')
+        if shared is not None and shared.is_copy(other):
+            return False
+    return True
+
+
+def _share_data(copy, original=None):
+    """
+    Mark copy as sharing the data buffer of original, and of the data
+    objects original is a view of. Without original, copy shares a buffer
+    that belongs to no data object (e.g. a shared memory block).
+
+    copy must not own its data, so it can be given its own data later
+    without changing the other objects.
+    """
+    originals = _data_object_chain(original)
+    shared = None
+    for obj in originals:
+        other = obj.__dict__.get('_shared_data')
+        if other is None or other is shared:
+            continue
+        if shared is None:
+            shared = other
+        else:
+            shared.absorb(other)
+    if shared is None:
+        shared = _SharedData()
+    for obj in originals:
+        shared.add_original(obj)
+    shared.add_copy(copy)
+
+
+def _own_data(obj):
+    """
+    Give obj, a copy sharing a data buffer, its own copy of the data.
+    """
+    data = obj.view(np.ndarray).tobytes()
+    # neo objects that are views of obj (e.g. its slices) still use the
+    # shared buffer, so obj keeps it alive
+    obj.__dict__['_shared_data_base'] = obj.base
+    del obj.__dict__['_shared_data']
+    # obj is a view of the buffer and does not own it, so only obj is changed
+    np.ndarray.__setstate__(obj, (1, obj.shape, obj.dtype, False, data))
+
+
+def _new_quantity(magnitude, dimensionality):
+    """
+    Rebuild a Quantity pickled by :class:`_PickledQuantity`, without copying
+    magnitude.
+    """
+    return pq.Quantity(magnitude, dimensionality, copy=False)
+
+
+class _PickledQuantity(object):
+    """
+    Stand-in for a Quantity in the arguments of a data object's __reduce__.
+
+    Quantity.__reduce__ always writes the data in the pickle stream, while a
+    plain array is written as an out-of-band buffer with pickle protocol 5
+    when a buffer_callback is given. This pickles the magnitude as a plain
+    array, it is unpickled as a Quantity.
+    """
+
+    def __init__(self, quantity):
+        self.quantity = quantity
+
+    def __reduce__(self):
+        return _new_quantity, (self.quantity.view(np.ndarray), self.quantity.dimensionality)
+
+
+def _pickled_quantity(quantity):
+    """
+    Return the stand-in to use in __reduce__ for quantity, anything else than
+    a Quantity (e.g. None) is returned as it is.
+    """
+    if not isinstance(quantity, pq.Quantity):
+        return quantity
+    return _PickledQuantity(quantity)
+
+
 class DataObject(BaseNeo, pq.Quantity):
     '''
     This is the base class from which all objects containing data inherit
@@ -173,6 +426,25 @@ class DataObject(BaseNeo, pq.Quantity):
         BaseNeo.__init__(self, name=name, description=description, file_origin=file_origin,
                          **annotations)
 
+    def _init_validated(self, name=None, description=None, file_origin=None,
+                        array_annotations=None, annotations=None):
+        """
+        Counterpart of :meth:`__init__` for the trusted constructors (`_from_validated`)
+        of the data objects: attributes, annotations and array annotations are stored
+        without being checked.
+        """
+        self.array_annotations = ArrayDict(self._get_arr_ann_length())
+        if array_annotations:
+            dict.update(self.array_annotations, array_annotations)
+        self.annotations = dict(annotations) if annotations else {}
+        self.name = name
+        self.description = description
+        self.file_origin = file_origin
+        for parent in self._single_parent_containers:
+            setattr(self, parent, None)
+        for parent in self._multi_parent_containers:
+            setattr(self, parent, [])
+
     def array_annotate(self, **array_annotations):
         """
         Add array annotations (annotations for individual data points) as arrays to a Neo data
@@ -331,6 +603,53 @@ class DataObject(BaseNeo, pq.Quantity):
             length = 1
         return length
 
+    def _slice_array_annotations(self, obj, index):
+        """
+        Give obj, obtained by indexing this object with index, the matching slice of
+        the array annotations. The slices are copied but not validated again.
+        """
+        obj.array_annotations = ArrayDict.sliced(self.array_annotations, index,
+                                                 obj._get_arr_ann_length())
+
+    def _unshare_data(self):
+        """
+        Let the object be modified when its data buffer is shared with other
+        objects because of :func:`copy_on_write`, without changing them.
+        """
+        shared = self.__dict__.get('_shared_data')
+        if shared is not None:
+            shared.unshare(self)
+
+    def _set_units(self, units):
+        self._unshare_data()
+        pq.Quantity.units.fset(self, units)
+
+    units = property(pq.Quantity.units.fget, _set_units, doc=pq.Quantity.units.__doc__)
+
+    def __setitem__(self, i, value):
+        self._unshare_data()
+        super(DataObject, self).__setitem__(i, value)
+
+    def __iadd__(self, other):
+        self._unshare_data()
+        return super(DataObject, self).__iadd__(other)
+
+    def __isub__(self, other):
+        self._unshare_data()
+        return super(DataObject, self).__isub__(other)
+
+    def __imul__(self, other):
+        self._unshare_data()
+        return super(DataObject, self).__imul__(other)
+
+    def __itruediv__(self, other):
+        self._unshare_data()
+        return super(DataObject, self).__itruediv__(other)
+
+    def __ipow__(self, other):
+        self._unshare_data()
+        return super(DataObject, self).__ipow__(other)
+
     def duplicate_with_new_array(self, signal, units=None):
         warnings.warn("Use of the `duplicate_with_new_array function is deprecated. "
                       "Please use `duplicate_with_new_data` instead.",
@@ -344,20 +663,33 @@ class DataObject(BaseNeo, pq.Quantity):
             References to parent objects are not kept, they are set to None.
 
 
+            Inside a :func:`copy_on_write` context the data buffer is shared
+            with the original object instead of being copied.
+
             :param memo: (dict) Objects that have been deep copied already
             :return: (DataObject) Deep copy of the input DataObject
         """
         cls = self.__class__
-        necessary_attrs = {}
-        # Units need to be specified explicitly for analogsignals/irregularlysampledsignals
-        for k in self._necessary_attrs + (('units',),):
-            necessary_attrs[k[0]] = getattr(self, k[0], self)
-        # Create object using constructor with necessary attributes
-        new_obj = cls(**necessary_attrs)
+        share_data = _copy_on_write_enabled() and _can_share_data(self)
+        if share_data:
+            # through a plain array, the copy does not depend on this object
+            # to keep the buffer alive
+            new_obj = self.view(np.ndarray).view(cls)
+        else:
+            necessary_attrs = {}
+            # Units need to be specified explicitly for analogsignals/irregularlysampledsignals
+            for k in self._necessary_attrs + (('units',),):
+                necessary_attrs[k[0]] = getattr(self, k[0], self)
+            # Create object using constructor with necessary attributes
+            new_obj = cls(**necessary_attrs)
         # Add all attributes
         new_obj.__dict__.update(self.__dict__)
+        new_obj.__dict__.pop('_shared_data', None)
+        new_obj.__dict__.pop('_shared_data_base', None)
         memo[id(self)] = new_obj
         for k, v in self.__dict__.items():
+            if k in ('_shared_data', '_shared_data_base'):
+                continue
             # Single parent objects should not be deepcopied, because this is not expected behavior
             # and leads to a lot of stuff being copied (e.g. all other children of the parent as well),
             # thus creating a lot of overhead
@@ -371,6 +703,9 @@ class DataObject(BaseNeo, pq.Quantity):
             except TypeError:
                 setattr(new_obj, k, v)
 
+        if share_data:
+            _share_data(new_obj, self)
+
         return new_obj
 
 
@@ -388,6 +723,40 @@ class ArrayDict(dict):
         self.check_function = check_function
         self.length = length
 
+    @classmethod
+    def sliced(cls, source, index, length):
+        """
+        Return an ArrayDict containing copies of the array annotations of source at index,
+        for an object whose data has the given length.
+
+        The annotations of source have already been checked, so the slices are only
+        normalized when indexing did not give a 1D array of that length.
+        """
+        new = cls(length, check_function=getattr(source, 'check_function',
+                                                 _normalize_array_annotations))
+        for key, value in dict.items(source):
+            try:
+                sliced = value[index]
+            except IndexError:
+                # IndexError caused by 'dummy' array annotations should not result in failure
+                # Taking a slice from nothing results in nothing
+                if len(value) == 0 and not length == 0:
+                    sliced = value
+                else:
+                    raise
+            if isinstance(sliced, np.ndarray) and sliced.ndim == 1 and \
+                    len(sliced) in (0, length):
+                # NO view on the parent's arrays, they are independent of each other
+                if sliced.dtype.hasobject:
+                    sliced = deepcopy(sliced)
+                else:
+                    sliced = sliced.copy()
+            else:
+                # Indexing with a scalar etc. still needs to be normalized
+                sliced = new.check_function({key: deepcopy(sliced)}, length)[key]
+            dict.__setitem__(new, key, sliced)
+        return new
+
     def __setitem__(self, key, value):
         # Directly call the defined function
         # Need to wrap key and value in a dict in order to make sure
@@ -16,7 +16,7 @@ import numpy as np
 import quantities as pq
 
 from neo.core.baseneo import BaseNeo, merge_annotations
-from neo.core.dataobject import DataObject, ArrayDict
+from neo.core.dataobject import DataObject, ArrayDict, _pickled_quantity
 
 PY_VER = sys.version_info[0]
 
@@ -28,9 +28,13 @@ def _new_epoch(cls, times=None, durations=None, labels=None, units=None, name=No
     A function to map epoch.__new__ to function that
     does not do the unit checking. This is needed for pickle to work.
     '''
-    e = Epoch(times=times, durations=durations, labels=labels, units=units, name=name,
-              file_origin=file_origin, description=description,
-              array_annotations=array_annotations, **annotations)
+    # unlike Epoch.__new__, this does not copy times, which can be an
+    # out-of-band buffer of pickle protocol 5
+    e = pq.Quantity(times, units=units, copy=False).view(cls)
+    e._durations = durations
+    e._labels = labels
+    Epoch.__init__(e, name=name, file_origin=file_origin, description=description,
+                   array_annotations=array_annotations, **annotations)
     e.segment = segment
     return e
 
@@ -136,10 +140,12 @@ class Epoch(DataObject):
     def __reduce__(self):
         '''
         Map the __new__ function onto _new_epoch, so that pickle
-        works
+        works. The times and the durations are given as plain arrays, so with
+        pickle protocol 5 they can be out-of-band buffers.
         '''
-        return _new_epoch, (self.__class__, self.times, self.durations, self.labels, self.units,
-                            self.name, self.file_origin, self.description, self.array_annotations,
+        return _new_epoch, (self.__class__, self.view(np.ndarray),
+                            _pickled_quantity(self.durations), self.labels, self.units,
+                            self.name, self.description, self.file_origin, self.array_annotations,
                             self.annotations, self.segment)
 
     def __array_finalize__(self, obj):
@@ -198,7 +204,7 @@ class Epoch(DataObject):
             obj._labels = self.labels
         try:
             # Array annotations need to be sliced accordingly
-            obj.array_annotate(**deepcopy(self.array_annotations_at_index(i)))
+            self._slice_array_annotations(obj, i)
         except AttributeError:  # If Quantity was returned, not Epoch
             pass
         return obj
@@ -28,8 +28,12 @@ def _new_event(cls, times=None, labels=None, units=None, name=None, file_origin=
     A function to map Event.__new__ to function that
     does not do the unit checking. This is needed for pickle to work.
     '''
-    e = Event(times=times, labels=labels, units=units, name=name, file_origin=file_origin,
-              description=description, array_annotations=array_annotations, **annotations)
+    # unlike Event.__new__, this does not copy times, which can be an
+    # out-of-band buffer of pickle protocol 5
+    e = pq.Quantity(times, units=units, copy=False).view(cls)
+    e._labels = labels
+    Event.__init__(e, name=name, file_origin=file_origin, description=description,
+                   array_annotations=array_annotations, **annotations)
     e.segment = segment
     return e
 
@@ -122,11 +126,12 @@ class Event(DataObject):
     def __reduce__(self):
         '''
         Map the __new__ function onto _new_event, so that pickle
-        works
+        works. The times are given as a plain array, so with pickle protocol 5
+        they can be an out-of-band buffer.
         '''
-        return _new_event, (self.__class__, np.array(self), self.labels, self.units, self.name,
-                            self.file_origin, self.description, self.array_annotations,
-                            self.annotations, self.segment)
+        return _new_event, (self.__class__, self.view(np.ndarray), self.labels, self.units,
+                            self.name, self.file_origin, self.description,
+                            self.array_annotations, self.annotations, self.segment)
 
     def __array_finalize__(self, obj):
         super(Event, self).__array_finalize__(obj)
@@ -240,7 +245,7 @@ class Event(DataObject):
         else:
             obj.labels = self._labels
         try:
-            obj.array_annotate(**deepcopy(self.array_annotations_at_index(i)))
+            self._slice_array_annotations(obj, i)
         except AttributeError:  # If Quantity was returned, not Event
             pass
         return obj
@@ -167,10 +167,13 @@ class IrregularlySampledSignal(BaseSignal):
     def __reduce__(self):
         '''
         Map the __new__ function onto _new_IrregularlySampledSignal, so that pickle
-        works
+        works. The times and the data are given as plain arrays and are not
+        copied when unpickled, so with pickle protocol 5 they can be
+        out-of-band buffers.
         '''
-        return _new_IrregularlySampledSignal, (self.__class__, self.times, np.array(self),
-                                               self.units, self.times.units, self.dtype, True,
+        return _new_IrregularlySampledSignal, (self.__class__, self.times.view(np.ndarray),
+                                               self.view(np.ndarray), self.units,
+                                               self.times.units, self.dtype, False,
                                                self.name, self.file_origin, self.description,
                                                self.array_annotations, self.annotations,
                                                self.segment, self.channel_index)
@@ -215,11 +218,11 @@ class IrregularlySampledSignal(BaseSignal):
                     raise TypeError("%s not supported" % type(j))
                 if isinstance(k, (int, np.integer)):
                     obj = obj.reshape(-1, 1)  # add if channel_index
-                obj.array_annotations = deepcopy(self.array_annotations_at_index(k))
+                self._slice_array_annotations(obj, k)
         elif isinstance(i, slice):
             obj = super(IrregularlySampledSignal, self).__getitem__(i)
             obj.times = self.times.__getitem__(i)
-            obj.array_annotations = deepcopy(self.array_annotations)
+            self._slice_array_annotations(obj, slice(None))
         elif isinstance(i, np.ndarray):
             # Indexing of an IrregularlySampledSignal is only consistent if the resulting
             # number of samples is the same for each trace. The time axis for these samples is not
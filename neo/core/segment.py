@@ -17,6 +17,33 @@ import numpy as np
 from neo.core.container import Container
 
 
+def _child_time_bounds(container_name, child):
+    """
+    Return the (t_start, t_stop) of a child stored in the container attribute
+    container_name of a :class:`Segment`, or None if it has no times.
+    """
+    if container_name in Segment._time_span_containers:
+        return child.t_start, child.t_stop
+    times = getattr(child, 'times', None)
+    if times is None or len(times) == 0:
+        return None
+    return times[0], times[-1]
+
+
+def _merge_time_bounds(bounds, other):
+    """
+    Combine two (t_start, t_stop) pairs, either of which may be missing.
+    """
+    if other is None:
+        return bounds
+    t_start, t_stop = bounds
+    if t_start is None or other[0] < t_start:
+        t_start = other[0]
+    if t_stop is None or other[1] > t_stop:
+        t_stop = other[1]
+    return t_start, t_stop
+
+
 class Segment(Container):
     '''
     A container for data sharing a common time basis.
@@ -97,30 +124,29 @@ class Segment(Container):
         self.rec_datetime = rec_datetime
         self.index = index
 
+    # containers whose children have a t_start and a t_stop, the other data
+    # containers only contribute the first and last of their times
+    _time_span_containers = ('analogsignals', 'spiketrains',
+                             'irregularlysampledsignals')
+
+    def _get_time_bounds(self):
+        """
+        Return (t_start, t_stop) of the children, in one pass over them.
+        """
+        bounds = (None, None)
+        for name in self._data_child_containers:
+            for child in getattr(self, name):
+                bounds = _merge_time_bounds(bounds, _child_time_bounds(name, child))
+        return bounds
+
     # t_start attribute is handled as a property so type checking can be done
     @property
     def t_start(self):
         '''
         Time when first signal begins.
         '''
-        
-        t_starts = [sig.t_start for sig in self.analogsignals +
-                    self.spiketrains + self.irregularlysampledsignals]
-        
-        for e in (self.epochs + self.events):
-            if hasattr(e, 'times'):
-                if len(e.times) > 0:
-                    t_starts += [e.times[0]]
-        # t_starts += [
-        #     e.times[0]
-        #     for e in self.epochs + self.events if len(e.times) > 0]
-
         # t_start is not defined if no children are present
-        if len(t_starts) == 0:
-            return None
-
-        t_start = min(t_starts)
-        return t_start
+        return self._get_time_bounds()[0]
 
     # t_stop attribute is handled as a property so type checking can be done
     @property
@@ -128,20 +154,8 @@ class Segment(Container):
         '''
         Time when last signal ends.
         '''
-        t_stops = [sig.t_stop for sig in self.analogsignals +
-                   self.spiketrains + self.irregularlysampledsignals]
-        for e in (self.epochs + self.events):
-            if hasattr(e, 'times'):
-                if len(e.times) > 0:
-                    t_stops += [e.times[-1]]
-        # t_stops += [e.times[-1] for e in self.epochs + self.events if len(e.times) > 0]
-
         # t_stop is not defined if no children are present
-        if len(t_stops) == 0:
-            return None
-
-        t_stop = max(t_stops)
-        return t_stop
+        return self._get_time_bounds()[1]
 
     def take_spiketrains_by_unit(self, unit_list=None):
         '''
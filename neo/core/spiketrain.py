@@ -28,7 +28,8 @@ import warnings
 import numpy as np
 import quantities as pq
 from neo.core.baseneo import BaseNeo, MergeError, merge_annotations
-from neo.core.dataobject import DataObject, ArrayDict
+from neo.core.dataobject import (DataObject, ArrayDict, _validated_dimensionality,
+                                 _pickled_quantity)
 
 
 def check_has_dimensions_time(*values):
@@ -322,6 +323,35 @@ class SpikeTrain(DataObject):
         DataObject.__init__(self, name=name, file_origin=file_origin, description=description,
                             array_annotations=array_annotations, **annotations)
 
+    @classmethod
+    def _from_validated(cls, times, t_stop, units, t_start, sampling_rate=1.0 * pq.Hz,
+                        waveforms=None, left_sweep=None, name=None, file_origin=None,
+                        description=None, array_annotations=None, annotations=None):
+        '''
+        Trusted constructor for readers creating many :class:`SpikeTrain` objects from
+        data that is already consistent, e.g. coming from a :class:`BaseRawIO` header.
+
+        Unlike the normal constructor this does not copy :attr:`times`, does not rescale
+        or cast anything and does not check that the spikes are between :attr:`t_start`
+        and :attr:`t_stop`, nor the waveforms, annotations and array annotations.
+        The caller is responsible for that:
+          * :attr:`times` is a numpy array (its dtype is kept)
+          * :attr:`units` is a time unit, preferably a quantity or a dimensionality
+          * :attr:`t_start` and :attr:`t_stop` are quantities with the same units and
+            dtype as :attr:`times`
+          * annotations and array annotations are valid
+        '''
+        dim = _validated_dimensionality(units)
+        obj = pq.Quantity(times, units=dim, copy=False).view(cls)
+        obj.t_start = t_start
+        obj.t_stop = t_stop
+        obj.waveforms = waveforms
+        obj.left_sweep = left_sweep
+        obj.sampling_rate = sampling_rate
+        obj._init_validated(name=name, description=description, file_origin=file_origin,
+                            array_annotations=array_annotations, annotations=annotations)
+        return obj
+
     def _repr_pretty_(self, pp, cycle):
         super(SpikeTrain, self)._repr_pretty_(pp, cycle)
 
@@ -339,14 +369,15 @@ class SpikeTrain(DataObject):
     def __reduce__(self):
         '''
         Map the __new__ function onto _new_BaseAnalogSignal, so that pickle
-        works
+        works. The times and the waveforms are given as plain arrays and are
+        not copied when unpickled, so with pickle protocol 5 they can be
+        out-of-band buffers.
         '''
-        import numpy
-        return _new_spiketrain, (self.__class__, numpy.array(self), self.t_stop, self.units,
-                                 self.dtype, True, self.sampling_rate, self.t_start,
-                                 self.waveforms, self.left_sweep, self.name, self.file_origin,
-                                 self.description, self.array_annotations, self.annotations,
-                                 self.segment, self.unit)
+        return _new_spiketrain, (self.__class__, self.view(np.ndarray), self.t_stop, self.units,
+                                 self.dtype, False, self.sampling_rate, self.t_start,
+                                 _pickled_quantity(self.waveforms), self.left_sweep, self.name,
+                                 self.file_origin, self.description, self.array_annotations,
+                                 self.annotations, self.segment, self.unit)
 
     def __array_finalize__(self, obj):
         '''
@@ -423,6 +454,7 @@ class SpikeTrain(DataObject):
         # now sort the times
         # We have sorted twice, but `self = self[sort_indices]` introduces
         # a dependency on the slicing functionality of SpikeTrain.
+        self._unshare_data()
         super(SpikeTrain, self).sort()
 
     def __getslice__(self, i, j):
@@ -510,7 +542,7 @@ class SpikeTrain(DataObject):
         if hasattr(obj, 'waveforms') and obj.waveforms is not None:
             obj.waveforms = obj.waveforms.__getitem__(i)
         try:
-            obj.array_annotate(**deepcopy(self.array_annotations_at_index(i)))
+            self._slice_array_annotations(obj, i)
         except AttributeError:  # If Quantity was returned, not SpikeTrain
             pass
         return obj
@@ -120,7 +120,8 @@ from neo.io.brainwaredamio import BrainwareDamIO
 from neo.io.brainwaref32io import BrainwareF32IO
 from neo.io.brainwaresrcio import BrainwareSrcIO
 from neo.io.elanio import ElanIO
-# from neo.io.elphyio import ElphyIO
+from neo.io.elphyio import ElphyIO
+from neo.io.elphyio_v1 import ElphyIO as OldElphyIO
 from neo.io.exampleio import ExampleIO
 from neo.io.igorproio import IgorIO
 from neo.io.intanio import IntanIO
@@ -161,7 +162,7 @@ iolist = [
     BrainwareF32IO,
     BrainwareSrcIO,
     ElanIO,
-    # ElphyIO,
+    ElphyIO,
     ExampleIO,
     IgorIO,
     IntanIO,
@@ -18,6 +18,8 @@ import numpy as np
 import quantities as pq
 
 from neo.io.baseio import BaseIO
+from neo.io.proxyobjects import AnalogSignalProxy
+from neo.rawio.asciisignalrawio import AsciiSignalRawIO
 from neo.core import AnalogSignal, IrregularlySampledSignal, Segment, Block
 
 
@@ -53,8 +55,12 @@ class AsciiSignalIO(BaseIO):
         signal_group_mode : if 'all-in-one', load data as a single, multi-channel AnalogSignal,
                        if 'split-all' (default for backwards compatibility) load data as
                        separate, single-channel AnalogSignals
-        method : 'genfromtxt', 'csv', 'homemade' or a user-defined function which takes a
-                 filename and usecolumns as argument and returns a 2D NumPy array.
+        method : 'genfromtxt', 'csv', 'homemade', 'stream' or a user-defined function which
+                 takes a filename and usecolumns as argument and returns a 2D NumPy array.
+        use_cache : if True the parsed signals are saved in a .npy file in cache_path
+                    and later reads use a memmap of it instead of parsing the text
+        cache_path : 'home', 'same_as_resource' or a dirname
+        block_size : number of bytes parsed at once by the 'stream' method
 
         If specifying both usecols and timecolumn, the latter should identify
         the column index _after_ removing the unused columns.
@@ -63,6 +69,14 @@ class AsciiSignalIO(BaseIO):
             - 'genfromtxt' use numpy.genfromtxt
             - 'csv' use csv module
             - 'homemade' use an intuitive, more robust but slow method
+            - 'stream' read the file by blocks of block_size bytes and convert the
+              numbers of each block at once, the memory needed is the one of the
+              float32 signals (none with use_cache) and of one block.
+
+        With lazy=True or use_cache=True the file is read with the 'stream' method
+        (neo.rawio.AsciiSignalRawIO) whatever the method, which must not be a function.
+        With lazy=True the AnalogSignals are AnalogSignalProxy objects, irregularly
+        sampled signals are always loaded.
 
     If `metadata_filename` is provided, the parameters for reading/writing the file
     ("delimiter", "timecolumn", "units", etc.) will be read from that file.
@@ -90,6 +104,7 @@ class AsciiSignalIO(BaseIO):
 
     is_readable = True
     is_writable = True
+    support_lazy = True
 
     supported_objects = [Block, Segment, AnalogSignal]
     readable_objects = [Block, Segment]
@@ -109,7 +124,8 @@ class AsciiSignalIO(BaseIO):
             ('time_units', {'value': pq.s, }),
             ('sampling_rate', {'value': 1.0 * pq.Hz, }),
             ('t_start', {'value': 0.0 * pq.s, }),
-            ('method', {'value': 'homemade', 'possible': ['genfromtxt', 'csv', 'homemade']}),
+            ('method', {'value': 'homemade',
+                        'possible': ['genfromtxt', 'csv', 'homemade', 'stream']}),
             ('signal_group_mode', {'value': 'split-all'})
         ]
     }
@@ -127,7 +143,8 @@ class AsciiSignalIO(BaseIO):
 
     def __init__(self, filename=None, delimiter='\t', usecols=None, skiprows=0, timecolumn=None,
                  sampling_rate=1.0 * pq.Hz, t_start=0.0 * pq.s, units=pq.V, time_units=pq.s,
-                 method='genfromtxt', signal_group_mode='split-all', metadata_filename=None):
+                 method='genfromtxt', signal_group_mode='split-all', metadata_filename=None,
+                 use_cache=False, cache_path='same_as_resource', block_size=2 ** 24):
         """
         This class read/write AnalogSignal in a text file.
         Each signal is a column.
@@ -157,11 +174,15 @@ class AsciiSignalIO(BaseIO):
         self.units = metadata.get("units", pq.Quantity(1, units))
 
         self.method = metadata.get("method", method)
-        if not(self.method in ('genfromtxt', 'csv', 'homemade') or callable(self.method)):
+        if not(self.method in ('genfromtxt', 'csv', 'homemade', 'stream') or
+               callable(self.method)):
             raise ValueError(
-                "method must be one of 'genfromtxt', 'csv', 'homemade', or a function")
+                "method must be one of 'genfromtxt', 'csv', 'homemade', 'stream', or a function")
 
         self.signal_group_mode = metadata.get("signal_group_mode", signal_group_mode)
+        self.use_cache = use_cache
+        self.cache_path = cache_path
+        self.block_size = block_size
 
     def read_block(self, lazy=False):
         block = Block(file_origin=os.path.basename(self.filename))
@@ -174,13 +195,22 @@ class AsciiSignalIO(BaseIO):
         """
 
         """
-        if lazy:
-            raise NotImplementedError("lazy mode not supported")
-
         seg = Segment(file_origin=os.path.basename(self.filename))
 
+        times = None
+        if lazy or self.use_cache or self.method == 'stream':
+            if callable(self.method):
+                raise NotImplementedError("lazy mode and cache not supported with a function")
+            rawio = self._make_rawio()
+            if lazy and rawio.is_regular:
+                self._read_proxies(rawio, seg)
+                seg.create_many_to_one_relationship()
+                return seg
+            sig = rawio.get_table()
+            # the float64 times of the rawio, sig is float32
+            times = rawio.get_times()
         # loadtxt
-        if self.method == 'genfromtxt':
+        elif self.method == 'genfromtxt':
             sig = np.genfromtxt(self.filename,
                                 delimiter=self.delimiter,
                                 usecols=self.usecols,
@@ -225,15 +255,17 @@ class AsciiSignalIO(BaseIO):
             sampling_rate = self.sampling_rate
             t_start = self.t_start
         else:
-            delta_t = np.diff(sig[:, self.timecolumn])
+            if times is None:
+                times = sig[:, self.timecolumn]
+            delta_t = np.diff(times)
             mean_delta_t = np.mean(delta_t)
             if (delta_t.max() - delta_t.min()) / mean_delta_t < 1e-6:
                 # equally spaced --> AnalogSignal
-                sampling_rate = 1.0 / np.mean(np.diff(sig[:, self.timecolumn])) / self.time_units
+                sampling_rate = 1.0 / mean_delta_t / self.time_units
             else:
                 # not equally spaced --> IrregularlySampledSignal
                 sampling_rate = None
-            t_start = sig[0, self.timecolumn] * self.time_units
+            t_start = times[0] * self.time_units
 
         if self.signal_group_mode == 'all-in-one':
             if self.timecolumn is not None:
@@ -246,7 +278,7 @@ class AsciiSignalIO(BaseIO):
             else:
                 signal = sig
             if sampling_rate is None:
-                irr_sig = IrregularlySampledSignal(signal[:, self.timecolumn] * self.time_units,
+                irr_sig = IrregularlySampledSignal(times * self.time_units,
                                                    signal * self.units,
                                                    name='multichannel')
                 seg.irregularlysampledsignals.append(irr_sig)
@@ -266,7 +298,7 @@ class AsciiSignalIO(BaseIO):
                     continue
                 signal = sig[:, i] * self.units
                 if sampling_rate is None:
-                    irr_sig = IrregularlySampledSignal(sig[:, time_col] * self.time_units,
+                    irr_sig = IrregularlySampledSignal(times * self.time_units,
                                                        signal,
                                                        t_start=t_start, channel_index=i,
                                                        name='Column %d' % i)
@@ -280,6 +312,37 @@ class AsciiSignalIO(BaseIO):
         seg.create_many_to_one_relationship()
         return seg
 
+    def _make_rawio(self):
+        time_units = 1.
+        if self.time_units is not None:
+            time_units = float(self.time_units.rescale(pq.s).magnitude)
+        if self.timecolumn is None:
+            sampling_rate = float(self.sampling_rate.rescale(pq.Hz).magnitude)
+            t_start = float(self.t_start.rescale(pq.s).magnitude)
+        else:
+            sampling_rate, t_start = 1., 0.
+        rawio = AsciiSignalRawIO(filename=self.filename, delimiter=self.delimiter,
+                                 usecols=self.usecols, skiprows=self.skiprows,
+                                 timecolumn=self.timecolumn, sampling_rate=sampling_rate,
+                                 t_start=t_start, units=self.units.dimensionality.string,
+                                 time_units=time_units, block_size=self.block_size,
+                                 signals_cache_path=self.cache_path if self.use_cache else None)
+        rawio.parse_header()
+        return rawio
+
+    def _read_proxies(self, rawio, seg):
+        nb_channel = rawio.signal_channels_count()
+        if self.signal_group_mode == 'all-in-one':
+            proxy = AnalogSignalProxy(rawio=rawio, global_channel_indexes=np.arange(nb_channel),
+                                      block_index=0, seg_index=0)
+            proxy.name = 'multichannel'
+            seg.analogsignals.append(proxy)
+        else:
+            for i in range(nb_channel):
+                proxy = AnalogSignalProxy(rawio=rawio, global_channel_indexes=[i],
+                                          block_index=0, seg_index=0)
+                seg.analogsignals.append(proxy)
+
     def read_metadata(self):
         """
         Read IO parameters from an associated JSON file
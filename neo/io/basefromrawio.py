@@ -82,7 +82,9 @@ class BaseFromRaw(BaseIO):
 
 
     def read_block(self, block_index=0, lazy=False, signal_group_mode=None,
-                   units_group_mode=None, load_waveforms=False):
+                   units_group_mode=None, load_waveforms=False, max_workers=None,
+                   executor=None, channel_indexes=None, channel_names=None,
+                   unit_indexes=None, event_channel_indexes=None):
         """
 
 
@@ -104,6 +106,34 @@ class BaseFromRaw(BaseIO):
 
         :param load_waveforms: False by default. Control SpikeTrains.waveforms is None or not.
 
+        :param max_workers: None by default. When lazy is False and max_workers is greater
+            than 1, the data objects of all segments are loaded concurrently by a pool
+            of max_workers threads. The order of the objects and their relationships
+            are the same as with a serial read. This requires concurrent.futures
+            (the futures package on Python 2) and a rawio with support_concurrent_reads,
+            other rawios are read serially.
+
+        :param executor: None by default. A concurrent.futures.Executor (for instance a
+            shared ThreadPoolExecutor) used instead of creating a new pool for
+            max_workers. The objects are loaded from threads of this process, so
+            process based executors are not supported. max_workers (4 by default)
+            then bounds the number of pending loads.
+
+        :param channel_indexes: None by default means all signal channels.
+            Indexes in header['signal_channels'] of the only signal channels to read.
+
+        :param channel_names: None by default. Names of signal channels to read, in
+            addition to those of channel_indexes.
+
+        :param unit_indexes: None by default means all units.
+            Indexes in header['unit_channels'] of the only units to read.
+
+        :param event_channel_indexes: None by default means all event and epoch channels.
+            Indexes in header['event_channels'] of the only channels to read.
+
+        Only the selected channels, units and event channels get a ChannelIndex, Unit
+        and data objects, and only their data are read from the file.
+
         """
 
         if signal_group_mode is None:
@@ -125,12 +155,12 @@ class BaseFromRaw(BaseIO):
 
         # ChannelIndex for AnalogSignals
         all_channels = self.header['signal_channels']
-        channel_indexes_list = self.get_group_channel_indexes()
+        channel_indexes_list = self._get_signal_channel_groups(channel_indexes, channel_names)
         for channel_index in channel_indexes_list:
             for i, (ind_within, ind_abs) in self._make_signal_channel_subgroups(
                     channel_index, signal_group_mode=signal_group_mode).items():
                 if signal_group_mode == "split-all":
-                    chidx_annotations = self.raw_annotations['signal_channels'][i]
+                    chidx_annotations = self.raw_annotations['signal_channels'][ind_abs[0]]
                 elif signal_group_mode == "group-by-same-units":
                     # this should be done with array_annotation soon:
                     keys = list(self.raw_annotations['signal_channels'][ind_abs[0]].keys())
@@ -159,20 +189,21 @@ class BaseFromRaw(BaseIO):
         #    'all-in-one'
         #  * Each units is assigned to one ChannelIndex: 'split-all'
         # This is kept for compatibility
-        unit_channels = self.header['unit_channels']
+        if unit_indexes is None:
+            unit_indexes = range(self.header['unit_channels'].size)
         if units_group_mode == 'all-in-one':
-            if unit_channels.size > 0:
+            if len(unit_indexes) > 0:
                 channel_index = ChannelIndex(index=np.array([], dtype='i'),
                                              name='ChannelIndex for all Unit')
                 bl.channel_indexes.append(channel_index)
-            for c in range(unit_channels.size):
+            for c in unit_indexes:
                 unit_annotations = self.raw_annotations['unit_channels'][c]
                 unit_annotations = check_annotations(unit_annotations)
                 unit = Unit(**unit_annotations)
                 channel_index.units.append(unit)
 
         elif units_group_mode == 'split-all':
-            for c in range(len(unit_channels)):
+            for c in unit_indexes:
                 unit_annotations = self.raw_annotations['unit_channels'][c]
                 unit_annotations = check_annotations(unit_annotations)
                 unit = Unit(**unit_annotations)
@@ -181,12 +212,20 @@ class BaseFromRaw(BaseIO):
                 channel_index.units.append(unit)
                 bl.channel_indexes.append(channel_index)
 
-        # Read all segments
+        # Read all segments, with proxies only when they are loaded concurrently
+        parallel = not lazy and self._use_executor(max_workers, executor)
         for seg_index in range(self.segment_count(block_index)):
             seg = self.read_segment(block_index=block_index, seg_index=seg_index,
-                                    lazy=lazy, signal_group_mode=signal_group_mode,
-                                    load_waveforms=load_waveforms)
+                                    lazy=lazy or parallel,
+                                    signal_group_mode=signal_group_mode,
+                                    load_waveforms=load_waveforms,
+                                    channel_indexes=channel_indexes,
+                                    channel_names=channel_names, unit_indexes=unit_indexes,
+                                    event_channel_indexes=event_channel_indexes)
             bl.segments.append(seg)
+        if parallel:
+            self._load_proxies(bl.segments, max_workers=max_workers, executor=executor,
+                               load_waveforms=load_waveforms)
 
         # create link to other containers ChannelIndex and Units
         for seg in bl.segments:
@@ -206,7 +245,9 @@ class BaseFromRaw(BaseIO):
 
     def read_segment(self, block_index=0, seg_index=0, lazy=False,
                      signal_group_mode=None, load_waveforms=False, time_slice=None,
-                     strict_slicing=True):
+                     strict_slicing=True, max_workers=None, executor=None,
+                     channel_indexes=None, channel_names=None, unit_indexes=None,
+                     event_channel_indexes=None):
         """
         :param block_index: int default 0. In case of several block block_index can be specified.
 
@@ -229,11 +270,32 @@ class BaseFromRaw(BaseIO):
         :param strict_slicing: True by default.
              Control if an error is raise or not when one of  time_slice member (t_start or t_stop)
              is outside the real time range of the segment.
+
+        :param max_workers: None by default. When lazy is False and max_workers is greater
+            than 1, the data objects are loaded concurrently by a pool of max_workers threads.
+
+        :param executor: None by default. A concurrent.futures.Executor used instead of
+            creating a new pool for max_workers, see read_block.
+
+        :param channel_indexes, channel_names, unit_indexes, event_channel_indexes:
+            None by default. Select the signal channels, units and event channels to
+            read, see read_block.
         """
 
         if lazy:
             assert time_slice is None, 'For lazy=true you must specify time_slice when loading'
 
+        if not lazy and self._use_executor(max_workers, executor):
+            seg = self.read_segment(block_index=block_index, seg_index=seg_index, lazy=True,
+                                    signal_group_mode=signal_group_mode,
+                                    channel_indexes=channel_indexes,
+                                    channel_names=channel_names, unit_indexes=unit_indexes,
+                                    event_channel_indexes=event_channel_indexes)
+            self._load_proxies([seg], max_workers=max_workers, executor=executor,
+                               load_waveforms=load_waveforms, time_slice=time_slice,
+                               strict_slicing=strict_slicing)
+            return seg
+
         if signal_group_mode is None:
             signal_group_mode = self._prefered_signal_group_mode
 
@@ -248,10 +310,11 @@ class BaseFromRaw(BaseIO):
         # AnalogSignal
         signal_channels = self.header['signal_channels']
         if signal_channels.size > 0:
-            channel_indexes_list = self.get_group_channel_indexes()
-            for channel_indexes in channel_indexes_list:
+            channel_indexes_list = self._get_signal_channel_groups(channel_indexes,
+                                                                   channel_names)
+            for group_channel_indexes in channel_indexes_list:
                 for i, (ind_within, ind_abs) in self._make_signal_channel_subgroups(
-                        channel_indexes,
+                        group_channel_indexes,
                         signal_group_mode=signal_group_mode).items():
                     # make a proxy...
                     anasig = AnalogSignalProxy(rawio=self, global_channel_indexes=ind_abs,
@@ -266,8 +329,9 @@ class BaseFromRaw(BaseIO):
                     seg.analogsignals.append(anasig)
 
         # SpikeTrain and waveforms (optional)
-        unit_channels = self.header['unit_channels']
-        for unit_index in range(len(unit_channels)):
+        if unit_indexes is None:
+            unit_indexes = range(self.header['unit_channels'].size)
+        for unit_index in unit_indexes:
             # make a proxy...
             sptr = SpikeTrainProxy(rawio=self, unit_index=unit_index,
                                                 block_index=block_index, seg_index=seg_index)
@@ -283,7 +347,9 @@ class BaseFromRaw(BaseIO):
 
         # Events/Epoch
         event_channels = self.header['event_channels']
-        for chan_ind in range(len(event_channels)):
+        if event_channel_indexes is None:
+            event_channel_indexes = range(len(event_channels))
+        for chan_ind in event_channel_indexes:
             if event_channels['type'][chan_ind] == b'event':
                 e = EventProxy(rawio=self, event_channel_index=chan_ind,
                                         block_index=block_index, seg_index=seg_index)
@@ -302,6 +368,95 @@ class BaseFromRaw(BaseIO):
         seg.create_many_to_one_relationship()
         return seg
 
+    def _get_signal_channel_groups(self, channel_indexes=None, channel_names=None):
+        """
+        Return the channel indexes of each group of signal channels, as given by
+        get_group_channel_indexes, keeping only the channels in channel_indexes or
+        channel_names. Groups without selected channels are dropped.
+        """
+        channel_indexes_list = self.get_group_channel_indexes()
+        if channel_indexes is None and channel_names is None:
+            return channel_indexes_list
+
+        nb_channel = self.header['signal_channels'].size
+        selected = np.zeros(nb_channel, dtype=bool)
+        if channel_indexes is not None:
+            selected[channel_indexes] = True
+        if channel_names is not None:
+            selected[self.channel_name_to_index(channel_names)] = True
+
+        selected_list = []
+        for group_channel_indexes in channel_indexes_list:
+            if group_channel_indexes is None:
+                group_channel_indexes = np.arange(nb_channel, dtype=int)
+            group_channel_indexes = group_channel_indexes[selected[group_channel_indexes]]
+            if group_channel_indexes.size > 0:
+                selected_list.append(group_channel_indexes)
+        return selected_list
+
+    def _use_executor(self, max_workers, executor):
+        if executor is None and (max_workers is None or max_workers <= 1):
+            return False
+        if not self.support_concurrent_reads:
+            self.logger.warning('%s does not support concurrent reads, '
+                                'objects are loaded serially' % self.__class__.__name__)
+            return False
+        return True
+
+    def _load_proxies(self, segments, max_workers=None, executor=None, load_waveforms=False,
+                      **load_kargs):
+        """
+        Replace the proxy objects of the segments by the loaded data objects.
+
+        The proxies are loaded concurrently by the executor, or by a new pool of
+        max_workers threads. Each loaded object takes the place of its proxy as soon
+        as it is ready, so the order of the objects does not depend on the order of
+        completion and no loaded object is held outside of its segment. At most
+        2 * max_workers loads are pending at a time.
+
+        The rawio must support concurrent reads (support_concurrent_reads).
+        """
+        from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+        tasks = []
+        for seg in segments:
+            for attr in ('analogsignals', 'spiketrains', 'events', 'epochs'):
+                objects = getattr(seg, attr)
+                for i, obj in enumerate(objects):
+                    if isinstance(obj, tuple(proxyobjectlist)):
+                        tasks.append((objects, i))
+
+        def load(proxy):
+            if isinstance(proxy, SpikeTrainProxy):
+                return proxy.load(load_waveforms=load_waveforms, **load_kargs)
+            return proxy.load(**load_kargs)
+
+        def replace(done):
+            for future in done:
+                objects, i = pending.pop(future)
+                obj = future.result()
+                obj.segment = objects[i].segment
+                objects[i] = obj
+
+        if max_workers is None:
+            max_workers = 4
+        pool = executor
+        if executor is None:
+            pool = ThreadPoolExecutor(max_workers=max_workers)
+        pending = {}
+        try:
+            for objects, i in tasks:
+                if len(pending) >= 2 * max_workers:
+                    replace(wait(pending, return_when=FIRST_COMPLETED).done)
+                pending[pool.submit(load, objects[i])] = (objects, i)
+            while pending:
+                replace(wait(pending, return_when=FIRST_COMPLETED).done)
+        finally:
+            for future in pending:
+                future.cancel()
+            if executor is None:
+                pool.shutdown()
+
     def _make_signal_channel_subgroups(self, channel_indexes,
                                        signal_group_mode='group-by-same-units'):
         """
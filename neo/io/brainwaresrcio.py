@@ -52,6 +52,14 @@ from neo.core import (Block, Event,
 # need to subclass BaseIO
 from neo.io.baseio import BaseIO
 
+# the lazy SpikeTrains and comments are proxies on a rawio of the index
+from neo.io.proxyobjects import SpikeTrainProxy, EventProxy
+from neo.rawio.baserawio import (BaseRawIO, _signal_channel_dtype,
+                                 _unit_channel_dtype, _event_channel_dtype)
+
+# the index of the file is cached like the rawio cache
+from neo.rawio.baserawio import get_cache_filename
+
 LOGHANDLER = logging.StreamHandler()
 
 PY_VER = sys.version_info[0]
@@ -95,6 +103,19 @@ class BrainwareSrcIO(BaseIO):
         There is always only one ChannelIndex.  BrainWare stores the
         equivalent of ChannelIndexes in separate files.
 
+    Note 5:
+        With lazy=True the SpikeTrains are SpikeTrainProxy objects, their
+        spikes are only read by their load method.  The comments are an
+        EventProxy.  The Segments and Units are always read.  The loaded
+        SpikeTrains have their times in s and no trig2 annotation, which is
+        read with the spikes.
+        This needs an index of the file (the start of each Block, the offset
+        of each list of spikes and the comments) which is built by a first
+        pass over the file that skips the spikes.  With use_cache=True the index is
+        saved in cache_path ('home', 'same_as_resource' or a dirname) like
+        the rawio cache.  The index also allows read_block to jump directly
+        to a Block.
+
     Usage:
         >>> from neo.io.brainwaresrcio import BrainwareSrcIO
         >>> srcfile = BrainwareSrcIO(filename='multi_500ms_mulitrep_ch1.src')
@@ -109,6 +130,8 @@ class BrainwareSrcIO(BaseIO):
         >>> print blk2[0].segments
         >>> print blks
         >>> print blks[0].segments
+        >>> blk3 = srcfile.read_block(block_index=2, lazy=True)
+        >>> spiketrain = blk3.segments[1].spiketrains[0].load()
     """
 
     is_readable = True  # This class can only read data
@@ -123,6 +146,7 @@ class BrainwareSrcIO(BaseIO):
 
     has_header = False
     is_streameable = False
+    support_lazy = True
 
     # This is for GUI stuff: a definition for parameters when reading.
     # This dict should be keyed by object (`Block`). Each entry is a list
@@ -140,10 +164,13 @@ class BrainwareSrcIO(BaseIO):
 
     mode = 'file'
 
-    def __init__(self, filename=None):
+    def __init__(self, filename=None, use_cache=False,
+                 cache_path='same_as_resource'):
         """
         Arguments:
             filename: the filename
+            use_cache: save the index of the file in cache_path
+            cache_path: 'home', 'same_as_resource' or a dirname
         """
         BaseIO.__init__(self)
 
@@ -187,6 +214,22 @@ class BrainwareSrcIO(BaseIO):
         # this stores an empty SpikeTrain which is used in various places.
         self._default_spiketrain = None
 
+        # if True the lists of spikes are replaced by proxies
+        self._lazy = False
+
+        # when building the index this is a list, and the lists of spikes are
+        # skipped and added to it
+        self._spike_lists = None
+
+        # this stores the index of the file, built on first use, the rawio
+        # on the index used by the proxies and the index of the Block read
+        # with lazy=True
+        self.use_cache = use_cache
+        self.cache_path = cache_path
+        self._index = None
+        self._index_rawio = None
+        self._block_index = None
+
     @property
     def _isopen(self):
         """
@@ -231,15 +274,16 @@ class BrainwareSrcIO(BaseIO):
         """
         return self.read_block(lazy=lazy, **kargs)
 
-    def read_block(self, lazy=False, **kargs):
+    def read_block(self, lazy=False, block_index=0, **kargs):
         """
         Reads the first Block from the Spike ReCording file "filename"
         generated with BrainWare.
 
+        block_index gives another Block, it is found with the index of the
+        file so the previous Blocks are not read.
+
         If you wish to read more than one Block, please use read_all_blocks.
         """
-        assert not lazy, 'Do not support lazy'
-
         # there are no keyargs implemented to so far.  If someone tries to pass
         # them they are expecting them to do something or making a mistake,
         # neither of which should pass silently
@@ -247,11 +291,21 @@ class BrainwareSrcIO(BaseIO):
             raise NotImplementedError('This method does not have any '
                                       'arguments implemented yet')
 
-        blockobj = self.read_next_block()
+        if block_index:
+            blocks = self._get_index()['blocks']
+            if block_index >= blocks.size:
+                raise IndexError('block_index %s out of range, the file has '
+                                 '%s Blocks' % (block_index, blocks.size))
+            self.close()
+            self._opensrc()
+            self._fsrc.seek(int(blocks['offset'][block_index]))
+            self._damaged = bool(blocks['damaged'][block_index])
+
+        blockobj = self.read_next_block(lazy=lazy)
         self.close()
         return blockobj
 
-    def read_next_block(self, **kargs):
+    def read_next_block(self, lazy=False, **kargs):
         """
         Reads a single Block from the Spike ReCording file "filename"
         generated with BrainWare.
@@ -269,7 +323,15 @@ class BrainwareSrcIO(BaseIO):
             raise NotImplementedError('This method does not have any '
                                       'arguments implemented yet')
 
+        if lazy:
+            # the lists of spikes are skipped with the index
+            self._get_index()
+        self._lazy = lazy
+
         self._opensrc()
+        if lazy:
+            self._block_index = int(np.searchsorted(
+                self._index['blocks']['offset'], self._fsrc.tell()))
 
         # create _default_spiketrain here for performance reasons
         self._default_spiketrain = self._init_default_spiketrain.copy()
@@ -337,8 +399,6 @@ class BrainwareSrcIO(BaseIO):
         # there are no keyargs implemented to so far.  If someone tries to pass
         # them they are expecting them to do something or making a mistake,
         # neither of which should pass silently
-        assert not lazy, 'Do not support lazy'
-
         if kargs:
             raise NotImplementedError('This method does not have any '
                                       'argument implemented yet')
@@ -352,7 +412,7 @@ class BrainwareSrcIO(BaseIO):
         blocks = []
         while self._isopen:
             try:
-                blocks.append(self.read_next_block())
+                blocks.append(self.read_next_block(lazy=lazy))
             except:
                 self.close()
                 raise
@@ -378,6 +438,73 @@ class BrainwareSrcIO(BaseIO):
 
         return timestamp
 
+    def _get_index(self):
+        """
+        Return the index of the file: a dict of arrays with the offset of
+        each Block ('blocks'), the offset, end and number of spikes of each
+        list of spikes ('spike_lists') and the Block, time (in s) and label of
+        each comment ('comment_blocks', 'comment_times', 'comment_labels').
+
+        It is built by a fast pass over the file on first use, and loaded
+        from or saved to the cache when use_cache is True.
+        """
+        if self._index is not None:
+            return self._index
+
+        if self.use_cache:
+            cache_filename = get_cache_filename(self._filename,
+                                                self.cache_path,
+                                                self.__class__.__name__)
+            cache_filename += '_index.npz'
+            if os.path.exists(cache_filename):
+                self.logger.info('Use existing index file %s',
+                                 cache_filename)
+                with np.load(cache_filename) as cached:
+                    self._index = dict(cached.items())
+                return self._index
+
+        # the file is read by another BrainwareSrcIO, which skips the lists
+        # of spikes, so the current reading point is not changed
+        reader = self.__class__(filename=self._filename)
+        reader._spike_lists = []
+        blocks = []
+        comments = []
+        reader._opensrc()
+        while reader._isopen:
+            blocks.append((reader._fsrc.tell(), reader._damaged))
+            comments.append(reader.read_next_block().segments[0].events[0])
+        self._index = {
+            'blocks': np.array(blocks, dtype=_block_dtype),
+            'spike_lists': np.array(reader._spike_lists,
+                                    dtype=_spike_list_dtype),
+            'comment_blocks': np.repeat(np.arange(len(comments)),
+                                        [event.size for event in comments]),
+            'comment_times': np.concatenate(
+                [event.times.rescale(pq.s).magnitude.astype('float64')
+                 for event in comments]),
+            'comment_labels': np.concatenate([event.labels
+                                              for event in comments])}
+
+        if self.use_cache:
+            self.logger.info('Create index file %s', cache_filename)
+            np.savez(cache_filename, **self._index)
+        return self._index
+
+    def _read_spike_list(self, offset, damaged):
+        """
+        Read the list of spikes at offset and return it as a SpikeTrain.
+
+        This is used by _SrcIndexRawIO, with a BrainwareSrcIO of its own.
+        """
+        self._opensrc()
+        try:
+            self._default_spiketrain = self._init_default_spiketrain.copy()
+            self._fsrc.seek(offset)
+            self._damaged = damaged
+            return self._combine_spiketrains(self.__read_list())
+        finally:
+            self.close()
+
     # -------------------------------------------------------------------------
     # -------------------------------------------------------------------------
     #  All methods from here on are private.  They are not intended to be used
@@ -406,8 +533,8 @@ class BrainwareSrcIO(BaseIO):
 
         try:
             # uint16 -- the ID code of the next sequence
-            seqid = np.asscalar(np.fromfile(self._fsrc,
-                                            dtype=np.uint16, count=1))
+            seqid = np.fromfile(self._fsrc,
+                                dtype=np.uint16, count=1).item()
         except ValueError:
             # return a None if at EOF.  Other methods use None to recognize
             # an EOF
@@ -500,6 +627,61 @@ class BrainwareSrcIO(BaseIO):
                                                             dtype=np.uint8),
                                           side='')
 
+    def _new_default_spiketrain(self):
+        """
+        _new_default_spiketrain() - return an empty SpikeTrain, or an empty
+        SpikeTrainProxy when reading lazily
+        """
+        if self._lazy:
+            # the last unit channel of the rawio has no spikes
+            return self._new_spiketrain_proxy(self._index['spike_lists'].size)
+        spiketrain = self._default_spiketrain.copy()
+        # the copy shares the annotations, which are changed afterwards
+        spiketrain.annotations = dict(spiketrain.annotations)
+        return spiketrain
+
+    def _get_index_rawio(self):
+        """
+        _get_index_rawio() - return the rawio on the index used by the
+        proxies
+        """
+        if self._index_rawio is None:
+            self._index_rawio = _SrcIndexRawIO(self._filename, self._index)
+            self._index_rawio.parse_header()
+        return self._index_rawio
+
+    def _spike_list_proxy(self, offset):
+        """
+        _spike_list_proxy(offset) - return a SpikeTrainProxy for the list of
+        spikes at offset and skip it, or None if there is no list of spikes
+        at offset.
+        """
+        spike_lists = self._index['spike_lists']
+        i = np.searchsorted(spike_lists['offset'], offset)
+        if i == spike_lists.size or spike_lists['offset'][i] != offset:
+            return None
+        self._fsrc.seek(int(spike_lists['stop'][i]))
+        return self._new_spiketrain_proxy(i)
+
+    def _new_spiketrain_proxy(self, unit_index):
+        """
+        _new_spiketrain_proxy(unit_index) - return a SpikeTrainProxy with the
+        attributes and annotations of an empty SpikeTrain (except trig2) for
+        the unit channel unit_index of the rawio on the index
+        """
+        proxy = SpikeTrainProxy(rawio=self._get_index_rawio(),
+                                unit_index=unit_index)
+
+        default = self._default_spiketrain
+        proxy.name = None
+        proxy.file_origin = self._file_origin
+        proxy.t_start = default.t_start.copy()
+        proxy.t_stop = default.t_stop.copy()
+        proxy.left_sweep = None
+        proxy.annotations = dict((k, v) for k, v in default.annotations.items()
+                                 if k != 'trig2')
+        return proxy
+
     def _combine_events(self, events):
         """
         _combine_events(events) - combine a list of Events
@@ -545,6 +727,14 @@ class BrainwareSrcIO(BaseIO):
         event = self._combine_events(segment.events)
         event_t_start = event.annotations.pop('t_start')
         segment.rec_datetime = self._convert_timestamp(event_t_start)
+        if self._lazy:
+            # the event channel of the rawio on the index for this Block
+            proxy = EventProxy(rawio=self._get_index_rawio(),
+                               event_channel_index=self._block_index)
+            proxy.name = event.name
+            proxy.file_origin = event.file_origin
+            proxy.annotations = event.annotations
+            event = proxy
         segment.events = [event]
         event.segment = segment
 
@@ -554,8 +744,11 @@ class BrainwareSrcIO(BaseIO):
         with single spikes into one long SpikeTrain
         """
 
+        if isinstance(spiketrains, SpikeTrainProxy):
+            return spiketrains
+
         if not spiketrains:
-            return self._default_spiketrain.copy()
+            return self._new_default_spiketrain()
 
         if hasattr(spiketrains[0], 'waveforms') and len(spiketrains) == 1:
             train = spiketrains[0]
@@ -575,7 +768,7 @@ class BrainwareSrcIO(BaseIO):
 
             spiketrains = [itrain for itrain in spiketrains if itrain.size > 0]
             if not spiketrains:
-                return self._default_spiketrain.copy()
+                return self._new_default_spiketrain()
 
             # get the times of the spiketrains and combine them
             waveforms = [itrain.waveforms for itrain in spiketrains]
@@ -619,7 +812,7 @@ class BrainwareSrcIO(BaseIO):
                                 units=pq.ms, copy=False)
 
         if not times.size:
-            return self._default_spiketrain.copy()
+            return self._new_default_spiketrain()
 
         # get the maximum time
         t_stop = times[-1] * 2.
@@ -652,8 +845,8 @@ class BrainwareSrcIO(BaseIO):
 
         This is compatible with python 2 and python 3.
         """
-        rawstr = np.asscalar(np.fromfile(self._fsrc,
-                                         dtype='S%s' % numchars, count=1))
+        rawstr = np.fromfile(self._fsrc,
+                             dtype='S%s' % numchars, count=1).item()
         if utf or (utf is None and PY_VER == 3):
             return rawstr.decode('utf-8')
         return rawstr
@@ -683,8 +876,8 @@ class BrainwareSrcIO(BaseIO):
             self._fsrc.seek(1, 1)
 
             # uint8 -- length of next string
-            numchars = np.asscalar(np.fromfile(self._fsrc,
-                                               dtype=np.uint8, count=1))
+            numchars = np.fromfile(self._fsrc,
+                                   dtype=np.uint8, count=1).item()
 
             # if there is no name, make one up
             if not numchars:
@@ -755,15 +948,15 @@ class BrainwareSrcIO(BaseIO):
         time = np.fromfile(self._fsrc, dtype=np.double, count=1)[0]
 
         # int16 -- length of next string
-        numchars1 = np.asscalar(np.fromfile(self._fsrc,
-                                            dtype=np.int16, count=1))
+        numchars1 = np.fromfile(self._fsrc,
+                                dtype=np.int16, count=1).item()
 
         # char * numchars -- the one who sent the comment
         sender = self.__read_str(numchars1)
 
         # int16 -- length of next string
-        numchars2 = np.asscalar(np.fromfile(self._fsrc,
-                                            dtype=np.int16, count=1))
+        numchars2 = np.fromfile(self._fsrc,
+                                dtype=np.int16, count=1).item()
 
         # char * numchars -- comment text
         text = self.__read_str(numchars2, utf=False)
@@ -805,6 +998,8 @@ class BrainwareSrcIO(BaseIO):
         ID: 29093
         """
 
+        offset = self._fsrc.tell()
+
         # int16 -- number of sequences to read
         numelements = np.fromfile(self._fsrc, dtype=np.int16, count=1)[0]
 
@@ -814,11 +1009,25 @@ class BrainwareSrcIO(BaseIO):
         if numelements == 0:
             return []
 
+        damaged = self._damaged
         if not self._damaged and numelements < 0:
             self._damaged = True
             self.logger.error('Negative sequence count %s, file damaged',
                               numelements)
 
+        if self._lazy:
+            # a list of spikes is skipped and read later by the proxy
+            proxy = self._spike_list_proxy(offset)
+            if proxy is not None:
+                return proxy
+        elif self._spike_lists is not None:
+            # building the index: a list of spikes is skipped
+            nb_spike = self.__skip_spike_list(numelements)
+            if nb_spike is not None:
+                self._spike_lists.append((offset, self._fsrc.tell(),
+                                          nb_spike, damaged))
+                return []
+
         if not self._damaged:
             # read the sequences into a list
             seq_list = [self._read_by_id() for _ in range(numelements)]
@@ -891,7 +1100,7 @@ class BrainwareSrcIO(BaseIO):
             else:
                 # if there are no spiketrains at all,
                 # create an empty spike train
-                trains = [[self._default_spiketrain.copy()]]
+                trains = [[self._new_default_spiketrain()]]
         elif hasattr(trains[0], 'dtype'):
             # workaround for some broken files
             trains = [unassigned_spikes +
@@ -1081,9 +1290,10 @@ class BrainwareSrcIO(BaseIO):
         segments = self.__read_segment_list()
 
         # add the sampling period to each SpikeTrain
+        # (as a sampling rate, which SpikeTrainProxy objects also have)
         for segment in segments:
             for spiketrain in segment.spiketrains:
-                spiketrain.sampling_period = sampling_period
+                spiketrain.sampling_rate = 1.0 / sampling_period
 
         return segments
 
@@ -1419,8 +1629,8 @@ class BrainwareSrcIO(BaseIO):
         self._fsrc.seek(2, 1)
 
         # uint16 -- number of characters in next string
-        numchars = np.asscalar(np.fromfile(self._fsrc,
-                                           dtype=np.uint16, count=1))
+        numchars = np.fromfile(self._fsrc,
+                               dtype=np.uint16, count=1).item()
 
         # char * numchars -- ID string of Unit
         name = self.__read_str(numchars)
@@ -1495,6 +1705,72 @@ class BrainwareSrcIO(BaseIO):
 
         return []
 
+    def __skip_spike_list(self, numelements):
+        """
+        Skip the data sequences of a list if they are all spikes.
+
+        This is only used to build the index of the file.  Runs of spikes
+        with a fixed waveform length are skipped at once.
+
+        ----------------------------------------------------------------
+        Returns the number of spikes, or None if the list is not a list of
+        spikes, in which case the position in the file is not changed.
+
+        No ID number: only called by __read_list
+        """
+
+        start = self._fsrc.tell()
+
+        # if the file is damaged the sequences are read while they have the
+        # ID of the first one, like in __read_list
+        count = None if self._damaged else numelements
+        seqidinit = None
+        nb_spike = 0
+        while count is None or nb_spike < count:
+            # uint16 -- the ID of the next sequence
+            seqid = np.fromfile(self._fsrc, dtype=np.uint16, count=1)
+            if not seqid.size:
+                # premature end of file, the reading stops there
+                break
+            seqid = seqid[0]
+            if seqidinit is None:
+                seqidinit = seqid
+            if count is None and seqid != seqidinit:
+                self._fsrc.seek(-2, 1)
+                break
+            if seqid not in _SPIKE_IDS:
+                self._fsrc.seek(start)
+                return None
+
+            size = _FIXED_SPIKE_SIZES.get(seqid)
+            if size is None:
+                # uint8 -- number of points in spike shape, then
+                # float32, int8 * numpts and uint8, see __read_spike_var
+                numpts = np.fromfile(self._fsrc, dtype=np.uint8, count=1)
+                if not numpts.size:
+                    break
+                self._fsrc.seek(4 + int(numpts[0]) + 1, 1)
+                nb_spike += 1
+                continue
+
+            # a run of spikes with the ID seqid, the ID code included
+            self._fsrc.seek(-2, 1)
+            run_start = self._fsrc.tell()
+            nb = 4096 if count is None else count - nb_spike
+            run = np.fromfile(self._fsrc, dtype=np.uint8, count=nb * size)
+            nb = run.size // size
+            seqids = run[:nb * size].reshape(nb, size)[:, :2].copy()
+            same = seqids.view(np.uint16)[:, 0] == seqid
+            if not np.all(same):
+                nb = int(np.argmin(same))
+            self._fsrc.seek(run_start + nb * size)
+            nb_spike += nb
+            if nb == 0:
+                # premature end of file
+                break
+
+        return nb_spike
+
     # This dictionary maps the numeric data sequence ID codes to the data
     # sequence reading functions.
     #
@@ -1530,6 +1806,147 @@ class BrainwareSrcIO(BaseIO):
                 }
 
 
+# the ID codes of the data sequences of a single spike
+_SPIKE_IDS = (29079, 29081, 29115)
+
+# the size (ID code included) of the data sequences of a spike with a fixed
+# waveform length
+_FIXED_SPIKE_SIZES = {29079: 47, 29081: 46}
+
+_block_dtype = [('offset', 'int64'), ('damaged', 'bool')]
+_spike_list_dtype = [('offset', 'int64'), ('stop', 'int64'),
+                     ('nb_spike', 'int64'), ('damaged', 'bool')]
+
+
+class _SrcIndexRawIO(BaseRawIO):
+    """
+    RawIO on the index of a SRC file, used by the proxies given by
+    BrainwareSrcIO with lazy=True.
+
+    It has a single Segment.  Each list of spikes of the index is a unit
+    channel, and the last unit channel has no spikes, it is used for the
+    empty SpikeTrains.  The comments of each Block are an event channel.
+    The spikes are read with a BrainwareSrcIO of its own, so the reading
+    point of the IO giving the proxies is not changed.
+
+    The spike timestamps are the spike times of the file in ms and the
+    waveforms are in mV.  The t_start, t_stop and sampling rate of the
+    SpikeTrain proxies are set by BrainwareSrcIO.
+    """
+    extensions = []
+    rawmode = 'one-file'
+
+    def __init__(self, filename, index):
+        BaseRawIO.__init__(self)
+        self.filename = filename
+        self._index = index
+        self._spike_lists = index['spike_lists']
+        self._reader = BrainwareSrcIO(filename=filename)
+        # (unit_index, times, waveforms) of the last list of spikes read,
+        # for the waveforms read after the times
+        self._last_spikes = None
+
+    def _source_name(self):
+        return self.filename
+
+    def _parse_header(self):
+        unit_channels = np.zeros(self._spike_lists.size + 1,
+                                 dtype=_unit_channel_dtype)
+        unit_channels['id'] = np.arange(unit_channels.size).astype('U')
+        unit_channels['wf_units'] = 'mV'
+        unit_channels['wf_gain'] = 1.
+        # the default sampling rate of SpikeTrain
+        unit_channels['wf_sampling_rate'] = 1.
+
+        nb_block = self._index['blocks'].size
+        event_channels = np.zeros(nb_block, dtype=_event_channel_dtype)
+        event_channels['name'] = 'Comments'
+        event_channels['id'] = np.arange(nb_block).astype('U')
+        event_channels['type'] = b'event'
+        # the comments of each Block
+        self._comment_limits = np.searchsorted(self._index['comment_blocks'],
+                                               np.arange(nb_block + 1))
+
+        self.header = {}
+        self.header['nb_block'] = 1
+        self.header['nb_segment'] = [1]
+        self.header['signal_channels'] = np.array([],
+                                                  dtype=_signal_channel_dtype)
+        self.header['unit_channels'] = unit_channels
+        self.header['event_channels'] = event_channels
+
+        self._generate_minimal_annotations()
+
+    def _segment_t_start(self, block_index, seg_index):
+        return 0.
+
+    def _segment_t_stop(self, block_index, seg_index):
+        times = self._index['comment_times']
+        return float(times.max()) if times.size else 0.
+
+    def _spike_count(self, block_index, seg_index, unit_index):
+        if unit_index == self._spike_lists.size:
+            return 0
+        return int(self._spike_lists['nb_spike'][unit_index])
+
+    def _get_spikes(self, unit_index, t_start, t_stop):
+        """
+        Return the times (in ms) and the waveforms of the spikes of
+        unit_index between t_start and t_stop (in s).
+        """
+        if self._last_spikes is None or self._last_spikes[0] != unit_index:
+            times = np.array([], dtype=np.float32)
+            waveforms = np.zeros((0, 1, 0), dtype=np.int8)
+            if unit_index < self._spike_lists.size:
+                spike_list = self._spike_lists[unit_index]
+                train = self._reader._read_spike_list(
+                    int(spike_list['offset']), bool(spike_list['damaged']))
+                if train.size:
+                    times = train.magnitude
+                    waveforms = train.waveforms.magnitude
+            self._last_spikes = (unit_index, times, waveforms)
+
+        _, times, waveforms = self._last_spikes
+        keep = np.ones(times.size, dtype='bool')
+        if t_start is not None:
+            keep &= times >= t_start * 1000.
+        if t_stop is not None:
+            keep &= times <= t_stop * 1000.
+        return times[keep], waveforms[keep]
+
+    def _get_spike_timestamps(self, block_index, seg_index, unit_index,
+                              t_start, t_stop):
+        return self._get_spikes(unit_index, t_start, t_stop)[0]
+
+    def _rescale_spike_timestamp(self, spike_timestamps, dtype):
+        return spike_timestamps.astype(dtype) / 1000.
+
+    def _get_spike_raw_waveforms(self, block_index, seg_index, unit_index,
+                                 t_start, t_stop):
+        return self._get_spikes(unit_index, t_start, t_stop)[1]
+
+    def _event_count(self, block_index, seg_index, event_channel_index):
+        start, stop = self._comment_limits[event_channel_index:
+                                           event_channel_index + 2]
+        return int(stop - start)
+
+    def _get_event_timestamps(self, block_index, seg_index,
+                              event_channel_index, t_start, t_stop):
+        start, stop = self._comment_limits[event_channel_index:
+                                           event_channel_index + 2]
+        times = self._index['comment_times'][start:stop]
+        labels = self._index['comment_labels'][start:stop]
+        keep = np.ones(times.size, dtype='bool')
+        if t_start is not None:
+            keep &= times >= t_start
+        if t_stop is not None:
+            keep &= times <= t_stop
+        return times[keep], None, labels[keep]
+
+    def _rescale_event_timestamp(self, event_timestamps, dtype):
+        return event_timestamps.astype(dtype)
+
+
 def convert_brainwaresrc_timestamp(timestamp,
                                    start_date=datetime(1899, 12, 30)):
     """
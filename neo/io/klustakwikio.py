@@ -277,14 +277,11 @@ class KlustaKwikIO(BaseIO):
 
         # Iterate through segments in this block
         for seg in block.segments:
-            # Write each spiketrain of the segment
+            # Collect each spiketrain of the segment
             for st in seg.spiketrains:
-                # Get file handles for this spiketrain using its group
+                # Get the group and the id to write to clu file for this
+                # spike train
                 group = self.st2group(st)
-                fetfilehandle = self._fetfilehandles[group]
-                clufilehandle = self._clufilehandles[group]
-
-                # Get the id to write to clu file for this spike train
                 cluster = self.st2cluster(st)
 
                 # Choose sampling rate to convert to samples
@@ -295,15 +292,14 @@ class KlustaKwikIO(BaseIO):
 
                 # Convert to samples
                 spike_times_in_samples = np.rint(
-                    np.array(st) * sr).astype(np.int)
+                    np.array(st) * sr).astype(np.int64)
 
                 # Try to get features from spiketrain
                 try:
                     all_features = st.annotations['waveform_features']
                 except KeyError:
                     # Use empty
-                    all_features = [
-                        [] for _ in range(len(spike_times_in_samples))]
+                    all_features = np.zeros((len(spike_times_in_samples), 0))
                 all_features = np.asarray(all_features)
                 if all_features.ndim != 2:
                     raise ValueError("waveform features should be 2d array")
@@ -317,28 +313,46 @@ class KlustaKwikIO(BaseIO):
                     self._group2features[group] = n_features
 
                     # and write to first line of file
-                    fetfilehandle.write("%d\n" % n_features)
+                    self._fetfilehandles[group].write("%d\n" % n_features)
                 if n_features != all_features.shape[1]:
                     raise ValueError("inconsistent number of features: " +
                                      "supposed to be %d but I got %d" %
                                      (n_features, all_features.shape[1]))
 
-                # Write features and time for each spike
-                for stt, features in zip(spike_times_in_samples, all_features):
-                    # first features
-                    for val in features:
-                        fetfilehandle.write(str(val))
-                        fetfilehandle.write(" ")
-
-                    # now time
-                    fetfilehandle.write("%d\n" % stt)
-
-                    # and cluster id
-                    clufilehandle.write("%d\n" % cluster)
+                # Write features, time and cluster id for each spike
+                self._write_spikes(group, spike_times_in_samples, all_features,
+                                   cluster)
 
         # We're done, so close the files
         self._close_all_files()
 
+    def _write_spikes(self, group, spike_times_in_samples, all_features,
+                      cluster, chunk_size=2 ** 16):
+        """Write the spikes of a spiketrain by chunks of chunk_size spikes.
+
+        Each chunk is formatted at once with a template of all its lines.
+        The values are written like str() of their numpy scalars.
+        """
+        fetfilehandle = self._fetfilehandles[group]
+        clufilehandle = self._clufilehandles[group]
+        n_features = self._group2features[group]
+
+        # str() of python int, bool and float is the one of their numpy
+        # scalars, other values are converted by numpy
+        if all_features.dtype.kind not in 'biu' and all_features.dtype != np.float64:
+            all_features = all_features.astype(str)
+
+        # each feature followed by a space, then the time
+        fet_line = "%s " * n_features + "%d\n"
+        for start in range(0, len(spike_times_in_samples), chunk_size):
+            times = spike_times_in_samples[start:start + chunk_size]
+            values = np.empty((len(times), n_features + 1), dtype=object)
+            values[:, :n_features] = all_features[start:start + chunk_size]
+            values[:, n_features] = times
+            fetfilehandle.write(fet_line * len(times) %
+                                tuple(values.ravel().tolist()))
+            clufilehandle.write("%d\n" % cluster * len(times))
+
     # Helper functions for writing
     def st2group(self, st):
         # Not sure this is right so make it a method in case we change it
@@ -1,13 +1,16 @@
 # -*- coding: utf-8 -*-
 """
 Module for reading/writing Neo objects in MATLAB format (.mat) versions
-5 to 7.2.
+5 to 7.3.
 
 This module is a bridge for MATLAB users who want to adopt the Neo object
 representation. The nomenclature is the same but using Matlab structs and cell
 arrays. With this module MATLAB users can use neo.io to read a format and
 convert it to .mat.
 
+Version 7.3 files are HDF5 files (read and written with h5py): the block is
+written one object at a time and can be read lazily.
+
 Supported : Read/Write
 
 Author: sgarcia, Robert Pröpper
@@ -15,6 +18,7 @@ Author: sgarcia, Robert Pröpper
 
 from datetime import datetime
 from distutils import version
+import platform
 import re
 
 import numpy as np
@@ -37,9 +41,22 @@ else:
         HAVE_SCIPY = True
         SCIPY_ERR = None
 
+# check h5py, for MATLAB 7.3 files
+try:
+    import h5py
+except ImportError as err:
+    HAVE_H5PY = False
+else:
+    HAVE_H5PY = True
+
 from neo.io.baseio import BaseIO
+from neo.io.proxyobjects import AnalogSignalProxy, SpikeTrainProxy, EventProxy, EpochProxy
+from neo.rawio.baserawio import (BaseRawIO, _signal_channel_dtype, _unit_channel_dtype,
+                                 _event_channel_dtype)
 from neo.core import (Block, Segment, AnalogSignal, Event, Epoch, SpikeTrain,
                       objectnames, class_by_name)
+from neo.core.baseneo import BaseNeo
+from neo.core.dataobject import ArrayDict
 
 classname_lower_to_upper = {}
 for k in objectnames:
@@ -187,9 +204,28 @@ class NeoMatlabIO(BaseIO):
             blocks = r.read()
             w.write(blocks[0])
 
+    4 - **Scenario 4: big blocks, MATLAB 7.3**
+
+        With version='7.3' the file is written in the MATLAB 7.3 format
+        (HDF5, needs h5py) one object at a time, arrays by chunks, instead of
+        building the whole block in memory first. Data objects given as proxy
+        objects (e.g. read with lazy=True) are loaded one at a time. In MATLAB
+        the file is read the same way as in the previous scenarios.
+
+        A MATLAB 7.3 file (saved with ``save 'myblock.mat' block -v7.3`` or
+        written with version='7.3') can be read lazily: the AnalogSignals,
+        SpikeTrains, Events and Epochs are then proxy objects whose arrays are
+        only read by load() (the file is opened for the read), optionally for
+        a time slice; their times are loaded in s::
+
+            r = NeoMatlabIO(filename='convertedfile.mat')
+            bl = r.read_block(lazy=True)
+            anasig = bl.segments[0].analogsignals[0].load(time_slice=(1 * pq.s, 2 * pq.s))
+
     """
     is_readable = True
     is_writable = True
+    support_lazy = True
 
     supported_objects = [Block, Segment, AnalogSignal, Epoch, Event, SpikeTrain]
     readable_objects = [Block]
@@ -205,24 +241,42 @@ class NeoMatlabIO(BaseIO):
 
     mode = 'file'
 
-    def __init__(self, filename=None):
+    # number of bytes of an array written at once in a MATLAB 7.3 file
+    chunk_size = 2 ** 26
+
+    def __init__(self, filename=None, version='5'):
         """
-        This class read/write neo objects in matlab 5 to 7.2 format.
+        This class read/write neo objects in matlab 5 to 7.3 format.
 
         Arguments:
             filename : the filename to read
+            version : the format of the written files, '5' (MATLAB 5 to 7.2)
+                      or '7.3' (HDF5). The format of read files is detected.
         """
         if not HAVE_SCIPY:
             raise SCIPY_ERR
+        if version not in ('5', '7.3'):
+            raise ValueError("version must be '5' or '7.3', not %r" % version)
+        if version == '7.3' and not HAVE_H5PY:
+            raise ImportError("h5py is not available")
         BaseIO.__init__(self)
         self.filename = filename
+        self.version = version
 
     def read_block(self, lazy=False):
         """
         Arguments:
-
+            lazy : give proxy objects for the AnalogSignals, SpikeTrains,
+                   Events and Epochs. The arrays of a MATLAB 7.3 file are
+                   then read when loaded (the file is opened for each read),
+                   a MATLAB 5 file is read at once.
         """
-        assert not lazy, 'Do not support lazy'
+        if HAVE_H5PY and h5py.is_hdf5(self.filename):
+            with h5py.File(self.filename, 'r') as f:
+                if 'block' not in f:
+                    self.logger.exception('No block in ' + self.filename)
+                    return None
+                return self._read_block_from_struct(_Mat73Struct(f['block']), lazy)
 
         d = scipy.io.loadmat(self.filename, struct_as_record=False,
                              squeeze_me=True, mat_dtype=True)
@@ -230,17 +284,61 @@ class NeoMatlabIO(BaseIO):
             self.logger.exception('No block in ' + self.filename)
             return None
 
-        bl_struct = d['block']
-        bl = self.create_ob_from_struct(
-            bl_struct, 'Block')
+        return self._read_block_from_struct(d['block'], lazy)
+
+    def _read_block_from_struct(self, bl_struct, lazy):
+        bl = self.create_ob_from_struct(bl_struct, 'Block', lazy=lazy)
+        if lazy:
+            rawio = _NeoMatlabRawIO(self.filename, bl_struct, self._convert_struct_item)
+            rawio.parse_header()
+            for seg_index, seg in enumerate(bl.segments):
+                self._add_proxies(rawio, seg_index, seg)
         bl.create_many_to_one_relationship()
         return bl
 
+    def _add_proxies(self, rawio, seg_index, seg):
+        """
+        Add to seg the proxy objects of the data objects of the Segment
+        seg_index of rawio, with the attributes of the file.
+        """
+        objects = rawio._seg_objects[seg_index]
+        for i in objects['analogsignals']:
+            sig = rawio._signals[i]
+            proxy = AnalogSignalProxy(rawio=rawio, global_channel_indexes=sig['channel_indexes'],
+                                      block_index=0, seg_index=seg_index)
+            # sampling_rate and t_start are given by rawio in Hz and s
+            attrs = dict((k, v) for k, v in sig['attrs'].items()
+                         if k not in ('sampling_rate', 't_start'))
+            self._set_proxy_attributes(proxy, attrs)
+            seg.analogsignals.append(proxy)
+        for i in objects['spiketrains']:
+            proxy = SpikeTrainProxy(rawio=rawio, unit_index=i, block_index=0,
+                                    seg_index=seg_index)
+            self._set_proxy_attributes(proxy, rawio._units[i]['attrs'])
+            seg.spiketrains.append(proxy)
+        for name, proxy_class in (('events', EventProxy), ('epochs', EpochProxy)):
+            for i in objects[name]:
+                proxy = proxy_class(rawio=rawio, event_channel_index=i, block_index=0,
+                                    seg_index=seg_index)
+                self._set_proxy_attributes(proxy, rawio._events[i]['attrs'])
+                getattr(seg, name).append(proxy)
+
+    def _set_proxy_attributes(self, proxy, attrs):
+        # like the objects read from the file, no annotations
+        proxy.name = proxy.description = proxy.file_origin = None
+        proxy.annotations = {}
+        proxy.array_annotations = ArrayDict(proxy.shape[-1])
+        for attrname, value in attrs.items():
+            setattr(proxy, attrname, value)
+
     def write_block(self, bl, **kargs):
         """
         Arguments:
             bl: the block to b saved
         """
+        if self.version == '7.3':
+            self._write_block_hdf5(bl)
+            return
 
         bl_struct = self.create_struct_from_obj(bl)
 
@@ -266,6 +364,107 @@ class NeoMatlabIO(BaseIO):
 
         scipy.io.savemat(self.filename, {'block': bl_struct}, oned_as='row')
 
+    def _write_block_hdf5(self, bl):
+        """
+        Write bl in a MATLAB 7.3 file, one object at a time.
+        """
+        with h5py.File(self.filename, 'w', userblock_size=512) as f:
+            # the elements of the cell arrays are stored in this group
+            refs = f.create_group('#refs#')
+            self._write_hdf5_value(f, 'block', bl, refs)
+
+        # the header of the userblock makes it a MAT-file for MATLAB
+        header = 'MATLAB 7.3 MAT-file, Platform: {}, Created on: {} HDF5 schema 1.00 .'.format(
+            platform.system(), datetime.now().strftime('%a %b %d %H:%M:%S %Y'))
+        with open(self.filename, 'r+b') as fid:
+            fid.write(header.ljust(116).encode('ascii') + b'\x00' * 8 + b'\x00\x02IM')
+
+    def _write_hdf5_value(self, group, name, value, refs):
+        """
+        Write value (a neo object, a dict for a struct, a list for a cell
+        array, a string or an array) as the field name of the struct group.
+        """
+        if isinstance(value, BaseNeo):
+            value = self._create_hdf5_struct_from_obj(value)
+        if isinstance(value, dict):
+            struct = group.create_group(name)
+            struct.attrs['MATLAB_class'] = np.bytes_('struct')
+            # an object array, so names of the same length are not a 2D array
+            fields = np.empty(len(value), dtype=object)
+            fields[:] = [np.array(list(k), dtype='S1') for k in value]
+            struct.attrs.create('MATLAB_fields', fields,
+                                dtype=h5py.vlen_dtype(np.dtype('S1')))
+            for k, v in value.items():
+                self._write_hdf5_value(struct, k, v, refs)
+        elif isinstance(value, (list, tuple)):
+            if len(value) == 0:
+                _write_hdf5_empty(group, name, 'cell', (0, 0))
+                return
+            cell = group.create_dataset(name, shape=(len(value), 1), dtype=h5py.ref_dtype)
+            cell.attrs['MATLAB_class'] = np.bytes_('cell')
+            for i, item in enumerate(value):
+                ref_name = str(len(refs))
+                self._write_hdf5_value(refs, ref_name, item, refs)
+                cell[i, 0] = refs[ref_name].ref
+        else:
+            self._write_hdf5_array(group, name, np.asarray(value))
+
+    def _create_hdf5_struct_from_obj(self, ob):
+        """
+        Like create_struct_from_obj, but the children are the neo objects,
+        converted when they are written. A proxy object is loaded.
+        """
+        if hasattr(ob, 'load'):
+            ob = ob.load()
+        struct = self.create_struct_from_obj(ob)
+        for childname in getattr(ob, '_single_child_containers', []):
+            if childname in struct:
+                struct[childname] = getattr(ob, childname)
+        return struct
+
+    def _write_hdf5_array(self, group, name, arr):
+        """
+        Write arr like scipy.io.savemat with oned_as='row', by chunks of the
+        first dimension.
+        """
+        if arr.dtype.kind in 'SU':
+            # char array, one row for each string
+            strings = np.asarray(arr.astype('U')).reshape(-1)
+            width = max([len(s) for s in strings.tolist()] + [0])
+            if width == 0:
+                _write_hdf5_empty(group, name, 'char', (0, 0))
+                return
+            strings = np.char.ljust(strings, width)
+            arr = strings.view(np.uint32).reshape(-1, width).astype(np.uint16)
+            matlab_class, int_decode = 'char', 2
+        elif arr.dtype.kind == 'b':
+            arr = arr.astype(np.uint8)
+            matlab_class, int_decode = 'logical', 1
+        elif arr.dtype.kind in 'iu':
+            matlab_class, int_decode = arr.dtype.name, None
+        elif arr.dtype.kind == 'f':
+            if arr.dtype.itemsize < 4:
+                arr = arr.astype(np.float32)
+            matlab_class = 'single' if arr.dtype.itemsize == 4 else 'double'
+            int_decode = None
+        else:
+            raise TypeError('Can not write %s in a MATLAB 7.3 file' % arr.dtype)
+
+        if arr.ndim < 2:
+            arr = arr.reshape(1, -1)
+        if arr.size == 0:
+            _write_hdf5_empty(group, name, matlab_class, arr.shape)
+            return
+        # MATLAB arrays are column major: the dimensions of the dataset are
+        # the reversed ones of arr
+        dset = group.create_dataset(name, shape=arr.shape[::-1], dtype=arr.dtype)
+        step = max(1, self.chunk_size // arr[0].nbytes)
+        for i in range(0, arr.shape[0], step):
+            dset[..., i:i + step] = arr[i:i + step].T
+        dset.attrs['MATLAB_class'] = np.bytes_(matlab_class)
+        if int_decode is not None:
+            dset.attrs['MATLAB_int_decode'] = np.int32(int_decode)
+
     def create_struct_from_obj(self, ob):
         struct = {}
 
@@ -307,8 +506,14 @@ class NeoMatlabIO(BaseIO):
 
         return struct
 
-    def create_ob_from_struct(self, struct, classname):
+    def create_ob_from_struct(self, struct, classname, lazy=False):
+        """
+        With lazy=True, the AnalogSignals, SpikeTrains, Events and Epochs are
+        not created (None is returned for them).
+        """
         cl = class_by_name[classname]
+        if lazy and cl in (AnalogSignal, SpikeTrain, Event, Epoch):
+            return None
         # check if hinerits Quantity
         # ~ is_quantity = False
         # ~ for attr in cl._necessary_attrs:
@@ -343,6 +548,9 @@ class NeoMatlabIO(BaseIO):
                     data_complement["t_start"] = arr.min()
                 else:
                     data_complement["t_start"] = 0.0
+            if cl in (AnalogSignal, SpikeTrain):
+                # arr has just been read
+                data_complement["copy"] = False
 
             ob = cl(arr, **data_complement)
         else:
@@ -359,14 +567,16 @@ class NeoMatlabIO(BaseIO):
                     # strange scipy.io behavior: if len is 1 there is no len()
                     child = self.create_ob_from_struct(
                         child_struct,
-                        classname_lower_to_upper[attrname[:-1]])
-                    getattr(ob, attrname.lower()).append(child)
+                        classname_lower_to_upper[attrname[:-1]], lazy=lazy)
+                    if child is not None:
+                        getattr(ob, attrname.lower()).append(child)
                 else:
                     for c in range(child_len):
                         child = self.create_ob_from_struct(
                             child_struct[c],
-                            classname_lower_to_upper[attrname[:-1]])
-                        getattr(ob, attrname.lower()).append(child)
+                            classname_lower_to_upper[attrname[:-1]], lazy=lazy)
+                        if child is not None:
+                            getattr(ob, attrname.lower()).append(child)
                 continue
 
             # attributes
@@ -376,32 +586,413 @@ class NeoMatlabIO(BaseIO):
             if (hasattr(cl, '_quantity_attr') and cl._quantity_attr == attrname):
                 continue
 
-            item = getattr(struct, attrname)
-
-            attributes = cl._necessary_attrs + cl._recommended_attrs
-            dict_attributes = dict([(a[0], a[1:]) for a in attributes])
-            if attrname in dict_attributes:
-                attrtype = dict_attributes[attrname][0]
-                if attrtype == datetime:
-                    m = r'(\d+)-(\d+)-(\d+) (\d+):(\d+):(\d+).(\d+)'
-                    r = re.findall(m, str(item))
-                    if len(r) == 1:
-                        item = datetime(*[int(e) for e in r[0]])
-                    else:
-                        item = None
-                elif attrtype == np.ndarray:
-                    dt = dict_attributes[attrname][2]
-                    item = item.astype(dt)
-                elif attrtype == pq.Quantity:
-                    ndim = dict_attributes[attrname][1]
-                    units = str(getattr(struct, attrname + '_units'))
-                    if ndim == 0:
-                        item = pq.Quantity(item, units)
-                    else:
-                        item = pq.Quantity(item, units)
-                else:
-                    item = attrtype(item)
-
+            item = self._convert_struct_item(cl, struct, attrname, getattr(struct, attrname))
             setattr(ob, attrname, item)
 
         return ob
+
+    def _convert_struct_item(self, cl, struct, attrname, item):
+        """
+        Convert the value item of the field attrname of struct to the type of
+        the attribute of cl.
+        """
+        attributes = cl._necessary_attrs + cl._recommended_attrs
+        dict_attributes = dict([(a[0], a[1:]) for a in attributes])
+        if attrname in dict_attributes:
+            attrtype = dict_attributes[attrname][0]
+            if attrtype == datetime:
+                m = r'(\d+)-(\d+)-(\d+) (\d+):(\d+):(\d+).(\d+)'
+                r = re.findall(m, str(item))
+                if len(r) == 1:
+                    item = datetime(*[int(e) for e in r[0]])
+                else:
+                    item = None
+            elif attrtype == np.ndarray:
+                dt = dict_attributes[attrname][2]
+                item = item.astype(dt)
+            elif attrtype == pq.Quantity:
+                ndim = dict_attributes[attrname][1]
+                units = str(getattr(struct, attrname + '_units'))
+                if ndim == 0:
+                    item = pq.Quantity(item, units)
+                else:
+                    item = pq.Quantity(item, units)
+            else:
+                item = attrtype(item)
+
+        return item
+
+
+def _write_hdf5_empty(group, name, matlab_class, shape):
+    """
+    Write an empty MATLAB array, whose dataset has its dimensions.
+    """
+    dset = group.create_dataset(name, data=np.array(shape[::-1], dtype=np.uint64))
+    dset.attrs['MATLAB_class'] = np.bytes_(matlab_class)
+    dset.attrs['MATLAB_empty'] = np.uint8(1)
+
+
+def _read_hdf5_value(node, index=None):
+    """
+    Read a MATLAB variable or struct field of a 7.3 file like
+    scipy.io.loadmat with squeeze_me=True, a struct is a _Mat73Struct and a
+    cell array a list. For an array, index is None or a slice of its first
+    dimension.
+    """
+    if isinstance(node, h5py.Group):
+        return _Mat73Struct(node)
+    matlab_class = node.attrs.get('MATLAB_class', b'double')
+    if isinstance(matlab_class, bytes):
+        matlab_class = matlab_class.decode()
+    if node.attrs.get('MATLAB_empty', 0):
+        return {'char': '', 'cell': []}.get(matlab_class, np.array([]))
+    if matlab_class == 'cell':
+        return [_read_hdf5_value(node.file[ref]) for ref in node[()].ravel()]
+
+    if index is None:
+        data = node[()].T
+    else:
+        data = node[..., index].T
+    if matlab_class == 'char':
+        # one string for each row
+        data = np.ascontiguousarray(data.reshape(-1, data.shape[-1]), dtype=np.uint32)
+        strings = data.view('U%d' % data.shape[1]).ravel()
+        if strings.size == 1:
+            return str(strings[0])
+        return strings
+    if matlab_class == 'logical':
+        data = data.astype(bool)
+    data = np.squeeze(data)
+    if data.ndim == 0:
+        return data[()]
+    return data
+
+
+class _Mat73Struct(object):
+    """
+    MATLAB struct of a 7.3 file. Its fields are read when they are used, like
+    the fields of the structs given by scipy.io.loadmat.
+    """
+
+    def __init__(self, group, slices=None):
+        self._group = group
+        # the fields that are only read for a slice of their first dimension
+        self._slices = slices or {}
+        if 'MATLAB_fields' in group.attrs:
+            self._fieldnames = [b''.join(field).decode()
+                                for field in group.attrs['MATLAB_fields']]
+        else:
+            self._fieldnames = list(group.keys())
+
+    def __getattr__(self, name):
+        if name.startswith('_') or name not in self._group:
+            raise AttributeError(name)
+        return _read_hdf5_value(self._group[name], self._slices.get(name))
+
+
+def _struct_array_info(struct, name):
+    """
+    Return the shape (like scipy.io.loadmat with squeeze_me=True for a
+    MATLAB 5 file) and the dtype of the array name of struct, without
+    reading the array of a 7.3 file.
+    """
+    if isinstance(struct, _Mat73Struct):
+        dset = struct._group[name]
+        if dset.attrs.get('MATLAB_empty', 0):
+            return (0, ), np.dtype('float64')
+        return dset.shape[::-1], dset.dtype
+    arr = np.asarray(getattr(struct, name))
+    return arr.shape, arr.dtype
+
+
+def _struct_children(struct, name):
+    """
+    Return the list of the structs of the cell array name of struct.
+    """
+    if name not in struct._fieldnames:
+        return []
+    children = getattr(struct, name)
+    try:
+        len(children)
+    except TypeError:
+        # strange scipy.io behavior: if len is 1 there is no len()
+        return [children]
+    return list(children)
+
+
+def _to_seconds(units):
+    """
+    Return the factor from units (a str) to s.
+    """
+    return float(pq.Quantity(1., units).rescale(pq.s).magnitude)
+
+
+class _NeoMatlabRawIO(BaseRawIO):
+    """
+    RawIO on the block of a .mat file, used by the proxies given by
+    NeoMatlabIO with lazy=True.
+
+    It has a single Block with the Segments of the file.  Each channel of an
+    AnalogSignal is a signal channel (a channel group for each AnalogSignal),
+    each SpikeTrain a unit channel and each Event or Epoch an event channel,
+    they belong to the Segment of the object only.  The spike and event
+    timestamps are the times in s.
+
+    The arrays of a MATLAB 7.3 file are read when they are loaded, the file is
+    then opened for the time of the read only.  The arrays of a MATLAB 5 file
+    are read at once by scipy.io.loadmat.
+    """
+    extensions = []
+    rawmode = 'one-file'
+
+    def __init__(self, filename, bl_struct, convert_struct_item):
+        BaseRawIO.__init__(self)
+        self.filename = filename
+        self._bl_struct = bl_struct
+        self._convert_struct_item = convert_struct_item
+
+    def _source_name(self):
+        return self.filename
+
+    def _parse_header(self):
+        bl_struct = self._bl_struct
+        del self._bl_struct
+        self._hdf5 = isinstance(bl_struct, _Mat73Struct)
+
+        # the objects of the file by type and of each Segment
+        self._signals, self._units, self._events = [], [], []
+        self._seg_objects = []
+        self._seg_limits = []
+        sig_channels = []
+        for seg_index, seg_struct in enumerate(_struct_children(bl_struct, 'segments')):
+            objects = {'analogsignals': [], 'spiketrains': [], 'events': [], 'epochs': []}
+            limits = []
+            for struct in _struct_children(seg_struct, 'analogsignals'):
+                sig = self._parse_analogsignal(struct)
+                nb_channel = sig['shape'][1]
+                first = len(sig_channels)
+                sig['channel_indexes'] = np.arange(first, first + nb_channel)
+                for c in range(nb_channel):
+                    sig_channels.append(('{} {}'.format(sig['attrs'].get('name', ''), c),
+                                         first + c, sig['sampling_rate'], sig['dtype'],
+                                         sig['units'], 1., 0., len(self._signals)))
+                objects['analogsignals'].append(len(self._signals))
+                self._signals.append(sig)
+                limits += [sig['t_start'], sig['t_start'] + sig['shape'][0] / sig['sampling_rate']]
+            for struct in _struct_children(seg_struct, 'spiketrains'):
+                unit = self._parse_spiketrain(struct)
+                objects['spiketrains'].append(len(self._units))
+                self._units.append(unit)
+                limits += [unit['t_start'], unit['t_stop']]
+            for name, cl in (('events', Event), ('epochs', Epoch)):
+                for struct in _struct_children(seg_struct, name):
+                    event = self._parse_event_or_epoch(struct, cl)
+                    objects[name].append(len(self._events))
+                    self._events.append(event)
+                    limits += event['limits']
+            self._seg_objects.append(objects)
+            if len(limits) == 0:
+                limits = [0.]
+            self._seg_limits.append((min(limits), max(limits)))
+
+        sig_channels = np.array(sig_channels, dtype=_signal_channel_dtype)
+
+        unit_channels = np.zeros(len(self._units), dtype=_unit_channel_dtype)
+        unit_channels['name'] = [str(unit['attrs'].get('name', '')) for unit in self._units]
+        unit_channels['id'] = np.arange(unit_channels.size).astype('U')
+        unit_channels['wf_units'] = [unit['wf_units'] for unit in self._units]
+        unit_channels['wf_gain'] = 1.
+        unit_channels['wf_sampling_rate'] = [unit['wf_sampling_rate'] for unit in self._units]
+
+        event_channels = np.zeros(len(self._events), dtype=_event_channel_dtype)
+        event_channels['name'] = [str(event['attrs'].get('name', '')) for event in self._events]
+        event_channels['id'] = np.arange(event_channels.size).astype('U')
+        event_channels['type'] = [event['type'] for event in self._events]
+
+        self.header = {}
+        self.header['nb_block'] = 1
+        self.header['nb_segment'] = [len(self._seg_objects)]
+        self.header['signal_channels'] = sig_channels
+        self.header['unit_channels'] = unit_channels
+        self.header['event_channels'] = event_channels
+
+        self._generate_minimal_annotations()
+
+    def _struct_attrs(self, struct, cl):
+        """
+        Return the attributes of the data object of struct whose class is cl,
+        except its arrays, which are not read.
+        """
+        attributes = cl._necessary_attrs + cl._recommended_attrs
+        arrays = [cl._quantity_attr] + [a[0] for a in attributes
+                                        if a[1] in (np.ndarray, pq.Quantity) and a[2] > 0]
+        attrs = {}
+        for attrname in struct._fieldnames:
+            if attrname.endswith('_units') or attrname in arrays:
+                continue
+            attrs[attrname] = self._convert_struct_item(cl, struct, attrname,
+                                                        getattr(struct, attrname))
+        return attrs
+
+    def _ref(self, struct):
+        # a 7.3 file is opened again for each read
+        return struct._group.name if self._hdf5 else struct
+
+    def _read_array(self, ref, name, index=None):
+        """
+        Read the array name of the struct ref, only the slice index of its
+        first dimension when index is not None.
+        """
+        if self._hdf5:
+            with h5py.File(self.filename, 'r') as f:
+                return np.asarray(_read_hdf5_value(f[ref][name], index))
+        arr = np.atleast_1d(getattr(ref, name))
+        if index is not None:
+            arr = arr[index]
+        return arr
+
+    def _parse_analogsignal(self, struct):
+        attrs = self._struct_attrs(struct, AnalogSignal)
+        shape, dtype = _struct_array_info(struct, 'signal')
+        t_start = attrs.get('t_start', 0. * pq.s)
+        return {'ref': self._ref(struct), 'attrs': attrs,
+                'shape': (shape[0], int(np.prod(shape[1:]))), 'dtype': dtype.name,
+                'units': str(struct.signal_units),
+                'sampling_rate': float(attrs['sampling_rate'].rescale(pq.Hz).magnitude),
+                't_start': float(t_start.rescale(pq.s).magnitude)}
+
+    def _parse_spiketrain(self, struct):
+        attrs = self._struct_attrs(struct, SpikeTrain)
+        shape, _ = _struct_array_info(struct, 'times')
+        unit = {'ref': self._ref(struct), 'attrs': attrs, 'count': int(np.prod(shape)),
+                'factor': _to_seconds(str(struct.times_units)),
+                'waveforms': False, 'wf_units': '', 'wf_sampling_rate': 0.}
+        if 't_start' not in attrs or 't_stop' not in attrs:
+            # like a SpikeTrain created from the struct
+            times = self._read_array(unit['ref'], 'times') * unit['factor']
+            limits = [times.min(), times.max()] if times.size else [0., 0.]
+        for i, attrname in enumerate(('t_start', 't_stop')):
+            if attrname in attrs:
+                unit[attrname] = float(attrs[attrname].rescale(pq.s).magnitude)
+            else:
+                unit[attrname] = float(limits[i])
+        if 'waveforms' in struct._fieldnames and attrs.get('sampling_rate') is not None \
+                and unit['count'] > 0:
+            unit['waveforms'] = True
+            unit['wf_units'] = str(struct.waveforms_units)
+            unit['wf_sampling_rate'] = float(attrs['sampling_rate'].rescale(pq.Hz).magnitude)
+        return unit
+
+    def _parse_event_or_epoch(self, struct, cl):
+        attrs = self._struct_attrs(struct, cl)
+        shape, _ = _struct_array_info(struct, 'times')
+        event = {'ref': self._ref(struct), 'attrs': attrs, 'count': int(np.prod(shape)),
+                 'type': cl.__name__.lower().encode('ascii'),
+                 'factor': _to_seconds(str(struct.times_units))}
+        if cl is Epoch:
+            event['durations_factor'] = _to_seconds(str(struct.durations_units))
+        # the times are read for the limits of the Segment
+        times, durations, _ = self._read_event_or_epoch(event)
+        if durations is not None:
+            times = np.concatenate([times, times + durations])
+        event['limits'] = [times.min(), times.max()] if times.size else []
+        return event
+
+    def _read_event_or_epoch(self, event):
+        """
+        Return the times and durations (in s) and the labels of event.
+        """
+        times = self._read_array(event['ref'], 'times').reshape(-1) * event['factor']
+        durations = None
+        if 'durations_factor' in event:
+            durations = self._read_array(event['ref'], 'durations').reshape(-1) \
+                * event['durations_factor']
+        labels = np.zeros(times.size, dtype='U1')
+        if times.size:
+            try:
+                labels = self._read_array(event['ref'], 'labels').reshape(-1)
+            except (AttributeError, KeyError):
+                pass
+        return times, durations, labels
+
+    def _segment_t_start(self, block_index, seg_index):
+        return self._seg_limits[seg_index][0]
+
+    def _segment_t_stop(self, block_index, seg_index):
+        return self._seg_limits[seg_index][1]
+
+    def _channel_signal(self, channel_indexes):
+        """
+        Return the signal of channel_indexes and the indexes of the channels
+        in it.
+        """
+        nb_channel = self.header['signal_channels'].size
+        if channel_indexes is None:
+            channel_indexes = slice(None)
+        channel_indexes = np.arange(nb_channel)[channel_indexes]
+        sig = self._signals[self.header['signal_channels']['group_id'][channel_indexes[0]]]
+        return sig, channel_indexes - sig['channel_indexes'][0]
+
+    def _get_signal_size(self, block_index, seg_index, channel_indexes):
+        return self._channel_signal(channel_indexes)[0]['shape'][0]
+
+    def _get_signal_t_start(self, block_index, seg_index, channel_indexes):
+        return self._channel_signal(channel_indexes)[0]['t_start']
+
+    def _get_analogsignal_chunk(self, block_index, seg_index, i_start, i_stop, channel_indexes):
+        sig, columns = self._channel_signal(channel_indexes)
+        raw_signal = self._read_array(sig['ref'], 'signal', slice(i_start, i_stop))
+        return raw_signal.reshape(-1, sig['shape'][1])[:, columns]
+
+    def _spike_count(self, block_index, seg_index, unit_index):
+        return self._units[unit_index]['count']
+
+    def _get_spikes(self, unit_index, t_start, t_stop, name):
+        """
+        Return the times (in s) or the waveforms (name) of the spikes of
+        unit_index between t_start and t_stop (in s).
+        """
+        unit = self._units[unit_index]
+        times = self._read_array(unit['ref'], 'times').reshape(-1) * unit['factor']
+        keep = np.ones(times.size, dtype='bool')
+        if t_start is not None:
+            keep &= times >= t_start
+        if t_stop is not None:
+            keep &= times <= t_stop
+        if name == 'times':
+            return times[keep]
+        if not unit['waveforms']:
+            return None
+        waveforms = self._read_array(unit['ref'], 'waveforms')
+        # the dimensions of 1 removed by scipy.io.loadmat
+        waveforms = waveforms.reshape((times.size, -1) + waveforms.shape[-1:])
+        return waveforms[keep]
+
+    def _get_spike_timestamps(self, block_index, seg_index, unit_index, t_start, t_stop):
+        return self._get_spikes(unit_index, t_start, t_stop, 'times')
+
+    def _rescale_spike_timestamp(self, spike_timestamps, dtype):
+        return spike_timestamps.astype(dtype)
+
+    def _get_spike_raw_waveforms(self, block_index, seg_index, unit_index, t_start, t_stop):
+        return self._get_spikes(unit_index, t_start, t_stop, 'waveforms')
+
+    def _event_count(self, block_index, seg_index, event_channel_index):
+        return self._events[event_channel_index]['count']
+
+    def _get_event_timestamps(self, block_index, seg_index, event_channel_index, t_start, t_stop):
+        times, durations, labels = self._read_event_or_epoch(self._events[event_channel_index])
+        keep = np.ones(times.size, dtype='bool')
+        if t_start is not None:
+            keep &= times >= t_start
+        if t_stop is not None:
+            keep &= times <= t_stop
+        if durations is not None:
+            durations = durations[keep]
+        return times[keep], durations, labels[keep]
+
+    def _rescale_event_timestamp(self, event_timestamps, dtype):
+        return event_timestamps.astype(dtype)
+
+    def _rescale_epoch_duration(self, raw_duration, dtype):
+        return raw_duration.astype(dtype)
@@ -22,6 +22,8 @@ import numpy as np
 import quantities as pq
 
 from neo.io.baseio import BaseIO
+from neo.rawio.asciisignalrawio import read_text_blocks, RowBuffer
+from neo.rawio.baserawio import get_cache_filename
 from neo.core import Block, Segment, SpikeTrain, AnalogSignal
 
 value_type_dict = {'V': pq.mV,
@@ -63,12 +65,18 @@ class NestIO(BaseIO):
     extensions = ['gdf', 'dat']
     mode = 'file'
 
-    def __init__(self, filenames=None):
+    def __init__(self, filenames=None, use_cache=False,
+                 cache_path='same_as_resource'):
         """
         Parameters
         ----------
             filenames: string or list of strings, default=None
                 The filename or list of filenames to load.
+            use_cache: bool, default=False
+                If True the data of each file is saved in a binary .npy file
+                in cache_path after the first read, and later loaded from it.
+            cache_path: string, default='same_as_resource'
+                'home', 'same_as_resource' or a dirname.
         """
 
         if isinstance(filenames, str):
@@ -86,7 +94,8 @@ class NestIO(BaseIO):
                     raise ValueError('Received multiple files with "%s" '
                                      'extention. Can only load single file of '
                                      'this type.' % ext)
-                self.avail_IOs[ext] = ColumnIO(filename)
+                self.avail_IOs[ext] = ColumnIO(filename, use_cache=use_cache,
+                                               cache_path=cache_path)
             self.avail_formats[ext] = path
 
     def __read_analogsignals(self, gid_list, time_unit, t_start=None,
@@ -153,11 +162,13 @@ class NestIO(BaseIO):
         if (gid_list == []) and id_column is not None:
             gid_list = np.unique(data[:, id_column])
 
+        # data ranges of all neuron IDs at once
+        all_selected_ids = self._get_selected_ids(
+            gid_list, id_column, time_column, t_start, t_stop, time_unit,
+            data)
+
         # generate analogsignals for each neuron ID
-        for i in gid_list:
-            selected_ids = self._get_selected_ids(
-                i, id_column, time_column, t_start, t_stop, time_unit,
-                data)
+        for i, selected_ids in zip(gid_list, all_selected_ids):
 
             # extract starting time of analogsignal
             if (time_column is not None) and data.size:
@@ -234,11 +245,12 @@ class NestIO(BaseIO):
             if (gdf_id_list == []) and id_column is not None:
                 gdf_id_list = np.unique(data[:, id_column])
 
-            spiketrain_list = []
-            for nid in gdf_id_list:
-                selected_ids = self._get_selected_ids(nid, id_column,
+            # data ranges of all neuron IDs at once
+            all_selected_ids = self._get_selected_ids(gdf_id_list, id_column,
                                                       time_column, t_start,
                                                       t_stop, time_unit, data)
+            spiketrain_list = []
+            for nid, selected_ids in zip(gdf_id_list, all_selected_ids):
                 times = data[selected_ids[0]:selected_ids[1], time_column]
                 spiketrain_list.append(SpikeTrain(
 
@@ -363,7 +375,7 @@ class NestIO(BaseIO):
         if sampling_period is None:
             if time_column is not None:
                 data_sampling = np.unique(
-                    np.diff(sorted(np.unique(data[:, 1]))))
+                    np.diff(np.unique(data[:, 1])))
                 if len(data_sampling) > 1:
                     raise ValueError('Different sampling distances found in '
                                      'data set (%s)' % data_sampling)
@@ -398,8 +410,10 @@ class NestIO(BaseIO):
         curr_id = 0
         if ((gid_list != [None]) and (gid_list is not None)):
             if gid_list != []:
+                gid_array = np.asarray(gid_list)
+
                 def condition(x):
-                    return x in gid_list
+                    return np.in1d(x, gid_array)
 
                 condition_column = id_column
             sorting_column.append(curr_id)  # Sorting according to gids first
@@ -416,43 +430,44 @@ class NestIO(BaseIO):
             sorting_column = sorting_column[::-1]
         return condition, condition_column, sorting_column
 
-    def _get_selected_ids(self, gid, id_column, time_column, t_start, t_stop,
-                          time_unit, data):
+    def _get_selected_ids(self, gid_list, id_column, time_column, t_start,
+                          t_stop, time_unit, data):
         """
-        Calculates the data range to load depending on the selected gid
+        Calculates the data ranges to load depending on the selected gids
         and the provided time range (t_start, t_stop)
 
-        gid: int, gid to be loaded.
+        gid_list: list of int, gids to be loaded.
         id_column: int, id of the column containing gids.
         time_column: int, id of the column containing times.
         t_start: pq.quantity.Quantity, start of the time range to load.
         t_stop: pq.quantity.Quantity, stop of the time range to load.
         time_unit: pq.quantity.Quantity, time unit of the data to load.
-        data: numpy array, data to load.
+        data: numpy array, data to load, sorted by gids and then times.
 
         Returns
-        list of selected gids
+        array (len(gid_list), 2) of the start and stop rows of each gid
         """
-        gid_ids = np.array([0, data.shape[0]])
+        nb_gid = len(gid_list)
         if id_column is not None:
-            gid_ids = np.array([np.searchsorted(data[:, 0], gid, side='left'),
-                                np.searchsorted(data[:, 0], gid, side='right')])
-        gid_data = data[gid_ids[0]:gid_ids[1], :]
+            gids = np.asarray(gid_list, dtype=data.dtype)
+            starts = np.searchsorted(data[:, 0], gids, side='left')
+            stops = np.searchsorted(data[:, 0], gids, side='right')
+        else:
+            starts = np.zeros(nb_gid, dtype='int64')
+            stops = np.full(nb_gid, data.shape[0], dtype='int64')
 
-        # select only requested time range
-        id_shifts = np.array([0, 0])
+        # select only requested time range: the times of a gid are sorted,
+        # so the rows before t_start (or t_stop) are the first ones of the gid
         if time_column is not None:
-            id_shifts[0] = np.searchsorted(gid_data[:, 1],
-                                           t_start.rescale(
-                                               time_unit).magnitude,
-                                           side='left')
-            id_shifts[1] = (np.searchsorted(gid_data[:, 1],
-                                            t_stop.rescale(
-                                                time_unit).magnitude,
-                                            side='left') - gid_data.shape[0])
-
-        selected_ids = gid_ids + id_shifts
-        return selected_ids
+            times = data[:, 1]
+            shifted = []
+            for t in (t_start, t_stop):
+                before = np.zeros(data.shape[0] + 1, dtype='int64')
+                np.cumsum(times < t.rescale(time_unit).magnitude, out=before[1:])
+                shifted.append(starts + before[stops] - before[starts])
+            starts, stops = shifted
+
+        return np.stack([starts, stops], axis=1)
 
     def read_block(self, gid_list=None, time_unit=pq.ms, t_start=None,
                    t_stop=None, sampling_period=None, id_column_dat=0,
@@ -661,27 +676,59 @@ class NestIO(BaseIO):
 class ColumnIO:
     '''
     Class for reading an ASCII file containing multiple columns of data.
+
+    The file is read by blocks with neo.rawio.asciisignalrawio.read_text_blocks.
+    With use_cache=True the data is saved in a .npy file in cache_path
+    ('home', 'same_as_resource' or a dirname) and later loaded from it with a
+    memmap instead of parsing the text again.
     '''
 
-    def __init__(self, filename):
+    def __init__(self, filename, use_cache=False, cache_path='same_as_resource',
+                 block_size=2 ** 24):
         """
         filename: string, path to ASCII file to read.
+        use_cache: bool, save the data in a .npy file in cache_path.
+        cache_path: string, 'home', 'same_as_resource' or a dirname.
+        block_size: int, number of bytes parsed at once.
         """
 
         self.filename = filename
-
-        # read the first line to check the data type (int or float) of the data
-        f = open(self.filename)
-        line = f.readline()
-
-        additional_parameters = {}
+        self.block_size = block_size
+        # row orders of the data by sorting columns, see get_columns()
+        self._sorting_orders = {}
+
+        if use_cache:
+            cache_filename = get_cache_filename(filename, cache_path,
+                                                self.__class__.__name__)
+            cache_filename += '_data.npy'
+            if not os.path.exists(cache_filename):
+                tmp_filename = cache_filename + '.tmp'
+                with open(tmp_filename, 'wb') as f:
+                    np.save(f, self._load_text())
+                # an interrupted write does not leave an incomplete file
+                os.rename(tmp_filename, cache_filename)
+            self.data = np.load(cache_filename, mmap_mode='r')
+        else:
+            self.data = self._load_text()
+
+    def _load_text(self):
+        # read the first line of data to check the data type (int or float)
+        line = ''
+        with open(self.filename) as f:
+            for line in f:
+                line = line.split('#', 1)[0]
+                if line.strip():
+                    break
+
+        dtype = np.float64
         if '.' not in line:
-            additional_parameters['dtype'] = np.int32
-
-        self.data = np.loadtxt(self.filename, **additional_parameters)
+            dtype = np.int32
 
-        if len(self.data.shape) == 1:
-            self.data = self.data[:, np.newaxis]
+        data = RowBuffer()
+        for rows in read_text_blocks(self.filename, dtype=dtype,
+                                     block_size=self.block_size):
+            data.append(rows)
+        return data.get_array(np.zeros((0, 1), dtype=dtype))
 
     def get_columns(self, column_ids='all', condition=None,
                     condition_column=None, sorting_columns=None):
@@ -690,12 +737,16 @@ class ColumnIO:
                     extract.
         condition : None or function, which is applied to each row to evaluate
                     if it should be included in the result.
-                    Needs to return a bool value.
+                    Needs to return a bool value. The function is first
+                    called once with the whole condition column and is
+                    only applied row by row when it does not return a bool
+                    array for it.
         condition_column : int, id of the column on which the condition
                     function is applied to
         sorting_columns : int or list of int, column ids to sort by.
                     List entries have to be ordered by increasing sorting
-                    priority!
+                    priority! Without condition the order of the rows is
+                    computed once for each sorting_columns.
 
         Returns
         -------
@@ -725,6 +776,7 @@ class ColumnIO:
 
         # Starting with whole dataset being selected for return
         selected_data = self.data
+        condition_applied = False
 
         # Apply filter condition to rows
         if condition and (condition_column is None):
@@ -735,16 +787,29 @@ class ColumnIO:
                           'given. No filtering will be performed.')
 
         elif (condition is not None) and (condition_column is not None):
-            condition_function = np.vectorize(condition)
-            mask = condition_function(
-                selected_data[:, condition_column]).astype(bool)
-            selected_data = selected_data[mask, :]
+            column = selected_data[:, condition_column]
+            try:
+                mask = np.asarray(condition(column))
+            except (TypeError, ValueError):
+                # a condition that can only be applied to single values
+                mask = None
+            if mask is None or mask.shape != column.shape:
+                condition_function = np.vectorize(condition)
+                mask = condition_function(column)
+            selected_data = selected_data[mask.astype(bool), :]
+            condition_applied = True
 
         # Apply sorting if requested
         if sorting_columns is not None:
-            values_to_sort = selected_data[:, sorting_columns].T
-            ordered_ids = np.lexsort(tuple(values_to_sort[i] for i in
-                                           range(len(values_to_sort))))
+            key = tuple(sorting_columns)
+            if condition_applied or key not in self._sorting_orders:
+                values_to_sort = selected_data[:, sorting_columns].T
+                ordered_ids = np.lexsort(tuple(values_to_sort[i] for i in
+                                               range(len(values_to_sort))))
+                if not condition_applied:
+                    self._sorting_orders[key] = ordered_ids
+            else:
+                ordered_ids = self._sorting_orders[key]
             selected_data = selected_data[ordered_ids, :]
 
         # Select only requested columns
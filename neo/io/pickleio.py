@@ -11,11 +11,15 @@ Supported: Read/Write
 Authors: Andrew Davison
 """
 
+import os
+
 try:
     import cPickle as pickle  # Python 2
 except ImportError:
     import pickle  # Python 3
 
+import numpy as np
+
 from neo.io.baseio import BaseIO
 from neo.core import (Block, Segment,
                       AnalogSignal, SpikeTrain)
@@ -28,6 +32,23 @@ class PickleIO(BaseIO):
     Note that files in this format may not be readable if using a different version
     of Neo to that used to create the file. It should therefore not be used for
     long-term storage, but rather for intermediate results in a pipeline.
+
+    Arguments:
+        filename : the pickle file
+        protocol : the pickle protocol used for writing, None for the default
+                   protocol of pickle
+        npy_buffers : if True (needs pickle protocol 5, Python >= 3.8) the
+                      data arrays are not written in the pickle file but each
+                      in a .npy file next to it (filename_0.npy,
+                      filename_1.npy, ...). When reading, these files are
+                      memory mapped (copy-on-write) instead of being loaded,
+                      so the data is only read from disk when used.
+
+    Example::
+
+        >>> io = PickleIO('data.pkl', npy_buffers=True)
+        >>> io.write_block(block)
+        >>> block = io.read_block()
     """
     is_readable = True
     is_writable = True
@@ -41,12 +62,55 @@ class PickleIO(BaseIO):
     name = "Python pickle file"
     extensions = ['pkl', 'pickle']
 
+    def __init__(self, filename=None, protocol=None, npy_buffers=False):
+        BaseIO.__init__(self, filename)
+        if npy_buffers and pickle.HIGHEST_PROTOCOL < 5:
+            raise ValueError('npy_buffers needs pickle protocol 5 (Python >= 3.8)')
+        self.protocol = protocol
+        self.npy_buffers = npy_buffers
+
     def read_block(self, lazy=False):
         assert not lazy, 'Do not support lazy'
         with open(self.filename, "rb") as fp:
-            block = pickle.load(fp)
+            if self.npy_buffers:
+                buffers = [np.load(filename, mmap_mode='c')
+                           for filename in self._buffer_filenames()]
+                block = pickle.load(fp, buffers=buffers)
+            else:
+                block = pickle.load(fp)
         return block
 
     def write_block(self, block):
         with open(self.filename, "wb") as fp:
-            pickle.dump(block, fp)
+            if self.npy_buffers:
+                buffers = []
+                pickle.dump(block, fp, protocol=5, buffer_callback=buffers.append)
+            else:
+                pickle.dump(block, fp, protocol=self.protocol)
+        if self.npy_buffers:
+            self._write_buffers(buffers)
+
+    def _buffer_filename(self, i):
+        return '{}_{}.npy'.format(self.filename, i)
+
+    def _buffer_filenames(self):
+        """
+        Return the names of the existing .npy files of the buffers, in order.
+        """
+        filenames = []
+        while os.path.exists(self._buffer_filename(len(filenames))):
+            filenames.append(self._buffer_filename(len(filenames)))
+        return filenames
+
+    def _write_buffers(self, buffers):
+        for i, buf in enumerate(buffers):
+            filename = self._buffer_filename(i)
+            tmp_filename = filename + '.tmp'
+            with open(tmp_filename, 'wb') as f:
+                # the raw bytes, the dtype and the shape are in the pickle file
+                np.save(f, np.frombuffer(buf.raw(), dtype='uint8'))
+            # an interrupted write does not leave an incomplete file
+            os.rename(tmp_filename, filename)
+        # the files of a previous write with more buffers
+        for filename in self._buffer_filenames()[len(buffers):]:
+            os.remove(filename)
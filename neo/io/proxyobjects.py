@@ -10,6 +10,9 @@ ineherits neo.rawio.
 
 """
 
+import copy
+import numbers
+
 import numpy as np
 import quantities as pq
 
@@ -22,6 +25,11 @@ from neo.core.dataobject import ArrayDict
 
 
 class BaseProxy(BaseNeo):
+    # limits in seconds in the rawio time of a proxy given by time_slice()
+    _window = None
+    # shift in seconds added to the rawio times by time_shift()
+    _time_shift = 0.
+
     def __init__(self, array_annotations=None, **annotations):
         # this for py27 str vs py3 str in neo attributes ompatibility
         annotations = check_annotations(annotations)
@@ -37,6 +45,106 @@ class BaseProxy(BaseNeo):
 
         BaseNeo.__init__(self, **annotations)
 
+    def load_windows(self, t_starts, duration, **kargs):
+        '''
+        Load the windows of the same duration starting at t_starts.
+
+        This is load_many() with time_slices (t_start, t_start + duration),
+        other keyword arguments are passed to load_many().
+        '''
+        t_starts = ensure_second(t_starts).magnitude
+        duration = ensure_second(duration).magnitude
+        time_slices = [(t * pq.s, (t + duration) * pq.s) for t in t_starts]
+        return self.load_many(time_slices, **kargs)
+
+    @property
+    def shape(self):
+        '''
+        Shape of the loaded object.
+
+        The number of spikes or events of a proxy given by time_slice() is
+        only known after reading their timestamps (not the waveforms, labels
+        or durations) in the window, this is done at the first access and
+        kept.
+        '''
+        if self._shape is None:
+            self._shape = (self._count_in_window(), )
+        return self._shape
+
+    @shape.setter
+    def shape(self, shape):
+        self._shape = shape
+
+    def _copy(self):
+        '''
+        Shallow copy sharing the rawio, used by time_slice() and time_shift().
+        '''
+        new = copy.copy(self)
+        new.annotations = dict(self.annotations)
+        new.array_annotations = copy.copy(self.array_annotations)
+        return new
+
+    def time_slice(self, t_start, t_stop, strict_slicing=True):
+        '''
+        Return a new proxy restricted to the times between t_start and t_stop,
+        without reading any data.
+
+        load() of the new proxy gives the same object as load() of this proxy
+        with time_slice=(t_start, t_stop).
+        '''
+        t_start, t_stop = consolidate_time_slice((t_start, t_stop), self.t_start,
+                                                 self.t_stop, strict_slicing)
+        new = self._copy()
+        new._window = self._rawio_time_limits(float(t_start.magnitude),
+                                              float(t_stop.magnitude))
+        new.t_start, new.t_stop = t_start, t_stop
+        new.shape = None
+        return new
+
+    def time_shift(self, t_shift):
+        '''
+        Return a new proxy whose loaded objects are shifted by t_shift,
+        without reading any data.
+        '''
+        t_shift = ensure_second(t_shift)
+        new = self._copy()
+        new._time_shift = self._time_shift + float(t_shift.magnitude)
+        new.t_start = self.t_start + t_shift
+        new.t_stop = self.t_stop + t_shift
+        return new
+
+    def _rawio_time_limits(self, t_start, t_stop):
+        '''
+        Convert limits in seconds (None for no limit) in the time of this
+        proxy to limits in the time of the rawio, restricted to the window
+        given by time_slice().
+        '''
+        if t_start is not None:
+            t_start = t_start - self._time_shift
+        if t_stop is not None:
+            t_stop = t_stop - self._time_shift
+        if self._window is not None:
+            window_t_start, window_t_stop = self._window
+            t_start = window_t_start if t_start is None else max(t_start, window_t_start)
+            t_stop = window_t_stop if t_stop is None else min(t_stop, window_t_stop)
+        return t_start, t_stop
+
+    def _raw_times(self, timestamps, clock):
+        '''
+        Return the timestamps as ticks of the clock (gain, offset) of the rawio
+        and the CompoundUnit of one tick.
+        '''
+        gain, offset = clock
+        # the offset (and the time shift) are added as a whole number of ticks
+        # to keep the dtype of the timestamps
+        ticks = (offset + self._time_shift) / gain
+        assert gain > 0. and np.isclose(ticks, np.round(ticks), rtol=0., atol=1e-3), \
+            'raw magnitude is not support the time offset is not a whole number of ticks'
+        ticks = int(np.round(ticks))
+        if ticks != 0:
+            timestamps = timestamps + np.array(ticks).astype(timestamps.dtype)
+        return timestamps, raw_time_units(gain)
+
 
 class AnalogSignalProxy(BaseProxy):
     '''
@@ -64,6 +172,8 @@ class AnalogSignalProxy(BaseProxy):
     >>> anasig = proxy_anasig.load()
     >>> slice_of_anasig = proxy_anasig.load(time_slice=(1.*pq.s, 2.*pq.s))
     >>> some_channel_of_anasig = proxy_anasig.load(channel_indexes=[0,5,10])
+    >>> trials = proxy_anasig.load_many([(1.*pq.s, 2.*pq.s), (5.*pq.s, 6.*pq.s)])
+    >>> stacked = proxy_anasig.load_windows([1., 5., 9.]*pq.s, 500*pq.ms)
 
     '''
     _single_parent_objects = ('Segment', 'ChannelIndex')
@@ -71,6 +181,9 @@ class AnalogSignalProxy(BaseProxy):
                                     ('t_start', pq.Quantity, 0))
     _recommended_attrs = BaseNeo._recommended_attrs
 
+    # index in the rawio of the first sample of a proxy given by time_slice()
+    _i_offset = 0
+
     def __init__(self, rawio=None, global_channel_indexes=None, block_index=0, seg_index=0):
         self._rawio = rawio
         self._block_index = block_index
@@ -170,50 +283,151 @@ class AnalogSignalProxy(BaseProxy):
         if channel_indexes is None:
             channel_indexes = slice(None)
 
-        sr = self.sampling_rate
-
-        if time_slice is None:
-            i_start, i_stop = None, None
-            sig_t_start = self.t_start
-        else:
-            t_start, t_stop = time_slice
-            if t_start is None:
-                i_start = None
-                sig_t_start = self.t_start
-            else:
-                t_start = ensure_second(t_start)
-                if strict_slicing:
-                    assert self.t_start <= t_start <= self.t_stop, 't_start is outside'
-                else:
-                    t_start = max(t_start, self.t_start)
-                # the i_start is ncessary ceil
-                i_start = int(np.ceil((t_start - self.t_start).magnitude * sr.magnitude))
-                # this needed to get the real t_start of the first sample
-                # because do not necessary match what is demanded
-                sig_t_start = self.t_start + i_start / sr
-
-            if t_stop is None:
-                i_stop = None
-            else:
-                t_stop = ensure_second(t_stop)
-                if strict_slicing:
-                    assert self.t_start <= t_stop <= self.t_stop, 't_stop is outside'
-                else:
-                    t_stop = min(t_stop, self.t_stop)
-                i_stop = int((t_stop - self.t_start).magnitude * sr.magnitude)
+        t_starts, t_stops = time_slices_to_seconds([time_slice])
+        i_starts, i_stops = self._time_windows_to_indexes(t_starts, t_stops, strict_slicing)
+        i_start, i_stop = int(i_starts[0]), int(i_stops[0])
 
         raw_signal = self._rawio.get_analogsignal_chunk(block_index=self._block_index,
-                    seg_index=self._seg_index, i_start=i_start, i_stop=i_stop,
+                    seg_index=self._seg_index, i_start=i_start + self._i_offset,
+                    i_stop=i_stop + self._i_offset,
                     channel_indexes=self._global_channel_indexes[channel_indexes])
 
-        # if slice in channel : change name and array_annotations
-        if raw_signal.shape[1] != self._nb_chan:
-            name = self._make_name(channel_indexes)
-            array_annotations = {k: v[channel_indexes] for k, v in self.array_annotations.items()}
-        else:
-            name = self.name
-            array_annotations = self.array_annotations
+        return self._make_analogsignal(raw_signal, self._sample_times(i_start),
+                                       channel_indexes, magnitude_mode)
 
+    def load_many(self, time_slices, strict_slicing=True, channel_indexes=None,
+                  magnitude_mode='rescaled'):
+        '''
+        Load several time slices at once.
+
+        The time slices are sorted and the overlapping ones are merged, so the
+        underlying data are read in a single pass over the file, each sample at
+        most once.
+
+        *Args*:
+            :time_slices: list of time slices, see load().
+            :strict_slicing, channel_indexes, magnitude_mode: see load().
+
+        Return a list of AnalogSignal in the order of time_slices.
+        '''
+        if channel_indexes is None:
+            channel_indexes = slice(None)
+
+        t_starts, t_stops = time_slices_to_seconds(time_slices)
+        i_starts, i_stops = self._time_windows_to_indexes(t_starts, t_stops, strict_slicing)
+
+        sig_t_starts = self._sample_times(i_starts)
+
+        anasigs = [None] * len(i_starts)
+        for i, span_start, raw_span in self._iter_raw_windows(i_starts, i_stops,
+                                                                channel_indexes):
+            raw_signal = raw_span[i_starts[i] - span_start:i_stops[i] - span_start]
+            anasigs[i] = self._make_analogsignal(raw_signal, sig_t_starts[i],
+                                                 channel_indexes, magnitude_mode)
+        return anasigs
+
+    def load_windows(self, t_starts, duration, channel_indexes=None,
+                     magnitude_mode='rescaled'):
+        '''
+        Load the windows of the same duration starting at t_starts, for instance
+        peri-stimulus windows, as one stacked array.
+
+        The first sample of each window is the first one at or after its start
+        and all windows have int(duration * sampling_rate) samples. The windows
+        must be inside the signal. The data are read as with load_many().
+
+        *Args*:
+            :t_starts: Quantity array of window starts.
+            :duration: Quantity, duration of the windows.
+            :channel_indexes, magnitude_mode: see load().
+
+        Return a Quantity of shape (nb_windows, nb_samples, nb_channels).
+        '''
+        if channel_indexes is None:
+            channel_indexes = slice(None)
+
+        t_starts = np.atleast_1d(ensure_second(t_starts).magnitude).astype('float64')
+        duration = ensure_second(duration).magnitude
+        nb_sample = int(duration * self.sampling_rate.rescale('Hz').magnitude)
+        i_starts, _ = self._time_windows_to_indexes(t_starts, t_starts + duration, True)
+        i_stops = i_starts + nb_sample
+        assert np.all(i_stops <= self.shape[0]), 't_stop is outside'
+
+        nb_chan = self._global_channel_indexes[channel_indexes].size
+        raw_windows = None
+        for i, span_start, raw_span in self._iter_raw_windows(i_starts, i_stops,
+                                                                channel_indexes):
+            if raw_windows is None:
+                raw_windows = np.empty((len(i_starts), nb_sample, nb_chan), dtype=raw_span.dtype)
+            raw_windows[i] = raw_span[i_starts[i] - span_start:i_stops[i] - span_start]
+        if raw_windows is None:
+            raw_windows = np.empty((0, nb_sample, nb_chan), dtype=self.dtype)
+
+        sig, units = self._rescale(raw_windows, channel_indexes, magnitude_mode)
+        return pq.Quantity(sig, units=units, copy=False)
+
+    def time_slice(self, t_start, t_stop, strict_slicing=True):
+        '''
+        Return a new AnalogSignalProxy restricted to the samples between
+        t_start and t_stop, without reading any data.
+
+        load() of the new proxy gives the same AnalogSignal as load() of this
+        proxy with time_slice=(t_start, t_stop).
+        '''
+        t_starts, t_stops = time_slices_to_seconds([(t_start, t_stop)])
+        i_starts, i_stops = self._time_windows_to_indexes(t_starts, t_stops, strict_slicing)
+        new = self._copy()
+        new._i_offset = self._i_offset + int(i_starts[0])
+        new.shape = (int(i_stops[0] - i_starts[0]), self._nb_chan)
+        new.t_start = pq.Quantity(self._sample_times(i_starts[0]), 's')
+        return new
+
+    def time_shift(self, t_shift):
+        '''
+        Return a new AnalogSignalProxy starting t_shift later, without reading
+        any data.
+        '''
+        new = self._copy()
+        new.t_start = self.t_start + ensure_second(t_shift)
+        return new
+
+    def _time_windows_to_indexes(self, t_starts, t_stops, strict_slicing):
+        '''
+        Convert arrays of window limits in seconds, with nan for None, to
+        arrays of sample indexes (i_starts, i_stops).
+        '''
+        no_start, no_stop = np.isnan(t_starts), np.isnan(t_stops)
+        sig_t_start = self.t_start.rescale('s').magnitude
+        sig_t_stop = self.t_stop.rescale('s').magnitude
+        t_starts, t_stops = consolidate_time_windows(t_starts, t_stops, sig_t_start,
+                                                     sig_t_stop, strict_slicing)
+        sr = self.sampling_rate.rescale('Hz').magnitude
+        # the i_start is ncessary ceil
+        i_starts = np.ceil((t_starts - sig_t_start) * sr).astype('int64')
+        i_stops = ((t_stops - sig_t_start) * sr).astype('int64')
+        i_starts[no_start] = 0
+        i_stops[no_stop] = self.shape[0]
+        return i_starts, i_stops
+
+    def _iter_raw_windows(self, i_starts, i_stops, channel_indexes):
+        '''
+        Read the windows [i_starts, i_stops[ with as few and as sorted calls to
+        get_analogsignal_chunk as possible, see iter_windows().
+        '''
+        global_channel_indexes = self._global_channel_indexes[channel_indexes]
+
+        def read_span(span_start, span_stop):
+            return self._rawio.get_analogsignal_chunk(
+                block_index=self._block_index, seg_index=self._seg_index,
+                i_start=int(span_start) + self._i_offset, i_stop=int(span_stop) + self._i_offset,
+                channel_indexes=global_channel_indexes)
+
+        return iter_windows(i_starts, i_stops, read_span)
+
+    def _rescale(self, raw_signal, channel_indexes, magnitude_mode):
+        '''
+        Return the signal in magnitude_mode and its units.
+        '''
         if magnitude_mode == 'raw':
             assert self._raw_units is not None,\
                     'raw magnitude is not support gain are not the same for all channel or offset is not 0'
@@ -228,11 +442,39 @@ class AnalogSignalProxy(BaseProxy):
             sig = self._rawio.rescale_signal_raw_to_float(raw_signal, dtype=dtype,
                                     channel_indexes=self._global_channel_indexes[channel_indexes])
             units = self.units
+        return sig, units
+
+    def _sample_times(self, i_starts):
+        '''
+        Return the times in seconds of the sample indexes i_starts.
+        '''
+        # this needed to get the real t_start of the first sample
+        # because do not necessary match what is demanded
+        return (self.t_start.rescale('s').magnitude
+                + i_starts / self.sampling_rate.rescale('Hz').magnitude)
 
-        anasig = AnalogSignal(sig, units=units, copy=False, t_start=sig_t_start,
+    def _make_analogsignal(self, raw_signal, sig_t_start, channel_indexes, magnitude_mode):
+        '''
+        Create the AnalogSignal of the raw_signal whose first sample is at
+        sig_t_start in seconds.
+        '''
+        sig_t_start = pq.Quantity(sig_t_start, 's')
+
+        # if slice in channel : change name and array_annotations
+        if raw_signal.shape[1] != self._nb_chan:
+            name = self._make_name(channel_indexes)
+            array_annotations = {k: v[channel_indexes] for k, v in self.array_annotations.items()}
+        else:
+            name = self.name
+            array_annotations = self.array_annotations
+
+        sig, units = self._rescale(raw_signal, channel_indexes, magnitude_mode)
+
+        # the header of the rawio is consistent so the checks of the constructor are skipped
+        anasig = AnalogSignal._from_validated(sig, units=units, t_start=sig_t_start,
                     sampling_rate=self.sampling_rate, name=name,
                     file_origin=self.file_origin, description=self.description,
-                    array_annotations=array_annotations, **self.annotations)
+                    array_annotations=array_annotations, annotations=self.annotations)
 
         return anasig
 
@@ -261,6 +503,7 @@ class SpikeTrainProxy(BaseProxy):
                         block_index=0, seg_index=0,)
     >>> sptr = proxy_sptr.load()
     >>> slice_of_sptr = proxy_sptr.load(time_slice=(1.*pq.s, 2.*pq.s))
+    >>> trials = proxy_sptr.load_windows([1., 5., 9.]*pq.s, 500*pq.ms)
 
     '''
 
@@ -296,7 +539,7 @@ class SpikeTrainProxy(BaseProxy):
         wf_sampling_rate = h['wf_sampling_rate']
         if not np.isnan(wf_sampling_rate) and wf_sampling_rate > 0:
             self.sampling_rate = wf_sampling_rate * pq.Hz
-            self.left_sweep = (h['wf_left_sweep'] / self.sampling_rate).rescale('s')
+            self.left_sweep = h['wf_left_sweep'] / wf_sampling_rate * pq.s
             self._wf_units = ensure_signal_units(h['wf_units'])
         else:
             self.sampling_rate = None
@@ -314,32 +557,110 @@ class SpikeTrainProxy(BaseProxy):
                  Control if an error is raise or not when one of  time_slice
                  member (t_start or t_stop) is outside the real time range of the segment.
             :magnitude_mode: 'rescaled' or 'raw'.
+                With 'raw' the times are the timestamps of the file with a
+                CompoundUnit (for instance '1/10000*s') as units and the
+                waveforms are dimensionless.
             :load_waveforms: bool load waveforms or not.
         '''
 
         t_start, t_stop = consolidate_time_slice(time_slice, self.t_start,
                                                                     self.t_stop, strict_slicing)
-        _t_start, _t_stop = prepare_time_slice(time_slice)
+        _t_start, _t_stop = self._rawio_time_limits(*prepare_time_slice(time_slice))
 
-        spike_timestamps = self._rawio.get_spike_timestamps(block_index=self._block_index,
-                        seg_index=self._seg_index, unit_index=self._unit_index, t_start=_t_start,
-                        t_stop=_t_stop)
+        spike_timestamps, raw_wfs = self._read_spikes(_t_start, _t_stop, load_waveforms)
 
-        if magnitude_mode == 'raw':
-            # we must modify a bit the neo.rawio interface to also read the spike_timestamps
-            # underlying clock wich is not always same as sigs
-            raise(NotImplementedError)
-        elif magnitude_mode == 'rescaled':
-            dtype = 'float64'
-            spike_times = self._rawio.rescale_spike_timestamp(spike_timestamps, dtype=dtype)
-            units = 's'
+        return self._make_spiketrain(spike_timestamps, raw_wfs, t_start, t_stop,
+                                     magnitude_mode)
+
+    def load_many(self, time_slices, strict_slicing=True,
+                  magnitude_mode='rescaled', load_waveforms=False):
+        '''
+        Load several time slices at once.
+
+        The time slices are sorted and the overlapping ones are merged, so the
+        spikes are read in a single pass over the file.
+
+        *Args*:
+            :time_slices: list of time slices, see load().
+            :strict_slicing, magnitude_mode, load_waveforms: see load().
+
+        Return a list of SpikeTrain in the order of time_slices.
+        '''
+        t_starts, t_stops = consolidate_time_windows(*time_slices_to_seconds(time_slices),
+                        seg_t_start=self.t_start.rescale('s').magnitude,
+                        seg_t_stop=self.t_stop.rescale('s').magnitude,
+                        strict_slicing=strict_slicing)
+
+        def read_span(span_t_start, span_t_stop):
+            spike_timestamps, raw_wfs = self._read_spikes(
+                *self._rawio_time_limits(span_t_start, span_t_stop),
+                load_waveforms=load_waveforms)
+            spike_times = self._rawio.rescale_spike_timestamp(spike_timestamps,
+                                                              dtype='float64')
+            return spike_timestamps, raw_wfs, spike_times + self._time_shift
+
+        sptrs = [None] * len(t_starts)
+        for i, _, span in iter_windows(t_starts, t_stops, read_span):
+            spike_timestamps, raw_wfs, spike_times = span
+            keep = select_window(spike_times, t_starts[i], t_stops[i])
+            if raw_wfs is not None:
+                raw_wfs = raw_wfs[keep]
+            sptrs[i] = self._make_spiketrain(spike_timestamps[keep], raw_wfs,
+                                             t_starts[i] * pq.s, t_stops[i] * pq.s,
+                                             magnitude_mode)
+        return sptrs
+
+    def _count_in_window(self):
+        spike_timestamps, _ = self._read_spikes(*self._rawio_time_limits(None, None),
+                                                load_waveforms=False)
+        return spike_timestamps.size
+
+    def _read_spikes(self, t_start, t_stop, load_waveforms):
+        '''
+        Read the spike timestamps and raw waveforms (None if not load_waveforms)
+        between t_start and t_stop in seconds.
+        '''
+        spike_timestamps = self._rawio.get_spike_timestamps(block_index=self._block_index,
+                        seg_index=self._seg_index, unit_index=self._unit_index, t_start=t_start,
+                        t_stop=t_stop)
 
         if load_waveforms:
             assert self.sampling_rate is not None, 'Do not have waveforms'
 
             raw_wfs = self._rawio.get_spike_raw_waveforms(block_index=self._block_index,
                 seg_index=self._seg_index, unit_index=self._unit_index,
-                            t_start=_t_start, t_stop=_t_stop)
+                            t_start=t_start, t_stop=t_stop)
+        else:
+            raw_wfs = None
+
+        return spike_timestamps, raw_wfs
+
+    def _make_spiketrain(self, spike_timestamps, raw_wfs, t_start, t_stop, magnitude_mode):
+        '''
+        Create the SpikeTrain from the raw spike timestamps and waveforms.
+        '''
+        if magnitude_mode == 'raw':
+            # the clock of spike timestamps is not always the same as sigs
+            spike_times, units = self._raw_times(spike_timestamps,
+                                                 self._rawio.get_spike_timestamp_clock())
+            t_start = t_start.rescale(units)
+            t_stop = t_stop.rescale(units)
+            if spike_times.dtype.kind in 'iu':
+                # whole ticks around the spikes, with the dtype of the times
+                t_start = np.floor(t_start)
+                t_stop = np.ceil(t_stop)
+            t_start = t_start.astype(spike_times.dtype)
+            t_stop = t_stop.astype(spike_times.dtype)
+        elif magnitude_mode == 'rescaled':
+            dtype = 'float64'
+            spike_times = self._rawio.rescale_spike_timestamp(spike_timestamps, dtype=dtype)
+            if self._time_shift != 0.:
+                spike_times += self._time_shift
+            units = pq.s
+            t_start = t_start.rescale(units)
+            t_stop = t_stop.rescale(units)
+
+        if raw_wfs is not None:
             if magnitude_mode == 'rescaled':
                 float_wfs = self._rawio.rescale_waveforms_to_float(raw_wfs,
                                 dtype='float32', unit_index=self._unit_index)
@@ -353,10 +674,13 @@ class SpikeTrainProxy(BaseProxy):
         else:
             waveforms = None
 
-        sptr = SpikeTrain(spike_times, t_stop, units=units, dtype=dtype,
-                t_start=t_start, copy=False, sampling_rate=self.sampling_rate,
+        # the rawio only gives spikes between t_start and t_stop so the checks of the
+        # constructor are skipped
+        sptr = SpikeTrain._from_validated(spike_times, t_stop, units=units,
+                t_start=t_start, sampling_rate=self.sampling_rate,
                 waveforms=waveforms, left_sweep=self.left_sweep, name=self.name,
-                file_origin=self.file_origin, description=self.description, **self.annotations)
+                file_origin=self.file_origin, description=self.description,
+                annotations=self.annotations)
 
         return sptr
 
@@ -388,7 +712,7 @@ class _EventOrEpoch(BaseProxy):
 
         BaseProxy.__init__(self, **annotations)
 
-    def load(self, time_slice=None, strict_slicing=True):
+    def load(self, time_slice=None, strict_slicing=True, magnitude_mode='rescaled'):
         '''
         *Args*:
             :time_slice: None or tuple of the time slice expressed with quantities.
@@ -396,34 +720,97 @@ class _EventOrEpoch(BaseProxy):
             :strict_slicing: True by default.
                  Control if an error is raise or not when one of  time_slice member (t_start or t_stop)
                  is outside the real time range of the segment.
+            :magnitude_mode: 'rescaled' or 'raw'.
+                With 'raw' the times (and durations) are the timestamps of the
+                file with a CompoundUnit (for instance '1/10000*s') as units.
         '''
 
         t_start, t_stop = consolidate_time_slice(time_slice, self.t_start,
                                                                     self.t_stop, strict_slicing)
-        _t_start, _t_stop = prepare_time_slice(time_slice)
+        _t_start, _t_stop = self._rawio_time_limits(*prepare_time_slice(time_slice))
 
         timestamp, durations, labels = self._rawio.get_event_timestamps(block_index=self._block_index,
                         seg_index=self._seg_index, event_channel_index=self._event_channel_index,
                         t_start=_t_start, t_stop=_t_stop)
 
-        dtype = 'float64'
-        times = self._rawio.rescale_event_timestamp(timestamp, dtype=dtype)
-        units = 's'
+        return self._make_event_or_epoch(timestamp, durations, labels, magnitude_mode)
+
+    def load_many(self, time_slices, strict_slicing=True, magnitude_mode='rescaled'):
+        '''
+        Load several time slices at once.
 
-        if durations is not None:
-            durations = self._rawio.rescale_epoch_duration(durations, dtype=dtype) * pq.s
+        The time slices are sorted and the overlapping ones are merged, so the
+        events are read in a single pass over the file.
+
+        *Args*:
+            :time_slices: list of time slices, see load().
+            :strict_slicing, magnitude_mode: see load().
+
+        Return a list of Event or Epoch in the order of time_slices.
+        '''
+        t_starts, t_stops = consolidate_time_windows(*time_slices_to_seconds(time_slices),
+                        seg_t_start=self.t_start.rescale('s').magnitude,
+                        seg_t_stop=self.t_stop.rescale('s').magnitude,
+                        strict_slicing=strict_slicing)
+
+        def read_span(span_t_start, span_t_stop):
+            span_t_start, span_t_stop = self._rawio_time_limits(span_t_start, span_t_stop)
+            timestamp, durations, labels = self._rawio.get_event_timestamps(
+                block_index=self._block_index, seg_index=self._seg_index,
+                event_channel_index=self._event_channel_index,
+                t_start=span_t_start, t_stop=span_t_stop)
+            times = self._rawio.rescale_event_timestamp(timestamp, dtype='float64')
+            return timestamp, durations, labels, times + self._time_shift
+
+        objects = [None] * len(t_starts)
+        for i, _, span in iter_windows(t_starts, t_stops, read_span):
+            timestamp, durations, labels, times = span
+            keep = select_window(times, t_starts[i], t_stops[i])
+            if durations is not None:
+                durations = durations[keep]
+            objects[i] = self._make_event_or_epoch(timestamp[keep], durations, labels[keep],
+                                                   magnitude_mode)
+        return objects
+
+    def _count_in_window(self):
+        _t_start, _t_stop = self._rawio_time_limits(None, None)
+        timestamp, _, _ = self._rawio.get_event_timestamps(
+            block_index=self._block_index, seg_index=self._seg_index,
+            event_channel_index=self._event_channel_index, t_start=_t_start, t_stop=_t_stop)
+        return timestamp.size
+
+    def _make_event_or_epoch(self, timestamp, durations, labels, magnitude_mode='rescaled'):
+        '''
+        Create the Event or Epoch from the raw timestamps and durations.
+        '''
+        if magnitude_mode == 'raw':
+            times, units = self._raw_times(timestamp, self._rawio.get_event_timestamp_clock())
+            if durations is not None:
+                gain, offset = self._rawio.get_epoch_duration_clock()
+                assert gain > 0. and offset == 0., \
+                    'raw magnitude is not support the durations have an offset'
+                durations = pq.Quantity(durations, units=raw_time_units(gain), copy=False)
+        elif magnitude_mode == 'rescaled':
+            dtype = 'float64'
+            times = self._rawio.rescale_event_timestamp(timestamp, dtype=dtype)
+            if self._time_shift != 0.:
+                times += self._time_shift
+            units = 's'
+
+            if durations is not None:
+                durations = self._rawio.rescale_epoch_duration(durations, dtype=dtype) * pq.s
 
         # this should be remove when labesl will be unicode
         labels = labels.astype('S')
 
         h = self._rawio.header['event_channels'][self._event_channel_index]
         if h['type'] == b'event':
-            ret = Event(times=times, labels=labels, units='s',
+            ret = Event(times=times, labels=labels, units=units,
                 name=self.name, file_origin=self.file_origin,
                 description=self.description, **self.annotations)
         elif h['type'] == b'epoch':
             ret = Epoch(times=times, durations=durations, labels=labels,
-                units='s',
+                units=units,
                 name=self.name, file_origin=self.file_origin,
                 description=self.description, **self.annotations)
 
@@ -522,13 +909,21 @@ def check_annotations(annotations):
     return annotations
 
 
+def raw_time_units(gain):
+    '''
+    CompoundUnit of a tick of a clock whose period is gain seconds.
+    '''
+    return pq.CompoundUnit('{!r}*s'.format(float(gain)))
+
+
 def ensure_second(v):
-    if isinstance(v, float):
-        return v * pq.s
-    elif isinstance(v, pq.Quantity):
+    if isinstance(v, pq.Quantity):
         return v.rescale('s')
-    elif isinstance(v, int):
-        return float(v) * pq.s
+    elif isinstance(v, (numbers.Real, np.ndarray, list, tuple)):
+        # numbers and arrays without units are in seconds
+        return np.asarray(v, dtype='float64') * pq.s
+    else:
+        raise TypeError('A time must be a Quantity or a number in s, not %s' % type(v))
 
 
 def prepare_time_slice(time_slice):
@@ -550,6 +945,92 @@ def prepare_time_slice(time_slice):
     return (t_start, t_stop)
 
 
+def time_slices_to_seconds(time_slices):
+    """
+    Convert a list of time slices to two float arrays of t_start and t_stop
+    in seconds, with nan where the time slice or one of its limits is None.
+    """
+    # rescaling each quantity is slow, so the factor of each units is computed once
+    factors = {}
+
+    def to_second(v):
+        if not isinstance(v, pq.Quantity):
+            return ensure_second(v).magnitude
+        key = v._dimensionality.string
+        if key not in factors:
+            factors[key] = pq.Quantity(1., v.units).rescale('s').magnitude
+        return v.magnitude * factors[key]
+
+    t_starts = np.full(len(time_slices), np.nan)
+    t_stops = np.full(len(time_slices), np.nan)
+    for i, time_slice in enumerate(time_slices):
+        if time_slice is None:
+            continue
+        t_start, t_stop = time_slice
+        if t_start is not None:
+            t_starts[i] = to_second(t_start)
+        if t_stop is not None:
+            t_stops[i] = to_second(t_stop)
+    return t_starts, t_stops
+
+
+def consolidate_time_windows(t_starts, t_stops, seg_t_start, seg_t_stop, strict_slicing):
+    """
+    Vectorized consolidate_time_slice for arrays of limits in seconds, nan is
+    replaced by the segment limits.
+    """
+    t_starts = np.where(np.isnan(t_starts), seg_t_start, t_starts)
+    t_stops = np.where(np.isnan(t_stops), seg_t_stop, t_stops)
+    if strict_slicing:
+        assert np.all((seg_t_start <= t_starts) & (t_starts <= seg_t_stop)), 't_start is outside'
+        assert np.all((seg_t_start <= t_stops) & (t_stops <= seg_t_stop)), 't_stop is outside'
+    else:
+        t_starts = np.maximum(t_starts, seg_t_start)
+        t_stops = np.minimum(t_stops, seg_t_stop)
+    return t_starts, t_stops
+
+
+def iter_windows(starts, stops, read_span):
+    """
+    Read the windows [starts[i], stops[i]] with as few calls to
+    read_span(span_start, span_stop) as possible.
+
+    The windows are sorted and the overlapping or contiguous ones are merged
+    into spans which are read once, in increasing order, so the file is read
+    in a single pass and only one span is in memory at a time.
+
+    Yield (i, span_start, span_data) for every window i, grouped by span.
+    """
+    starts = np.asarray(starts)
+    stops = np.asarray(stops)
+    if starts.size == 0:
+        return
+    order = np.argsort(starts, kind='mergesort')
+    sorted_starts = starts[order]
+    running_stops = np.maximum.accumulate(stops[order])
+    # a span begins with a window starting after the end of all previous ones
+    new_span = np.ones(order.size, dtype=bool)
+    new_span[1:] = sorted_starts[1:] > running_stops[:-1]
+    firsts = np.nonzero(new_span)[0]
+    lasts = np.append(firsts[1:], order.size) - 1
+    for first, last in zip(firsts, lasts):
+        span_start = sorted_starts[first]
+        span_data = read_span(span_start, running_stops[last])
+        for i in order[first:last + 1]:
+            yield i, span_start, span_data
+
+
+def select_window(times, t_start, t_stop):
+    """
+    Return the index of times between t_start and t_stop included, a slice
+    when times are sorted.
+    """
+    if np.all(times[1:] >= times[:-1]):
+        return slice(np.searchsorted(times, t_start, side='left'),
+                     np.searchsorted(times, t_stop, side='right'))
+    return (times >= t_start) & (times <= t_stop)
+
+
 def consolidate_time_slice(time_slice, seg_t_start, seg_t_stop, strict_slicing):
     """
     This give clean time slice in quantity for t_start/t_stop of object
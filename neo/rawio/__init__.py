@@ -11,11 +11,16 @@ Classes:
 
 """
 
+from neo.rawio.alphaomegarawio import AlphaOmegaRawIO
+from neo.rawio.asciisignalrawio import AsciiSignalRawIO
 from neo.rawio.axographrawio import AxographRawIO
 from neo.rawio.axonrawio import AxonRawIO
 from neo.rawio.blackrockrawio import BlackrockRawIO
 from neo.rawio.brainvisionrawio import BrainVisionRawIO
+from neo.rawio.brainwaredamrawio import BrainwareDamRawIO
+from neo.rawio.brainwaref32rawio import BrainwareF32RawIO
 from neo.rawio.elanrawio import ElanRawIO
+from neo.rawio.elphyrawio import ElphyRawIO
 from neo.rawio.intanrawio import IntanRawIO
 from neo.rawio.micromedrawio import MicromedRawIO
 from neo.rawio.neuralynxrawio import NeuralynxRawIO
@@ -31,11 +36,16 @@ from neo.rawio.winedrrawio import WinEdrRawIO
 from neo.rawio.winwcprawio import WinWcpRawIO
 
 rawiolist = [
+    AlphaOmegaRawIO,
+    AsciiSignalRawIO,
     AxographRawIO,
     AxonRawIO,
     BlackrockRawIO,
     BrainVisionRawIO,
+    BrainwareDamRawIO,
+    BrainwareF32RawIO,
     ElanRawIO,
+    ElphyRawIO,
     IntanRawIO,
     MicromedRawIO,
     NeuralynxRawIO,
@@ -0,0 +1,648 @@
+# -*- coding: utf-8 -*-
+"""
+Class for reading data from Alpha Omega .map files.
+
+This class is an experimental reader with important limitations.
+See the source code for details of the limitations.
+The code of this reader is of alpha quality and received very limited testing.
+
+This code is written from the incomplete file specifications available in:
+
+[1] AlphaMap Data Acquisition System User's Manual Version 10.1.1
+Section 5 APPENDIX B: ALPHAMAP FILE STRUCTURE, pages 120-140
+Edited by ALPHA OMEGA Home Office: P.O. Box 810, Nazareth Illit 17105, Israel
+http://www.alphaomega-eng.com/
+
+and from the source code of a C software for conversion of .map files to
+.eeg elan software files :
+
+[2] alphamap2eeg 1.0, 12/03/03, Anne CHEYLUS - CNRS ISC UMR 5015
+
+The file is a sequence of blocks, each starting with its length and its type.
+The blocks are walked once in _parse_header() and the data blocks of type 5
+(data block for one channel) are indexed in numpy arrays (this index can be
+cached with use_cache=True). The signals are then read with a memmap of the
+payload of the data blocks.
+
+Supported : Read
+
+@author : sgarcia, Florent Jaillet
+
+"""
+
+# NOTE: For some specific types of comments, the following convention is used:
+# "TODO:" Desirable future evolution
+# "WARNING:" Information about code that is based on broken or missing
+# specifications and that might be wrong
+
+
+# Main limitations of this reader:
+# - The reader is only able to load data stored in data blocks of type 5
+#   (data block for one channel). In particular it means that it doesn't
+#   support signals stored in blocks of type 7 (data block for multiple
+#   channels).
+#   For more details on these data blocks types, see 5.4.1 and 5.4.2 p 127 in
+#   [1].
+# - Rather than supporting all the neo objects types that could be extracted
+#   from the file, all read data are returned in AnalogSignal objects, even for
+#   digital channels or channels containing spiking informations.
+# - Digital channels are not converted to events or events array as they
+#   should.
+# - Many data or metadata that are avalaible in the file and that could be
+#   represented in some way in the neo model are not extracted. In particular
+#   scaling of the data and extraction of the units of the signals are not
+#   supported.
+#
+# These limitations are mainly due to the following reasons:
+# - Incomplete, unclear and in some places innacurate specifications of the
+#   format in [1].
+# - Lack of test files containing all the types of data blocks of interest
+#   (in particular no file with type 7 data block for multiple channels where
+#   available when writing this code).
+# - Lack of knowledge of the Alphamap software and the associated data models.
+
+from __future__ import unicode_literals, print_function, division, absolute_import
+
+from .baserawio import (BaseRawIO, _signal_channel_dtype, _unit_channel_dtype,
+                        _event_channel_dtype)
+
+import numpy as np
+
+import datetime
+import struct
+
+
+class AlphaOmegaRawIO(BaseRawIO):
+    """
+    Class for reading data from Alpha Omega .map files (experimental)
+
+    Each channel with data is a signal channel in its own group because
+    channels can have different sampling rates, t_start and sizes.
+    """
+    extensions = ['map']
+    rawmode = 'one-file'
+    support_concurrent_reads = True
+
+    def __init__(self, filename='', **kargs):
+        self.filename = filename
+        BaseRawIO.__init__(self, **kargs)
+
+    def _source_name(self):
+        return self.filename
+
+    def _parse_header(self):
+        self._memmap = np.memmap(self.filename, dtype='uint8', mode='r')
+
+        index = None
+        if self.use_cache:
+            index = self._cache.get('index')
+        if index is None:
+            # this walks all blocks of the file
+            index = self._index_blocks()
+            if self.use_cache:
+                self.add_in_cache(index=index)
+
+        sig_channels = []
+        self._sig_blocks = []
+        self._sig_t_starts = []
+        for chan in index['channels']:
+            # data blocks of this channel
+            mask = index['data_channel'] == chan['m_numChannel']
+            data_pos = index['data_pos'][mask]
+            # for information about type 5 data block, see [1]
+            # -6 corresponds to the header of block 5, and the -2 take into
+            # account the fact that last 2 values are not available as the 4
+            # corresponding bytes are coding the time stamp of the beginning
+            # of the block
+            counts = (index['data_length'][mask].astype('int64') - 6) // 2 - 2
+            if np.sum(counts) <= 0:
+                continue
+
+            # WARNING: blocks are read supposing that they are all contiguous
+            # and sorted in time. I don't know if it's always the case.
+            # Maybe we should use the time stamp of each data block.
+            start_index, = struct.unpack_from('<l', self._memmap,
+                                              int(data_pos[0] + 6 + counts[0] * 2))
+            # sample rate seems to be given in kHz
+            sampling_rate = chan['m_SampleRate'] * 1000.
+            self._sig_t_starts.append(start_index / sampling_rate)
+            # position of the samples and index of the first sample of each block
+            self._sig_blocks.append((data_pos + 6, counts,
+                                     np.concatenate([[0], np.cumsum(counts)])))
+
+            name = chan['m_Name']
+            chan_id = chan['m_numChannel']
+            units = ''
+            gain = 1.
+            offset = 0.
+            group_id = len(sig_channels)
+            sig_channels.append((name, chan_id, sampling_rate, 'int16',
+                                 units, gain, offset, group_id))
+        sig_channels = np.array(sig_channels, dtype=_signal_channel_dtype)
+
+        # No events
+        event_channels = []
+        event_channels = np.array(event_channels, dtype=_event_channel_dtype)
+
+        # No spikes
+        unit_channels = []
+        unit_channels = np.array(unit_channels, dtype=_unit_channel_dtype)
+
+        if len(sig_channels) > 0:
+            t_stops = [t_start + blocks[2][-1] / sig_channels['sampling_rate'][c]
+                       for c, (t_start, blocks) in enumerate(zip(self._sig_t_starts,
+                                                                self._sig_blocks))]
+            self._t_start = min(self._sig_t_starts)
+            self._t_stop = max(t_stops)
+        else:
+            self._t_start, self._t_stop = 0., 0.
+
+        # fille into header dict
+        self.header = {}
+        self.header['nb_block'] = 1
+        self.header['nb_segment'] = [1]
+        self.header['signal_channels'] = sig_channels
+        self.header['unit_channels'] = unit_channels
+        self.header['event_channels'] = event_channels
+
+        # insert some annotation at some place
+        self._generate_minimal_annotations()
+        for c, chan in enumerate([chan for chan in index['channels'] if chan['has_data']]):
+            sig_ann = self.raw_annotations['blocks'][0]['segments'][0]['signals'][c]
+            sig_ann['channel_name'] = chan['m_Name']
+            sig_ann['channel_type'] = chan['type_subblock']
+
+        file_header = index['file_header']
+        if file_header is not None:
+            bl_ann = self.raw_annotations['blocks'][0]
+            seg_ann = bl_ann['segments'][0]
+            # the 10000 is here to convert m_time_hsecond from centisecond
+            # to microsecond
+            rec_datetime = datetime.datetime(
+                file_header['m_date_year'], file_header['m_date_month'],
+                file_header['m_date_day'], file_header['m_time_hour'],
+                file_header['m_time_minute'], file_header['m_time_second'],
+                10000 * file_header['m_time_hsecond'])
+            for ann in (bl_ann, seg_ann):
+                ann['rec_datetime'] = rec_datetime
+                ann['alphamap_version'] = file_header['m_version']
+
+    def _index_blocks(self):
+        """
+        Walk all blocks of the file and return a dict with the header of the
+        file (block 'h'), the list of channels (blocks '2') and the position,
+        length and channel number of all data blocks of type 5 as numpy arrays.
+
+        NOTE: the word "block" is used here in the sense of the alpha-omega
+        specifications (ie a data chunk in the file), rather than in the sense
+        of the usual Block object in neo
+        """
+        buf = self._memmap
+        file_size = buf.size
+        file_header = None
+        channels = []
+        data_pos = []
+        data_length = []
+        data_channel = []
+
+        pos = 0  # position of the current block in the file
+        while pos + 4 <= file_size:
+            m_length, m_TypeBlock = struct.unpack_from('<Hcx', buf, pos)
+            m_TypeBlock = m_TypeBlock.decode('latin-1')
+
+            if m_TypeBlock == '5':
+                data_pos.append(pos)
+                data_length.append(m_length)
+                data_channel.append(struct.unpack_from('<h', buf, pos + 4)[0])
+            elif m_TypeBlock == 'h' and pos == 0:
+                file_header, _ = read_header(buf, pos + 4, TypeH_Header)
+            elif m_TypeBlock == '2':
+                chan, offset = read_header(buf, pos + 4, Type2_DefBlocksChannels)
+                if chan is not None:
+                    chan.update(self._read_channel_subblock(buf, offset, chan))
+                    channels.append(chan)
+
+            if m_length == 0:
+                # corrupted file
+                break
+            pos += m_length
+
+        index = {
+            'file_header': file_header,
+            'channels': channels,
+            'data_pos': np.array(data_pos, dtype='int64'),
+            'data_length': np.array(data_length, dtype='int64'),
+            'data_channel': np.array(data_channel, dtype='int64'),
+        }
+        for chan in channels:
+            counts = (index['data_length'][index['data_channel'] == chan['m_numChannel']] -
+                      6) // 2 - 2
+            chan['has_data'] = bool(np.sum(counts) > 0)
+        return index
+
+    def _read_channel_subblock(self, buf, offset, chan):
+        # The beginning of the block of type '2' is identical for
+        # all types of channels, but the following part depends on
+        # the type of channel. So we need a special case here.
+
+        # WARNING: How to check the type of channel is not
+        # described in the documentation. So here I use what is
+        # proposed in the C code [2].
+        # According to this C code, it seems that the 'm_isAnalog'
+        # is used to distinguished analog and digital channels, and
+        # 'm_Mode' encodes the type of analog channel:
+        # 0 for continuous, 1 for level, 2 for external trigger.
+        # But in some files, I found channels that seemed to be
+        # continuous channels with 'm_Modes' = 128 or 192. So I
+        # decided to consider every channel with 'm_Modes'
+        # different from 1 or 2 as continuous. I also couldn't
+        # check that values of 1 and 2 are really for level and
+        # external trigger as I had no test files containing data
+        # of this types.
+        type_subblock = 'unknown_channel_type(m_Mode=' + str(chan['m_Mode']) + ')'
+        description = Type2_SubBlockUnknownChannels
+        if chan['m_isAnalog'] == 0:
+            # digital channel
+            type_subblock = 'digital'
+            description = Type2_SubBlockDigitalChannels
+        elif chan['m_isAnalog'] == 1:
+            # analog channel
+            if chan['m_Mode'] == 1:
+                # level channel
+                type_subblock = 'level'
+                description = Type2_SubBlockLevelChannels
+            elif chan['m_Mode'] == 2:
+                # external trigger channel
+                type_subblock = 'external_trigger'
+                description = Type2_SubBlockExtTriggerChannels
+            else:
+                # continuous channel
+                type_subblock = 'continuous(Mode' + str(chan['m_Mode']) + ')'
+                description = Type2_SubBlockContinuousChannels
+
+        subblock, _ = read_header(buf, offset, description)
+        if subblock is None:
+            subblock = {}
+        subblock.setdefault('m_Name', 'unknown_name')
+        subblock['type_subblock'] = type_subblock
+        return subblock
+
+    def _segment_t_start(self, block_index, seg_index):
+        return self._t_start
+
+    def _segment_t_stop(self, block_index, seg_index):
+        return self._t_stop
+
+    def get_group_channel_indexes(self):
+        # each channel is its own group, in the order of the channels in the file
+        return [np.array([c]) for c in range(self.header['signal_channels'].size)]
+
+    def _channel_index(self, channel_indexes):
+        # each channel is in its own group so only one channel is read at once
+        if channel_indexes is None:
+            return 0
+        return np.arange(self.header['signal_channels'].size)[channel_indexes][0]
+
+    def _get_signal_size(self, block_index, seg_index, channel_indexes):
+        return int(self._sig_blocks[self._channel_index(channel_indexes)][2][-1])
+
+    def _get_signal_t_start(self, block_index, seg_index, channel_indexes):
+        return self._sig_t_starts[self._channel_index(channel_indexes)]
+
+    def _get_analogsignal_chunk(self, block_index, seg_index, i_start, i_stop, channel_indexes):
+        samples_pos, counts, first_samples = self._sig_blocks[self._channel_index(channel_indexes)]
+
+        if i_start is None:
+            i_start = 0
+        if i_stop is None:
+            i_stop = int(first_samples[-1])
+
+        # data blocks overlapping i_start:i_stop
+        b0 = max(np.searchsorted(first_samples, i_start, side='right') - 1, 0)
+        b1 = np.searchsorted(first_samples, i_stop, side='left')
+        pieces = []
+        for b in range(b0, b1):
+            sl0 = max(i_start - first_samples[b], 0)
+            sl1 = min(i_stop - first_samples[b], counts[b])
+            if sl1 <= sl0:
+                continue
+            p = int(samples_pos[b])
+            pieces.append(self._memmap[p + 2 * sl0:p + 2 * sl1].view('<i2'))
+
+        if len(pieces) == 0:
+            raw_signals = np.zeros(0, dtype='int16')
+        elif len(pieces) == 1:
+            raw_signals = pieces[0]
+        else:
+            raw_signals = np.concatenate(pieces)
+        return raw_signals[:, None]
+
+
+def read_header(buf, offset, description):
+    """
+    Read a header of the given description at offset of the buffer.
+    Return the dict of the header (None if the buffer is too short) and the
+    offset after the header.
+    """
+    d = {}
+    for key, fmt in description:
+        fmt = '<' + fmt  # insures use of standard sizes
+        size = struct.calcsize(fmt)
+        if offset + size > buf.size:
+            return None, offset
+        val = list(struct.unpack_from(fmt, buf, offset))
+        offset += size
+        for i, ival in enumerate(val):
+            if isinstance(ival, bytes):
+                val[i] = ival.split(b'\x00', 1)[0].decode('latin-1')
+        if len(val) == 1:
+            val = val[0]
+        d[key] = val
+    return d, offset
+
+
+"""
+Information for special types in [1]:
+
+_dostime_t type definition:
+struct dos_time_t
+{
+ unsigned char hour; /* hours (0-23)*/
+ unsigned char minute; /* minutes (0-59)*/
+ unsigned char second; /* seconds (0-59) */
+ unsigned char hsecond; /* seconds/ 100 (0-99)*/
+}
+
+_dosdate_t type definition:
+struct _dosdate_t
+{
+ unsigned char day;       /* day of month( 1-31) */
+ unsigned char month;     /* month (1-12) */
+ unsigned int year;       /* year (1980-2099) */
+ unsigned char dayofweek; /* day of week (0 = Sunday) */
+}
+
+WINDOWPLACEMENT16 type definition (according to WINE source code):
+typedef struct
+{
+    UINT16   length;
+    UINT16   flags;
+    UINT16   showCmd;
+    POINT16  ptMinPosition;
+    POINT16  ptMaxPosition;
+    RECT16   rcNormalPosition;
+} WINDOWPLACEMENT16,*LPNONCLIENTMETRICS16;
+
+"""
+
+max_string_len = '32s'  # maximal length of variable length strings in the file
+# WARNING: I don't know what is the real value here. According to [1] p 139
+# it seems that it could be 20. Some tests would be needed to check this.
+
+# WARNING: A cleaner way to handle strings reading is suitable. Currently I
+# read a buffer of max_string_len bytes and look for the C "end of string"
+# character ('\x00'). It would be better either to read characters until
+# reaching '\x00' or to read the exact number of characters needed, if the
+# length of a string can be deduced from the lentgh of the block and the number
+# of bytes already read (it seems possible, at least for certain block types).
+
+# WARNING: Some test files contains data blocks of type 'b' and they are not
+# described in the documentation.
+
+# The name of the keys in the folowing dicts are chosen to match as closely as
+# possible the names in document [1]
+
+TypeH_Header = [
+    ('m_nextBlock', 'l'),
+    ('m_version', 'h'),
+    ('m_time_hour', 'B'),
+    ('m_time_minute', 'B'),
+    ('m_time_second', 'B'),
+    ('m_time_hsecond', 'B'),
+    ('m_date_day', 'B'),
+    ('m_date_month', 'B'),
+    ('m_date_year', 'H'),
+    ('m_date_dayofweek', 'B'),
+    ('blank', 'x'),  # one byte blank because of the 2 bytes alignement
+    ('m_MinimumTime', 'd'),
+    ('m_MaximumTime', 'd')]
+
+Type0_SetBoards = [
+    ('m_nextBlock', 'l'),
+    ('m_BoardCount', 'h'),
+    ('m_GroupCount', 'h'),
+    ('m_placeMainWindow', 'x')]  # WARNING: unknown type ('x' is wrong)
+
+Type1_Boards = [  # WARNING: needs to be checked
+    ('m_nextBlock', 'l'),
+    ('m_Number', 'h'),
+    ('m_countChannel', 'h'),
+    ('m_countAnIn', 'h'),
+    ('m_countAnOut', 'h'),
+    ('m_countDigIn', 'h'),
+    ('m_countDigOut', 'h'),
+    ('m_TrigCount', 'h'),  # not defined in 5.3.3 but appears in 5.5.1 and
+    # seems to really exist in files
+    # WARNING: check why 'm_TrigCount is not in the C code [2]
+    ('m_Amplitude', 'f'),
+    ('m_cSampleRate', 'f'),  # sample rate seems to be given in kHz
+    ('m_Duration', 'f'),
+    ('m_nPreTrigmSec', 'f'),
+    ('m_nPostTrigmSec', 'f'),
+    ('m_TrgMode', 'h'),
+    ('m_LevelValue', 'h'),  # after this line, 5.3.3 is wrong,
+    # check example in 5.5.1 for the right fields
+    # WARNING: check why the following part is not corrected in the C code [2]
+    ('m_nSamples', 'h'),
+    ('m_fRMS', 'f'),
+    ('m_ScaleFactor', 'f'),
+    ('m_DapTime', 'f'),
+    ('m_nameBoard', max_string_len)]
+# ('m_DiscMaxValue','h'), # WARNING: should this exist?
+# ('m_DiscMinValue','h') # WARNING: should this exist?
+
+Type2_DefBlocksChannels = [
+    # common parameters for all types of channels
+    ('m_nextBlock', 'l'),
+    ('m_isAnalog', 'h'),
+    ('m_isInput', 'h'),
+    ('m_numChannel', 'h'),
+    ('m_numColor', 'h'),
+    ('m_Mode', 'h')]
+
+Type2_SubBlockContinuousChannels = [
+    # continuous channels parameters
+    ('blank', '2x'),  # WARNING: this is not in the specs but it seems needed
+    ('m_Amplitude', 'f'),
+    ('m_SampleRate', 'f'),
+    ('m_ContBlkSize', 'h'),
+    ('m_ModeSpike', 'h'),  # WARNING: the C code [2] uses usigned short here
+    ('m_Duration', 'f'),
+    ('m_bAutoScale', 'h'),
+    ('m_Name', max_string_len)]
+
+Type2_SubBlockLevelChannels = [  # WARNING: untested
+    # level channels parameters
+    ('m_Amplitude', 'f'),
+    ('m_SampleRate', 'f'),
+    ('m_nSpikeCount', 'h'),
+    ('m_ModeSpike', 'h'),
+    ('m_nPreTrigmSec', 'f'),
+    ('m_nPostTrigmSec', 'f'),
+    ('m_LevelValue', 'h'),
+    ('m_TrgMode', 'h'),
+    ('m_YesRms', 'h'),
+    ('m_bAutoScale', 'h'),
+    ('m_Name', max_string_len)]
+
+Type2_SubBlockExtTriggerChannels = [  # WARNING: untested
+    # external trigger channels parameters
+    ('m_Amplitude', 'f'),
+    ('m_SampleRate', 'f'),
+    ('m_nSpikeCount', 'h'),
+    ('m_ModeSpike', 'h'),
+    ('m_nPreTrigmSec', 'f'),
+    ('m_nPostTrigmSec', 'f'),
+    ('m_TriggerNumber', 'h'),
+    ('m_Name', max_string_len)]
+
+Type2_SubBlockDigitalChannels = [
+    # digital channels parameters
+    ('m_SampleRate', 'f'),
+    ('m_SaveTrigger', 'h'),
+    ('m_Duration', 'f'),
+    ('m_PreviousStatus', 'h'),  # WARNING: check difference with C code here
+    ('m_Name', max_string_len)]
+
+Type2_SubBlockUnknownChannels = [
+    # WARNING: We have a mode that doesn't appear in our spec, so we don't
+    # know what are the fields.
+    # It seems that for non-digital channels the beginning is
+    # similar to continuous channels. Let's hope we're right...
+    ('blank', '2x'),
+    ('m_Amplitude', 'f'),
+    ('m_SampleRate', 'f')]
+# there are probably other fields after...
+
+Type6_DefBlockTrigger = [  # WARNING: untested
+    ('m_nextBlock', 'l'),
+    ('m_Number', 'h'),
+    ('m_countChannel', 'h'),
+    ('m_StateChannels', 'i'),
+    ('m_numChannel1', 'h'),
+    ('m_numChannel2', 'h'),
+    ('m_numChannel3', 'h'),
+    ('m_numChannel4', 'h'),
+    ('m_numChannel5', 'h'),
+    ('m_numChannel6', 'h'),
+    ('m_numChannel7', 'h'),
+    ('m_numChannel8', 'h'),
+    ('m_Name', 'c')]
+
+Type3_DefBlockGroup = [  # WARNING: untested
+    ('m_nextBlock', 'l'),
+    ('m_Number', 'h'),
+    ('m_Z_Order', 'h'),
+    ('m_countSubGroups', 'h'),
+    ('m_placeGroupWindow', 'x'),  # WARNING: unknown type ('x' is wrong)
+    ('m_NetLoc', 'h'),
+    ('m_locatMax', 'x'),  # WARNING: unknown type ('x' is wrong)
+    ('m_nameGroup', 'c')]
+
+Type4_DefBlockSubgroup = [  # WARNING: untested
+    ('m_nextBlock', 'l'),
+    ('m_Number', 'h'),
+    ('m_TypeOverlap', 'h'),
+    ('m_Z_Order', 'h'),
+    ('m_countChannel', 'h'),
+    ('m_NetLoc', 'h'),
+    ('m_location', 'x'),  # WARNING: unknown type ('x' is wrong)
+    ('m_bIsMaximized', 'h'),
+    ('m_numChannel1', 'h'),
+    ('m_numChannel2', 'h'),
+    ('m_numChannel3', 'h'),
+    ('m_numChannel4', 'h'),
+    ('m_numChannel5', 'h'),
+    ('m_numChannel6', 'h'),
+    ('m_numChannel7', 'h'),
+    ('m_numChannel8', 'h'),
+    ('m_Name', 'c')]
+
+Type5_DataBlockOneChannel = [
+    ('m_numChannel', 'h')]
+# WARNING: 'm_numChannel' (called 'm_Number' in 5.4.1 of [1]) is supposed
+# to be uint according to 5.4.1 but it seems to be a short in the files
+# (or should it be ushort ?)
+
+# WARNING: In 5.1.1 page 121 of [1], they say "Note: 5 is used for demo
+# purposes, 7 is used for real data", but looking at some real datafiles,
+# it seems that block of type 5 are also used for real data...
+
+Type7_DataBlockMultipleChannels = [  # WARNING: unfinished
+    ('m_lenHead', 'h'),  # WARNING: unknown true type
+    ('FINT', 'h')]
+# WARNING: there should be data after...
+
+TypeP_DefBlockPeriStimHist = [  # WARNING: untested
+    ('m_Number_Chan', 'h'),
+    ('m_Position', 'x'),  # WARNING: unknown type ('x' is wrong)
+    ('m_isStatVisible', 'h'),
+    ('m_DurationSec', 'f'),
+    ('m_Rows', 'i'),
+    ('m_DurationSecPre', 'f'),
+    ('m_Bins', 'i'),
+    ('m_NoTrigger', 'h')]
+
+TypeF_DefBlockFRTachogram = [  # WARNING: untested
+    ('m_Number_Chan', 'h'),
+    ('m_Position', 'x'),  # WARNING: unknown type ('x' is wrong)
+    ('m_isStatVisible', 'h'),
+    ('m_DurationSec', 'f'),
+    ('m_AutoManualScale', 'i'),
+    ('m_Max', 'i')]
+
+TypeR_DefBlockRaster = [  # WARNING: untested
+    ('m_Number_Chan', 'h'),
+    ('m_Position', 'x'),  # WARNING: unknown type ('x' is wrong)
+    ('m_isStatVisible', 'h'),
+    ('m_DurationSec', 'f'),
+    ('m_Rows', 'i'),
+    ('m_NoTrigger', 'h')]
+
+TypeI_DefBlockISIHist = [  # WARNING: untested
+    ('m_Number_Chan', 'h'),
+    ('m_Position', 'x'),  # WARNING: unknown type ('x' is wrong)
+    ('m_isStatVisible', 'h'),
+    ('m_DurationSec', 'f'),
+    ('m_Bins', 'i'),
+    ('m_TypeScale', 'i')]
+
+Type8_MarkerBlock = [  # WARNING: untested
+    ('m_Number_Channel', 'h'),
+    ('m_Time', 'l')]  # WARNING: check what's the right type here.
+# It seems that the size of time_t type depends on the system typedef,
+# I put long here but I couldn't check if it is the right type
+
+Type9_ScaleBlock = [  # WARNING: untested
+    ('m_Number_Channel', 'h'),
+    ('m_Scale', 'f')]
+
+Type_Unknown = []
+
+dict_header_type = {
+    'h': TypeH_Header,
+    '0': Type0_SetBoards,
+    '1': Type1_Boards,
+    '2': Type2_DefBlocksChannels,
+    '6': Type6_DefBlockTrigger,
+    '3': Type3_DefBlockGroup,
+    '4': Type4_DefBlockSubgroup,
+    '5': Type5_DataBlockOneChannel,
+    '7': Type7_DataBlockMultipleChannels,
+    'P': TypeP_DefBlockPeriStimHist,
+    'F': TypeF_DefBlockFRTachogram,
+    'R': TypeR_DefBlockRaster,
+    'I': TypeI_DefBlockISIHist,
+    '8': Type8_MarkerBlock,
+    '9': Type9_ScaleBlock
+}
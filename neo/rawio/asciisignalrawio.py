@@ -0,0 +1,340 @@
+# -*- coding: utf-8 -*-
+"""
+Class for reading analog signals in a text file, one column for each signal.
+
+The file is read by blocks of block_size bytes with read_text_blocks() and
+the numbers of each block are converted at once. The blocks are gathered in a
+RowBuffer, so reading a big file only needs the memory of the float32 signals
+and of one block. neo.io.NestIO reads its text files with them too.
+
+One column can hold the times of the samples, the sampling rate and t_start
+are then computed from it. The times are also kept in float64, float32 is too
+coarse to check that the samples are equally spaced.
+
+With signals_cache_path ('home', 'same_as_resource' or a dirname) the parsed
+signals (and times) are written once in .npy files, next to the file like the
+rawio cache, which are then read with a memmap instead of parsing the text
+again.
+
+This class is used by neo.io.AsciiSignalIO for lazy loading, the reading of
+irregularly sampled signals and the metadata file are only available at
+neo.io level.
+
+Author: Samuel Garcia
+"""
+from __future__ import unicode_literals, print_function, division, absolute_import
+
+from .baserawio import (BaseRawIO, _signal_channel_dtype, _unit_channel_dtype,
+                        _event_channel_dtype)
+
+import numpy as np
+
+import hashlib
+import io
+import os
+import re
+import shutil
+
+
+# whitespaces of bytes.split()
+_BLANK = np.zeros(256, dtype=bool)
+_BLANK[list(bytearray(b' \t\n\r\x0b\x0c'))] = True
+
+_COMMENT = re.compile(b'#[^\n]*')
+
+
+def _count_values(text):
+    """
+    Return the number of whitespace separated values of each line of text.
+    """
+    chars = np.frombuffer(text, dtype='uint8')
+    blank = _BLANK[chars]
+    starts = ~blank
+    starts[1:] &= blank[:-1]
+    newlines = np.flatnonzero(chars == ord(b'\n'))
+    nb_line = newlines.size + (not text.endswith(b'\n'))
+    line_indexes = np.searchsorted(newlines, np.flatnonzero(starts))
+    return np.bincount(line_indexes, minlength=nb_line)
+
+
+def read_text_blocks(filename, delimiter=None, skiprows=0, dtype='float32',
+                     block_size=2 ** 24):
+    """
+    Read a delimited text file by blocks of block_size bytes and yield the
+    rows (2D array of dtype) of the complete lines of each block.
+
+    The numbers of a block are converted at once. As with numpy.loadtxt the
+    text after a '#' is a comment and blank lines are skipped. A block with
+    missing values or lines of other lengths is read with numpy.genfromtxt,
+    missing values are then nan. delimiter None means any whitespace.
+    """
+    # whitespaces are the separators of bytes.split()
+    sep = None
+    if delimiter is not None and delimiter.strip():
+        sep = delimiter.encode('latin-1')
+    nb_col = None
+    with open(filename, 'rb') as fid:
+        for _ in range(skiprows):
+            fid.readline()
+        rest = b''
+        while True:
+            data = fid.read(block_size)
+            if data:
+                text = rest + data
+                # the last line of the block is parsed with the next one
+                cut = text.rfind(b'\n') + 1
+                text, rest = text[:cut], text[cut:]
+            else:
+                text, rest = rest, b''
+            if b'#' in text:
+                text = _COMMENT.sub(b'', text)
+            spaced = text if sep is None else text.replace(sep, b' ')
+            values = spaced.split()
+            if len(values) > 0:
+                counts = _count_values(spaced)
+                if nb_col is None:
+                    nb_col = counts[counts > 0][0]
+                if np.all((counts == nb_col) | (counts == 0)):
+                    rows = np.array(values, dtype=dtype)
+                else:
+                    # missing values: the slow way
+                    rows = np.genfromtxt(io.BytesIO(text), dtype=dtype, delimiter=delimiter)
+                yield rows.reshape(-1, nb_col)
+            if not data:
+                break
+
+
+class RowBuffer(object):
+    """
+    Gather the rows of several blocks in one array.
+
+    The array is grown in place (by at least a factor 2), so the rows of all
+    the blocks are not held twice in memory as with a list of blocks and
+    numpy.concatenate().
+    """
+
+    def __init__(self):
+        self._data = None
+        self._nb_row = 0
+
+    def append(self, rows):
+        if self._data is None:
+            self._data = np.array(rows)
+        else:
+            nb_row = self._nb_row + rows.shape[0]
+            if nb_row > self._data.shape[0]:
+                size = max(2 * self._data.shape[0], nb_row)
+                self._data.resize((size, ) + self._data.shape[1:], refcheck=False)
+            self._data[self._nb_row:nb_row] = rows
+        self._nb_row += rows.shape[0]
+
+    def get_array(self, empty):
+        """
+        Return the rows, or the array empty when there were no blocks.
+        """
+        if self._data is None:
+            return empty
+        self._data.resize((self._nb_row, ) + self._data.shape[1:], refcheck=False)
+        data, self._data = self._data, None
+        return data
+
+
+class AsciiSignalRawIO(BaseRawIO):
+    """
+    Class for reading signals in a delimited text file.
+
+    Arguments:
+        delimiter : column delimiter, e.g. '\t', ' ', ',', ';'
+        usecols : None for all the columns or a list of the used columns
+        skiprows : number of lines of header to skip
+        timecolumn : None or the index (in the used columns) of the column
+                     of times, which is not a signal
+        sampling_rate : in Hz, ignored when timecolumn is not None
+        t_start : in s, ignored when timecolumn is not None
+        units : units of the signals
+        time_units : the time unit of the timecolumn in s
+        block_size : number of bytes parsed at once
+        signals_cache_path : None or where to save the parsed signals
+
+    When the times of the timecolumn are not equally spaced is_regular is
+    False and the header has the mean sampling rate, the times are then in
+    the timecolumn of get_table().
+    """
+    extensions = ['txt', 'asc', 'csv', 'tsv']
+    rawmode = 'one-file'
+    support_concurrent_reads = True
+
+    def __init__(self, filename='', delimiter='\t', usecols=None, skiprows=0,
+                 timecolumn=None, sampling_rate=1., t_start=0., units='V', time_units=1.,
+                 block_size=2 ** 24, signals_cache_path=None):
+        BaseRawIO.__init__(self)
+        self.filename = filename
+        self.delimiter = delimiter
+        self.usecols = usecols
+        self.skiprows = skiprows
+        self.timecolumn = timecolumn
+        self.sampling_rate = sampling_rate
+        self.t_start = t_start
+        self.units = units
+        self.time_units = time_units
+        self.block_size = block_size
+        self.signals_cache_path = signals_cache_path
+
+    def _source_name(self):
+        return self.filename
+
+    def _parse_header(self):
+        if self.signals_cache_path is None:
+            table, times = RowBuffer(), RowBuffer()
+            for rows, block_times in self._iter_blocks():
+                table.append(rows)
+                if block_times is not None:
+                    times.append(block_times)
+            self._table = table.get_array(np.zeros((0, 0), dtype='float32'))
+            if self.timecolumn is not None:
+                self._times = times.get_array(np.zeros(0))
+        else:
+            filename = self._signals_cache_filename()
+            times_filename = self._signals_cache_filename(kind='times')
+            if not os.path.exists(filename) or \
+                    (self.timecolumn is not None and not os.path.exists(times_filename)):
+                self.logger.warning('Create signals cache file {}'.format(filename))
+                self._write_signals_cache(filename, times_filename)
+            self._table = np.load(filename, mmap_mode='r')
+            if self.timecolumn is not None:
+                self._times = np.load(times_filename, mmap_mode='r')
+
+        nb_col = self._table.shape[1]
+        columns = np.arange(nb_col)
+        self.is_regular = True
+        if self.timecolumn is None:
+            sampling_rate = float(self.sampling_rate)
+            self._t_start = float(self.t_start)
+        else:
+            time_col = columns[self.timecolumn]
+            columns = columns[columns != time_col]
+            times = self._times
+            delta_t = np.diff(times)
+            mean_delta_t = np.mean(delta_t)
+            if (delta_t.max() - delta_t.min()) / mean_delta_t >= 1e-6:
+                self.is_regular = False
+            sampling_rate = 1. / (mean_delta_t * self.time_units)
+            self._t_start = float(times[0]) * self.time_units
+        self._signal_columns = columns
+
+        sig_channels = []
+        for c in columns:
+            sig_channels.append(('Column {}'.format(c), c, sampling_rate, 'float32',
+                                 self.units, 1., 0., 0))
+        sig_channels = np.array(sig_channels, dtype=_signal_channel_dtype)
+
+        # No events
+        event_channels = []
+        event_channels = np.array(event_channels, dtype=_event_channel_dtype)
+
+        # No spikes
+        unit_channels = []
+        unit_channels = np.array(unit_channels, dtype=_unit_channel_dtype)
+
+        # fille into header dict
+        self.header = {}
+        self.header['nb_block'] = 1
+        self.header['nb_segment'] = [1]
+        self.header['signal_channels'] = sig_channels
+        self.header['unit_channels'] = unit_channels
+        self.header['event_channels'] = event_channels
+
+        # insert some annotation at some place
+        self._generate_minimal_annotations()
+
+    def _iter_blocks(self):
+        """
+        Yield the rows of the file by blocks (2D float32, only the usecols)
+        and the float64 times of the timecolumn (None without timecolumn).
+        """
+        dtype = 'float32' if self.timecolumn is None else 'float64'
+        for rows in read_text_blocks(self.filename, delimiter=self.delimiter,
+                                     skiprows=self.skiprows, dtype=dtype,
+                                     block_size=self.block_size):
+            if self.usecols is not None:
+                rows = rows[:, self.usecols]
+            times = None
+            if self.timecolumn is not None:
+                times = rows[:, self.timecolumn].copy()
+                rows = rows.astype('float32')
+            yield rows, times
+
+    def _signals_cache_filename(self, kind='signals'):
+        # the name depends on the parameters used to parse the file
+        params = (self.delimiter, self.usecols, self.skiprows)
+        if kind == 'times':
+            params += (self.timecolumn, )
+        params = repr(params).encode('utf8')
+        return '{}_{}_{}.npy'.format(self._get_cache_filename(self.signals_cache_path),
+                                     kind, hashlib.md5(params).hexdigest()[:8])
+
+    def _write_signals_cache(self, filename, times_filename):
+        # the number of rows is only known at the end, so the rows are written
+        # in raw files which are then copied after the header of the .npy
+        raw_filename = filename + '.raw.tmp'
+        raw_times_filename = times_filename + '.raw.tmp'
+        nb_row, nb_col = 0, 0
+        with open(raw_filename, 'wb') as fid, open(raw_times_filename, 'wb') as times_fid:
+            for rows, times in self._iter_blocks():
+                rows.tofile(fid)
+                if times is not None:
+                    times.tofile(times_fid)
+                nb_row, nb_col = nb_row + rows.shape[0], rows.shape[1]
+        self._raw_to_npy(raw_filename, filename, 'float32', (nb_row, nb_col))
+        if self.timecolumn is None:
+            os.remove(raw_times_filename)
+        else:
+            self._raw_to_npy(raw_times_filename, times_filename, 'float64', (nb_row,))
+
+    def _raw_to_npy(self, raw_filename, filename, dtype, shape):
+        tmp_filename = filename + '.tmp'
+        with open(tmp_filename, 'wb') as fid, open(raw_filename, 'rb') as raw_fid:
+            header = {'descr': np.lib.format.dtype_to_descr(np.dtype(dtype)),
+                      'fortran_order': False, 'shape': shape}
+            np.lib.format.write_array_header_1_0(fid, header)
+            shutil.copyfileobj(raw_fid, fid, self.block_size)
+        os.remove(raw_filename)
+        # an interrupted write does not leave an incomplete file
+        os.rename(tmp_filename, filename)
+
+    def get_table(self, i_start=None, i_stop=None):
+        """
+        Return the rows i_start:i_stop of all the used columns, timecolumn
+        included (2D float32).
+        """
+        return self._table[i_start:i_stop]
+
+    def get_times(self, i_start=None, i_stop=None):
+        """
+        Return the times i_start:i_stop of the timecolumn (1D float64, in the
+        unit of the file), None without timecolumn.
+        """
+        if self.timecolumn is None:
+            return None
+        return self._times[i_start:i_stop]
+
+    def _segment_t_start(self, block_index, seg_index):
+        return self._t_start
+
+    def _segment_t_stop(self, block_index, seg_index):
+        sampling_rate = self.header['signal_channels']['sampling_rate']
+        if sampling_rate.size == 0:
+            return self._t_start
+        return self._t_start + self._table.shape[0] / sampling_rate[0]
+
+    def _get_signal_size(self, block_index, seg_index, channel_indexes):
+        return self._table.shape[0]
+
+    def _get_signal_t_start(self, block_index, seg_index, channel_indexes):
+        return self._t_start
+
+    def _get_analogsignal_chunk(self, block_index, seg_index, i_start, i_stop, channel_indexes):
+        if channel_indexes is None:
+            channel_indexes = slice(None)
+        columns = self._signal_columns[channel_indexes]
+        return self._table[i_start:i_stop][:, columns]
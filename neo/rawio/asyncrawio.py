@@ -0,0 +1,185 @@
+# -*- coding: utf-8 -*-
+"""
+asyncio interface for neo.rawio.
+
+The methods of a RawIO read files and block, so calling them from a
+coroutine blocks the event loop. `AsyncRawIO` wraps a RawIO and gives
+coroutine versions of the methods that read the file, which run the reads
+in a bounded pool of threads.
+
+Identical requests made at the same time (for instance by several viewers of
+the same recording) are read only once and share the result. A cancelled
+request is also cancelled in the pool if nobody else waits for it and it is
+not started yet.
+
+Usage:
+    >>> reader = AsyncRawIO(PlexonRawIO(filename='File_plexon_1.plx'),
+                            max_workers=4)
+    >>> await reader.parse_header()
+    >>> raw_chunk = await reader.get_analogsignal_chunk(block_index=0,
+                        seg_index=0, i_start=0, i_stop=1024)
+    >>> spike_timestamps = await reader.get_spike_timestamps(unit_index=0)
+    >>> await reader.close()
+
+The results of identical requests are the same objects, they must not be
+modified in place.
+
+When the RawIO does not support_concurrent_reads (it reads from a shared file
+handle) the reads are serialized with `concurrent_reads_lock()`, the event
+loop is still not blocked.
+
+This module requires Python >= 3.5.
+
+"""
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+import functools
+
+import numpy as np
+
+from .baserawio import concurrent_reads_lock
+
+# asyncio.get_running_loop is new in Python 3.7, before it get_event_loop
+# returns the running loop when called from a coroutine
+_get_running_loop = getattr(asyncio, 'get_running_loop', asyncio.get_event_loop)
+
+
+class AsyncRawIO(object):
+    """
+    Wrapper of a RawIO with coroutine versions of the methods reading data.
+
+    The other attributes and methods of the RawIO (header, rescale methods...)
+    are available on the wrapper as they are.
+
+    *Args*:
+        :rawio: the RawIO to wrap. Its reads are done by several threads at
+            the same time only if it supports it (support_concurrent_reads),
+            otherwise one at a time.
+        :max_workers: number of threads reading the file.
+        :executor: None or a concurrent.futures.Executor used instead of a new
+            pool of max_workers threads (it is not shut down by close()).
+    """
+
+    def __init__(self, rawio, max_workers=4, executor=None):
+        self.rawio = rawio
+        if executor is None:
+            self._executor = ThreadPoolExecutor(max_workers=max_workers)
+            self._own_executor = True
+        else:
+            self._executor = executor
+            self._own_executor = False
+        # request key -> [future, number of waiters]
+        self._inflight = {}
+
+    def __getattr__(self, name):
+        # only called for attributes not found on the wrapper
+        if name == 'rawio':
+            raise AttributeError(name)
+        return getattr(self.rawio, name)
+
+    def __repr__(self):
+        return 'AsyncRawIO({!r})'.format(self.rawio)
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        await self.close()
+
+    async def close(self):
+        """Shut down the pool of threads (if it is not given at __init__)."""
+        if self._own_executor:
+            await _get_running_loop().run_in_executor(
+                None, functools.partial(self._executor.shutdown, wait=True))
+
+    async def parse_header(self):
+        return await self._call('parse_header')
+
+    async def get_signal_size(self, block_index, seg_index, channel_indexes=None):
+        return await self._call('get_signal_size', block_index=block_index,
+                                seg_index=seg_index, channel_indexes=channel_indexes)
+
+    async def get_analogsignal_chunk(self, block_index=0, seg_index=0, i_start=None,
+                                     i_stop=None, channel_indexes=None, channel_names=None,
+                                     channel_ids=None):
+        return await self._call('get_analogsignal_chunk', block_index=block_index,
+                                seg_index=seg_index, i_start=i_start, i_stop=i_stop,
+                                channel_indexes=channel_indexes, channel_names=channel_names,
+                                channel_ids=channel_ids)
+
+    async def spike_count(self, block_index=0, seg_index=0, unit_index=0):
+        return await self._call('spike_count', block_index=block_index, seg_index=seg_index,
+                                unit_index=unit_index)
+
+    async def get_spike_timestamps(self, block_index=0, seg_index=0, unit_index=0,
+                                   t_start=None, t_stop=None):
+        return await self._call('get_spike_timestamps', block_index=block_index,
+                                seg_index=seg_index, unit_index=unit_index,
+                                t_start=t_start, t_stop=t_stop)
+
+    async def get_spike_raw_waveforms(self, block_index=0, seg_index=0, unit_index=0,
+                                      t_start=None, t_stop=None):
+        return await self._call('get_spike_raw_waveforms', block_index=block_index,
+                                seg_index=seg_index, unit_index=unit_index,
+                                t_start=t_start, t_stop=t_stop)
+
+    async def event_count(self, block_index=0, seg_index=0, event_channel_index=0):
+        return await self._call('event_count', block_index=block_index, seg_index=seg_index,
+                                event_channel_index=event_channel_index)
+
+    async def get_event_timestamps(self, block_index=0, seg_index=0, event_channel_index=0,
+                                   t_start=None, t_stop=None):
+        return await self._call('get_event_timestamps', block_index=block_index,
+                                seg_index=seg_index, event_channel_index=event_channel_index,
+                                t_start=t_start, t_stop=t_stop)
+
+    def inflight_count(self):
+        """Number of distinct requests being read."""
+        return len(self._inflight)
+
+    async def _call(self, method_name, **kargs):
+        """
+        Run the method of the rawio in the pool, or wait for the identical
+        request already running.
+        """
+        key = (method_name,) + tuple(sorted((k, _hashable(v)) for k, v in kargs.items()))
+        entry = self._inflight.get(key)
+        if entry is None:
+            func = functools.partial(_call_locked, concurrent_reads_lock(self.rawio),
+                                     getattr(self.rawio, method_name), kargs)
+            future = _get_running_loop().run_in_executor(self._executor, func)
+            entry = [future, 0]
+            self._inflight[key] = entry
+
+            def forget(future):
+                if self._inflight.get(key) is entry:
+                    del self._inflight[key]
+            future.add_done_callback(forget)
+
+        future = entry[0]
+        entry[1] += 1
+        try:
+            # shield: a cancelled waiter does not cancel the other waiters
+            return await asyncio.shield(future)
+        finally:
+            entry[1] -= 1
+            if entry[1] == 0 and not future.done():
+                # nobody waits anymore
+                future.cancel()
+
+
+def _call_locked(lock, method, kargs):
+    with lock:
+        return method(**kargs)
+
+
+def _hashable(v):
+    """
+    Return a hashable version of an argument (channel_indexes can be a list,
+    an array or a slice).
+    """
+    if isinstance(v, slice):
+        return ('slice', v.start, v.stop, v.step)
+    if isinstance(v, (list, tuple, np.ndarray)):
+        return tuple(np.asarray(v).tolist())
+    return v
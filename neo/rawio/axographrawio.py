@@ -224,6 +224,7 @@ class AxographRawIO(BaseRawIO):
     description = 'This IO reads .axgd/.axgx files created with AxoGraph'
     extensions = ['axgd', 'axgx']
     rawmode = 'one-file'
+    support_concurrent_reads = True
 
     def __init__(self, filename, force_single_segment=False):
         BaseRawIO.__init__(self)
@@ -53,6 +53,7 @@ import numpy as np
 class AxonRawIO(BaseRawIO):
     extensions = ['abf']
     rawmode = 'one-file'
+    support_concurrent_reads = True
 
     def __init__(self, filename=''):
         BaseRawIO.__init__(self)
@@ -43,12 +43,16 @@ or vector can be store somewhere (near the fiel, /tmp, any path)
 # from __future__ import unicode_literals, print_function, division, absolute_import
 from __future__ import print_function, division, absolute_import
 
+import hashlib
 import logging
 import numpy as np
 import os
 import sys
+import threading
 
 from neo import logging_handler
+from .chunkcache import ChunkCache
+from .envelope import SignalEnvelope, compute_bins, bins_to_envelope
 
 try:
     import joblib
@@ -104,6 +108,23 @@ class BaseRawIO(object):
 
     rawmode = None  # one key in possible_raw_modes
 
+    # True when the data methods can be called from several threads at the same time,
+    # for instance because the data are read through np.memmap or from memory.
+    # RawIOs reading from a shared file handle must keep False.
+    # Everything reading from other threads follows it: BaseFromRaw (max_workers)
+    # reads serially when it is False, PrefetchRawIO and AsyncRawIO hold
+    # concurrent_reads_lock(rawio) around each read, so their reads are serialized.
+    support_concurrent_reads = False
+
+    # ChunkCache given by enable_chunk_cache()
+    _chunk_cache = None
+    # SignalEnvelope by (block_index, seg_index, group_index) given by
+    # build_analogsignal_envelope()
+    _envelopes = None
+    # memmap of the channel contiguous signals by (block_index, seg_index, group_index)
+    # given by build_transposed_signals() or found next to the file at the first read
+    _transposed = None
+
     def __init__(self, use_cache=False, cache_path='same_as_resource', **kargs):
         """
 
@@ -482,11 +503,335 @@ class BaseRawIO(object):
         if self._several_channel_groups:
             self._check_common_characteristics(channel_indexes)
 
-        raw_chunk = self._get_analogsignal_chunk(
-            block_index, seg_index, i_start, i_stop, channel_indexes)
+        transposed = self._get_transposed_signals(block_index, seg_index, i_start, i_stop,
+                                                  channel_indexes)
+        if transposed is not None:
+            raw_chunk = transposed
+        elif self._chunk_cache is None:
+            raw_chunk = self._get_analogsignal_chunk(
+                block_index, seg_index, i_start, i_stop, channel_indexes)
+        else:
+            raw_chunk = self._get_cached_analogsignal_chunk(
+                block_index, seg_index, i_start, i_stop, channel_indexes)
 
         return raw_chunk
 
+    def enable_chunk_cache(self, max_bytes=100 * 1024 ** 2, chunk_size=2 ** 16):
+        """
+        Keep in memory the decoded chunks of signals read by
+        `get_analogsignal_chunk()`, so reading again the same region
+        (scrolling in a viewer for instance) does not decode it again.
+
+        Chunks contain chunk_size samples of all channels of a channel group,
+        the least recently used ones are dropped above max_bytes.
+        This is only useful for formats that are slow to decode: for formats
+        read with a memmap the chunks are copied in memory for nothing.
+
+        The returned chunks are read only.
+        """
+        self._chunk_cache = ChunkCache(max_bytes=max_bytes, chunk_size=chunk_size)
+
+    def disable_chunk_cache(self):
+        self._chunk_cache = None
+
+    def clear_chunk_cache(self):
+        if self._chunk_cache is not None:
+            self._chunk_cache.clear()
+
+    def chunk_cache_stats(self):
+        """
+        Return the hits/misses/evictions statistics of the chunk cache (see
+        `ChunkCache.stats()`) or None if it is not enabled.
+        """
+        if self._chunk_cache is None:
+            return None
+        return self._chunk_cache.stats()
+
+    def build_transposed_signals(self, cache_path='same_as_resource', max_channels=4,
+                                 min_samples=2 ** 16, chunk_size=2 ** 20):
+        """
+        Write a copy of the signals with the samples of each channel contiguous
+        (one .npy file for each segment and channel group, next to the file
+        like the rawio cache) or use it if it already exists.
+
+        Then `get_analogsignal_chunk()` reads from this copy (memmap) the
+        requests of at most max_channels channels and at least min_samples
+        samples. This is useful for formats with interleaved samples, where
+        reading one channel touches all the file.
+
+        The copy is written by chunks of chunk_size samples.
+
+        A copy written before next to the file is also used without calling
+        this, with the default max_channels and min_samples.
+        """
+        self._transposed = self._load_transposed_signals(cache_path, chunk_size)
+        self._transposed_limits = (max_channels, min_samples)
+
+    def _load_transposed_signals(self, cache_path, chunk_size=None):
+        """
+        Return the memmaps of the transposed copies by (block_index, seg_index,
+        group_index). The missing copies are written when chunk_size is given
+        and skipped otherwise.
+        """
+        prefix = self._get_cache_filename(cache_path) + '_transposed'
+        transposed = {}
+        for block_index in range(self.block_count()):
+            for seg_index in range(self.segment_count(block_index)):
+                for channel_indexes in self.get_group_channel_indexes():
+                    group_index, _, _ = self._get_channel_group(channel_indexes)
+                    filename = '{}_{}_{}_{}.npy'.format(prefix, block_index, seg_index,
+                                                        group_index)
+                    if not os.path.exists(filename):
+                        if chunk_size is None:
+                            continue
+                        self.logger.warning('Create transposed file {}'.format(filename))
+                        self._write_transposed_signals(filename, block_index, seg_index,
+                                                       channel_indexes, chunk_size)
+                    transposed[block_index, seg_index, group_index] = np.load(filename,
+                                                                             mmap_mode='r')
+        return transposed
+
+    def _find_transposed_signals(self):
+        """
+        Look for the transposed copies written next to the file by an other
+        instance, once at the first read.
+        """
+        try:
+            ressource_name = self._get_ressource_name()
+        except NotImplementedError:
+            ressource_name = None
+        if isinstance(ressource_name, str) and os.path.exists(ressource_name):
+            transposed = self._load_transposed_signals('same_as_resource')
+        else:
+            # no ressource on disk to name the copy
+            transposed = {}
+        if transposed:
+            self.logger.warning('Use existing transposed files')
+        self._transposed = transposed
+        # max_channels and min_samples of build_transposed_signals()
+        self._transposed_limits = (4, 2 ** 16)
+
+    def _write_transposed_signals(self, filename, block_index, seg_index, channel_indexes,
+                                  chunk_size):
+        size = self.get_signal_size(block_index, seg_index, channel_indexes)
+        sig_channels = self.header['signal_channels']
+        if channel_indexes is not None:
+            sig_channels = sig_channels[channel_indexes]
+        tmp_filename = filename + '.tmp'
+        transposed = np.lib.format.open_memmap(tmp_filename, mode='w+',
+                                               dtype=np.dtype(sig_channels['dtype'][0]),
+                                               shape=(sig_channels.size, size))
+        for i_start in range(0, size, chunk_size):
+            i_stop = min(i_start + chunk_size, size)
+            transposed[:, i_start:i_stop] = self._get_analogsignal_chunk(
+                block_index, seg_index, i_start, i_stop, channel_indexes).T
+        transposed.flush()
+        del transposed
+        # an interrupted write does not leave an incomplete file
+        os.rename(tmp_filename, filename)
+
+    def _get_transposed_signals(self, block_index, seg_index, i_start, i_stop, channel_indexes):
+        """
+        Return the chunk read from the transposed copy of the signals, or None
+        when the request must be read from the file.
+        """
+        if self._transposed is None:
+            if self.signal_channels_count() == 0:
+                return None
+            self._find_transposed_signals()
+        if not self._transposed:
+            return None
+        max_channels, min_samples = self._transposed_limits
+        if channel_indexes is None:
+            nb_channel = self.signal_channels_count()
+        else:
+            nb_channel = len(np.arange(self.signal_channels_count())[channel_indexes])
+        if nb_channel > max_channels:
+            return None
+
+        group_index, _, local_indexes = self._get_channel_group(channel_indexes)
+        transposed = self._transposed.get((block_index, seg_index, group_index))
+        if transposed is None:
+            return None
+        if i_start is None:
+            i_start = 0
+        if i_stop is None:
+            i_stop = transposed.shape[1]
+        if i_stop - i_start < min_samples:
+            return None
+        if local_indexes is None:
+            local_indexes = slice(None)
+        return transposed[local_indexes, i_start:i_stop].T
+
+    def build_analogsignal_envelope(self, cache_path=None, min_decimation=2 ** 10,
+                                    with_mean=False, chunk_size=2 ** 20):
+        """
+        Build the envelope pyramid (min/max, and mean/RMS when with_mean) of all
+        signals of all segments used by `get_analogsignal_envelope()`.
+
+        The signals are read once by chunks of chunk_size samples. The levels
+        of the pyramid are bins of min_decimation, 2 * min_decimation, ...
+        samples.
+
+        When cache_path is not None ('home', 'same_as_resource' or a dirname)
+        the pyramid is saved like the rawio cache and is loaded instead of
+        being built again when it exists with the same parameters.
+        """
+        params = dict(min_decimation=int(min_decimation), with_mean=with_mean)
+        filename = None
+        if cache_path is not None:
+            filename = self._get_cache_filename(cache_path) + '_envelope'
+            if os.path.exists(filename):
+                assert HAVE_JOBLIB, 'You need to install joblib for cache'
+                saved = joblib.load(filename)
+                if saved['params'] == params:
+                    self.logger.warning('Use existing envelope file {}'.format(filename))
+                    self._envelopes = saved['envelopes']
+                    return
+
+        # read chunks of whole bins
+        chunk_size = max(chunk_size // min_decimation, 1) * min_decimation
+        envelopes = {}
+        for block_index in range(self.block_count()):
+            for seg_index in range(self.segment_count(block_index)):
+                for channel_indexes in self.get_group_channel_indexes():
+                    group_index, _, _ = self._get_channel_group(channel_indexes)
+                    if channel_indexes is None:
+                        nb_channel = self.signal_channels_count()
+                    else:
+                        nb_channel = len(channel_indexes)
+                    envelope = SignalEnvelope(nb_channel, **params)
+                    size = self.get_signal_size(block_index, seg_index, channel_indexes)
+                    for i_start in range(0, size, chunk_size):
+                        envelope.feed(self.get_analogsignal_chunk(
+                            block_index, seg_index, i_start, min(i_start + chunk_size, size),
+                            channel_indexes))
+                    envelope.finalize()
+                    envelopes[block_index, seg_index, group_index] = envelope
+        self._envelopes = envelopes
+
+        if filename is not None:
+            assert HAVE_JOBLIB, 'You need to install joblib for cache'
+            self.logger.warning('Create envelope file {}'.format(filename))
+            joblib.dump(dict(params=params, envelopes=envelopes), filename)
+
+    def get_analogsignal_envelope(self, block_index=0, seg_index=0, t_start=None, t_stop=None,
+                                  n_pixels=1000, channel_indexes=None, channel_names=None,
+                                  channel_ids=None):
+        """
+        Return (times, envelope) of the signal between t_start and t_stop (in
+        seconds, None for the limits of the signal) drawn on n_pixels.
+
+        times are the start times of between n_pixels and 2 * n_pixels bins
+        and envelope is a dict of 2D arrays (bins, channels): 'min' and 'max'
+        (and 'mean' and 'rms' if built with_mean) of the raw signal in each
+        bin. Use `rescale_signal_raw_to_float()` to get them in real units.
+        Bins are aligned on multiples of a power of 2 so the first and last
+        bins can contain samples outside t_start/t_stop.
+
+        It uses the pyramid of `build_analogsignal_envelope()` (built without
+        cache when needed), so it takes a time proportional to n_pixels.
+        When zoomed in (less than min_decimation samples by pixel) the
+        envelope is computed from the signal.
+        """
+        channel_indexes = self._get_channel_indexes(channel_indexes, channel_names, channel_ids)
+        if self._several_channel_groups:
+            self._check_common_characteristics(channel_indexes)
+        if self._envelopes is None:
+            self.build_analogsignal_envelope()
+
+        group_index, group_channels, local_indexes = self._get_channel_group(channel_indexes)
+        envelope = self._envelopes[block_index, seg_index, group_index]
+
+        sig_t_start = self.get_signal_t_start(block_index, seg_index, group_channels)
+        sr = self.get_signal_sampling_rate(group_channels)
+        size = envelope.size
+        i_start = 0 if t_start is None else int(np.clip((t_start - sig_t_start) * sr, 0, size))
+        i_stop = size if t_stop is None else int(np.clip((t_stop - sig_t_start) * sr, 0, size))
+        n_pixels = max(min(n_pixels, i_stop - i_start), 1)
+
+        result = envelope.query(i_start, i_stop, n_pixels)
+        if result is None:
+            # zoomed in: compute the bins from the signal
+            decimation = 2 ** int(np.log2(max((i_stop - i_start) / n_pixels, 1)))
+            bin_start = i_start // decimation
+            bin_stop = -(-i_stop // decimation)
+            raw_signal = self.get_analogsignal_chunk(
+                block_index, seg_index, bin_start * decimation,
+                min(bin_stop * decimation, size), group_channels)
+            bins = compute_bins(raw_signal, decimation, envelope.with_mean)
+            result = decimation, bin_start, bins_to_envelope(
+                bins, envelope._counts(decimation, bin_start, bin_stop))
+        decimation, bin_start, env = result
+
+        if local_indexes is not None:
+            env = {name: values[:, local_indexes] for name, values in env.items()}
+        nb_bin = env['min'].shape[0]
+        times = sig_t_start + (bin_start + np.arange(nb_bin)) * decimation / sr
+        return times, env
+
+    def _get_channel_group(self, channel_indexes):
+        """
+        Return (group_index, group_channels, local_indexes) of the channel
+        group containing channel_indexes: the group is identified by its
+        first channel (0 when there is only one group), group_channels are
+        the channel_indexes of the group (None when all channels) and
+        local_indexes the position of channel_indexes in the group.
+        """
+        if self._several_channel_groups:
+            all_channels = np.arange(self.signal_channels_count())
+            channel_indexes = all_channels[channel_indexes]
+            characteristics = self.header['signal_channels'][_common_sig_characteristics]
+            group_channels, = np.nonzero(characteristics == characteristics[channel_indexes[0]])
+            group_index = int(group_channels[0])
+            local_indexes = np.searchsorted(group_channels, channel_indexes)
+        else:
+            group_index = 0
+            group_channels = None
+            local_indexes = channel_indexes
+        return group_index, group_channels, local_indexes
+
+    def _get_cached_analogsignal_chunk(self, block_index, seg_index, i_start, i_stop,
+                                       channel_indexes):
+        """
+        Read a chunk of raw signal via the chunk cache.
+
+        The signal is read by chunks of all channels of the group containing
+        channel_indexes and channels are selected after.
+        """
+        group_index, group_channels, local_indexes = self._get_channel_group(channel_indexes)
+
+        size = self._get_signal_size(block_index, seg_index, group_channels)
+        if i_start is None:
+            i_start = 0
+        if i_stop is None:
+            i_stop = size
+
+        cache = self._chunk_cache
+        chunk_size = cache.chunk_size
+        chunks = []
+        # an empty selection still reads the chunk of i_start to get the dtype and shape
+        last_chunk_index = max(i_stop - 1, i_start) // chunk_size
+        for chunk_index in range(i_start // chunk_size, last_chunk_index + 1):
+            key = (block_index, seg_index, group_index, chunk_index)
+            chunk_start = chunk_index * chunk_size
+
+            def decode(chunk_start=chunk_start):
+                return self._get_analogsignal_chunk(block_index, seg_index, chunk_start,
+                                                    min(chunk_start + chunk_size, size),
+                                                    group_channels)
+
+            chunk = cache.get(key, decode)
+            sl = slice(max(i_start - chunk_start, 0), i_stop - chunk_start)
+            if local_indexes is None:
+                chunks.append(chunk[sl])
+            else:
+                chunks.append(chunk[sl][:, local_indexes])
+
+        if len(chunks) == 1:
+            return chunks[0]
+        return np.concatenate(chunks, axis=0)
+
     def rescale_signal_raw_to_float(self, raw_signal, dtype='float32',
                                     channel_indexes=None, channel_names=None, channel_ids=None):
 
@@ -529,6 +874,13 @@ class BaseRawIO(object):
         """
         return self._rescale_spike_timestamp(spike_timestamps, dtype)
 
+    def get_spike_timestamp_clock(self):
+        """
+        Return (gain, offset) of the clock of the spike timestamps:
+        times in second = timestamps * gain + offset
+        """
+        return _linear_clock(self._rescale_spike_timestamp)
+
     # spiketrain waveform zone
     def get_spike_raw_waveforms(self, block_index=0, seg_index=0, unit_index=0,
                                 t_start=None, t_stop=None):
@@ -577,45 +929,28 @@ class BaseRawIO(object):
         """
         return self._rescale_event_timestamp(event_timestamps, dtype)
 
+    def get_event_timestamp_clock(self):
+        """
+        Return (gain, offset) of the clock of the event timestamps:
+        times in second = timestamps * gain + offset
+        """
+        return _linear_clock(self._rescale_event_timestamp)
+
     def rescale_epoch_duration(self, raw_duration, dtype='float64'):
         """
         Rescale epoch raw duration to s
         """
         return self._rescale_epoch_duration(raw_duration, dtype)
 
-    def setup_cache(self, cache_path, **init_kargs):
-        if self.rawmode in ('one-file', 'multi-file'):
-            ressource_name = self.filename
-        elif self.rawmode == 'one-dir':
-            ressource_name = self.dirname
-        else:
-            raise (NotImplementedError)
-
-        if cache_path == 'home':
-            if sys.platform.startswith('win'):
-                dirname = os.path.join(os.environ['APPDATA'], 'neo_rawio_cache')
-            elif sys.platform.startswith('darwin'):
-                dirname = '~/Library/Application Support/neo_rawio_cache'
-            else:
-                dirname = os.path.expanduser('~/.config/neo_rawio_cache')
-            dirname = os.path.join(dirname, self.__class__.__name__)
-
-            if not os.path.exists(dirname):
-                os.makedirs(dirname)
-        elif cache_path == 'same_as_resource':
-            dirname = os.path.dirname(ressource_name)
-        else:
-            assert os.path.exists(cache_path), \
-                'cache_path do not exists use "home" or "same_as_file" to make this auto'
-
-        # the hash of the ressource (dir of file) is done with filename+datetime
-        # TODO make something more sofisticated when rawmode='one-dir' that use all filename and datetime
-        d = dict(ressource_name=ressource_name, mtime=os.path.getmtime(ressource_name))
-        hash = joblib.hash(d, hash_name='md5')
+    def get_epoch_duration_clock(self):
+        """
+        Return (gain, offset) of the clock of the epoch raw durations:
+        durations in second = raw_duration * gain + offset
+        """
+        return _linear_clock(self._rescale_epoch_duration)
 
-        # name is compund by the real_n,ame and the hash
-        name = '{}_{}'.format(os.path.basename(ressource_name), hash)
-        self.cache_filename = os.path.join(dirname, name)
+    def setup_cache(self, cache_path, **init_kargs):
+        self.cache_filename = self._get_cache_filename(cache_path)
 
         if os.path.exists(self.cache_filename):
             self.logger.warning('Use existing cache file {}'.format(self.cache_filename))
@@ -625,6 +960,23 @@ class BaseRawIO(object):
             self._cache = {}
             self.dump_cache()
 
+    def _get_cache_filename(self, cache_path):
+        """
+        Return the name of the cache file of the ressource in cache_path
+        ('home', 'same_as_resource' or a dirname).
+        The name changes when the ressource is modified.
+        """
+        return get_cache_filename(self._get_ressource_name(), cache_path,
+                                  self.__class__.__name__)
+
+    def _get_ressource_name(self):
+        if self.rawmode in ('one-file', 'multi-file'):
+            return self.filename
+        elif self.rawmode == 'one-dir':
+            return self.dirname
+        else:
+            raise (NotImplementedError)
+
     def add_in_cache(self, **kargs):
         assert self.use_cache
         self._cache.update(kargs)
@@ -692,3 +1044,80 @@ class BaseRawIO(object):
 
     def _rescale_epoch_duration(self, raw_duration, dtype):
         raise (NotImplementedError)
+
+
+def _linear_clock(rescale):
+    """
+    Return the (gain, offset) of a linear rescale function of the rawio.
+
+    The rescale functions have no explicit clock, so it is deduced from the
+    rescaling of 0 and of a big timestamp (to limit the rounding error on the
+    gain when the offset is big).
+    """
+    probe = 2. ** 32
+    t0, t1 = rescale(np.array([0., probe]), 'float64')
+    return float(t1 - t0) / probe, float(t0)
+
+
+class _NoLock(object):
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        return False
+
+
+_no_lock = _NoLock()
+
+
+def concurrent_reads_lock(rawio):
+    """
+    Return the lock to hold around a call of a data method of the rawio that
+    can be made while an other thread reads it.
+
+    It is a lock of the rawio (the same for all callers) when the rawio does
+    not support_concurrent_reads, and a lock doing nothing otherwise.
+    """
+    if rawio.support_concurrent_reads:
+        return _no_lock
+    # setdefault is atomic, all callers get the same lock
+    return rawio.__dict__.setdefault('_concurrent_reads_lock', threading.Lock())
+
+
+def get_cache_filename(ressource_name, cache_path, classname):
+    """
+    Return the name of the cache file of the ressource (file or dir) in
+    cache_path ('home', 'same_as_resource' or a dirname).
+    'home' uses a sub directory classname of the neo_rawio_cache directory.
+    The name changes when the ressource is modified.
+    """
+    if cache_path == 'home':
+        if sys.platform.startswith('win'):
+            dirname = os.path.join(os.environ['APPDATA'], 'neo_rawio_cache')
+        elif sys.platform.startswith('darwin'):
+            dirname = '~/Library/Application Support/neo_rawio_cache'
+        else:
+            dirname = os.path.expanduser('~/.config/neo_rawio_cache')
+        dirname = os.path.join(dirname, classname)
+
+        if not os.path.exists(dirname):
+            os.makedirs(dirname)
+    elif cache_path == 'same_as_resource':
+        dirname = os.path.dirname(ressource_name)
+    else:
+        assert os.path.exists(cache_path), \
+            'cache_path do not exists use "home" or "same_as_file" to make this auto'
+        dirname = cache_path
+
+    # the hash of the ressource (dir of file) is done with filename+datetime
+    # TODO make something more sofisticated when rawmode='one-dir' that use all filename and datetime
+    d = dict(ressource_name=ressource_name, mtime=os.path.getmtime(ressource_name))
+    if HAVE_JOBLIB:
+        hash = joblib.hash(d, hash_name='md5')
+    else:
+        # no joblib cache can exist without joblib, only the .npy files use this name
+        hash = hashlib.md5(repr(sorted(d.items())).encode('utf8')).hexdigest()
+
+    # name is compund by the real_n,ame and the hash
+    name = '{}_{}'.format(os.path.basename(ressource_name), hash)
+    return os.path.join(dirname, name)
@@ -22,6 +22,7 @@ class BCI2000RawIO(BaseRawIO):
     """
     extensions = ['dat']
     rawmode = 'one-file'
+    support_concurrent_reads = True
 
     def __init__(self, filename=''):
         BaseRawIO.__init__(self)
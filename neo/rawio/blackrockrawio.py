@@ -128,6 +128,7 @@ class BlackrockRawIO(BaseRawIO):
     extensions = ['ns' + str(_) for _ in range(1, 7)]
     extensions.extend(['nev', ])  # 'sif', 'ccf' not yet supported
     rawmode = 'multi-file'
+    support_concurrent_reads = True
 
     def __init__(self, filename=None, nsx_override=None, nev_override=None,
                  nsx_to_load=None, verbose=False):
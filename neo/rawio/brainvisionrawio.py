@@ -26,6 +26,7 @@ class BrainVisionRawIO(BaseRawIO):
     """
     extensions = ['vhdr']
     rawmode = 'one-file'
+    support_concurrent_reads = True
 
     def __init__(self, filename=''):
         BaseRawIO.__init__(self)
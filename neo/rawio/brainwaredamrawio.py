@@ -0,0 +1,164 @@
+# -*- coding: utf-8 -*-
+"""
+Class for reading from Brainware DAM files
+
+DAM files are binary files for holding raw data.  They are broken up into
+sequence of sweeps, each containing a single raw trace and parameters:
+  * float64 -- start time of the sweep in days
+  * int16 -- index of the stimulus parameters
+  * int16 -- number of stimulus parameters
+  * for each parameter: uint8 -- number of characters, and the name
+  * float32 * number of parameters -- the values of the parameters
+  * int32 -- number of samples
+  * int16 * number of samples -- the trace
+
+The sweeps are walked once in _parse_header(), only their small headers are
+read, and the traces are then read with a memmap of the file.
+Each sweep is a Segment of the only Block.
+
+The DAM file does NOT contain a sampling rate, nor can it be reliably
+calculated from any of the parameters.  It is set to 1 Hz, but this is
+arbitrary.  You can calculate it from the "sweep length" attribute if it
+is present, but it isn't always present.  It is more reliable to get it from
+the corresponding SRC file or F32 file if you have one.
+
+Brainware was developed by Dr. Jan Schnupp and is availabe from
+Tucker Davis Technologies, Inc.
+http://www.tdt.com/downloads.htm
+
+Neither Dr. Jan Schnupp nor Tucker Davis Technologies, Inc. had any part in the
+development of this code
+
+The code is implemented with the permission of Dr. Jan Schnupp
+
+Author: Todd Jennings
+"""
+from __future__ import unicode_literals, print_function, division, absolute_import
+
+from .baserawio import (BaseRawIO, _signal_channel_dtype, _unit_channel_dtype,
+                        _event_channel_dtype)
+
+import numpy as np
+
+import struct
+
+
+class BrainwareDamRawIO(BaseRawIO):
+    """
+    Class for reading Brainware raw data files with the extension '.dam'.
+
+    Each sweep is a Segment with one signal of the only channel 'Chan1'.
+    The index of the stimulus parameters and the parameters of the sweep are
+    annotations of the Segment ('stim_index' and the parameter names).
+    """
+    extensions = ['dam']
+    rawmode = 'one-file'
+    support_concurrent_reads = True
+
+    def __init__(self, filename=''):
+        BaseRawIO.__init__(self)
+        self.filename = filename
+
+    def _source_name(self):
+        return self.filename
+
+    def _parse_header(self):
+        self._memmap = np.memmap(self.filename, dtype='uint8', mode='r')
+        self._sweeps = self._index_sweeps()
+
+        sig_channels = [('Chan1', 1, 1., 'int16', 'mV', 1., 0., 0)]
+        sig_channels = np.array(sig_channels, dtype=_signal_channel_dtype)
+
+        # No events
+        event_channels = []
+        event_channels = np.array(event_channels, dtype=_event_channel_dtype)
+
+        # No spikes
+        unit_channels = []
+        unit_channels = np.array(unit_channels, dtype=_unit_channel_dtype)
+
+        # fille into header dict
+        self.header = {}
+        self.header['nb_block'] = 1
+        self.header['nb_segment'] = [len(self._sweeps)]
+        self.header['signal_channels'] = sig_channels
+        self.header['unit_channels'] = unit_channels
+        self.header['event_channels'] = event_channels
+
+        # insert some annotation at some place
+        self._generate_minimal_annotations()
+        for seg_index, sweep in enumerate(self._sweeps):
+            seg_ann = self.raw_annotations['blocks'][0]['segments'][seg_index]
+            seg_ann['stim_index'] = sweep['stim_index']
+            seg_ann.update(sweep['params'])
+
+    def _index_sweeps(self):
+        """
+        Walk the headers of all sweeps of the file and return a list of
+        dict with the timestamp (in days), the t_start (in s), the stim_index,
+        the params and the position and number of the samples of each sweep.
+        """
+        buf = self._memmap
+        file_size = buf.size
+        sweeps = []
+
+        pos = 0
+        while pos + 12 <= file_size:
+            # float64 -- start time in days, int16 -- index of the stimulus
+            # parameters, int16 -- number of stimulus parameters
+            t_start, stim_index, numelements = struct.unpack_from('<dhh', buf, pos)
+            pos += 12
+
+            # the name strings for the stimulus parameters
+            paramnames = []
+            for _ in range(numelements):
+                # uint8 -- the number of characters in the string
+                numchars = int(buf[pos])
+                name = buf[pos + 1:pos + 1 + numchars]
+                pos += 1 + numchars
+                # exclude invalid characters
+                paramnames.append(name[name >= 32].tobytes().decode('latin-1'))
+
+            # float32 * numelements -- the values for the stimulus parameters
+            paramvalues = struct.unpack_from('<{}f'.format(numelements), buf, pos)
+            pos += 4 * numelements
+
+            # int32 -- the number elements of the signal
+            numpts, = struct.unpack_from('<i', buf, pos)
+            pos += 4
+
+            sweeps.append({
+                'timestamp': t_start,
+                't_start': t_start * 86400.,
+                'stim_index': stim_index,
+                'params': dict(zip(paramnames, paramvalues)),
+                'samples_pos': pos,
+                'numpts': numpts,
+            })
+            # int16 * numpts -- the signal itself
+            pos += 2 * numpts
+        return sweeps
+
+    def _segment_t_start(self, block_index, seg_index):
+        return self._sweeps[seg_index]['t_start']
+
+    def _segment_t_stop(self, block_index, seg_index):
+        sweep = self._sweeps[seg_index]
+        # the sampling rate is 1 Hz
+        return sweep['t_start'] + sweep['numpts']
+
+    def _get_signal_size(self, block_index, seg_index, channel_indexes):
+        return self._sweeps[seg_index]['numpts']
+
+    def _get_signal_t_start(self, block_index, seg_index, channel_indexes):
+        return self._sweeps[seg_index]['t_start']
+
+    def _get_analogsignal_chunk(self, block_index, seg_index, i_start, i_stop, channel_indexes):
+        sweep = self._sweeps[seg_index]
+        if i_start is None:
+            i_start = 0
+        if i_stop is None:
+            i_stop = sweep['numpts']
+        p = sweep['samples_pos']
+        raw_signals = self._memmap[p + 2 * i_start:p + 2 * i_stop].view('<i2')
+        return raw_signals[:, None]
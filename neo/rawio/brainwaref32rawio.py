@@ -0,0 +1,182 @@
+# -*- coding: utf-8 -*-
+"""
+Class for reading from Brainware F32 files
+
+F32 files are simplified binary files for holding spike data.  Unlike SRC
+files, F32 files carry little metadata.  This also means, however, that the
+file format does not change, unlike SRC files whose format changes periodically
+(although ideally SRC files are backwards-compatible).
+
+The file is a sequence of float32:
+  * -2 starts a stimulus condition, it is followed by the length of the sweeps
+    in ms, the number of stimulus parameters and the parameter values.
+  * -1 starts a new sweep of the current condition.
+  * any other value is the time of a spike of the current sweep in ms.
+
+The markers are located in one vectorized scan in _parse_header() and the
+spike times are then read with a memmap of the file.
+Each sweep is a Segment of the only Block, with one SpikeTrain of the only
+unit.
+
+The only metadata stored in the file is the length of a single repetition
+of the stimulus and the values of the stimulus parameters (but not the names
+of the parameters, they are named 'Param0', 'Param1'...).
+
+Brainware was developed by Dr. Jan Schnupp and is availabe from
+Tucker Davis Technologies, Inc.
+http://www.tdt.com/downloads.htm
+
+Neither Dr. Jan Schnupp nor Tucker Davis Technologies, Inc. had any part in the
+development of this code
+
+The code is implemented with the permission of Dr. Jan Schnupp
+
+Author: Todd Jennings
+"""
+from __future__ import unicode_literals, print_function, division, absolute_import
+
+from .baserawio import (BaseRawIO, _signal_channel_dtype, _unit_channel_dtype,
+                        _event_channel_dtype)
+
+import numpy as np
+
+
+class BrainwareF32RawIO(BaseRawIO):
+    """
+    Class for reading Brainware Spike ReCord files with the extension '.f32'
+
+    Each sweep is a Segment starting at 0 s with the spikes of the only unit.
+    The stimulus parameters of the sweep are annotations of the Segment.
+    """
+    extensions = ['f32']
+    rawmode = 'one-file'
+    support_concurrent_reads = True
+
+    def __init__(self, filename=''):
+        BaseRawIO.__init__(self)
+        self.filename = filename
+
+    def _source_name(self):
+        return self.filename
+
+    def _parse_header(self):
+        self._memmap = np.memmap(self.filename, dtype='<f4', mode='r')
+        self._sweeps = self._index_sweeps()
+
+        # No signals
+        sig_channels = []
+        sig_channels = np.array(sig_channels, dtype=_signal_channel_dtype)
+
+        # one unit without waveforms
+        unit_channels = [('unit0', '0', '', 1., 0., 0, 0.)]
+        unit_channels = np.array(unit_channels, dtype=_unit_channel_dtype)
+
+        # No events
+        event_channels = []
+        event_channels = np.array(event_channels, dtype=_event_channel_dtype)
+
+        # fille into header dict
+        self.header = {}
+        self.header['nb_block'] = 1
+        self.header['nb_segment'] = [len(self._sweeps)]
+        self.header['signal_channels'] = sig_channels
+        self.header['unit_channels'] = unit_channels
+        self.header['event_channels'] = event_channels
+
+        # insert some annotation at some place
+        self._generate_minimal_annotations()
+        for seg_index, sweep in enumerate(self._sweeps):
+            seg_ann = self.raw_annotations['blocks'][0]['segments'][seg_index]
+            seg_ann.update(sweep['params'])
+
+    def _index_sweeps(self):
+        """
+        Locate the markers of conditions and sweeps and return a list of dict
+        with the t_stop (in ms), the params and the spans (start, stop) of the
+        spike times of each sweep.
+        """
+        data = self._memmap
+        # the values of a condition header can also be -1 or -2, these
+        # candidates are skipped while walking the markers
+        candidates = np.flatnonzero((data == -1) | (data == -2))
+
+        sweeps = []
+        t_stop = None
+        params = {}
+        sweep = None
+        span_start = None  # start of the spike times of the current span
+        skip_until = 0
+        for pos in candidates:
+            if pos < skip_until:
+                continue
+            if sweep is not None:
+                sweep['spans'].append((span_start, pos))
+            if data[pos] == -2:
+                # float32 -- sweep length in ms, float32 -- number of stimulus
+                # parameters, float32 * numelements -- parameter values
+                t_stop = float(data[pos + 1])
+                numelements = int(data[pos + 2])
+                paramvals = data[pos + 3:pos + 3 + numelements].tolist()
+                params = dict(('Param%s' % i, val) for i, val in enumerate(paramvals))
+                skip_until = pos + 3 + numelements
+                span_start = skip_until
+                if sweep is not None:
+                    # the sweep length of a sweep is the last one before its end
+                    sweep['t_stop'] = t_stop
+            else:
+                # spike times before the first sweep are ignored
+                sweep = {'t_stop': t_stop, 'params': params, 'spans': []}
+                sweeps.append(sweep)
+                span_start = pos + 1
+        if sweep is not None:
+            sweep['spans'].append((span_start, data.size))
+
+        for sweep in sweeps:
+            sweep['spans'] = np.array([(start, stop) for start, stop in sweep['spans']
+                                       if stop > start], dtype='int64').reshape(-1, 2)
+            if sweep['t_stop'] is None:
+                # no condition before the sweep
+                spike_times = self._sweep_spike_times(sweep)
+                sweep['t_stop'] = float(spike_times.max()) if spike_times.size else 0.
+        return sweeps
+
+    def _sweep_spike_times(self, sweep):
+        pieces = [self._memmap[start:stop] for start, stop in sweep['spans']]
+        if len(pieces) == 0:
+            return np.zeros(0, dtype='float32')
+        elif len(pieces) == 1:
+            return pieces[0]
+        return np.concatenate(pieces)
+
+    def _segment_t_start(self, block_index, seg_index):
+        return 0.
+
+    def _segment_t_stop(self, block_index, seg_index):
+        return self._sweeps[seg_index]['t_stop'] / 1000.
+
+    def _spike_count(self, block_index, seg_index, unit_index):
+        spans = self._sweeps[seg_index]['spans']
+        return int(np.sum(spans[:, 1] - spans[:, 0]))
+
+    def _get_spike_timestamps(self, block_index, seg_index, unit_index, t_start, t_stop):
+        # float64 so the timestamps can be rescaled with the spike clock
+        spike_timestamps = self._sweep_spike_times(self._sweeps[seg_index]).astype('float64')
+
+        if t_start is not None or t_stop is not None:
+            # timestamps are in ms
+            mask = np.ones(spike_timestamps.size, dtype='bool')
+            if t_start is not None:
+                mask &= spike_timestamps >= t_start * 1000.
+            if t_stop is not None:
+                mask &= spike_timestamps <= t_stop * 1000.
+            spike_timestamps = spike_timestamps[mask]
+
+        return spike_timestamps
+
+    def _rescale_spike_timestamp(self, spike_timestamps, dtype):
+        spike_times = spike_timestamps.astype(dtype)
+        spike_times /= 1000.
+        return spike_times
+
+    def _get_spike_raw_waveforms(self, block_index, seg_index, unit_index, t_start, t_stop):
+        return None
@@ -0,0 +1,100 @@
+# -*- coding: utf-8 -*-
+"""
+In memory cache of decoded signal chunks for neo.rawio.
+
+Some formats need a lot of work to decode a piece of signal (walking data
+blocks for Plexon, Spike2 and TDT, flattening records for Neuralynx and
+OpenEphys...). When the same region is read several times, for instance
+when scrolling back and forth in a viewer, the decoded chunks can be kept
+with `BaseRawIO.enable_chunk_cache()`.
+
+Signals are cut in chunks of a fixed number of samples containing all
+channels of a channel group. Chunks are identified by the key
+(block_index, seg_index, group_index, chunk_index) and the least recently
+used ones are dropped when the size of the cache goes over max_bytes.
+
+"""
+from __future__ import print_function, division, absolute_import
+
+from collections import OrderedDict
+import threading
+
+import numpy as np
+
+
+class ChunkCache(object):
+    """
+    Size bounded LRU cache of decoded chunks.
+
+    Usage:
+        >>> cache = ChunkCache(max_bytes=100 * 1024 ** 2, chunk_size=2 ** 16)
+        >>> chunk = cache.get(key, decode)
+        >>> cache.stats()
+
+    decode() is called on a miss and must return the chunk as a numpy array.
+    The cached chunks are read only.
+    """
+
+    def __init__(self, max_bytes=100 * 1024 ** 2, chunk_size=2 ** 16):
+        assert max_bytes > 0, 'max_bytes must be positive'
+        assert chunk_size > 0, 'chunk_size must be positive'
+        self.max_bytes = int(max_bytes)
+        self.chunk_size = int(chunk_size)
+        # several segments can be read at the same time by threads
+        self._lock = threading.Lock()
+        self.clear()
+
+    def clear(self):
+        """Drop all chunks and reset the statistics."""
+        with self._lock:
+            self._chunks = OrderedDict()
+            self._nbytes = 0
+            self._hits = 0
+            self._misses = 0
+            self._evictions = 0
+
+    def get(self, key, decode):
+        """
+        Return the chunk of key, decoding it with decode() if it is not cached.
+        """
+        with self._lock:
+            chunk = self._chunks.pop(key, None)
+            if chunk is not None:
+                # re inserted as the most recently used
+                self._chunks[key] = chunk
+                self._hits += 1
+                return chunk
+            self._misses += 1
+
+        # decoding is done outside the lock so other chunks can be served
+        # the cache own its chunks: views (of a memmap for instance) are copied
+        chunk = np.require(decode(), requirements=['C', 'O'])
+        chunk.setflags(write=False)
+
+        with self._lock:
+            if key not in self._chunks and chunk.nbytes <= self.max_bytes:
+                self._chunks[key] = chunk
+                self._nbytes += chunk.nbytes
+                while self._nbytes > self.max_bytes:
+                    _, old = self._chunks.popitem(last=False)
+                    self._nbytes -= old.nbytes
+                    self._evictions += 1
+        return chunk
+
+    def stats(self):
+        """
+        Return a dict with the number of hits, misses and evictions, the
+        hit_ratio and the current nb_chunks and nbytes of the cache.
+        """
+        with self._lock:
+            nb_request = self._hits + self._misses
+            return {
+                'hits': self._hits,
+                'misses': self._misses,
+                'evictions': self._evictions,
+                'hit_ratio': self._hits / nb_request if nb_request else 0.,
+                'nb_chunks': len(self._chunks),
+                'nbytes': self._nbytes,
+                'max_bytes': self.max_bytes,
+                'chunk_size': self.chunk_size,
+            }
@@ -32,6 +32,7 @@ import io
 class ElanRawIO(BaseRawIO):
     extensions = ['eeg']
     rawmode = 'one-file'
+    support_concurrent_reads = True
 
     def __init__(self, filename=''):
         BaseRawIO.__init__(self)
@@ -0,0 +1,648 @@
+# -*- coding: utf-8 -*-
+"""
+Class for reading data from Elphy files (.DAT).
+
+Elphy is an acquisition and analysis software developed at the UNIC
+(CNRS, Gif-sur-Yvette), see http://www.unic.cnrs-gif.fr/software.html
+
+Two of the three Elphy formats are supported:
+  * 'DAC2 objects': the file is a sequence of blocks, each starting with
+    its size (int32) and its identifier (pascal string). A 'B_Ep' block
+    describes an episode (sub-blocks 'Ep', 'Adc', 'Ksamp' and 'Ktype'), it is
+    followed by the 'RDATA' blocks of its multiplexed samples and by the
+    'REVT' (events), 'RSPK' (spike times) and 'RspkWave' (waveforms) blocks of
+    the episode.
+  * 'DAC2/GS/2000': a 'MAIN' block describes the channels and the samples
+    are in 'DAC2SEQ' blocks (one per episode) or after all blocks in
+    continuous mode.
+The old 'ACQUIS1/GS/1991' format is not supported, it is read by the older
+neo.io.elphyio_v1.ElphyIO.
+
+The blocks are walked once in _parse_header() and the episodes are indexed
+(position of their data blocks, layout of the channels, counts of events and
+spikes), this index can be cached with use_cache=True. The samples are then
+read with a memmap of the file.
+
+The samples of the channels are multiplexed: the file is a sequence of
+aggregates, an aggregate contains one sample of each channel, or several for
+channels sampled faster than the others (the 'Ksamp' sub-sampling factors).
+An aggregate is read as one item of a numpy structured dtype with one field
+per sample.
+
+Each episode is a Segment of the only Block. The analog channels are
+signals, the channels with a sub-sampling factor of 0 are event channels and
+each electrode of the 'RSPK' blocks is a unit. The tag channels are not read
+(see neo.io.elphyio_v1.ElphyIO).
+
+Author: Thierry Brizzi, Domenico Guarino
+
+"""
+from __future__ import unicode_literals, print_function, division, absolute_import
+
+from .baserawio import (BaseRawIO, _signal_channel_dtype, _unit_channel_dtype,
+                        _event_channel_dtype)
+
+import numpy as np
+
+import struct
+
+try:
+    from math import gcd
+except ImportError:
+    from fractions import gcd
+
+# numpy dtypes of the sample types of Elphy (only the ones that numpy
+# can read, the others are real48, extended and complex types)
+_sample_dtypes = {
+    0: 'uint8',
+    1: 'int8',
+    2: '<i2',
+    3: '<u2',
+    4: '<i4',
+    5: '<f4',
+    7: '<f8',
+}
+
+_time_factors = {'s': 1., 'sec': 1., 'ms': 1e-3, 'us': 1e-6, '\xb5s': 1e-6}
+
+
+class ElphyRawIO(BaseRawIO):
+    """
+    Class for reading data from Elphy files (DAC2 objects and DAC2/GS/2000
+    formats).
+
+    All episodes must have the same analog channels (sub-sampling factors,
+    sample types and scales).
+    """
+    extensions = ['DAT']
+    rawmode = 'one-file'
+    support_concurrent_reads = True
+
+    def __init__(self, filename='', **kargs):
+        self.filename = filename
+        BaseRawIO.__init__(self, **kargs)
+
+    def _source_name(self):
+        return self.filename
+
+    def _parse_header(self):
+        self._memmap = np.memmap(self.filename, dtype='uint8', mode='r')
+
+        index = None
+        if self.use_cache:
+            index = self._cache.get('index')
+        if index is None:
+            # this walks all blocks of the file
+            index = self._index_episodes()
+            if self.use_cache:
+                self.add_in_cache(index=index)
+        self._episodes = index['episodes']
+
+        if len(self._episodes) > 0:
+            ep0 = self._episodes[0]
+            for ep in self._episodes[1:]:
+                if ep['channels'] != ep0['channels'] or ep['dX'] != ep0['dX']:
+                    raise NotImplementedError('ElphyRawIO only reads files whose episodes '
+                                              'have the same analog channels')
+            for ep in self._episodes:
+                self._setup_aggregates(ep)
+            time_factor = _time_factors.get(ep0['x_unit'], 1.)
+            # times of events and spikes are counted in samples of the
+            # aggregate (events) or of the acquisition (spikes)
+            self._event_tick = ep0['dX'] * time_factor / len(ep0['k_sampling'])
+            self._spike_tick = ep0['dX'] * time_factor
+            channels = ep0['channels']
+            event_numbers = ep0['event_numbers']
+        else:
+            channels = []
+            event_numbers = []
+
+        sig_channels = []
+        groups = []
+        for chan in channels:
+            number, k, sample_type, units, gain, offset = chan
+            group = (k, sample_type)
+            if group not in groups:
+                groups.append(group)
+            sampling_rate = 1. / (ep0['dX'] * k * time_factor)
+            sig_channels.append(('Channel %d' % number, number, sampling_rate,
+                                 _sample_dtypes[sample_type], units, gain, offset,
+                                 groups.index(group)))
+        sig_channels = np.array(sig_channels, dtype=_signal_channel_dtype)
+
+        event_channels = []
+        for number in event_numbers:
+            event_channels.append(('Channel %d' % number, number, 'event'))
+        event_channels = np.array(event_channels, dtype=_event_channel_dtype)
+
+        nb_unit = max([0] + [len(counts) for ep in self._episodes
+                             for _, counts in ep['spk_blocks']])
+        unit_channels = []
+        for u in range(nb_unit):
+            wf_sampling_rate = 1. / self._spike_tick
+            if len(ep0['wf_blocks']):
+                pre_trigger = ep0['wf_blocks'][0][2]
+                wf_units, wf_gain, wf_offset = ep0['wf_scale']
+            else:
+                pre_trigger = 0
+                wf_units, wf_gain, wf_offset = '', 1., 0.
+            unit_channels.append(('electrode %d' % (u + 1), u + 1, wf_units, wf_gain,
+                                  wf_offset, pre_trigger, wf_sampling_rate))
+        unit_channels = np.array(unit_channels, dtype=_unit_channel_dtype)
+
+        # fille into header dict
+        self.header = {}
+        self.header['nb_block'] = 1
+        self.header['nb_segment'] = [len(self._episodes)]
+        self.header['signal_channels'] = sig_channels
+        self.header['unit_channels'] = unit_channels
+        self.header['event_channels'] = event_channels
+
+        # insert some annotation at some place
+        self._generate_minimal_annotations()
+        bl_ann = self.raw_annotations['blocks'][0]
+        bl_ann['elphy_format'] = index['format']
+        for seg_index, ep in enumerate(self._episodes):
+            seg_ann = bl_ann['segments'][seg_index]
+            seg_ann['name'] = ep['name']
+            seg_ann['continuous'] = ep['continuous']
+
+    def _index_episodes(self):
+        """
+        Walk all blocks of the file and return a dict with the format and the
+        list of the episodes.
+
+        Each episode is a dict with the time scale (x_unit, dX, X0), the
+        analog channels (number, sub-sampling factor, sample type, units,
+        gain, offset), the sub-sampling factors and sample types of all
+        channels, the positions (start, size) of its data and of its event,
+        spike and waveform blocks.
+        """
+        buf = self._memmap
+        length, title = struct.unpack_from('<B15s', buf, 0)
+        title = title[:length].decode('latin-1')
+        if title == 'DAC2 objects':
+            episodes = self._index_dac2_objects()
+        elif title == 'DAC2/GS/2000':
+            episodes = self._index_dac2_gs()
+        else:
+            raise NotImplementedError('ElphyRawIO does not read the format %r, see '
+                                      'neo.io.elphyio_v1.ElphyIO' % title)
+        return {'format': title, 'episodes': episodes}
+
+    def _index_dac2_objects(self):
+        buf = self._memmap
+        file_size = buf.size
+        episodes = []
+        ep = None
+
+        # the header is the title (16 bytes) and its size (int16)
+        pos = 18
+        while pos + 5 <= file_size:
+            # int32 -- size of the block, pascal string -- identifier
+            size, ident_size = struct.unpack_from('<iB', buf, pos)
+            if size <= 0:
+                break
+            identifier = _read_string(buf, pos + 4)
+            data_pos = pos + 5 + ident_size
+            end = min(pos + size, file_size)
+
+            if identifier == 'B_Ep':
+                ep = self._parse_dac2_episode(data_pos, end)
+                ep['name'] = 'episode %d' % (len(episodes) + 1)
+                episodes.append(ep)
+            elif ep is None:
+                # blocks before the first episode: file info...
+                pass
+            elif identifier == 'RDATA':
+                # the samples are preceded by a record whose size is the
+                # first uint16 of the record
+                start = data_pos + struct.unpack_from('<H', buf, data_pos)[0]
+                if end > start:
+                    ep['spans'].append((start, end - start))
+            elif identifier in ('REVT', 'RSPK'):
+                fmt = '<H' if identifier == 'REVT' else '<h'
+                p = data_pos + struct.unpack_from(fmt, buf, data_pos)[0]
+                # int32 -- number of channels, int32 * n -- number of events
+                # of each channel, then the times of all channels
+                n, = struct.unpack_from('<i', buf, p)
+                counts = list(struct.unpack_from('<%di' % n, buf, p + 4))
+                blocks = ep['evt_blocks'] if identifier == 'REVT' else ep['spk_blocks']
+                blocks.append((p + 4 + 4 * n, counts))
+            elif identifier == 'RspkWave':
+                p = data_pos + struct.unpack_from('<H', buf, data_pos)[0]
+                wavelength, pre_trigger, n = struct.unpack_from('<iii', buf, p)
+                counts = list(struct.unpack_from('<%di' % n, buf, p + 12))
+                ep['wf_blocks'].append((p + 12 + 4 * n, wavelength, pre_trigger, counts))
+            elif identifier == 'COM':
+                # int16 -- number of characters, the name of the episode
+                name = buf[data_pos + 2:end].tobytes().decode('latin-1')
+                if len(name) > 0:
+                    ep['name'] = name
+            pos += size
+
+        for ep in episodes:
+            ep['spans'] = np.array(ep['spans'], dtype='int64').reshape(-1, 2)
+            ep['t_max'] = self._max_event_time(ep)
+        return episodes
+
+    def _parse_dac2_episode(self, pos, end):
+        """
+        Parse the sub-blocks of a 'B_Ep' block.
+        """
+        buf = self._memmap
+        sub_blocks = {}
+        while pos < end:
+            # pascal string -- identifier, uint16 -- size (0xFFFF means that
+            # the size is the next int32)
+            identifier = _read_string(buf, pos)
+            pos += 1 + len(identifier)
+            size, = struct.unpack_from('<H', buf, pos)
+            pos += 2
+            if size == 0xFFFF:
+                size, = struct.unpack_from('<i', buf, pos)
+                pos += 4
+            sub_blocks[identifier] = (pos, size)
+            pos += size
+
+        p, size = sub_blocks['Ep']
+        n_channels, nbpt, tpData = struct.unpack_from('<BiB', buf, p)
+        x_unit = _read_string(buf, p + 6, 10)
+        dX, X0 = struct.unpack_from('<dd', buf, p + 17)
+        continuous, tag_mode, tag_shift = struct.unpack_from('<?BB', buf, p + 33)
+        ep = {'x_unit': x_unit, 'dX': dX, 'X0': X0, 'continuous': continuous,
+              'tag_shift': tag_shift if tag_mode == 1 else 0,
+              'spans': [], 'evt_blocks': [], 'spk_blocks': [], 'wf_blocks': [],
+              'wf_scale': ('', 1., 0.)}
+        if size >= 94:
+            # scales of the waveforms of the spikes
+            dX_wf, X0_wf, n_spk, dY_wf, Y0_wf = struct.unpack_from('<ddidd', buf, p + 36)
+            y_unit_wf = _read_string(buf, p + 83, 10)
+            ep['wf_scale'] = (y_unit_wf, dY_wf, Y0_wf)
+
+        if 'Ksamp' in sub_blocks:
+            p, _ = sub_blocks['Ksamp']
+            k_sampling = list(struct.unpack_from('<%dH' % n_channels, buf, p))
+        else:
+            k_sampling = [1] * n_channels
+        if 'Ktype' in sub_blocks:
+            p, _ = sub_blocks['Ktype']
+            k_types = list(struct.unpack_from('<%dB' % n_channels, buf, p))
+        else:
+            k_types = [tpData] * n_channels
+        scales = []
+        if 'Adc' in sub_blocks:
+            p, _ = sub_blocks['Adc']
+            for c in range(n_channels):
+                units = _read_string(buf, p + 27 * c, 10)
+                dY, Y0 = struct.unpack_from('<dd', buf, p + 27 * c + 11)
+                scales.append((units, dY, Y0))
+        else:
+            scales = [('', 1., 0.)] * n_channels
+
+        # with tag_mode 2 the last channel is dedicated to the tags
+        nb_analog = n_channels - 1 if tag_mode == 2 else n_channels
+        ep['k_sampling'] = k_sampling
+        ep['k_types'] = k_types
+        ep['channels'] = [(c + 1, k_sampling[c], k_types[c]) + scales[c]
+                          for c in range(nb_analog) if k_sampling[c] > 0]
+        ep['event_numbers'] = [c + 1 for c in range(nb_analog) if k_sampling[c] == 0]
+        return ep
+
+    def _index_dac2_gs(self):
+        buf = self._memmap
+        file_size = buf.size
+        data_offset, = struct.unpack_from('<i', buf, 16)
+        episodes = []
+        main = None
+
+        # the header is the title (16 bytes) and its size (int32)
+        pos = 20
+        while pos + 20 <= file_size:
+            ident_size, = struct.unpack_from('<B', buf, pos)
+            identifier = buf[pos + 1:pos + 1 + ident_size].tobytes().decode('latin-1')
+            if identifier.startswith('DAC2SEQ'):
+                # the identifier of episodes is stored on 7 bytes
+                if main is None:
+                    break
+                ep = self._parse_dac2_gs_main(pos + 12, main)
+                ep['spans'] = np.array([(pos + main['preSeqI'], main['ep_data_size'])],
+                                       dtype='int64')
+                ep['name'] = 'episode %d' % (len(episodes) + 1)
+                episodes.append(ep)
+                size = main['ep_size']
+            else:
+                size, = struct.unpack_from('<i', buf, pos + 16)
+                if identifier == 'MAIN':
+                    main = self._parse_dac2_gs_main(pos + 20)
+                    if main['continuous']:
+                        # the samples are stored after all blocks
+                        break
+            if size <= 0:
+                break
+            pos += size
+
+        if main is not None and main['continuous'] and main['ep_data_size'] > 0:
+            main['spans'] = np.array([(data_offset, main['ep_data_size'])], dtype='int64')
+            main['name'] = 'episode 1'
+            episodes = [main]
+        for ep in episodes:
+            ep['t_max'] = 0.
+        return episodes
+
+    def _parse_dac2_gs_main(self, p, main=None):
+        """
+        Parse the 'MAIN' block (main is None) or a 'DAC2SEQ' block of the
+        DAC2/GS/2000 format. The scales of an episode are the ones of its
+        'DAC2SEQ' block in episode mode.
+        """
+        buf = self._memmap
+        if main is None:
+            n_channels, nbpt, tpData = struct.unpack_from('<BiB', buf, p)
+            p += 6
+        else:
+            n_channels, nbpt, tpData, postSeqI = struct.unpack_from('<BiBi', buf, p)
+            n_channels = main['n_channels']
+            p += 10
+        x_unit = _read_string(buf, p, 10)
+        dX, X0 = struct.unpack_from('<dd', buf, p + 11)
+        p += 27
+        scales = []
+        for c in range(16):
+            units = _read_string(buf, p, 10)
+            dY, Y0 = struct.unpack_from('<dd', buf, p + 11)
+            scales.append((units, dY, Y0))
+            p += 27
+        if main is not None:
+            if main['continuous']:
+                x_unit, dX, X0 = main['x_unit'], main['dX'], main['X0']
+                scales = main['scales']
+            k_types = main['k_types']
+            tag_shift = main['tag_shift']
+            continuous = False
+        else:
+            preSeqI, postSeqI, continuous, varEp, withTags = struct.unpack_from(
+                '<ii???', buf, p)
+            # some files do not give the tag shift
+            tagShift, = struct.unpack_from('<B', buf, p + 11)
+            tag_shift = (tagShift or 4) if withTags else 0
+            k_types = [tpData] * n_channels
+
+        ep = {'x_unit': x_unit, 'dX': dX, 'X0': X0, 'continuous': continuous,
+              'tag_shift': tag_shift, 'scales': scales[:n_channels],
+              'n_channels': n_channels, 'k_sampling': [1] * n_channels, 'k_types': k_types,
+              'channels': [(c + 1, 1, k_types[c]) + scales[c] for c in range(n_channels)],
+              'event_numbers': [], 'evt_blocks': [], 'spk_blocks': [], 'wf_blocks': [],
+              'wf_scale': ('', 1., 0.)}
+        if main is None:
+            sample_size = np.dtype(_sample_dtypes[tpData]).itemsize
+            if continuous:
+                data_offset, = struct.unpack_from('<i', buf, 16)
+                ep['preSeqI'] = 0
+                ep['ep_data_size'] = (buf.size - data_offset) // (n_channels * sample_size) * \
+                    n_channels * sample_size
+            else:
+                ep['preSeqI'] = preSeqI
+                ep['ep_data_size'] = nbpt * sample_size * n_channels
+            ep['ep_size'] = ep['preSeqI'] + postSeqI + ep['ep_data_size']
+        return ep
+
+    def _setup_aggregates(self, ep):
+        """
+        Build the numpy structured dtype of an aggregate of samples and the
+        fields of each channel in the aggregate.
+        """
+        for sample_type in ep['k_types']:
+            if sample_type not in _sample_dtypes:
+                raise NotImplementedError('ElphyRawIO does not read the sample type %d'
+                                          % sample_type)
+        mask = _channel_mask(ep['k_sampling'])
+        formats = [_sample_dtypes[ep['k_types'][number - 1]] for number in mask]
+        names = ['s%d' % i for i in range(len(mask))]
+        ep['aggregate_dtype'] = np.dtype({'names': names, 'formats': formats})
+        ep['fields'] = dict((number, [names[i] for i in np.flatnonzero(mask == number)])
+                            for number in np.unique(mask))
+        aggregate_size = ep['aggregate_dtype'].itemsize
+        # the samples of an incomplete aggregate at the end are ignored
+        ep['nb_aggregate'] = int(np.sum(ep['spans'][:, 1])) // aggregate_size
+        ep['span_stops'] = np.cumsum(ep['spans'][:, 1])
+
+    def _max_event_time(self, ep):
+        """
+        Return the time of the last event or spike of an episode.
+        """
+        t_max = 0.
+        time_factor = _time_factors.get(ep['x_unit'], 1.)
+        for blocks, tick, stride in ((ep['evt_blocks'], len(ep['k_sampling']), 4),
+                                     (ep['spk_blocks'], 1, 5)):
+            for data_pos, counts in blocks:
+                p = data_pos
+                for count in counts:
+                    if count > 0:
+                        times = self._memmap[p:p + 4 * count].view('<i4')
+                        t_max = max(t_max, times.max() * ep['dX'] * time_factor / tick)
+                    p += stride * count
+        return float(t_max)
+
+    def _segment_t_start(self, block_index, seg_index):
+        ep = self._episodes[seg_index]
+        return min(0., ep['X0'] * _time_factors.get(ep['x_unit'], 1.))
+
+    def _segment_t_stop(self, block_index, seg_index):
+        ep = self._episodes[seg_index]
+        t_stop = ep['t_max']
+        sig_channels = self.header['signal_channels']
+        if len(sig_channels):
+            for c in range(len(sig_channels)):
+                t_stop = max(t_stop, self._get_signal_t_start(block_index, seg_index, [c]) +
+                             self._get_signal_size(block_index, seg_index, [c]) /
+                             sig_channels['sampling_rate'][c])
+        return t_stop
+
+    def _get_signal_size(self, block_index, seg_index, channel_indexes):
+        ep = self._episodes[seg_index]
+        if channel_indexes is None:
+            channel_indexes = slice(None)
+        number = self.header['signal_channels']['id'][channel_indexes][0]
+        return ep['nb_aggregate'] * len(ep['fields'][number])
+
+    def _get_signal_t_start(self, block_index, seg_index, channel_indexes):
+        ep = self._episodes[seg_index]
+        return ep['X0'] * _time_factors.get(ep['x_unit'], 1.)
+
+    def _get_analogsignal_chunk(self, block_index, seg_index, i_start, i_stop, channel_indexes):
+        ep = self._episodes[seg_index]
+        if channel_indexes is None:
+            channel_indexes = slice(None)
+        numbers = self.header['signal_channels']['id'][channel_indexes]
+        # number of samples of the channels in an aggregate
+        n = len(ep['fields'][numbers[0]])
+        if i_start is None:
+            i_start = 0
+        if i_stop is None:
+            i_stop = ep['nb_aggregate'] * n
+
+        first, last = i_start // n, -(-i_stop // n)
+        aggregates = self._get_aggregates(ep, first, last)
+        dtype = _sample_dtypes[ep['k_types'][numbers[0] - 1]]
+        raw_signals = np.empty(((last - first) * n, len(numbers)), dtype=dtype)
+        for c, number in enumerate(numbers):
+            for i, field in enumerate(ep['fields'][number]):
+                raw_signals[i::n, c] = aggregates[field]
+        raw_signals = raw_signals[i_start - first * n:i_stop - first * n]
+
+        if ep['tag_shift'] and raw_signals.dtype.kind in 'iu':
+            # the lower bits of the samples are the tags
+            raw_signals >>= ep['tag_shift']
+        return raw_signals
+
+    def _get_aggregates(self, ep, first, last):
+        """
+        Return the aggregates first:last of an episode, they can be spread
+        over several data blocks.
+        """
+        aggregate_dtype = ep['aggregate_dtype']
+        start = first * aggregate_dtype.itemsize
+        stop = last * aggregate_dtype.itemsize
+        span_stops = ep['span_stops']
+        span_starts = span_stops - ep['spans'][:, 1]
+        if stop <= start:
+            return np.zeros(0, dtype=aggregate_dtype)
+        pieces = []
+        for s in range(np.searchsorted(span_stops, start, side='right'), len(span_stops)):
+            if span_starts[s] >= stop:
+                break
+            p = ep['spans'][s, 0] - span_starts[s]
+            pieces.append(self._memmap[p + max(start, span_starts[s]):
+                                       p + min(stop, span_stops[s])])
+        if len(pieces) == 1:
+            raw = pieces[0]
+        else:
+            raw = np.concatenate(pieces)
+        return raw.view(aggregate_dtype)
+
+    def _spike_count(self, block_index, seg_index, unit_index):
+        blocks = self._episodes[seg_index]['spk_blocks']
+        return int(sum(counts[unit_index] for _, counts in blocks if unit_index < len(counts)))
+
+    def _get_spike_timestamps(self, block_index, seg_index, unit_index, t_start, t_stop):
+        # each electrode has the times (int32) and then the units (uint8)
+        # of its spikes
+        times = self._get_times(self._episodes[seg_index]['spk_blocks'], unit_index, 5)
+        return self._filter_times(times, self._spike_tick, t_start, t_stop)
+
+    def _rescale_spike_timestamp(self, spike_timestamps, dtype):
+        spike_times = spike_timestamps.astype(dtype)
+        spike_times *= self._spike_tick
+        return spike_times
+
+    def _get_spike_raw_waveforms(self, block_index, seg_index, unit_index, t_start, t_stop):
+        ep = self._episodes[seg_index]
+        if len(ep['wf_blocks']) == 0:
+            return None
+        pieces = []
+        for data_pos, wavelength, pre_trigger, counts in ep['wf_blocks']:
+            if unit_index >= len(counts):
+                continue
+            record_dtype = np.dtype([('elphy_time', '<u4'), ('device_time', '<u4'),
+                                     ('channel_id', '<u2'), ('unit_id', 'u1'),
+                                     ('dummy', 'u1', (13,)),
+                                     ('waveform', '<i2', (wavelength,))])
+            p = data_pos + record_dtype.itemsize * sum(counts[:unit_index])
+            records = self._memmap[p:p + record_dtype.itemsize * counts[unit_index]]
+            pieces.append(records.view(record_dtype)['waveform'])
+        if len(pieces) == 0:
+            return None
+        waveforms = np.concatenate(pieces)
+        times = self._get_times(ep['spk_blocks'], unit_index, 5)
+        if waveforms.shape[0] != times.size:
+            # the waveforms do not match the spike times
+            return None
+        if t_start is not None or t_stop is not None:
+            keep = self._time_mask(times, self._spike_tick, t_start, t_stop)
+            waveforms = waveforms[keep]
+        return waveforms[:, None, :]
+
+    def _event_count(self, block_index, seg_index, event_channel_index):
+        blocks = self._episodes[seg_index]['evt_blocks']
+        return int(sum(counts[event_channel_index] for _, counts in blocks
+                       if event_channel_index < len(counts)))
+
+    def _get_event_timestamps(self, block_index, seg_index, event_channel_index, t_start, t_stop):
+        times = self._get_times(self._episodes[seg_index]['evt_blocks'],
+                                event_channel_index, 4)
+        timestamps = self._filter_times(times, self._event_tick, t_start, t_stop)
+        durations = None
+        labels = np.zeros(timestamps.size, dtype='U')
+        return timestamps, durations, labels
+
+    def _rescale_event_timestamp(self, event_timestamps, dtype):
+        event_times = event_timestamps.astype(dtype)
+        event_times *= self._event_tick
+        return event_times
+
+    def _get_times(self, blocks, channel, stride):
+        """
+        Return the raw times (int32) of a channel of the event or spike
+        blocks of an episode, stride is the number of bytes of an event.
+        """
+        pieces = []
+        for data_pos, counts in blocks:
+            if channel >= len(counts):
+                continue
+            p = data_pos + stride * sum(counts[:channel])
+            pieces.append(self._memmap[p:p + 4 * counts[channel]].view('<i4'))
+        if len(pieces) == 0:
+            return np.zeros(0, dtype='int32')
+        elif len(pieces) == 1:
+            return pieces[0]
+        return np.concatenate(pieces)
+
+    def _time_mask(self, times, tick, t_start, t_stop):
+        keep = np.ones(times.size, dtype='bool')
+        if t_start is not None:
+            keep &= times >= t_start / tick
+        if t_stop is not None:
+            keep &= times <= t_stop / tick
+        return keep
+
+    def _filter_times(self, times, tick, t_start, t_stop):
+        if t_start is not None or t_stop is not None:
+            times = times[self._time_mask(times, tick, t_start, t_stop)]
+        return times
+
+
+def _read_string(buf, pos, max_length=None):
+    """
+    Return the pascal string (uint8 length and the characters) at pos.
+    """
+    length = int(buf[pos])
+    if max_length is not None:
+        length = min(length, max_length)
+    return buf[pos + 1:pos + 1 + length].tobytes().decode('latin-1').strip()
+
+
+def _channel_mask(k_sampling):
+    """
+    Return the numbers of the channels of the successive samples of an
+    aggregate, from the sub-sampling factors of the channels (0 for the
+    event channels, which have no samples).
+
+    Converted from 'TseqBlock.BuildMask' of 'ElphyFormat.pas' in the Elphy
+    source code.
+    """
+    lcm = 1
+    for k in k_sampling:
+        if k > 0:
+            lcm = lcm * k // gcd(lcm, k)
+    count = sum(lcm // k for k in k_sampling if k > 0)
+    mask = []
+    i = 0
+    while len(mask) < count:
+        for c, k in enumerate(k_sampling):
+            if k > 0 and i % k == 0:
+                mask.append(c + 1)
+                if len(mask) >= count:
+                    break
+        i += 1
+    return np.array(mask, dtype='int64')
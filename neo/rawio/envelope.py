@@ -0,0 +1,159 @@
+# -*- coding: utf-8 -*-
+"""
+Envelope pyramid of signals for neo.rawio.
+
+To draw a long recording zoomed out only the min and max of the samples
+of each pixel are needed. `SignalEnvelope` keeps, for each channel of a
+signal, the min and max (and optionally the mean and RMS) of bins of
+min_decimation samples, and of bins of 2, 4, 8... times more samples.
+It is built in one pass over the signal and then an envelope of n_pixels
+is given in a time proportional to n_pixels.
+
+See `BaseRawIO.build_analogsignal_envelope()` and
+`BaseRawIO.get_analogsignal_envelope()`.
+
+"""
+from __future__ import print_function, division, absolute_import
+
+import numpy as np
+
+
+def compute_bins(raw_signal, decimation, with_mean=False):
+    """
+    Return a dict of the min and max (and the sum and the sum of squares
+    when with_mean) of bins of decimation samples of raw_signal (2D).
+    The last bin can be incomplete.
+    """
+    size, nb_channel = raw_signal.shape
+    nb_full = size // decimation
+    bins = {}
+    full = raw_signal[:nb_full * decimation].reshape(nb_full, decimation, nb_channel)
+    rest = raw_signal[nb_full * decimation:]
+    for name, func in (('min', np.min), ('max', np.max)):
+        values = func(full, axis=1)
+        if rest.shape[0] > 0:
+            values = np.concatenate([values, func(rest, axis=0, keepdims=True)])
+        bins[name] = values
+    if with_mean:
+        for name, op in (('sum', lambda x: x), ('sumsq', np.square)):
+            values = op(full.astype('float64')).sum(axis=1)
+            if rest.shape[0] > 0:
+                values = np.concatenate([values, op(rest.astype('float64')).sum(
+                    axis=0, keepdims=True)])
+            bins[name] = values
+    return bins
+
+
+_combine = {'min': np.minimum, 'max': np.maximum, 'sum': np.add, 'sumsq': np.add}
+
+
+def _downsample(bins):
+    """
+    Return the bins merged by pairs.
+    """
+    new_bins = {}
+    for name, values in bins.items():
+        n = values.shape[0]
+        merged = _combine[name](values[0:n - 1:2], values[1:n:2])
+        if n % 2:
+            merged = np.concatenate([merged, values[-1:]])
+        new_bins[name] = merged
+    return new_bins
+
+
+def bins_to_envelope(bins, counts):
+    """
+    Return the envelope {'min', 'max'[, 'mean', 'rms']} of bins of counts
+    samples.
+    """
+    envelope = {'min': bins['min'], 'max': bins['max']}
+    if 'sum' in bins:
+        counts = counts[:, np.newaxis]
+        envelope['mean'] = bins['sum'] / counts
+        envelope['rms'] = np.sqrt(bins['sumsq'] / counts)
+    return envelope
+
+
+class SignalEnvelope(object):
+    """
+    Envelope pyramid of a signal of nb_channel channels.
+
+    Usage:
+        >>> envelope = SignalEnvelope(nb_channel=16, min_decimation=1024)
+        >>> for raw_chunk in chunks:
+        ...     envelope.feed(raw_chunk)
+        >>> envelope.finalize()
+        >>> decimation, bin_start, env = envelope.query(i_start, i_stop, n_pixels=1000)
+
+    Chunks can have any size. The level k of the pyramid contains bins of
+    min_decimation * 2 ** k samples (the last bin of a level can be
+    incomplete).
+    """
+
+    def __init__(self, nb_channel, min_decimation=2 ** 10, with_mean=False):
+        self.nb_channel = nb_channel
+        self.min_decimation = int(min_decimation)
+        self.with_mean = with_mean
+        self.size = 0
+        self.levels = None
+        self._bins = []
+        self._rest = None
+
+    def feed(self, raw_chunk):
+        """Add the next chunk (n_samples, nb_channel) of the signal."""
+        assert self.levels is None, 'the envelope is already finalized'
+        self.size += raw_chunk.shape[0]
+        if self._rest is not None:
+            raw_chunk = np.concatenate([self._rest, raw_chunk])
+        nb_full = raw_chunk.shape[0] // self.min_decimation * self.min_decimation
+        if nb_full > 0:
+            self._bins.append(compute_bins(raw_chunk[:nb_full], self.min_decimation,
+                                           self.with_mean))
+        # copy so the rest does not keep the whole chunk in memory
+        self._rest = np.array(raw_chunk[nb_full:])
+
+    def finalize(self):
+        """Build the levels of the pyramid once the whole signal is fed."""
+        if self._rest is not None and self._rest.shape[0] > 0:
+            self._bins.append(compute_bins(self._rest, self.min_decimation, self.with_mean))
+        if len(self._bins) == 0:
+            self.levels = []
+        else:
+            bins = {name: np.concatenate([b[name] for b in self._bins])
+                    for name in self._bins[0]}
+            self.levels = [bins]
+            while bins['min'].shape[0] > 1:
+                bins = _downsample(bins)
+                self.levels.append(bins)
+        self._bins = []
+        self._rest = None
+
+    def decimation(self, level):
+        return self.min_decimation * 2 ** level
+
+    def query(self, i_start, i_stop, n_pixels):
+        """
+        Return (decimation, bin_start, envelope) for the samples between
+        i_start and i_stop, with between n_pixels and 2 * n_pixels bins.
+
+        The bins are aligned on multiples of decimation so the first and last
+        bins can contain samples outside i_start:i_stop.
+        Return None when the wanted decimation is below min_decimation, the
+        envelope must then be computed from the signal.
+        """
+        assert self.levels is not None, 'the envelope is not finalized'
+        wanted = (i_stop - i_start) / n_pixels
+        if wanted < self.min_decimation or len(self.levels) == 0:
+            return None
+        level = min(int(np.log2(wanted / self.min_decimation)), len(self.levels) - 1)
+        decimation = self.decimation(level)
+        bin_start = i_start // decimation
+        bin_stop = min(-(-i_stop // decimation), self.levels[level]['min'].shape[0])
+        bins = {name: values[bin_start:bin_stop]
+                for name, values in self.levels[level].items()}
+        return decimation, bin_start, bins_to_envelope(bins, self._counts(
+            decimation, bin_start, bin_stop))
+
+    def _counts(self, decimation, bin_start, bin_stop):
+        starts = np.arange(bin_start, bin_stop) * decimation
+        return np.minimum(starts + decimation, self.size) - starts
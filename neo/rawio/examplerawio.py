@@ -84,6 +84,7 @@ class ExampleRawIO(BaseRawIO):
     """
     extensions = ['fake']
     rawmode = 'one-file'
+    support_concurrent_reads = True
 
     def __init__(self, filename=''):
         BaseRawIO.__init__(self)
@@ -273,7 +274,7 @@ class ExampleRawIO(BaseRawIO):
 
         # the same clip t_start/t_start must be used in _spike_raw_waveforms()
 
-        ts_start = (self._segment_t_start(block_index, seg_index) * 10000)
+        ts_start = int(self._segment_t_start(block_index, seg_index) * 10000)
 
         spike_timestamps = np.arange(0, 10000, 500) + ts_start
 
@@ -313,8 +314,8 @@ class ExampleRawIO(BaseRawIO):
         ts = self._get_spike_timestamps(block_index, seg_index, unit_index, t_start, t_stop)
         nb_spike = ts.size
 
-        np.random.seed(2205)  # a magic number (my birthday)
-        waveforms = np.random.randint(low=-2**4, high=2**4, size=nb_spike * 50, dtype='int16')
+        rng = np.random.RandomState(2205)  # a magic number (my birthday)
+        waveforms = rng.randint(low=-2**4, high=2**4, size=nb_spike * 50, dtype='int16')
         waveforms = waveforms.reshape(nb_spike, 1, 50)
         return waveforms
 
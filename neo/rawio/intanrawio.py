@@ -34,6 +34,7 @@ class IntanRawIO(BaseRawIO):
     """
     extensions = ['rhd', 'rhs']
     rawmode = 'one-file'
+    support_concurrent_reads = True
 
     def __init__(self, filename=''):
         BaseRawIO.__init__(self)
@@ -35,6 +35,7 @@ class MicromedRawIO(BaseRawIO):
     """
     extensions = ['trc', 'TRC']
     rawmode = 'one-file'
+    support_concurrent_reads = True
 
     def __init__(self, filename=''):
         BaseRawIO.__init__(self)
@@ -51,6 +51,7 @@ class NeuralynxRawIO(BaseRawIO):
     """
     extensions = ['nse', 'ncs', 'nev', 'ntt']
     rawmode = 'one-dir'
+    support_concurrent_reads = True
 
     def __init__(self, dirname='', **kargs):
         self.dirname = dirname
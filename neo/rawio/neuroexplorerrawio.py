@@ -37,6 +37,7 @@ import datetime
 class NeuroExplorerRawIO(BaseRawIO):
     extensions = ['nex']
     rawmode = 'one-file'
+    support_concurrent_reads = True
 
     def __init__(self, filename=''):
         BaseRawIO.__init__(self)
@@ -28,6 +28,7 @@ from xml.etree import ElementTree
 class NeuroScopeRawIO(BaseRawIO):
     extensions = ['xml', 'dat']
     rawmode = 'one-file'
+    support_concurrent_reads = True
 
     def __init__(self, filename=''):
         BaseRawIO.__init__(self)
@@ -64,6 +64,7 @@ class OpenEphysRawIO(BaseRawIO):
     """
     extensions = []
     rawmode = 'one-dir'
+    support_concurrent_reads = True
 
     def __init__(self, dirname=''):
         BaseRawIO.__init__(self)
@@ -36,6 +36,7 @@ import datetime
 class PlexonRawIO(BaseRawIO):
     extensions = ['plx']
     rawmode = 'one-file'
+    support_concurrent_reads = True
 
     def __init__(self, filename=''):
         BaseRawIO.__init__(self)
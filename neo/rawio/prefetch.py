@@ -0,0 +1,230 @@
+# -*- coding: utf-8 -*-
+"""
+Read-ahead of signal chunks for neo.rawio.
+
+When a file is read front to back with `get_analogsignal_chunk()`, each read
+waits for the disk (page faults of a memmap, HDF5 I/O...) while the CPU is
+idle, and then the disk waits while the chunk is processed.
+`PrefetchRawIO` wraps a RawIO and reads the next chunks in a background
+thread so reading overlaps with the processing of the consumer.
+
+The next chunks are either guessed, when a request starts where the previous
+one (same block, segment and channels) stopped the next ones are supposed to
+follow with the same size, or given by an explicit schedule.
+
+Usage:
+    >>> reader = PrefetchRawIO(PlexonRawIO(filename='File_plexon_1.plx'),
+                               nb_chunks=4)
+    >>> reader.parse_header()
+    >>> for i_start in range(0, size, 10000):
+    ...     raw_chunk = reader.get_analogsignal_chunk(block_index=0, seg_index=0,
+    ...                     i_start=i_start, i_stop=min(i_start + 10000, size))
+    >>> reader.close()
+
+The background thread reads the RawIO while the main thread can read it too.
+When the RawIO does not support_concurrent_reads (it reads from a shared file
+handle) the reads of both threads are serialized with
+`concurrent_reads_lock()`, the chunks are still read while the main thread
+processes the previous ones.
+
+"""
+from __future__ import print_function, division, absolute_import
+
+from collections import OrderedDict
+import threading
+
+import numpy as np
+
+from .baserawio import concurrent_reads_lock
+
+try:
+    from concurrent.futures import ThreadPoolExecutor
+
+    HAVE_FUTURES = True
+except ImportError:
+    HAVE_FUTURES = False
+
+
+class PrefetchRawIO(object):
+    """
+    Wrapper of a RawIO reading the next signal chunks in a background thread.
+
+    All attributes and methods of the RawIO are available on the wrapper,
+    only `get_analogsignal_chunk()` is changed.
+
+    *Args*:
+        :rawio: the RawIO to wrap.
+        :nb_chunks: number of chunks read in advance, this bounds the memory
+            used by the buffer to nb_chunks chunks.
+        :schedule: None or a list of requests (block_index, seg_index,
+            i_start, i_stop, channel_indexes) that will be done in this order,
+            see `set_schedule()`. When None the sequential accesses are
+            detected.
+    """
+
+    def __init__(self, rawio, nb_chunks=4, schedule=None):
+        assert HAVE_FUTURES, 'PrefetchRawIO requires concurrent.futures (futures on Python 2)'
+        assert nb_chunks > 0, 'nb_chunks must be positive'
+        self.rawio = rawio
+        self.nb_chunks = int(nb_chunks)
+        self._executor = ThreadPoolExecutor(max_workers=1)
+        self._lock = threading.Lock()
+        # request key -> future of the prefetched chunk, in the reading order
+        self._buffer = OrderedDict()
+        self._last_request = None
+        self._hits = 0
+        self._misses = 0
+        self.set_schedule(schedule)
+
+    def __getattr__(self, name):
+        # only called for attributes not found on the wrapper
+        if name == 'rawio':
+            raise AttributeError(name)
+        return getattr(self.rawio, name)
+
+    def __repr__(self):
+        return 'PrefetchRawIO({!r})'.format(self.rawio)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def close(self):
+        """Cancel the pending reads and stop the background thread."""
+        self._drop_buffer(keep=())
+        self._executor.shutdown(wait=True)
+
+    def set_schedule(self, schedule):
+        """
+        Give the list of requests (block_index, seg_index, i_start, i_stop,
+        channel_indexes) that will be done in this order.
+
+        After each request of the schedule the next nb_chunks requests are
+        read in advance. Requests not in the schedule are read directly.
+        None goes back to the detection of sequential accesses.
+        """
+        if schedule is None:
+            self._schedule = None
+        else:
+            self._schedule = [self._request(*request) for request in schedule]
+            self._schedule_index = {}
+            for i, (key, _) in enumerate(self._schedule):
+                self._schedule_index.setdefault(key, i)
+        self._last_request = None
+        self._drop_buffer(keep=())
+        if self._schedule is not None:
+            self._prefetch(self._schedule[:self.nb_chunks])
+
+    def prefetch_stats(self):
+        """
+        Return a dict with the number of requests served by the buffer (hits),
+        the number of requests read directly (misses) and the number of
+        chunks in the buffer.
+        """
+        with self._lock:
+            return {'hits': self._hits, 'misses': self._misses,
+                    'nb_buffered': len(self._buffer)}
+
+    def get_analogsignal_chunk(self, block_index=0, seg_index=0, i_start=None, i_stop=None,
+                               channel_indexes=None, channel_names=None, channel_ids=None):
+        """
+        Return a chunk of raw signal, see `BaseRawIO.get_analogsignal_chunk()`.
+
+        The chunk is taken from the buffer when it was read in advance, and
+        the next chunks are read in advance.
+        """
+        channel_indexes = self.rawio._get_channel_indexes(channel_indexes, channel_names,
+                                                          channel_ids)
+        key, request = self._request(block_index, seg_index, i_start, i_stop, channel_indexes)
+
+        with self._lock:
+            future = self._buffer.pop(key, None)
+            if future is None:
+                self._misses += 1
+            else:
+                self._hits += 1
+
+        next_requests = self._next_requests(key, request)
+        if next_requests is not None:
+            self._prefetch(next_requests)
+
+        if future is None:
+            with concurrent_reads_lock(self.rawio):
+                return self.rawio.get_analogsignal_chunk(*request)
+        return future.result()
+
+    def _request(self, block_index, seg_index, i_start, i_stop, channel_indexes):
+        """
+        Return the hashable key and the arguments of a request with explicit
+        i_start and i_stop.
+        """
+        if i_start is None:
+            i_start = 0
+        if i_stop is None:
+            i_stop = self.rawio.get_signal_size(block_index, seg_index, channel_indexes)
+        if channel_indexes is None:
+            channel_key = None
+        elif isinstance(channel_indexes, slice):
+            channel_key = (channel_indexes.start, channel_indexes.stop, channel_indexes.step)
+        else:
+            channel_key = tuple(np.asarray(channel_indexes).tolist())
+        key = (block_index, seg_index, int(i_start), int(i_stop), channel_key)
+        return key, (block_index, seg_index, i_start, i_stop, channel_indexes)
+
+    def _next_requests(self, key, request):
+        """
+        Return the list of the (key, request) expected after the request key,
+        or None when the buffer must be kept as it is.
+        """
+        if self._schedule is not None:
+            i = self._schedule_index.get(key)
+            if i is None:
+                # out of schedule
+                return None
+            return self._schedule[i + 1:i + 1 + self.nb_chunks]
+
+        last, self._last_request = self._last_request, key
+        block_index, seg_index, i_start, i_stop, channel_key = key
+        # a sequential access starts where the previous request stopped
+        if last is None or last[:2] != key[:2] or last[4] != channel_key or \
+                last[3] != i_start or i_stop <= i_start:
+            return []
+
+        channel_indexes = request[4]
+        size = self.rawio.get_signal_size(block_index, seg_index, channel_indexes)
+        step = i_stop - i_start
+        next_requests = []
+        for k in range(self.nb_chunks):
+            start = i_stop + k * step
+            if start >= size:
+                break
+            next_requests.append(self._request(block_index, seg_index, start,
+                                               min(start + step, size), channel_indexes))
+        return next_requests
+
+    def _prefetch(self, next_requests):
+        """
+        Submit the reads of next_requests not already in the buffer and drop
+        the buffered chunks that are not expected anymore.
+        """
+        keys = [key for key, _ in next_requests]
+        self._drop_buffer(keep=keys)
+        with self._lock:
+            for key, request in next_requests:
+                if key not in self._buffer:
+                    self._buffer[key] = self._executor.submit(self._read, request)
+
+    def _read(self, request):
+        with concurrent_reads_lock(self.rawio):
+            raw_chunk = self.rawio.get_analogsignal_chunk(*request)
+            # a chunk of a memmap is only read from the disk when it is used,
+            # so it is copied here to be read in the background thread
+            return np.require(raw_chunk, requirements=['O'])
+
+    def _drop_buffer(self, keep):
+        with self._lock:
+            for key in list(self._buffer.keys()):
+                if key not in keep:
+                    self._buffer.pop(key).cancel()
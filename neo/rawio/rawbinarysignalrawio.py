@@ -31,6 +31,7 @@ import sys
 class RawBinarySignalRawIO(BaseRawIO):
     extensions = ['raw', '*']
     rawmode = 'one-file'
+    support_concurrent_reads = True
 
     def __init__(self, filename='', dtype='int16', sampling_rate=10000.,
                  nb_channel=2, signal_gain=1., signal_offset=0., bytesoffset=0):
@@ -28,6 +28,7 @@ import sys
 class RawMCSRawIO(BaseRawIO):
     extensions = ['raw']
     rawmode = 'one-file'
+    support_concurrent_reads = True
 
     def __init__(self, filename=''):
         BaseRawIO.__init__(self)
@@ -34,6 +34,7 @@ class Spike2RawIO(BaseRawIO):
     """
     extensions = ['smr']
     rawmode = 'one-file'
+    support_concurrent_reads = True
 
     def __init__(self, filename='', take_ideal_sampling_rate=False, ced_units=True):
         BaseRawIO.__init__(self)
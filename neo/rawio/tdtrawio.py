@@ -36,6 +36,7 @@ from collections import OrderedDict
 
 class TdtRawIO(BaseRawIO):
     rawmode = 'one-dir'
+    support_concurrent_reads = True
 
     def __init__(self, dirname='', sortname=''):
         """
@@ -0,0 +1,159 @@
+# -*- coding: utf-8 -*-
+"""
+Test cases of neo.rawio.asyncrawio, run by test_asyncrawio.
+
+They use the async/await syntax so this module can only be imported with
+Python >= 3.5.
+"""
+
+import asyncio
+import threading
+import time
+import unittest
+
+import numpy as np
+
+from neo.rawio.examplerawio import ExampleRawIO
+from neo.rawio.asyncrawio import AsyncRawIO
+
+
+class TestAsyncRawIO(unittest.TestCase):
+    def setUp(self):
+        self.loop = asyncio.new_event_loop()
+        self.reader = AsyncRawIO(ExampleRawIO(filename='fake'), max_workers=2)
+        self.loop.run_until_complete(self.reader.parse_header())
+
+    def tearDown(self):
+        self.loop.run_until_complete(self.reader.close())
+        self.loop.close()
+
+    def block_rawio(self, method_name):
+        '''
+        Make the method of the rawio wait for the returned threading.Event,
+        the calls are counted in the returned list.
+        '''
+        release = threading.Event()
+        calls = []
+        method = getattr(self.reader.rawio, method_name)
+
+        def wrapper(*args, **kargs):
+            calls.append(kargs)
+            release.wait(5.)
+            return method(*args, **kargs)
+        setattr(self.reader.rawio, method_name, wrapper)
+        return release, calls
+
+    def test_read(self):
+        reader = self.reader
+        assert reader.header['nb_block'] == 2
+        assert reader.signal_channels_count() == 16
+
+        async def read():
+            raw_chunk = await reader.get_analogsignal_chunk(block_index=0, seg_index=0,
+                                                            i_start=0, i_stop=1024,
+                                                            channel_indexes=[0, 3])
+            spike_timestamps = await reader.get_spike_timestamps(unit_index=1)
+            ev = await reader.get_event_timestamps(event_channel_index=0)
+            return raw_chunk, spike_timestamps, ev
+
+        raw_chunk, spike_timestamps, ev = self.loop.run_until_complete(read())
+        rawio = reader.rawio
+        np.testing.assert_array_equal(raw_chunk, rawio.get_analogsignal_chunk(
+            block_index=0, seg_index=0, i_start=0, i_stop=1024, channel_indexes=[0, 3]))
+        np.testing.assert_array_equal(spike_timestamps, rawio.get_spike_timestamps(unit_index=1))
+        np.testing.assert_array_equal(ev[0], rawio.get_event_timestamps()[0])
+        assert reader.inflight_count() == 0
+
+    def test_coalesce(self):
+        reader = self.reader
+        release, calls = self.block_rawio('get_analogsignal_chunk')
+
+        async def read():
+            tasks = [asyncio.ensure_future(reader.get_analogsignal_chunk(
+                i_start=0, i_stop=10, channel_indexes=channel_indexes), loop=self.loop)
+                for channel_indexes in ([1, 2], np.array([1, 2]), [1, 2], [3])]
+            await asyncio.sleep(0.05)
+            assert reader.inflight_count() == 2
+            release.set()
+            return await asyncio.gather(*tasks)
+
+        results = self.loop.run_until_complete(read())
+        assert len(calls) == 2
+        assert results[0] is results[1]
+        assert results[0] is results[2]
+        assert results[3].shape == (10, 1)
+        assert reader.inflight_count() == 0
+
+    def test_cancel(self):
+        reader = self.reader
+        release, calls = self.block_rawio('get_spike_timestamps')
+
+        async def read():
+            task1 = asyncio.ensure_future(reader.get_spike_timestamps(unit_index=0),
+                                          loop=self.loop)
+            task2 = asyncio.ensure_future(reader.get_spike_timestamps(unit_index=0),
+                                          loop=self.loop)
+            await asyncio.sleep(0.05)
+            # the other waiter still gets the result
+            task1.cancel()
+            await asyncio.sleep(0.05)
+            assert reader.inflight_count() == 1
+            release.set()
+            spike_timestamps = await task2
+            try:
+                await task1
+            except asyncio.CancelledError:
+                cancelled = True
+            else:
+                cancelled = False
+            return cancelled, spike_timestamps
+
+        cancelled, spike_timestamps = self.loop.run_until_complete(read())
+        assert cancelled
+        assert spike_timestamps.size == 20
+        assert len(calls) == 1
+        assert reader.inflight_count() == 0
+
+        release.clear()
+
+        async def read_cancelled():
+            task = asyncio.ensure_future(reader.get_spike_timestamps(unit_index=1),
+                                         loop=self.loop)
+            await asyncio.sleep(0.05)
+            task.cancel()
+            await asyncio.sleep(0.05)
+            release.set()
+            return reader.inflight_count()
+
+        # the last waiter cancels the request
+        assert self.loop.run_until_complete(read_cancelled()) == 0
+
+    def test_not_concurrent_rawio(self):
+        # the reads of a rawio without support_concurrent_reads never overlap
+        reader = self.reader
+        reader.rawio.support_concurrent_reads = False
+        lock = threading.Lock()
+        active = []
+        overlaps = []
+        method = reader.rawio.get_analogsignal_chunk
+
+        def wrapper(*args, **kargs):
+            with lock:
+                active.append(1)
+                overlaps.append(len(active) > 1)
+            time.sleep(0.01)
+            with lock:
+                active.pop()
+            return method(*args, **kargs)
+        reader.rawio.get_analogsignal_chunk = wrapper
+
+        async def read():
+            return await asyncio.gather(*[reader.get_analogsignal_chunk(
+                i_start=0, i_stop=10, channel_indexes=[c]) for c in range(4)])
+
+        results = self.loop.run_until_complete(read())
+        for c, raw_chunk in enumerate(results):
+            np.testing.assert_array_equal(raw_chunk, method(i_start=0, i_stop=10,
+                                                            channel_indexes=[c]))
+        assert len(overlaps) == 4
+        assert not any(overlaps)
@@ -272,6 +272,10 @@ def read_spike_times(reader):
                 spike_times = reader.rescale_spike_timestamp(spike_timestamp, 'float64')
                 assert spike_times.dtype == 'float64'
 
+                gain, offset = reader.get_spike_timestamp_clock()
+                assert np.allclose(spike_timestamp * gain + offset, spike_times,
+                                   rtol=1e-9, atol=1e-9)
+
                 if spike_times.size > 3:
                     # load only one spike by forcing limits
                     t_start = spike_times[1] - 0.001
@@ -347,6 +351,10 @@ def read_events(reader):
                 ev_times = reader.rescale_event_timestamp(ev_timestamps, dtype='float64')
                 assert ev_times.dtype == 'float64'
 
+                gain, offset = reader.get_event_timestamp_clock()
+                assert np.allclose(ev_timestamps * gain + offset, ev_times,
+                                   rtol=1e-9, atol=1e-9)
+
 
 def has_annotations(reader):
     assert hasattr(reader, 'raw_annotations'), 'raw_annotation are not set'
@@ -0,0 +1,124 @@
+# -*- coding: utf-8 -*-
+
+# needed for python 3 compatibility
+from __future__ import unicode_literals, print_function, division, absolute_import
+
+import datetime
+import os
+import shutil
+import struct
+import tempfile
+import unittest
+
+import numpy as np
+
+from neo.rawio.alphaomegarawio import AlphaOmegaRawIO
+
+from neo.rawio.tests.common_rawio_test import BaseTestRawIO
+from neo.rawio.tests import rawio_compliance as compliance
+
+
+class TestAlphaOmegaRawIO(BaseTestRawIO, unittest.TestCase, ):
+    rawioclass = AlphaOmegaRawIO
+    files_to_download = [
+        'File_AlphaOmega_1.map',
+        'File_AlphaOmega_2.map',
+    ]
+    entities_to_test = files_to_download
+
+
+def write_map_file(filename, rec_datetime, channels, data_blocks):
+    """
+    Write a .map file with a header block, one channel block per entry of
+    channels, a (num, is_analog, mode, sampling rate in kHz, name) tuple, and
+    one type 5 data block per entry of data_blocks, a (num, time stamp,
+    int16 samples) tuple.
+    """
+    def block(type_block, payload):
+        return struct.pack('<Hcx', len(payload) + 4, type_block) + payload
+
+    dt = rec_datetime
+    blocks = [block(b'h', struct.pack(
+        '<lhBBBBBBHBxdd', 0, 7, dt.hour, dt.minute, dt.second,
+        dt.microsecond // 10000, dt.day, dt.month, dt.year, 0, 0., 0.))]
+    # a block of a type without description is skipped
+    blocks.append(block(b'b', b'\x00' * 6))
+    for num, is_analog, mode, sampling_rate, name in channels:
+        payload = struct.pack('<lhhhhh', 0, is_analog, 1, num, 0, mode)
+        name = name.encode('latin-1')
+        if is_analog:
+            payload += struct.pack('<2xffhhfh32s', 1., sampling_rate, 0, 0, 0., 0, name)
+        else:
+            payload += struct.pack('<fhfh32s', sampling_rate, 0, 0., 0, name)
+        blocks.append(block(b'2', payload))
+    for num, time_stamp, samples in data_blocks:
+        payload = b''.join([struct.pack('<h', num),
+                            np.asarray(samples, dtype='<i2').tobytes(),
+                            struct.pack('<l', time_stamp)])
+        blocks.append(block(b'5', payload))
+    with open(filename, 'wb') as f:
+        f.write(b''.join(blocks))
+
+
+class TestAlphaOmegaRawIOGeneratedFiles(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.filename = os.path.join(self.tmpdir, 'test.map')
+        self.rec_datetime = datetime.datetime(2003, 3, 12, 14, 25, 31, 470000)
+        channels = [(0, 1, 0, 20., 'EEG 1'),
+                    (1, 1, 0, 20., 'no data'),
+                    (2, 0, 0, 0.5, 'Digital 2'),
+                    (3, 1, 128, 10., 'EEG 3')]
+        rng = np.random.RandomState(0)
+        self.samples = {num: rng.randint(-2000, 2000, size)
+                        for num, size in [(0, 150), (2, 12), (3, 80)]}
+        # interleaved blocks of the channels
+        data_blocks = []
+        for b in range(3):
+            data_blocks.append((0, 40 + 50 * b, self.samples[0][50 * b:50 * (b + 1)]))
+            data_blocks.append((3, 10 + 40 * b, self.samples[3][40 * b:40 * (b + 1)]))
+        data_blocks.append((2, 3, self.samples[2]))
+        write_map_file(self.filename, self.rec_datetime, channels, data_blocks)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_read(self):
+        reader = AlphaOmegaRawIO(filename=self.filename)
+        reader.parse_header()
+        compliance.header_is_total(reader)
+        compliance.count_element(reader)
+        compliance.read_analogsignals(reader)
+        compliance.has_annotations(reader)
+
+        sig_channels = reader.header['signal_channels']
+        self.assertEqual(list(sig_channels['name']), ['EEG 1', 'Digital 2', 'EEG 3'])
+        self.assertEqual(list(sig_channels['id']), [0, 2, 3])
+        self.assertEqual(list(sig_channels['sampling_rate']), [20000., 500., 10000.])
+        self.assertEqual(list(sig_channels['group_id']), [0, 1, 2])
+
+        for c, (num, t_start) in enumerate([(0, 40 / 20000.), (2, 3 / 500.),
+                                            (3, 10 / 10000.)]):
+            samples = self.samples[num]
+            self.assertEqual(reader.get_signal_size(0, 0, [c]), len(samples))
+            self.assertEqual(reader.get_signal_t_start(0, 0, [c]), t_start)
+            raw = reader.get_analogsignal_chunk(channel_indexes=[c])
+            np.testing.assert_array_equal(raw[:, 0], samples)
+            # across the data blocks
+            raw = reader.get_analogsignal_chunk(i_start=7, i_stop=len(samples) - 3,
+                                                channel_indexes=[c])
+            np.testing.assert_array_equal(raw[:, 0], samples[7:-3])
+
+        self.assertEqual(reader.segment_t_start(0, 0), 10 / 10000.)
+        self.assertEqual(reader.segment_t_stop(0, 0), 3 / 500. + 12 / 500.)
+
+        bl_ann = reader.raw_annotations['blocks'][0]
+        self.assertEqual(bl_ann['rec_datetime'], self.rec_datetime)
+        self.assertEqual(bl_ann['alphamap_version'], 7)
+        sig_anns = bl_ann['segments'][0]['signals']
+        self.assertEqual([ann['channel_type'] for ann in sig_anns],
+                         ['continuous(Mode0)', 'digital', 'continuous(Mode128)'])
+
+
+if __name__ == "__main__":
+    unittest.main()
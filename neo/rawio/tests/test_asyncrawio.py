@@ -0,0 +1,22 @@
+# -*- coding: utf-8 -*-
+"""
+Tests of neo.rawio.asyncrawio
+"""
+
+# needed for python 3 compatibility
+from __future__ import unicode_literals, print_function, division, absolute_import
+
+import sys
+import unittest
+
+if sys.version_info >= (3, 5):
+    # the test cases use async/await, which is a SyntaxError before Python 3.5
+    from neo.rawio.tests.asyncrawio_cases import TestAsyncRawIO  # noqa
+else:
+    @unittest.skip('requires Python >= 3.5')
+    class TestAsyncRawIO(unittest.TestCase):
+        pass
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,83 @@
+# -*- coding: utf-8 -*-
+
+# needed for python 3 compatibility
+from __future__ import unicode_literals, print_function, division, absolute_import
+
+import os
+import shutil
+import struct
+import tempfile
+import unittest
+
+import numpy as np
+
+from neo.rawio.brainwaredamrawio import BrainwareDamRawIO
+
+from neo.rawio.tests.common_rawio_test import BaseTestRawIO
+from neo.rawio.tests import rawio_compliance as compliance
+
+
+class TestBrainwareDamRawIO(BaseTestRawIO, unittest.TestCase, ):
+    rawioclass = BrainwareDamRawIO
+    files_to_download = [
+        'block_300ms_4rep_1clust_part_ch1.dam',
+        'interleaved_500ms_5rep_ch2.dam',
+        'long_170s_1rep_1clust_ch2.dam',
+        'multi_500ms_mulitrep_ch1.dam',
+        'random_500ms_12rep_noclust_part_ch2.dam',
+        'sequence_500ms_5rep_ch2.dam',
+    ]
+    entities_to_test = files_to_download
+
+
+def write_dam_file(filename, sweeps):
+    """
+    Write a .dam file, sweeps is a list of (timestamp in days, stim_index,
+    params as a list of (name, value), int16 samples).
+    """
+    with open(filename, 'wb') as f:
+        for timestamp, stim_index, params, samples in sweeps:
+            f.write(struct.pack('<dhh', timestamp, stim_index, len(params)))
+            for name, _ in params:
+                name = name.encode('latin-1')
+                f.write(struct.pack('<B', len(name)) + name)
+            f.write(struct.pack('<{}f'.format(len(params)), *[v for _, v in params]))
+            f.write(struct.pack('<i', len(samples)))
+            f.write(np.asarray(samples, dtype='<i2').tobytes())
+
+
+class TestBrainwareDamRawIOGeneratedFiles(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.filename = os.path.join(self.tmpdir, 'test.dam')
+        rng = np.random.RandomState(0)
+        self.sweeps = [(736000.5 + i, 3 - i, [('freq', 1000. * i), ('atten', 20.)],
+                        rng.randint(-500, 500, 40 + i)) for i in range(3)]
+        write_dam_file(self.filename, self.sweeps)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_read(self):
+        reader = BrainwareDamRawIO(filename=self.filename)
+        reader.parse_header()
+        compliance.header_is_total(reader)
+        compliance.count_element(reader)
+        compliance.read_analogsignals(reader)
+        compliance.has_annotations(reader)
+
+        self.assertEqual(reader.segment_count(0), 3)
+        for seg_index, (timestamp, stim_index, params, samples) in enumerate(self.sweeps):
+            seg_ann = reader.raw_annotations['blocks'][0]['segments'][seg_index]
+            self.assertEqual(seg_ann['stim_index'], stim_index)
+            self.assertEqual(seg_ann['freq'], params[0][1])
+            self.assertEqual(reader.segment_t_start(0, seg_index), timestamp * 86400.)
+            self.assertEqual(reader.get_signal_size(0, seg_index), len(samples))
+            raw = reader.get_analogsignal_chunk(seg_index=seg_index)
+            np.testing.assert_array_equal(raw[:, 0], samples)
+            raw = reader.get_analogsignal_chunk(seg_index=seg_index, i_start=5, i_stop=30)
+            np.testing.assert_array_equal(raw[:, 0], samples[5:30])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,89 @@
+# -*- coding: utf-8 -*-
+
+# needed for python 3 compatibility
+from __future__ import unicode_literals, print_function, division, absolute_import
+
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+
+from neo.rawio.brainwaref32rawio import BrainwareF32RawIO
+
+from neo.rawio.tests.common_rawio_test import BaseTestRawIO
+from neo.rawio.tests import rawio_compliance as compliance
+
+
+class TestBrainwareF32RawIO(BaseTestRawIO, unittest.TestCase, ):
+    rawioclass = BrainwareF32RawIO
+    files_to_download = [
+        'block_300ms_4rep_1clust_part_ch1.f32',
+        'block_500ms_5rep_empty_fullclust_ch1.f32',
+        'block_500ms_5rep_empty_partclust_ch1.f32',
+        'interleaved_500ms_5rep_ch2.f32',
+        'interleaved_500ms_5rep_nospikes_ch1.f32',
+        'multi_500ms_mulitrep_ch1.f32',
+        'random_500ms_12rep_noclust_part_ch2.f32',
+        'sequence_500ms_5rep_ch2.f32',
+    ]
+    entities_to_test = files_to_download
+
+
+def write_f32_file(filename, conditions):
+    """
+    Write a .f32 file, conditions is a list of (sweep length in ms, parameter
+    values, list of the spike times in ms of each sweep).
+    """
+    values = []
+    for sweep_length, params, sweeps in conditions:
+        values += [-2, sweep_length, len(params)] + list(params)
+        for spike_times in sweeps:
+            values += [-1] + list(spike_times)
+    np.array(values, dtype='<f4').tofile(filename)
+
+
+class TestBrainwareF32RawIOGeneratedFiles(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.filename = os.path.join(self.tmpdir, 'test.f32')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_read(self):
+        # a parameter value of -1 or -2 is not a marker
+        conditions = [(500., [1., -1.], [[1.5, 20.25, 300.], [7.]]),
+                      (300., [-2.], [[], [2.5, 299.]])]
+        write_f32_file(self.filename, conditions)
+        reader = BrainwareF32RawIO(filename=self.filename)
+        reader.parse_header()
+        compliance.header_is_total(reader)
+        compliance.count_element(reader)
+        compliance.read_spike_times(reader)
+        compliance.has_annotations(reader)
+
+        self.assertEqual(reader.segment_count(0), 4)
+        # like BrainwareF32IO did, the sweep length of a sweep is the last
+        # one read before its end, so the last sweep of a condition gets the
+        # sweep length of the next condition
+        t_stops = [.5, .3, .3, .3]
+        seg_index = 0
+        for sweep_length, params, sweeps in conditions:
+            for spike_times in sweeps:
+                seg_ann = reader.raw_annotations['blocks'][0]['segments'][seg_index]
+                self.assertEqual([seg_ann['Param%d' % i] for i in range(len(params))], params)
+                self.assertEqual(reader.segment_t_stop(0, seg_index), t_stops[seg_index])
+                self.assertEqual(reader.spike_count(seg_index=seg_index), len(spike_times))
+                ts = reader.get_spike_timestamps(seg_index=seg_index)
+                times = reader.rescale_spike_timestamp(ts, dtype='float64')
+                np.testing.assert_allclose(times, np.array(spike_times) / 1000.)
+                seg_index += 1
+
+        ts = reader.get_spike_timestamps(seg_index=0, t_start=0.01, t_stop=0.1)
+        np.testing.assert_array_equal(ts, [20.25])
+
+
+if __name__ == "__main__":
+    unittest.main()
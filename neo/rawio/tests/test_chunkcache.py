@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+"""
+Tests of neo.rawio.chunkcache and of the chunk cache of BaseRawIO
+"""
+
+# needed for python 3 compatibility
+from __future__ import unicode_literals, print_function, division, absolute_import
+
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+
+from neo.rawio.chunkcache import ChunkCache
+from neo.rawio.rawbinarysignalrawio import RawBinarySignalRawIO
+from neo.rawio.examplerawio import ExampleRawIO
+
+
+class TestChunkCache(unittest.TestCase):
+    def test_lru(self):
+        cache = ChunkCache(max_bytes=3 * 80, chunk_size=10)
+        decoded = []
+
+        def decode(i):
+            def f():
+                decoded.append(i)
+                return np.full(10, i, dtype='float64')
+            return f
+
+        for i in (0, 1, 2, 0, 3, 0, 1):
+            chunk = cache.get(i, decode(i))
+            assert np.all(chunk == i)
+            assert not chunk.flags.writeable
+
+        # 1 is dropped by 3 and decoded again
+        assert decoded == [0, 1, 2, 3, 1]
+        stats = cache.stats()
+        assert stats['hits'] == 2
+        assert stats['misses'] == 5
+        assert stats['evictions'] == 2
+        assert stats['nb_chunks'] == 3
+        assert stats['nbytes'] == 3 * 80
+
+        cache.clear()
+        assert cache.stats()['nb_chunks'] == 0
+        assert cache.stats()['misses'] == 0
+
+    def test_too_big_chunk(self):
+        cache = ChunkCache(max_bytes=10, chunk_size=10)
+        cache.get(0, lambda: np.zeros(10))
+        assert cache.stats()['nb_chunks'] == 0
+
+
+class TestBaseRawIOChunkCache(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.filename = os.path.join(self.tmpdir, 'sigs.raw')
+        self.sigs = np.arange(1000 * 4, dtype='int16').reshape(1000, 4)
+        self.sigs.tofile(self.filename)
+
+        self.reader = RawBinarySignalRawIO(filename=self.filename, nb_channel=4)
+        self.reader.parse_header()
+
+    def tearDown(self):
+        self.reader = None
+        shutil.rmtree(self.tmpdir)
+
+    def test_get_analogsignal_chunk(self):
+        reader = self.reader
+        assert reader.chunk_cache_stats() is None
+        reader.enable_chunk_cache(chunk_size=64)
+
+        for i_start, i_stop, channel_indexes in [(None, None, None), (10, 20, [1, 3]),
+                                                 (60, 200, None), (0, 64, slice(1, 3)),
+                                                 (999, 1000, [2]), (100, 100, None),
+                                                 (60, 200, np.array([0, 2]))]:
+            raw_chunk = reader.get_analogsignal_chunk(i_start=i_start, i_stop=i_stop,
+                                                      channel_indexes=channel_indexes)
+            if channel_indexes is None:
+                channel_indexes = slice(None)
+            expected = self.sigs[i_start:i_stop, channel_indexes]
+            assert raw_chunk.dtype == expected.dtype
+            np.testing.assert_array_equal(raw_chunk, expected)
+
+        stats = reader.chunk_cache_stats()
+        # the first read decodes all the chunks
+        assert stats['misses'] == 16
+        assert stats['hits'] > 0
+        assert stats['nb_chunks'] == 16
+
+        reader.clear_chunk_cache()
+        assert reader.chunk_cache_stats()['nb_chunks'] == 0
+        reader.disable_chunk_cache()
+        assert reader.chunk_cache_stats() is None
+
+    def test_several_channel_groups(self):
+        reader = ExampleRawIO(filename='fake')
+        reader.parse_header()
+        reader._several_channel_groups = True
+        reader.enable_chunk_cache(chunk_size=1000)
+        raw_chunk = reader.get_analogsignal_chunk(i_start=500, i_stop=2500,
+                                                  channel_indexes=[3, 5])
+        assert raw_chunk.shape == (2000, 2)
+        assert reader.chunk_cache_stats()['misses'] == 3
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,270 @@
+# -*- coding: utf-8 -*-
+
+# needed for python 3 compatibility
+from __future__ import unicode_literals, print_function, division, absolute_import
+
+import os
+import shutil
+import struct
+import tempfile
+import unittest
+
+import numpy as np
+
+from neo.rawio.elphyrawio import ElphyRawIO
+
+from neo.rawio.tests.common_rawio_test import BaseTestRawIO
+from neo.rawio.tests import rawio_compliance as compliance
+
+
+class TestElphyRawIO(BaseTestRawIO, unittest.TestCase, ):
+    rawioclass = ElphyRawIO
+    files_to_download = [
+        'ElphyExample.DAT',
+        'ElphyExample_Mode1.dat',
+        'ElphyExample_Mode2.dat',
+        'ElphyExample_Mode3.dat',
+    ]
+    entities_to_test = files_to_download
+
+
+def _pascal(text, size=None):
+    """
+    Return a pascal string (uint8 length and the characters), padded to size.
+    """
+    text = text.encode('latin-1')
+    return (struct.pack('<B', len(text)) + text).ljust(size or 0, b'\x00')
+
+
+def _dac2_block(identifier, data):
+    """
+    Return a block of the 'DAC2 objects' format.
+    """
+    ident = _pascal(identifier)
+    return struct.pack('<i', 4 + len(ident) + len(data)) + ident + data
+
+
+def _dac2_sub_block(identifier, data):
+    return _pascal(identifier) + struct.pack('<H', len(data)) + data
+
+
+def write_dac2_objects_file(filename, episodes, dX=0.5, x_unit='ms'):
+    """
+    Write a file of the 'DAC2 objects' format.
+
+    episodes is a list of dicts with:
+      * 'k_sampling': the sub-sampling factors of the channels (0 for an
+        event channel)
+      * 'signals': the raw int16 samples of each analog channel
+      * 'scales': (units, gain, offset) of each channel
+      * 'events': the times of each event channel, in ticks of dX / n_channels
+      * 'spikes': the times of each electrode, in samples
+      * 'waveforms': None or an array (nb_spike, wavelength) for each electrode
+      * 'nb_rdata': the number of RDATA blocks of the samples
+    The samples of the channels are multiplexed in aggregates, like Elphy does.
+    """
+    with open(filename, 'wb') as f:
+        f.write(_pascal('DAC2 objects', 16) + struct.pack('<h', 18))
+        for ep in episodes:
+            k_sampling = ep['k_sampling']
+            n_channels = len(k_sampling)
+            nb_spk = len(ep.get('spikes', []))
+            ep_data = (struct.pack('<BiB', n_channels, 0, 2) + _pascal(x_unit, 11)
+                       + struct.pack('<dd?BB', dX, 0., False, 0, 0)
+                       + struct.pack('<ddidd', dX, 0., nb_spk, 0.5, 1.)
+                       + _pascal('ms', 11) + _pascal('uV', 11) + struct.pack('<dI', 0., 0))
+            adc = b''.join(_pascal(units, 11) + struct.pack('<dd', gain, offset)
+                           for units, gain, offset in ep['scales'])
+            data = (_dac2_sub_block('Ep', ep_data) + _dac2_sub_block('Adc', adc)
+                    + _dac2_sub_block('Ksamp', struct.pack('<%dH' % n_channels, *k_sampling))
+                    + _dac2_sub_block('Ktype', struct.pack('<%dB' % n_channels,
+                                                           *([2] * n_channels))))
+            f.write(_dac2_block('B_Ep', data))
+
+            # multiplex the samples: an aggregate has one sample of the
+            # channel c every k_sampling[c] samples of the fastest channels
+            k_max = max(k_sampling)
+            samples = []
+            signals = iter(ep['signals'])
+            columns = [next(signals) if k > 0 else None for k in k_sampling]
+            for i in range(len(columns[0]) // k_max * k_max):
+                for c, k in enumerate(k_sampling):
+                    if k > 0 and i % k == 0:
+                        samples.append(columns[c][i // k])
+            samples = np.array(samples, dtype='<i2').tobytes()
+            cuts = np.linspace(0, len(samples) // 2, ep.get('nb_rdata', 1) + 1).astype(int) * 2
+            for start, stop in zip(cuts[:-1], cuts[1:]):
+                f.write(_dac2_block('RDATA', struct.pack('<H', 2) + samples[start:stop]))
+
+            events = ep.get('events', [])
+            if len(events):
+                data = struct.pack('<H', 2) + struct.pack('<i', len(events))
+                data += struct.pack('<%di' % len(events), *[len(t) for t in events])
+                data += b''.join(np.array(t, dtype='<i4').tobytes() for t in events)
+                f.write(_dac2_block('REVT', data))
+
+            spikes = ep.get('spikes', [])
+            if len(spikes):
+                # Elphy writes a record of 15 bytes before the counts
+                data = struct.pack('<h', 15) + b'\x00' * 13 + struct.pack('<i', len(spikes))
+                data += struct.pack('<%di' % len(spikes), *[len(t) for t in spikes])
+                # the times and then the units of each electrode
+                data += b''.join(np.array(t, dtype='<i4').tobytes()
+                                 + np.zeros(len(t), dtype='u1').tobytes() for t in spikes)
+                f.write(_dac2_block('RSPK', data))
+
+            waveforms = ep.get('waveforms')
+            if waveforms is not None:
+                wavelength = waveforms[0].shape[1]
+                record_dtype = np.dtype([('elphy_time', '<u4'), ('device_time', '<u4'),
+                                         ('channel_id', '<u2'), ('unit_id', 'u1'),
+                                         ('dummy', 'u1', (13,)),
+                                         ('waveform', '<i2', (wavelength,))])
+                data = struct.pack('<H', 2) + struct.pack('<iii', wavelength, 2, len(waveforms))
+                data += struct.pack('<%di' % len(waveforms), *[len(w) for w in waveforms])
+                for times, wfs in zip(spikes, waveforms):
+                    records = np.zeros(len(wfs), dtype=record_dtype)
+                    records['elphy_time'] = times
+                    records['waveform'] = wfs
+                    data += records.tobytes()
+                f.write(_dac2_block('RspkWave', data))
+
+            if 'name' in ep:
+                f.write(_dac2_block('COM', struct.pack('<h', len(ep['name']))
+                                    + ep['name'].encode('latin-1')))
+
+
+def write_dac2_gs_file(filename, signals, scales, dX=0.5, x_unit='ms', continuous=False):
+    """
+    Write a file of the 'DAC2/GS/2000' format with the int16 samples signals
+    (one array (nb_sample, nb_channel) for each episode), in continuous mode
+    (a single episode) or in episode mode.
+    """
+    n_channels = signals[0].shape[1]
+    scale_data = b''.join(_pascal(units, 11) + struct.pack('<dd', gain, offset)
+                          for units, gain, offset in scales)
+    scale_data = scale_data.ljust(16 * 27, b'\x00')
+    x_data = _pascal(x_unit, 11) + struct.pack('<dd', dX, 0.)
+    pre_seq = 12 + 10 + len(x_data) + len(scale_data)
+    main = (struct.pack('<BiB', n_channels, signals[0].shape[0], 2) + x_data + scale_data
+            + struct.pack('<ii???B', pre_seq, 0, continuous, False, False, 0))
+    main_block = _pascal('MAIN', 16) + struct.pack('<i', 20 + len(main)) + main
+    data_offset = 20 + len(main_block)
+    with open(filename, 'wb') as f:
+        f.write(_pascal('DAC2/GS/2000', 16) + struct.pack('<i', data_offset))
+        f.write(main_block)
+        for sig in signals:
+            raw = np.ascontiguousarray(sig, dtype='<i2').tobytes()
+            if not continuous:
+                f.write(_pascal('DAC2SEQ') + struct.pack('<i', pre_seq + len(raw))
+                        + struct.pack('<BiBi', n_channels, sig.shape[0], 2, 0)
+                        + x_data + scale_data)
+            f.write(raw)
+
+
+class TestElphyRawIOGeneratedFiles(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.filename = os.path.join(self.tmpdir, 'test.DAT')
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def check_compliance(self, reader):
+        compliance.header_is_total(reader)
+        compliance.count_element(reader)
+        compliance.read_analogsignals(reader)
+        compliance.read_spike_times(reader)
+        compliance.read_spike_waveforms(reader)
+        compliance.read_events(reader)
+        compliance.has_annotations(reader)
+
+    def test_dac2_objects(self):
+        rng = np.random.RandomState(0)
+        episodes = []
+        for e in range(2):
+            episodes.append({
+                'k_sampling': [1, 2, 0],
+                'signals': [rng.randint(-1000, 1000, 100), rng.randint(-1000, 1000, 50)],
+                'scales': [('mV', 0.5, 1.), ('pA', 2., 0.), ('', 1., 0.)],
+                'events': [[3, 10, 40 + e]],
+                'spikes': [[5, 60], [7, 8, 90]],
+                'waveforms': [rng.randint(-100, 100, (2, 6)), rng.randint(-100, 100, (3, 6))],
+                'nb_rdata': 1 + 2 * e,
+            })
+        episodes[1]['name'] = 'second'
+        write_dac2_objects_file(self.filename, episodes)
+
+        reader = ElphyRawIO(filename=self.filename)
+        reader.parse_header()
+        self.check_compliance(reader)
+        self.assertEqual(reader.segment_count(0), 2)
+        sig_channels = reader.header['signal_channels']
+        np.testing.assert_array_equal(sig_channels['id'], [1, 2])
+        np.testing.assert_allclose(sig_channels['sampling_rate'], [2000., 1000.])
+        np.testing.assert_array_equal(sig_channels['units'], ['mV', 'pA'])
+        self.assertEqual(reader.event_channels_count(), 1)
+        self.assertEqual(reader.unit_channels_count(), 2)
+        self.assertEqual(reader.raw_annotations['blocks'][0]['segments'][1]['name'], 'second')
+
+        for seg_index, ep in enumerate(episodes):
+            for c in range(2):
+                raw = reader.get_analogsignal_chunk(seg_index=seg_index, channel_indexes=[c])
+                np.testing.assert_array_equal(raw[:, 0], ep['signals'][c])
+                # a chunk across aggregates and data blocks
+                raw = reader.get_analogsignal_chunk(seg_index=seg_index, i_start=3,
+                                                    i_stop=41, channel_indexes=[c])
+                np.testing.assert_array_equal(raw[:, 0], ep['signals'][c][3:41])
+                sig = reader.rescale_signal_raw_to_float(raw, dtype='float64',
+                                                         channel_indexes=[c])
+                gain, offset = ep['scales'][c][1:]
+                np.testing.assert_allclose(sig[:, 0], ep['signals'][c][3:41] * gain + offset)
+
+            # like the older ElphyIO, a tick of event is dX / number of channels
+            ts = reader.get_event_timestamps(seg_index=seg_index, event_channel_index=0)[0]
+            times = reader.rescale_event_timestamp(ts, dtype='float64')
+            np.testing.assert_allclose(times, np.array(ep['events'][0]) * 0.5e-3 / 3)
+
+            for u in range(2):
+                ts = reader.get_spike_timestamps(seg_index=seg_index, unit_index=u)
+                times = reader.rescale_spike_timestamp(ts, dtype='float64')
+                np.testing.assert_allclose(times, np.array(ep['spikes'][u]) * 0.5e-3)
+                wfs = reader.get_spike_raw_waveforms(seg_index=seg_index, unit_index=u)
+                np.testing.assert_array_equal(wfs[:, 0, :], ep['waveforms'][u])
+
+            # time slice of the spikes
+            ts = reader.get_spike_timestamps(seg_index=seg_index, unit_index=1,
+                                             t_start=3e-3, t_stop=30e-3)
+            np.testing.assert_array_equal(ts, [7, 8])
+            wfs = reader.get_spike_raw_waveforms(seg_index=seg_index, unit_index=1,
+                                                 t_start=3e-3, t_stop=30e-3)
+            np.testing.assert_array_equal(wfs[:, 0, :], ep['waveforms'][1][:2])
+
+    def test_dac2_gs(self):
+        rng = np.random.RandomState(1)
+        scales = [('mV', 0.5, 1.), ('mV', 0.25, 0.)]
+        signals = [rng.randint(-1000, 1000, (30, 2)) for e in range(3)]
+        for continuous in (False, True):
+            if continuous:
+                signals = signals[:1]
+            write_dac2_gs_file(self.filename, signals, scales, continuous=continuous)
+            reader = ElphyRawIO(filename=self.filename)
+            reader.parse_header()
+            self.check_compliance(reader)
+            self.assertEqual(reader.segment_count(0), len(signals))
+            np.testing.assert_allclose(reader.header['signal_channels']['sampling_rate'],
+                                       [2000., 2000.])
+            for seg_index, sig in enumerate(signals):
+                raw = reader.get_analogsignal_chunk(seg_index=seg_index,
+                                                    channel_indexes=[0, 1])
+                np.testing.assert_array_equal(raw, sig)
+
+    def test_acquis1_not_read(self):
+        with open(self.filename, 'wb') as f:
+            f.write(_pascal('ACQUIS1/GS/1991', 16) + b'\x00' * 1024)
+        reader = ElphyRawIO(filename=self.filename)
+        self.assertRaises(NotImplementedError, reader.parse_header)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,117 @@
+# -*- coding: utf-8 -*-
+"""
+Tests of neo.rawio.envelope and of the envelope of BaseRawIO
+"""
+
+# needed for python 3 compatibility
+from __future__ import unicode_literals, print_function, division, absolute_import
+
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+
+from neo.rawio.baserawio import HAVE_JOBLIB
+from neo.rawio.envelope import SignalEnvelope
+from neo.rawio.rawbinarysignalrawio import RawBinarySignalRawIO
+
+
+def brute_force_envelope(sigs, i_start, i_stop, decimation):
+    bin_start = i_start // decimation
+    bin_stop = -(-i_stop // decimation)
+    env = {'min': [], 'max': [], 'mean': [], 'rms': []}
+    for b in range(bin_start, bin_stop):
+        chunk = sigs[b * decimation:(b + 1) * decimation].astype('float64')
+        env['min'].append(chunk.min(axis=0))
+        env['max'].append(chunk.max(axis=0))
+        env['mean'].append(chunk.mean(axis=0))
+        env['rms'].append(np.sqrt(np.mean(chunk ** 2, axis=0)))
+    return {k: np.array(v) for k, v in env.items()}
+
+
+class TestSignalEnvelope(unittest.TestCase):
+    def test_query(self):
+        sigs = np.random.randint(-1000, 1000, size=(10000, 3)).astype('int16')
+        envelope = SignalEnvelope(nb_channel=3, min_decimation=16, with_mean=True)
+        # chunks not aligned on bins
+        for i in range(0, 10000, 999):
+            envelope.feed(sigs[i:i + 999])
+        envelope.finalize()
+        assert envelope.size == 10000
+        assert envelope.levels[-1]['min'].shape[0] == 1
+
+        for i_start, i_stop, n_pixels in [(0, 10000, 100), (123, 9876, 10), (0, 10000, 1),
+                                          (5000, 10000, 7)]:
+            decimation, bin_start, env = envelope.query(i_start, i_stop, n_pixels)
+            assert decimation >= 16
+            assert n_pixels <= env['min'].shape[0] <= 2 * n_pixels + 1
+            expected = brute_force_envelope(sigs, i_start, i_stop, decimation)
+            for name in ('min', 'max'):
+                np.testing.assert_array_equal(env[name], expected[name])
+                assert env[name].dtype == 'int16'
+            for name in ('mean', 'rms'):
+                np.testing.assert_allclose(env[name], expected[name])
+
+        # zoomed in
+        assert envelope.query(0, 1000, 100) is None
+
+
+class TestBaseRawIOEnvelope(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.filename = os.path.join(self.tmpdir, 'sigs.raw')
+        self.sigs = np.random.randint(-1000, 1000, size=(100000, 4)).astype('int16')
+        self.sigs.tofile(self.filename)
+
+        self.reader = RawBinarySignalRawIO(filename=self.filename, nb_channel=4,
+                                           sampling_rate=1000.)
+        self.reader.parse_header()
+
+    def tearDown(self):
+        self.reader = None
+        shutil.rmtree(self.tmpdir)
+
+    def check_envelope(self, reader):
+        for t_start, t_stop, n_pixels, channel_indexes in [(None, None, 500, None),
+                                                           (10., 20., 100, [1, 3]),
+                                                           (50., 51., 100, [2]),
+                                                           (99.5, 200., 1000, None)]:
+            times, env = reader.get_analogsignal_envelope(t_start=t_start, t_stop=t_stop,
+                                                          n_pixels=n_pixels,
+                                                          channel_indexes=channel_indexes)
+            decimation = int(round((times[1] - times[0]) * 1000.))
+            i_start = int(round(times[0] * 1000.))
+            i_stop = min(i_start + len(times) * decimation, 100000)
+            if channel_indexes is None:
+                channel_indexes = slice(None)
+            expected = brute_force_envelope(self.sigs[:, channel_indexes], i_start, i_stop,
+                                            decimation)
+            assert len(times) >= min(n_pixels, (i_stop - i_start))
+            for name in ('min', 'max'):
+                np.testing.assert_array_equal(env[name], expected[name])
+            if t_start is not None:
+                assert times[0] <= t_start < times[0] + decimation / 1000.
+
+    def test_get_analogsignal_envelope(self):
+        reader = self.reader
+        reader.build_analogsignal_envelope(min_decimation=64, chunk_size=1000)
+        self.check_envelope(reader)
+
+    @unittest.skipUnless(HAVE_JOBLIB, 'requires joblib')
+    def test_persistence(self):
+        self.reader.build_analogsignal_envelope(cache_path='same_as_resource',
+                                                min_decimation=64)
+        files = [f for f in os.listdir(self.tmpdir) if f.endswith('_envelope')]
+        assert len(files) == 1
+
+        reader = RawBinarySignalRawIO(filename=self.filename, nb_channel=4,
+                                      sampling_rate=1000.)
+        reader.parse_header()
+        reader.build_analogsignal_envelope(cache_path='same_as_resource', min_decimation=64)
+        self.check_envelope(reader)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+"""
+Tests of neo.rawio.prefetch
+"""
+
+# needed for python 3 compatibility
+from __future__ import unicode_literals, print_function, division, absolute_import
+
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+
+import numpy as np
+
+from neo.rawio.prefetch import PrefetchRawIO, HAVE_FUTURES
+from neo.rawio.rawbinarysignalrawio import RawBinarySignalRawIO
+
+
+@unittest.skipUnless(HAVE_FUTURES, 'requires concurrent.futures')
+class TestPrefetchRawIO(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.filename = os.path.join(self.tmpdir, 'sigs.raw')
+        self.sigs = np.arange(1000 * 4, dtype='int16').reshape(1000, 4)
+        self.sigs.tofile(self.filename)
+
+        self.reader = PrefetchRawIO(RawBinarySignalRawIO(filename=self.filename, nb_channel=4),
+                                    nb_chunks=3)
+        self.reader.parse_header()
+
+    def tearDown(self):
+        self.reader.close()
+        self.reader = None
+        shutil.rmtree(self.tmpdir)
+
+    def test_wrapped_attributes(self):
+        reader = self.reader
+        assert reader.signal_channels_count() == 4
+        assert reader.header['nb_block'] == 1
+        assert reader.get_signal_size(0, 0) == 1000
+
+    def test_sequential(self):
+        reader = self.reader
+        for i_start in range(0, 1000, 100):
+            raw_chunk = reader.get_analogsignal_chunk(i_start=i_start, i_stop=i_start + 100,
+                                                      channel_indexes=[1, 2])
+            np.testing.assert_array_equal(raw_chunk, self.sigs[i_start:i_start + 100, [1, 2]])
+
+        stats = reader.prefetch_stats()
+        # the first 2 requests are needed to detect the sequential access
+        assert stats['hits'] == 8
+        assert stats['misses'] == 2
+        assert stats['nb_buffered'] == 0
+
+        # not sequential: nothing is read in advance
+        raw_chunk = reader.get_analogsignal_chunk(i_start=10, i_stop=20)
+        np.testing.assert_array_equal(raw_chunk, self.sigs[10:20])
+        assert reader.prefetch_stats()['nb_buffered'] == 0
+
+    def test_schedule(self):
+        reader = self.reader
+        schedule = [(0, 0, 500, 600, None), (0, 0, 0, 50, [3]), (0, 0, 900, 1000, slice(0, 2)),
+                    (0, 0, 100, 200, None)]
+        reader.set_schedule(schedule)
+        # out of schedule requests are read directly and keep the buffer
+        raw_chunk = reader.get_analogsignal_chunk(i_start=10, i_stop=20)
+        np.testing.assert_array_equal(raw_chunk, self.sigs[10:20])
+        assert reader.prefetch_stats()['misses'] == 1
+
+        for block_index, seg_index, i_start, i_stop, channel_indexes in schedule:
+            raw_chunk = reader.get_analogsignal_chunk(block_index=block_index,
+                                                      seg_index=seg_index, i_start=i_start,
+                                                      i_stop=i_stop,
+                                                      channel_indexes=channel_indexes)
+            if channel_indexes is None:
+                channel_indexes = slice(None)
+            np.testing.assert_array_equal(raw_chunk,
+                                          self.sigs[i_start:i_stop, channel_indexes])
+        assert reader.prefetch_stats()['hits'] == 4
+        assert reader.prefetch_stats()['misses'] == 1
+
+    def test_not_concurrent_rawio(self):
+        # the reads of a rawio without support_concurrent_reads never overlap
+        rawio = RawBinarySignalRawIO(filename=self.filename, nb_channel=4)
+        rawio.support_concurrent_reads = False
+        rawio.parse_header()
+        lock = threading.Lock()
+        active = []
+        overlaps = []
+        method = rawio.get_analogsignal_chunk
+
+        def wrapper(*args):
+            with lock:
+                active.append(1)
+                overlaps.append(len(active) > 1)
+            time.sleep(0.005)
+            with lock:
+                active.pop()
+            return method(*args)
+        rawio.get_analogsignal_chunk = wrapper
+
+        with PrefetchRawIO(rawio, nb_chunks=3) as reader:
+            for i_start in range(0, 1000, 100):
+                raw_chunk = reader.get_analogsignal_chunk(i_start=i_start,
+                                                          i_stop=i_start + 100)
+                np.testing.assert_array_equal(raw_chunk, self.sigs[i_start:i_start + 100])
+            assert reader.prefetch_stats()['hits'] == 8
+        assert len(overlaps) == 10
+        assert not any(overlaps)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,114 @@
+# -*- coding: utf-8 -*-
+"""
+Tests of the transposed copy of signals of BaseRawIO
+"""
+
+# needed for python 3 compatibility
+from __future__ import unicode_literals, print_function, division, absolute_import
+
+import hashlib
+import os
+import shutil
+import tempfile
+import unittest
+
+import numpy as np
+
+from neo.rawio.baserawio import get_cache_filename, HAVE_JOBLIB
+if HAVE_JOBLIB:
+    import joblib
+from neo.rawio.rawbinarysignalrawio import RawBinarySignalRawIO
+
+
+class TestTransposedSignals(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.filename = os.path.join(self.tmpdir, 'sigs.raw')
+        self.sigs = np.random.randint(-1000, 1000, size=(10000, 8)).astype('int16')
+        self.sigs.tofile(self.filename)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def make_reader(self):
+        reader = RawBinarySignalRawIO(filename=self.filename, nb_channel=8)
+        reader.parse_header()
+        return reader
+
+    def count_calls(self, reader):
+        calls = []
+        method = reader._get_analogsignal_chunk
+
+        def wrapper(*args):
+            calls.append(args)
+            return method(*args)
+        reader._get_analogsignal_chunk = wrapper
+        return calls
+
+    def test_get_analogsignal_chunk(self):
+        reader = self.make_reader()
+        reader.build_transposed_signals(max_channels=2, min_samples=1000, chunk_size=3000)
+        files = [f for f in os.listdir(self.tmpdir) if f.endswith('.npy')]
+        assert len(files) == 1
+
+        calls = self.count_calls(reader)
+        for i_start, i_stop, channel_indexes, routed in [
+                (None, None, [3], True), (100, 5000, [0, 7], True), (100, 5000, slice(2, 4), True),
+                (100, 500, [3], False), (None, None, [0, 1, 2], False), (None, None, None, False)]:
+            raw_chunk = reader.get_analogsignal_chunk(i_start=i_start, i_stop=i_stop,
+                                                      channel_indexes=channel_indexes)
+            if channel_indexes is None:
+                channel_indexes = slice(None)
+            np.testing.assert_array_equal(raw_chunk, self.sigs[i_start:i_stop, channel_indexes])
+            assert raw_chunk.dtype == 'int16'
+            assert len(calls) == (0 if routed else 1)
+            del calls[:]
+
+        # the existing copy is used
+        reader = self.make_reader()
+        calls = self.count_calls(reader)
+        reader.build_transposed_signals(max_channels=2, min_samples=1000)
+        assert len(calls) == 0
+        raw_chunk = reader.get_analogsignal_chunk(channel_indexes=[5])
+        np.testing.assert_array_equal(raw_chunk, self.sigs[:, [5]])
+        assert len(calls) == 0
+
+    def test_found_at_read(self):
+        # a copy written by an other instance is used without building it
+        # (above the default min_samples)
+        self.sigs = np.random.randint(-1000, 1000, size=(70000, 8)).astype('int16')
+        self.sigs.tofile(self.filename)
+        self.make_reader().build_transposed_signals()
+        reader = self.make_reader()
+        calls = self.count_calls(reader)
+        raw_chunk = reader.get_analogsignal_chunk(channel_indexes=[5])
+        np.testing.assert_array_equal(raw_chunk, self.sigs[:, [5]])
+        assert len(calls) == 0
+        # with the default limits
+        raw_chunk = reader.get_analogsignal_chunk(i_start=0, i_stop=100, channel_indexes=[5])
+        np.testing.assert_array_equal(raw_chunk, self.sigs[:100, [5]])
+        assert len(calls) == 1
+
+        # no copy: read from the file
+        os.remove(os.path.join(self.tmpdir, [f for f in os.listdir(self.tmpdir)
+                                             if f.endswith('.npy')][0]))
+        reader = self.make_reader()
+        calls = self.count_calls(reader)
+        raw_chunk = reader.get_analogsignal_chunk(channel_indexes=[5])
+        np.testing.assert_array_equal(raw_chunk, self.sigs[:, [5]])
+        assert len(calls) == 1
+
+    def test_cache_filename(self):
+        # the name of the rawio cache (setup_cache) is kept
+        d = dict(ressource_name=self.filename, mtime=os.path.getmtime(self.filename))
+        if HAVE_JOBLIB:
+            hash = joblib.hash(d, hash_name='md5')
+        else:
+            hash = hashlib.md5(repr(sorted(d.items())).encode('utf8')).hexdigest()
+        expected = os.path.join(self.tmpdir, 'sigs.raw_{}'.format(hash))
+        assert get_cache_filename(self.filename, 'same_as_resource',
+                                  'RawBinarySignalRawIO') == expected
+
+
+if __name__ == "__main__":
+    unittest.main()
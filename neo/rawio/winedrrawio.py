@@ -23,6 +23,7 @@ import sys
 class WinEdrRawIO(BaseRawIO):
     extensions = ['EDR', 'edr']
     rawmode = 'one-file'
+    support_concurrent_reads = True
 
     def __init__(self, filename=''):
         BaseRawIO.__init__(self)
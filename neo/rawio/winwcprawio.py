@@ -24,6 +24,7 @@ import struct
 class WinWcpRawIO(BaseRawIO):
     extensions = ['wcp']
     rawmode = 'one-file'
+    support_concurrent_reads = True
 
     def __init__(self, filename=''):
         BaseRawIO.__init__(self)
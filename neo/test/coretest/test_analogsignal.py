@@ -153,6 +153,20 @@ class TestAnalogSignalConstructor(unittest.TestCase):
 
         # signal must be 1D - should raise Exception if not 1D
 
+    def test__from_validated(self):
+        data = np.arange(20.0, dtype='float32').reshape(10, 2)
+        signal = AnalogSignal._from_validated(
+            data, units=pq.mV, t_start=1 * pq.s, sampling_rate=1 * pq.kHz, name='sig',
+            array_annotations={'channel_ids': np.array([3, 4])}, annotations={'a': 1})
+        target = AnalogSignal(data, units='mV', t_start=1 * pq.s, sampling_rate=1 * pq.kHz,
+                              name='sig', array_annotations={'channel_ids': [3, 4]}, a=1)
+        assert_neo_object_is_compliant(signal)
+        assert_same_sub_schema(signal, target)
+        self.assertEqual(signal.dtype, np.float32)
+        self.assertTrue(np.shares_memory(signal, data))
+        self.assertIsNone(signal.segment)
+        self.assertIsNone(signal.channel_index)
+
 
 class TestAnalogSignalProperties(unittest.TestCase):
     def setUp(self):
@@ -891,6 +905,23 @@ class TestAnalogSignalFunctions(unittest.TestCase):
         fobj.close()
         os.remove('./pickle')
 
+    @unittest.skipIf(pickle.HIGHEST_PROTOCOL < 5, "requires pickle protocol 5")
+    def test__pickle_out_of_band(self):
+        signal1 = AnalogSignal(np.arange(20.).reshape(10, 2), sampling_rate=1 * pq.kHz,
+                               units='mV', t_start=3 * pq.s, name='sig')
+        buffers = []
+        data = pickle.dumps(signal1, protocol=5, buffer_callback=buffers.append)
+        self.assertEqual(len(buffers), 1)
+
+        signal2 = pickle.loads(data, buffers=buffers)
+        # the data is not copied
+        self.assertTrue(np.shares_memory(signal1, signal2))
+        assert_array_equal(signal1, signal2)
+        self.assertEqual(signal2.units, pq.mV)
+        self.assertEqual(signal2.t_start, 3 * pq.s)
+        self.assertEqual(signal2.sampling_rate, 1 * pq.kHz)
+        self.assertEqual(signal2.name, 'sig')
+
 
 class TestAnalogSignalSampling(unittest.TestCase):
     def test___get_sampling_rate__period_none_rate_none_ValueError(self):
@@ -1,9 +1,15 @@
 import copy
+import gc
+import pickle
 
 import numpy as np
+from numpy.testing import assert_array_equal
+import quantities as pq
 import unittest
 
-from neo.core.dataobject import DataObject, _normalize_array_annotations, ArrayDict
+from neo.core.dataobject import (DataObject, _normalize_array_annotations, ArrayDict,
+                                 copy_on_write)
+from neo.core import AnalogSignal, Block, Segment, SpikeTrain
 
 
 class Test_DataObject(unittest.TestCase):
@@ -11,6 +17,115 @@ class Test_DataObject(unittest.TestCase):
         pass
 
 
+class Test_copy_on_write(unittest.TestCase):
+    def setUp(self):
+        self.sig = AnalogSignal(np.arange(20.).reshape(10, 2), units='mV',
+                                sampling_rate=1 * pq.kHz)
+        self.train = SpikeTrain([3., 1., 2.], units='s', t_stop=10 * pq.s)
+
+    def test_deepcopy_shares_data(self):
+        with copy_on_write():
+            sig_copy = copy.deepcopy(self.sig)
+        self.assertTrue(np.shares_memory(sig_copy, self.sig))
+        self.assertFalse(sig_copy.flags.writeable)
+        self.assertFalse(self.sig.flags.writeable)
+        self.assertEqual(sig_copy.sampling_rate, self.sig.sampling_rate)
+        self.assertIsNone(sig_copy.segment)
+
+    def test_write_to_copy_does_not_change_original(self):
+        with copy_on_write():
+            sig_copy = copy.deepcopy(self.sig)
+        sig_copy[0, 0] = 100 * pq.mV
+        sig_copy += 1 * pq.mV
+        self.assertEqual(self.sig[0, 0], 0 * pq.mV)
+        self.assertEqual(sig_copy[0, 0], 101 * pq.mV)
+        self.assertFalse(np.shares_memory(sig_copy, self.sig))
+
+    def test_write_to_original_does_not_change_copy(self):
+        with copy_on_write():
+            train_copy = copy.deepcopy(self.train)
+        self.train.sort()
+        self.assertEqual(list(self.train.magnitude), [1., 2., 3.])
+        self.assertEqual(list(train_copy.magnitude), [3., 1., 2.])
+
+    def test_write_to_original_with_several_copies(self):
+        with copy_on_write():
+            copies = [copy.deepcopy(self.sig) for i in range(3)]
+            sliced = self.sig.time_slice(2 * pq.ms, 5 * pq.ms)
+        self.sig[2, 0] = -1 * pq.mV
+        self.assertTrue(self.sig.flags.writeable)
+        for sig_copy in copies:
+            self.assertEqual(sig_copy[2, 0], 4 * pq.mV)
+        self.assertEqual(sliced[0, 0], 4 * pq.mV)
+
+    def test_write_to_copy_after_original_is_deleted(self):
+        with copy_on_write():
+            sig_copy = copy.deepcopy(self.sig)
+        part = sig_copy[2:5]
+        del self.sig
+        gc.collect()
+        sig_copy[2, 0] = -1 * pq.mV
+        self.assertEqual(sig_copy[2, 0], -1 * pq.mV)
+        assert_array_equal(part.magnitude, [[4., 5.], [6., 7.], [8., 9.]])
+
+    def test_set_units_after_context(self):
+        with copy_on_write():
+            train_copy = copy.deepcopy(self.train)
+        train_copy.units = 'ms'
+        self.assertEqual(list(train_copy.magnitude), [3000., 1000., 2000.])
+        self.assertEqual(list(self.train.magnitude), [3., 1., 2.])
+        # no copy shares the data of the original any more
+        self.assertTrue(self.train.flags.writeable)
+
+    def test_original_writeable_when_copies_released(self):
+        with copy_on_write():
+            copies = [copy.deepcopy(self.sig) for i in range(2)]
+        copies[0][0, 0] = 100 * pq.mV
+        self.assertFalse(self.sig.flags.writeable)
+        del copies[1]
+        gc.collect()
+        self.assertTrue(self.sig.flags.writeable)
+        self.sig.magnitude.fill(0)
+        self.assertEqual(copies[0][0, 0], 100 * pq.mV)
+
+    def test_original_not_writeable_flag_kept(self):
+        self.sig.flags.writeable = False
+        with copy_on_write():
+            sig_copy = copy.deepcopy(self.sig)
+        del sig_copy
+        gc.collect()
+        self.assertFalse(self.sig.flags.writeable)
+
+    def test_raw_write_raises(self):
+        with copy_on_write():
+            sig_copy = copy.deepcopy(self.sig)
+        self.assertRaises(ValueError, sig_copy.magnitude.fill, 0)
+
+    def test_time_slice(self):
+        with copy_on_write():
+            sliced = self.sig.time_slice(2 * pq.ms, 5 * pq.ms)
+        self.assertTrue(np.shares_memory(sliced, self.sig))
+        sliced[0, 0] = -1 * pq.mV
+        self.assertEqual(self.sig[2, 0], 4 * pq.mV)
+
+    def test_block_deepcopy(self):
+        blk = Block()
+        seg = Segment()
+        blk.segments.append(seg)
+        seg.analogsignals.append(self.sig)
+        blk.create_relationship()
+        with copy_on_write():
+            blk_copy = copy.deepcopy(blk)
+        sig_copy = blk_copy.segments[0].analogsignals[0]
+        self.assertTrue(np.shares_memory(sig_copy, self.sig))
+        self.assertIs(sig_copy.segment, blk_copy.segments[0])
+
+    def test_default_copies(self):
+        sig_copy = copy.deepcopy(self.sig)
+        self.assertFalse(np.shares_memory(sig_copy, self.sig))
+        self.assertTrue(self.sig.flags.writeable)
+
+
 class Test_array_annotations(unittest.TestCase):
     def test_check_arr_ann(self):
         # DataObject instance that handles checking
@@ -186,3 +301,37 @@ class Test_array_annotations(unittest.TestCase):
         # Make sure that original object is edited when editing extracted array_annotations
         ann_slice_all['anno1'][2] = 10
         self.assertEqual(datobj.array_annotations_at_index(2)['anno1'], 10)
+
+
+class Test_ArrayDict(unittest.TestCase):
+    def setUp(self):
+        self.arr_ann = ArrayDict(4)
+        self.arr_ann.update(anno1=[3, 4, 5, 6], anno2=['ABC', 'DEF', 'GHI', 'JKL'])
+
+    def test_sliced(self):
+        sliced = ArrayDict.sliced(self.arr_ann, slice(1, 3), 2)
+        self.assertEqual(len(sliced), 2)
+        self.assertTrue((sliced['anno1'] == np.array([4, 5])).all())
+        self.assertTrue((sliced['anno2'] == np.array(['DEF', 'GHI'])).all())
+
+    def test_sliced_scalar_index(self):
+        sliced = ArrayDict.sliced(self.arr_ann, 2, 1)
+        self.assertTrue((sliced['anno1'] == np.array([5])).all())
+        self.assertTrue((sliced['anno2'] == np.array(['GHI'])).all())
+
+    def test_sliced_snapshot(self):
+        sliced = ArrayDict.sliced(self.arr_ann, [0, 3], 2)
+        self.arr_ann['anno1'] = [0, 0, 0, 0]
+        self.assertTrue((sliced['anno1'] == np.array([3, 6])).all())
+
+    def test_sliced_independent_of_writes_to_parent(self):
+        sliced = ArrayDict.sliced(self.arr_ann, slice(0, 2), 2)
+        self.arr_ann['anno1'][0] = 99
+        self.assertTrue((sliced['anno1'] == np.array([3, 4])).all())
+
+    def test_sliced_copy_and_pickle(self):
+        sliced = ArrayDict.sliced(self.arr_ann, slice(0, 2), 2)
+        for other in (copy.deepcopy(sliced), pickle.loads(pickle.dumps(sliced))):
+            self.assertIsInstance(other, ArrayDict)
+            self.assertTrue((other['anno1'] == np.array([3, 4])).all())
+            self.assertEqual(other.length, 2)
@@ -691,6 +691,25 @@ class TestEpochFunctions(unittest.TestCase):
             epoch2.array_annotations['anno4'] = [2, 1]
         os.remove('./pickle')
 
+    @unittest.skipIf(pickle.HIGHEST_PROTOCOL < 5, "requires pickle protocol 5")
+    def test__pickle_out_of_band(self):
+        epoch1 = Epoch(np.arange(0, 30, 10) * pq.s, durations=[1, 2, 3] * pq.ms,
+                       labels=np.array(['t0', 't1', 't2'], dtype='S'),
+                       description='desc', file_origin='file')
+        buffers = []
+        data = pickle.dumps(epoch1, protocol=5, buffer_callback=buffers.append)
+        epoch2 = pickle.loads(data, buffers=buffers)
+
+        # times, durations and labels are not copied
+        self.assertTrue(np.shares_memory(epoch1, epoch2))
+        self.assertTrue(np.shares_memory(epoch1.durations, epoch2.durations))
+        assert_array_equal(epoch1.times, epoch2.times)
+        assert_array_equal(epoch1.durations, epoch2.durations)
+        self.assertEqual(epoch2.durations.units, pq.ms)
+        assert_array_equal(epoch1.labels, epoch2.labels)
+        self.assertEqual(epoch2.description, 'desc')
+        self.assertEqual(epoch2.file_origin, 'file')
+
 
 if __name__ == "__main__":
     unittest.main()
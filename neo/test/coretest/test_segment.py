@@ -24,7 +24,7 @@ else:
 
 from neo.core.segment import Segment
 from neo.core import (AnalogSignal, Block,
-                      Epoch, ChannelIndex, SpikeTrain, Unit)
+                      Epoch, Event, ChannelIndex, SpikeTrain, Unit)
 from neo.core.container import filterdata
 from neo.test.tools import (assert_neo_object_is_compliant,
                             assert_same_sub_schema)
@@ -231,6 +231,52 @@ class TestSegment(unittest.TestCase):
             self.assertEqual(seg.t_start, targ_t_start)
             self.assertEqual(seg.t_stop, targ_t_stop)
 
+    def test_times_follow_children(self):
+        seg = Segment()
+        self.assertIsNone(seg.t_start)
+        self.assertIsNone(seg.t_stop)
+
+        sig = AnalogSignal(np.zeros(10), units='mV', sampling_rate=1 * pq.kHz,
+                           t_start=2 * pq.s)
+        seg.analogsignals.append(sig)
+        self.assertEqual(seg.t_start, 2 * pq.s)
+        self.assertEqual(seg.t_stop, 2.01 * pq.s)
+
+        train = SpikeTrain([1.5, 3.], units='s', t_start=1 * pq.s, t_stop=4 * pq.s)
+        seg.spiketrains += [train]
+        self.assertEqual(seg.t_start, 1 * pq.s)
+        self.assertEqual(seg.t_stop, 4 * pq.s)
+
+        seg.spiketrains.remove(train)
+        self.assertEqual(seg.t_start, 2 * pq.s)
+        self.assertEqual(seg.t_stop, 2.01 * pq.s)
+
+        seg.epochs = [Epoch([0.5, 3.] * pq.s, durations=[1., 1.] * pq.s)]
+        self.assertEqual(seg.t_start, 0.5 * pq.s)
+        self.assertEqual(seg.t_stop, 3. * pq.s)
+
+        del seg.epochs[:]
+        sig.t_start = 5 * pq.s
+        self.assertEqual(seg.t_start, 5 * pq.s)
+        self.assertEqual(seg.t_stop, 5.01 * pq.s)
+
+        # children modified in place
+        seg.spiketrains.append(train)
+        train.t_stop = 20 * pq.s
+        self.assertEqual(seg.t_stop, 20 * pq.s)
+        event = Event([1., 2.] * pq.s)
+        seg.events.append(event)
+        event[1] = 30 * pq.s
+        self.assertEqual(seg.t_stop, 30 * pq.s)
+
+        # the assigned list is kept
+        trains = []
+        seg.spiketrains = trains
+        trains.append(SpikeTrain([1.], units='s', t_start=0.1 * pq.s, t_stop=40 * pq.s))
+        self.assertIs(seg.spiketrains, trains)
+        self.assertEqual(seg.t_start, 0.1 * pq.s)
+        self.assertEqual(seg.t_stop, 40 * pq.s)
+
     def test__merge(self):
         seg1a = fake_neo(Block, seed=self.seed1, n=self.nchildren).segments[0]
         assert_same_sub_schema(self.seg1, seg1a)
@@ -30,7 +30,7 @@ from neo.core.spiketrain import (check_has_dimensions_time, SpikeTrain, _check_t
 from neo.core import Segment, Unit
 from neo.core.baseneo import MergeError
 from neo.test.tools import (assert_arrays_equal, assert_arrays_almost_equal,
-                            assert_neo_object_is_compliant)
+                            assert_neo_object_is_compliant, assert_same_sub_schema)
 from neo.test.generate_datasets import (get_fake_value, get_fake_values, fake_neo,
                                         TEST_ANNOTATIONS)
 
@@ -236,6 +236,18 @@ class Testcheck_time_in_range(unittest.TestCase):
 
 
 class TestConstructor(unittest.TestCase):
+    def test__from_validated(self):
+        times = np.array([1., 2., 3.])
+        train = SpikeTrain._from_validated(times, 10. * pq.s, units=pq.s, t_start=0. * pq.s,
+                                           name='st', annotations={'a': 1})
+        target = SpikeTrain(times, 10. * pq.s, units='s', name='st', a=1)
+        assert_neo_object_is_compliant(train)
+        assert_same_sub_schema(train, target)
+        self.assertTrue(np.shares_memory(train, times))
+        self.assertIsNone(train.segment)
+        self.assertIsNone(train.unit)
+        self.assertEqual(len(train.array_annotations), 0)
+
     def result_spike_check(self, train, st_out, t_start_out, t_stop_out, dtype, units):
         assert_arrays_equal(train, st_out)
         assert_arrays_equal(train, train.times)
@@ -789,6 +801,19 @@ class TestSlice(unittest.TestCase):
         self.assertIsInstance(result.array_annotations['label'], np.ndarray)
         self.assertIsInstance(result.array_annotations, ArrayDict)
 
+    def test_slice_array_annotations_independent(self):
+        result = self.train1[1:]
+        self.assertEqual(sorted(result.array_annotations.keys()), ['index', 'label'])
+
+        # sliced annotations do not share memory with the original ones
+        result.array_annotations['index'][0] = 100
+        assert_arrays_equal(self.train1.array_annotations['index'], np.arange(1, 4))
+        self.train1.array_annotations['index'][2] = 99
+        assert_arrays_equal(result.array_annotations['index'], np.array([100, 3]))
+
+        # setting annotations is still checked
+        self.assertRaises(ValueError, result.array_annotate, index=[1, 2, 3])
+
     def test_slice_to_end(self):
         # slice spike train, keep sliced spike times
         result = self.train1[1:]
@@ -6,10 +6,18 @@ Tests of neo.io.alphaomegaio
 # needed for python 3 compatibility
 from __future__ import absolute_import, division
 
+import datetime
+import os
+import shutil
+import tempfile
 import unittest
 
+import numpy as np
+import quantities as pq
+
 from neo.io import AlphaOmegaIO
 from neo.test.iotest.common_io_test import BaseTestIO
+from neo.rawio.tests.test_alphaomegarawio import write_map_file
 
 
 class TestAlphaOmegaIO(BaseTestIO, unittest.TestCase):
@@ -19,5 +27,61 @@ class TestAlphaOmegaIO(BaseTestIO, unittest.TestCase):
     ioclass = AlphaOmegaIO
 
 
+class TestAlphaOmegaIOGeneratedFiles(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.filename = os.path.join(self.tmpdir, 'test.map')
+        self.rec_datetime = datetime.datetime(2003, 3, 12, 14, 25, 31, 470000)
+        channels = [(0, 1, 0, 20., 'EEG 1'),
+                    (1, 1, 0, 20., 'no data'),
+                    (2, 0, 0, 0.5, 'Digital 2')]
+        rng = np.random.RandomState(0)
+        self.samples = [rng.randint(-2000, 2000, 100), rng.randint(0, 2, 12)]
+        data_blocks = [(0, 40, self.samples[0][:60]),
+                       (2, 3, self.samples[1]),
+                       (0, 100, self.samples[0][60:])]
+        write_map_file(self.filename, self.rec_datetime, channels, data_blocks)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_read_block(self):
+        # the layout of the reading before AlphaOmegaRawIO
+        block = AlphaOmegaIO(self.filename).read_block()
+        self.assertEqual(block.file_origin, 'test.map')
+        self.assertEqual(block.rec_datetime, self.rec_datetime)
+        self.assertEqual(block.annotations['alphamap_version'], 7)
+        seg = block.segments[0]
+        self.assertEqual(seg.rec_datetime, self.rec_datetime)
+
+        self.assertEqual([sig.name for sig in seg.analogsignals], ['EEG 1', 'Digital 2'])
+        for sig, samples, sampling_rate, t_start, channel_type in zip(
+                seg.analogsignals, self.samples, [20., .5] * pq.kHz,
+                [40 / 20000., 3 / 500.] * pq.s, ['continuous(Mode0)', 'digital']):
+            self.assertEqual(sig.dtype, np.int16)
+            self.assertEqual(sig.units, pq.dimensionless)
+            np.testing.assert_array_equal(sig.magnitude[:, 0], samples)
+            self.assertEqual(sig.sampling_rate, sampling_rate)
+            self.assertEqual(sig.sampling_rate.units, pq.kHz)
+            self.assertEqual(sig.t_start, t_start)
+            self.assertEqual(sig.file_origin, 'test.map')
+            self.assertEqual(sig.annotations['channel_name'], sig.name)
+            self.assertEqual(sig.annotations['channel_type'], channel_type)
+            self.assertIs(sig.segment, seg)
+            self.assertEqual(sig.channel_index.analogsignals, [sig])
+
+        # lazy
+        block = AlphaOmegaIO(self.filename).read_block(lazy=True)
+        proxies = block.segments[0].analogsignals
+        self.assertEqual([proxy.name for proxy in proxies], ['EEG 1', 'Digital 2'])
+        sig = proxies[0].load(time_slice=(0.003 * pq.s, 0.005 * pq.s))
+        np.testing.assert_array_equal(sig.magnitude[:, 0], self.samples[0][20:60])
+
+    def test_read_segment(self):
+        seg = AlphaOmegaIO(self.filename).read_segment(max_workers=2)
+        self.assertEqual([sig.dtype for sig in seg.analogsignals], [np.int16, np.int16])
+        np.testing.assert_array_equal(seg.analogsignals[1].magnitude[:, 0], self.samples[1])
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -14,6 +14,7 @@ import numpy as np
 import quantities as pq
 from numpy.testing import assert_array_almost_equal, assert_array_equal
 from neo.io import AsciiSignalIO
+from neo.io.proxyobjects import AnalogSignalProxy
 from neo.test.iotest.common_io_test import BaseTestIO
 from neo.core import AnalogSignal, Segment, Block
 
@@ -334,6 +335,119 @@ class TestAsciiSignalIO(unittest.TestCase):
 
         os.remove(filename)
 
+    def test_stream_expect_success(self):
+        sample_data = np.random.uniform(size=(2000, 3))
+        filename = "test_stream_expect_success.txt"
+        np.savetxt(filename, sample_data, delimiter=',', header='a,b,c', comments='')
+        ref = AsciiSignalIO(filename, delimiter=',', skiprows=1, units='mV',
+                            method='genfromtxt').read_block()
+
+        # small blocks so that lines are cut between blocks
+        io = AsciiSignalIO(filename, delimiter=',', skiprows=1, units='mV',
+                           method='stream', block_size=1000)
+        block = io.read_block()
+
+        self.assertEqual(len(block.segments[0].analogsignals), 3)
+        for signal, ref_signal in zip(block.segments[0].analogsignals,
+                                      ref.segments[0].analogsignals):
+            assert_array_equal(signal.magnitude, ref_signal.magnitude)
+            self.assertEqual(signal.name, ref_signal.name)
+            self.assertEqual(signal.units, pq.mV)
+
+        os.remove(filename)
+
+    def test_stream_missing_values(self):
+        filename = "test_stream_missing_values.txt"
+        with open(filename, 'w') as fp:
+            fp.write('1\t2\t3\n\n4\t\t6\n7\t8\t9\n')
+        io = AsciiSignalIO(filename, method='stream', signal_group_mode='all-in-one')
+        signal = io.read_block().segments[0].analogsignals[0]
+
+        assert_array_equal(signal.magnitude, [[1, 2, 3], [4, np.nan, 6], [7, 8, 9]])
+
+        os.remove(filename)
+
+    def test_stream_comments(self):
+        filename = "test_stream_comments.txt"
+        with open(filename, 'w') as fp:
+            fp.write('# a\tb\n1\t2\n\n3\t4  # last\n# end\n5\t6\n')
+        ref = AsciiSignalIO(filename, method='genfromtxt',
+                            signal_group_mode='all-in-one').read_block()
+        for block_size in (5, 2 ** 24):
+            io = AsciiSignalIO(filename, method='stream', signal_group_mode='all-in-one',
+                               block_size=block_size)
+            signal = io.read_block().segments[0].analogsignals[0]
+            assert_array_equal(signal.magnitude, [[1, 2], [3, 4], [5, 6]])
+            assert_array_equal(signal.magnitude,
+                               ref.segments[0].analogsignals[0].magnitude)
+
+        os.remove(filename)
+
+    def test_stream_lines_of_other_lengths(self):
+        filename = "test_stream_lines_of_other_lengths.txt"
+        # same number of values as two lines of two columns
+        with open(filename, 'w') as fp:
+            fp.write('1\t2\n3\n4\t5\t6\n')
+        io = AsciiSignalIO(filename, method='stream')
+        self.assertRaises(ValueError, io.read_block)
+
+        os.remove(filename)
+
+    def test_lazy_with_cache(self):
+        sample_data = np.random.uniform(size=(2000, 3))
+        sampling_period = 0.5
+        sample_data[:, 0] = sampling_period * np.arange(sample_data.shape[0])
+        filename = "test_lazy_with_cache.txt"
+        np.savetxt(filename, sample_data, delimiter=' ')
+
+        for i in range(2):
+            io = AsciiSignalIO(filename, delimiter=' ', timecolumn=0, units='mV',
+                               time_units='ms', use_cache=True, block_size=1000)
+            block = io.read_block(lazy=True)
+            cache_files = [f for f in os.listdir('.')
+                           if f.startswith(filename) and f.endswith('.npy')]
+            # signals and times
+            self.assertEqual(len(cache_files), 2)
+
+            proxy = block.segments[0].analogsignals[1]
+            self.assertEqual(proxy.shape, (2000, 1))
+            self.assertEqual(proxy.name, 'Column 2')
+            signal = proxy.load()
+            assert_array_almost_equal(signal.reshape(-1).magnitude, sample_data[:, 2],
+                                      decimal=6)
+            self.assertAlmostEqual(signal.sampling_period.rescale('ms').magnitude,
+                                   sampling_period)
+
+            signal = proxy.load(time_slice=(100 * pq.ms, 200 * pq.ms))
+            self.assertEqual(signal.shape, (200, 1))
+            assert_array_almost_equal(signal.reshape(-1).magnitude, sample_data[200:400, 2],
+                                      decimal=6)
+
+        for cache_file in cache_files:
+            os.remove(cache_file)
+        os.remove(filename)
+
+    def test_lazy_regular_times(self):
+        # 1 kHz times written with 6 decimals are not equally spaced in float32
+        sample_data = np.random.uniform(size=(1000, 2))
+        sample_data[:, 0] = np.arange(sample_data.shape[0]) / 1000.
+        filename = "test_lazy_regular_times.txt"
+        np.savetxt(filename, sample_data, fmt='%.6f', delimiter='\t')
+
+        io = AsciiSignalIO(filename, timecolumn=0, units='mV', method='stream')
+        segment = io.read_segment(lazy=True)
+        self.assertIsInstance(segment.analogsignals[0], AnalogSignalProxy)
+        signal = segment.analogsignals[0].load()
+        self.assertAlmostEqual(signal.sampling_rate.rescale('Hz').magnitude, 1000.)
+        assert_array_almost_equal(signal.reshape(-1).magnitude, sample_data[:, 1],
+                                  decimal=6)
+
+        segment = io.read_segment()
+        self.assertEqual(len(segment.analogsignals), 1)
+        self.assertEqual(len(segment.irregularlysampledsignals), 0)
+
+        os.remove(filename)
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -8,7 +8,10 @@ from __future__ import absolute_import, division, print_function
 
 import logging
 import os.path
+import shutil
+import struct
 import sys
+import tempfile
 
 import unittest
 
@@ -18,8 +21,13 @@ import quantities as pq
 from neo.core import (Block, Event,
                       ChannelIndex, Segment, SpikeTrain, Unit)
 from neo.io import BrainwareSrcIO, brainwaresrcio
+from neo.io.proxyobjects import SpikeTrainProxy
 from neo.test.iotest.common_io_test import BaseTestIO
-from neo.test.tools import (assert_same_sub_schema,
+from neo.test.tools import (assert_arrays_equal,
+                            assert_arrays_almost_equal,
+                            assert_same_annotations,
+                            assert_same_sub_schema,
+                            assert_sub_schema_is_lazy_loaded,
                             assert_neo_object_is_compliant)
 from neo.test.iotest.tools import create_generic_reader
 
@@ -48,6 +56,37 @@ FILES_TO_COMPARE = ['block_300ms_4rep_1clust_part_ch1',
                     'sequence_500ms_5rep_ch2']
 
 
+def assert_same_lazy_blocks(blocks, lazy_blocks):
+    '''Check that the SpikeTrains of Blocks read with lazy=True are proxies
+    loading the SpikeTrains of the same Blocks read with lazy=False'''
+    assert len(blocks) == len(lazy_blocks)
+    for block, lazy_block in zip(blocks, lazy_blocks):
+        assert len(block.segments) == len(lazy_block.segments)
+        assert len(block.list_units) == len(lazy_block.list_units)
+        pairs = []
+        for seg, lazy_seg in zip(block.segments, lazy_block.segments):
+            assert seg.annotations.keys() == lazy_seg.annotations.keys()
+            pairs.extend(zip(seg.spiketrains, lazy_seg.spiketrains))
+        for unit, lazy_unit in zip(block.list_units, lazy_block.list_units):
+            assert unit.name == lazy_unit.name
+            pairs.extend(zip(unit.spiketrains, lazy_unit.spiketrains))
+        for train, proxy in pairs:
+            assert isinstance(proxy, SpikeTrainProxy)
+            assert proxy.shape == train.shape
+            loaded = proxy.load(load_waveforms=True)
+            # the loaded times are in s
+            assert_arrays_almost_equal(loaded.rescale(train.units).magnitude,
+                                       train.magnitude, 1e-4)
+            if train.size:
+                assert_arrays_equal(loaded.waveforms.magnitude,
+                                    train.waveforms.magnitude)
+            assert loaded.t_stop == train.t_stop
+            assert loaded.sampling_period == train.sampling_period
+            assert loaded.file_origin == train.file_origin
+            assert_same_annotations(loaded, train, exclude=['trig2'])
+            assert loaded.segment is None
+
+
 def proc_src(filename):
     '''Load an src file that has already been processed by the official matlab
     file converter.  That matlab data is saved to an m-file, which is then
@@ -335,6 +374,138 @@ class BrainwareSrcIOTestCase(BaseTestIO, unittest.TestCase):
                 raise
 
 
+def _seq(seqid, body):
+    return struct.pack('<H', seqid) + body
+
+
+def _list_body(items):
+    return struct.pack('<h4x', len(items)) + b''.join(items)
+
+
+def _spike(time, waveform, trig2):
+    return _seq(29079, struct.pack('<f', time)
+                + np.asarray(waveform, dtype='int8').tobytes()
+                + struct.pack('<B', trig2))
+
+
+def _spikes(rng, n):
+    return [_spike(t, rng.randint(-100, 100, size=40), rng.randint(0, 40))
+            for t in np.sort(rng.uniform(0, 500, size=n))]
+
+
+def _annotations(params):
+    names = b''.join(struct.pack('<xB', len(name)) + name.encode('ascii')
+                     for name in params)
+    values = np.array(list(params.values()), dtype='float32').tobytes()
+    return _seq(29109, struct.pack('<h', len(params)) + names + values)
+
+
+def _unit(name, trains):
+    return _seq(29116, struct.pack('<2xH', len(name)) + name.encode('ascii')
+                + struct.pack('<5i', 500, 10, 100, 200, 300)
+                + _seq(29082, _list_body(trains))
+                + np.arange(18, dtype='float32').tobytes() + b'\x01' * 9)
+
+
+def _block(rng, nb_rep, conditions, comments):
+    segments = []
+    for params in conditions:
+        unassigned = [_seq(29121, struct.pack('<id', rep, 43000.5 + rep)
+                           + _list_body(_spikes(rng, rep)))
+                      for rep in range(nb_rep)]
+        trains = [_seq(29083, _list_body(_spikes(rng, 3 * rep)))
+                  for rep in range(nb_rep)]
+        units = [_unit('unit1', trains)]
+        segments.append(_seq(29106, _annotations(params)
+                             + _seq(29082, _list_body(unassigned))
+                             + _seq(29082, _list_body(units))
+                             + struct.pack('<i', 500)))
+    body = struct.pack('<fB', 40., 1) + _list_body(segments) + b'L'
+    body += struct.pack('<h', len(comments))
+    for time, sender, text in comments:
+        body += struct.pack('<dh', time, len(sender)) + sender.encode('ascii')
+        body += struct.pack('<h', len(text)) + text.encode('ascii')
+    # unit list with one time slice of one unit
+    body += struct.pack('<h2xdh2xh', 1, 1.5, 1, 1) + b'\x00' * 10
+    body += np.zeros(20, dtype='float32').tobytes()
+    body += struct.pack('<2xB??', 1, True, False)
+    return _seq(29120, body)
+
+
+def write_src_file(filename):
+    '''Write a small SRC file with two Blocks'''
+    rng = np.random.RandomState(0)
+    with open(filename, 'wb') as f:
+        f.write(_block(rng, 3, [{'freq': 1000., 'level': 60.},
+                                {'freq': 2000., 'level': 60.}],
+                       [(43000.5, 'me', 'first'), (43000.6, 'me', 'second')]))
+        # end of the first Block
+        f.write(struct.pack('<H', 0))
+        f.write(_block(rng, 2, [{'freq': 4000.}], []))
+
+
+class BrainwareSrcIOIndexTestCase(unittest.TestCase):
+    '''
+    Tests of the index and of the lazy mode of neo.io.BrainwareSrcIO on a
+    generated file
+    '''
+
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.filename = os.path.join(self.tmpdir, 'generated.src')
+        write_src_file(self.filename)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_index(self):
+        index = BrainwareSrcIO(filename=self.filename)._get_index()
+        assert index['blocks'].size == 2
+        assert index['blocks']['offset'][0] == 0
+        # empty lists of spikes are not in the index
+        assert index['spike_lists'].size == 2 * (2 + 2) + (1 + 1)
+        assert np.all(np.diff(index['spike_lists']['offset']) > 0)
+
+    def test_read_block_index(self):
+        blocks = BrainwareSrcIO(filename=self.filename).read_all_blocks()
+        assert len(blocks) == 2
+        assert len(blocks[0].segments) == 1 + 2 * 3
+        for block_index, block in enumerate(blocks):
+            ioobj = BrainwareSrcIO(filename=self.filename)
+            assert_same_sub_schema(block,
+                                   ioobj.read_block(block_index=block_index))
+        self.assertRaises(IndexError, ioobj.read_block, block_index=2)
+
+    def test_lazy(self):
+        ioobj = BrainwareSrcIO(filename=self.filename)
+        blocks = ioobj.read_all_blocks()
+        lazy_blocks = ioobj.read_all_blocks(lazy=True)
+        assert_same_lazy_blocks(blocks, lazy_blocks)
+        for lazy_block in lazy_blocks:
+            assert_sub_schema_is_lazy_loaded(lazy_block)
+
+        lazy_block = ioobj.read_block(block_index=1, lazy=True)
+        assert_same_lazy_blocks(blocks[1:], [lazy_block])
+        assert not ioobj._isopen
+        proxy = lazy_block.segments[2].spiketrains[1]
+        assert proxy.segment is lazy_block.segments[2]
+        assert proxy.shape == (3, )
+
+    def test_cache(self):
+        ioobj = BrainwareSrcIO(filename=self.filename, use_cache=True,
+                               cache_path=self.tmpdir)
+        index = ioobj._get_index()
+        cache_files = [name for name in os.listdir(self.tmpdir)
+                       if name.endswith('_index.npz')]
+        assert len(cache_files) == 1
+
+        ioobj = BrainwareSrcIO(filename=self.filename, use_cache=True,
+                               cache_path=self.tmpdir)
+        cached = ioobj._get_index()
+        for name in ('blocks', 'spike_lists'):
+            assert_arrays_equal(cached[name], index[name])
+
+
 if __name__ == '__main__':
     logger = logging.getLogger(BrainwareSrcIO.__module__ +
                                '.' +
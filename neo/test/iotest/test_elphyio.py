@@ -6,14 +6,23 @@ Tests of neo.io.elphyio
 # needed for python 3 compatibility
 from __future__ import division
 
+import os
+import shutil
 import sys
+import tempfile
 
 import unittest
 
+import numpy as np
+import quantities as pq
+
+from neo.core import Block, Segment, AnalogSignal, SpikeTrain
 try:
     from neo.io.elphyio import ElphyIO
 except ImportError:
     ElphyIO = None
+from neo.io.elphyio_v1 import ElphyIO as OldElphyIO
+from neo.rawio.tests.test_elphyrawio import write_dac2_objects_file
 from neo.test.iotest.common_io_test import BaseTestIO
 
 
@@ -29,5 +38,80 @@ class TestElphyIO(BaseTestIO, unittest.TestCase):
     files_to_download = files_to_test
 
 
+class TestElphyIOGeneratedFiles(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.filename = os.path.join(self.tmpdir, 'test.DAT')
+        rng = np.random.RandomState(0)
+        self.episodes = [{
+            'k_sampling': [1, 2],
+            'signals': [rng.randint(-1000, 1000, 100), rng.randint(-1000, 1000, 50)],
+            'scales': [('mV', 0.5, 1.), ('pA', 2., 0.)],
+            'spikes': [[5, 60], [7, 8, 90]],
+            'waveforms': [rng.randint(-100, 100, (2, 6)), rng.randint(-100, 100, (3, 6))],
+            'nb_rdata': 2,
+        } for e in range(2)]
+        write_dac2_objects_file(self.filename, self.episodes)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_read_block(self):
+        for lazy in (False, True):
+            bl = ElphyIO(filename=self.filename).read_block(lazy=lazy)
+            if lazy:
+                for seg in bl.segments:
+                    seg.analogsignals = [p.load() for p in seg.analogsignals]
+                    seg.spiketrains = [p.load() for p in seg.spiketrains]
+            self.assertEqual(len(bl.segments), 2)
+            for seg, ep in zip(bl.segments, self.episodes):
+                sigs = {sig.units.dimensionality.string: sig for sig in seg.analogsignals}
+                for c, (units, gain, offset) in enumerate(ep['scales']):
+                    sig = sigs[units]
+                    self.assertEqual(sig.sampling_rate, 2. / ep['k_sampling'][c] * pq.kHz)
+                    np.testing.assert_allclose(sig.magnitude[:, 0],
+                                               ep['signals'][c] * gain + offset)
+                self.assertEqual(len(seg.spiketrains), 2)
+                for st, spikes in zip(seg.spiketrains, ep['spikes']):
+                    np.testing.assert_allclose(st.rescale('ms').magnitude,
+                                               np.array(spikes) * 0.5)
+
+    def test_same_as_older_io(self):
+        bl = ElphyIO(filename=self.filename).read_block()
+        old_bl = OldElphyIO(filename=self.filename).read_block()
+        self.assertEqual(len(bl.segments), len(old_bl.segments))
+        for seg, old_seg in zip(bl.segments, old_bl.segments):
+            sigs = {sig.units.dimensionality.string: sig for sig in seg.analogsignals}
+            self.assertEqual(len(sigs), len(old_seg.analogsignals))
+            for old_sig in old_seg.analogsignals:
+                sig = sigs[old_sig.units.dimensionality.string]
+                self.assertEqual(sig.sampling_rate, old_sig.sampling_rate)
+                np.testing.assert_allclose(sig.magnitude, old_sig.magnitude)
+            self.assertEqual(len(seg.spiketrains), len(old_seg.spiketrains))
+            for st, old_st in zip(seg.spiketrains, old_seg.spiketrains):
+                # the older IO gives the times in the time unit of the file, labelled s
+                np.testing.assert_allclose(st.rescale('ms').magnitude, old_st.magnitude)
+
+    def test_read_written_by_older_io(self):
+        bl = Block()
+        seg = Segment(name='written')
+        bl.segments.append(seg)
+        signal = np.arange(60.).reshape(30, 2)
+        seg.analogsignals.append(AnalogSignal(signal * pq.mV, sampling_rate=1 * pq.kHz))
+        seg.spiketrains.append(SpikeTrain([1., 2., 20.] * pq.ms, t_stop=30 * pq.ms))
+        filename = os.path.join(self.tmpdir, 'written.DAT')
+        OldElphyIO(filename=filename).write_block(bl)
+
+        seg = ElphyIO(filename=filename).read_block().segments[0]
+        self.assertEqual(seg.name, 'written')
+        self.assertEqual(len(seg.analogsignals), 2)
+        for c, sig in enumerate(seg.analogsignals):
+            self.assertEqual(sig.sampling_rate, 1 * pq.kHz)
+            self.assertEqual(sig.units, pq.mV)
+            np.testing.assert_allclose(sig.magnitude[:, 0], signal[:, c])
+        self.assertEqual(len(seg.spiketrains), 1)
+        np.testing.assert_allclose(seg.spiketrains[0].rescale('ms').magnitude, [1., 2., 20.])
+
+
 if __name__ == "__main__":
     unittest.main()
@@ -7,11 +7,17 @@ Tests of neo.io.exampleio
 from __future__ import unicode_literals, print_function, division, absolute_import
 
 import unittest
+try:
+    from concurrent.futures import ThreadPoolExecutor
+    HAVE_FUTURES = True
+except ImportError:
+    HAVE_FUTURES = False
 
 from neo.io.exampleio import ExampleIO  # , HAVE_SCIPY
 from neo.test.iotest.common_io_test import BaseTestIO
 from neo.io.proxyobjects import (AnalogSignalProxy,
-                SpikeTrainProxy, EventProxy, EpochProxy)
+                SpikeTrainProxy, EventProxy, EpochProxy, proxyobjectlist)
+from neo.test.tools import assert_arrays_equal, assert_same_sub_schema
 from neo import (AnalogSignal, SpikeTrain)
 
 import quantities as pq
@@ -93,6 +99,71 @@ class Specific_TestExampleIO(unittest.TestCase):
         assert np.all(event_slice.times >= t_start)
         assert np.all(event_slice.times <= t_stop)
 
+    @unittest.skipUnless(HAVE_FUTURES, 'requires concurrent.futures')
+    def test_read_block_parallel(self):
+        r = ExampleIO(filename=None)
+        bl = r.read_block(lazy=False)
+        bl_parallel = r.read_block(lazy=False, max_workers=4)
+        assert_same_sub_schema(bl_parallel, bl)
+        for seg in bl_parallel.segments:
+            for obj in seg.analogsignals + seg.spiketrains + seg.events + seg.epochs:
+                assert not isinstance(obj, tuple(proxyobjectlist))
+                assert obj.segment is seg
+        for chx, chx_parallel in zip(bl.channel_indexes, bl_parallel.channel_indexes):
+            assert len(chx_parallel.analogsignals) == len(chx.analogsignals)
+            for unit, unit_parallel in zip(chx.units, chx_parallel.units):
+                assert len(unit_parallel.spiketrains) == len(unit.spiketrains)
+
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            bl_executor = r.read_block(lazy=False, executor=executor)
+        assert_same_sub_schema(bl_executor, bl)
+
+    @unittest.skipUnless(HAVE_FUTURES, 'requires concurrent.futures')
+    def test_read_segment_parallel(self):
+        r = ExampleIO(filename=None)
+        time_slice = (260 * pq.ms, 1.854 * pq.s)
+        seg = r.read_segment(time_slice=time_slice, load_waveforms=True)
+        seg_parallel = r.read_segment(time_slice=time_slice, load_waveforms=True,
+                                      max_workers=3)
+        assert_same_sub_schema(seg_parallel, seg)
+        assert seg_parallel.spiketrains[0].waveforms is not None
+
+    def test_read_block_parallel_not_supported(self):
+        class SerialExampleIO(ExampleIO):
+            support_concurrent_reads = False
+
+        r = SerialExampleIO(filename=None)
+        bl = r.read_block(lazy=False)
+        bl_parallel = r.read_block(lazy=False, max_workers=4, executor=object())
+        assert_same_sub_schema(bl_parallel, bl)
+
+    def test_read_block_selection(self):
+        r = ExampleIO(filename=None)
+        bl_full = r.read_block(lazy=False, signal_group_mode='split-all')
+        bl = r.read_block(lazy=False, signal_group_mode='split-all',
+                          channel_indexes=[3, 1], channel_names=['ch7'], unit_indexes=[2],
+                          event_channel_indexes=[1])
+
+        assert len(bl.channel_indexes) == 3 + 1
+        assert_arrays_equal(bl.channel_indexes[0].channel_names, np.array([b'ch1']))
+        for seg, seg_full in zip(bl.segments, bl_full.segments):
+            assert len(seg.analogsignals) == 3
+            for anasig, c in zip(seg.analogsignals, [1, 3, 7]):
+                assert_arrays_equal(anasig.magnitude, seg_full.analogsignals[c].magnitude)
+            assert len(seg.spiketrains) == 1
+            assert_arrays_equal(seg.spiketrains[0].magnitude,
+                                seg_full.spiketrains[2].magnitude)
+            assert seg.spiketrains[0].unit is bl.channel_indexes[3].units[0]
+            assert len(seg.events) == 0
+            assert len(seg.epochs) == 1
+
+        bl = r.read_block(lazy=True, channel_indexes=[0, 5], unit_indexes=[],
+                          event_channel_indexes=[])
+        seg = bl.segments[0]
+        assert len(seg.analogsignals) == 1
+        assert_arrays_equal(seg.analogsignals[0]._global_channel_indexes, np.array([0, 5]))
+        assert len(seg.spiketrains) == len(seg.events) == len(seg.epochs) == 0
+
 
 if __name__ == "__main__":
     unittest.main()
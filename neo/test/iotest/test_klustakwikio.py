@@ -8,6 +8,7 @@ from __future__ import absolute_import
 
 import glob
 import os.path
+import shutil
 import sys
 import tempfile
 
@@ -337,6 +338,47 @@ class testWriteWithFeatures(unittest.TestCase):
         delete_test_session(self.dirname)
 
 
+@unittest.skipUnless(HAVE_MLAB, "requires matplotlib")
+class testWriteFormat(unittest.TestCase):
+    def setUp(self):
+        self.dirname = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.dirname)
+
+    def test_write_bytes(self):
+        """Each spiketrain is written with the dtype of its features"""
+        block = neo.Block()
+        segment = neo.Segment()
+        block.segments.append(segment)
+
+        st1 = neo.SpikeTrain(times=[.002, .004], units='s', t_stop=1.)
+        st1.annotations['cluster'] = 3
+        st1.annotations['waveform_features'] = np.array([[1, 2], [3, -4]])
+        segment.spiketrains.append(st1)
+
+        st2 = neo.SpikeTrain(times=[.0055], units='s', t_stop=1.)
+        st2.annotations['cluster'] = 1
+        st2.annotations['waveform_features'] = np.array([[0.1, 2.]])
+        segment.spiketrains.append(st2)
+
+        st3 = neo.SpikeTrain(times=[.009], units='s', t_stop=1.)
+        st3.annotations['cluster'] = 1
+        st3.annotations['waveform_features'] = np.array([[0.1, -2.5]],
+                                                        dtype='float32')
+        segment.spiketrains.append(st3)
+
+        kio = KlustaKwikIO(filename=os.path.join(self.dirname, 'base'),
+                           sampling_rate=1000.)
+        kio.write_block(block)
+
+        with open(os.path.join(self.dirname, 'base.fet.0'), 'rb') as f:
+            self.assertEqual(f.read(),
+                             b'2\n1 2 2\n3 -4 4\n0.1 2.0 6\n0.1 -2.5 9\n')
+        with open(os.path.join(self.dirname, 'base.clu.0'), 'rb') as f:
+            self.assertEqual(f.read(), b'2\n3\n3\n1\n1\n')
+
+
 @unittest.skipUnless(HAVE_MLAB, "requires matplotlib")
 class CommonTests(BaseTestIO, unittest.TestCase):
     ioclass = KlustaKwikIO
@@ -8,10 +8,13 @@ from __future__ import absolute_import, division
 
 import unittest
 
+import numpy as np
 import quantities as pq
-from neo import Block, Segment, SpikeTrain
+from neo import Block, Segment, AnalogSignal, SpikeTrain, Event
 from neo.test.iotest.common_io_test import BaseTestIO
-from neo.io.neomatlabio import NeoMatlabIO, HAVE_SCIPY
+from neo.test.tools import assert_same_sub_schema, assert_sub_schema_is_lazy_loaded
+from neo.io.proxyobjects import AnalogSignalProxy, SpikeTrainProxy, EventProxy
+from neo.io.neomatlabio import NeoMatlabIO, HAVE_SCIPY, HAVE_H5PY
 
 
 @unittest.skipUnless(HAVE_SCIPY, "requires scipy")
@@ -39,6 +42,65 @@ class TestNeoMatlabIO(BaseTestIO, unittest.TestCase):
         self.assertEqual(block1.segments[0].spiketrains[0],
                          block2.segments[0].spiketrains[0])
 
+    @unittest.skipUnless(HAVE_H5PY, "requires h5py")
+    def test_write_read_hdf5(self):
+        block1 = Block(name='block')
+        seg = Segment('segment1', index=0)
+        block1.segments.append(seg)
+        seg.analogsignals.append(AnalogSignal(np.random.rand(500, 3) * pq.mV,
+                                              sampling_rate=100 * pq.Hz, t_start=1 * pq.s,
+                                              name='signal'))
+        seg.spiketrains.append(SpikeTrain([0.5, 1.5, 3.] * pq.s, t_stop=10 * pq.s,
+                                          waveforms=np.random.rand(3, 2, 4) * pq.uV))
+        seg.events.append(Event([1., 2.] * pq.s, labels=np.array(['start', 'stop'])))
+        block1.create_many_to_one_relationship()
+
+        filename = BaseTestIO.get_filename_path(self, 'matlabiotestfile_v73.mat')
+        self.ioclass(filename, version='7.3').write_block(block1)
+
+        # the same reader for both versions, the same block
+        block2 = self.ioclass(filename).read_block()
+        assert_same_sub_schema(block1, block2)
+        filename_v5 = BaseTestIO.get_filename_path(self, 'matlabiotestfile.mat')
+        self.ioclass(filename_v5).write_block(block1)
+        block_v5 = self.ioclass(filename_v5).read_block()
+        np.testing.assert_array_equal(block2.segments[0].events[0].labels,
+                                      block_v5.segments[0].events[0].labels)
+
+        # lazy
+        for fname, block_eager in ((filename, block2), (filename_v5, block_v5)):
+            block3 = self.ioclass(fname).read_block(lazy=True)
+            assert_sub_schema_is_lazy_loaded(block3)
+            proxy = block3.segments[0].analogsignals[0]
+            self.assertIsInstance(proxy, AnalogSignalProxy)
+            self.assertEqual(proxy.shape, (500, 3))
+            self.assertEqual(proxy.name, 'signal')
+            assert_same_sub_schema(proxy.load(), block_eager.segments[0].analogsignals[0])
+            sig = proxy.load(time_slice=(2 * pq.s, 3 * pq.s))
+            self.assertEqual(sig.t_start, 2 * pq.s)
+            np.testing.assert_array_equal(sig.magnitude, block1.segments[0].analogsignals[0]
+                                          .time_slice(2 * pq.s, 3 * pq.s).magnitude)
+            proxy = block3.segments[0].spiketrains[0]
+            self.assertIsInstance(proxy, SpikeTrainProxy)
+            st = proxy.load(load_waveforms=True)
+            np.testing.assert_array_equal(st.times, block1.segments[0].spiketrains[0].times)
+            # the waveforms of the proxy objects are float32
+            np.testing.assert_allclose(st.waveforms.rescale(pq.uV).magnitude,
+                                       block1.segments[0].spiketrains[0].waveforms.magnitude,
+                                       rtol=1e-6)
+            st = proxy.load(time_slice=(1 * pq.s, 5 * pq.s))
+            self.assertEqual(len(st), 2)
+            proxy = block3.segments[0].events[0]
+            self.assertIsInstance(proxy, EventProxy)
+            ev = proxy.load()
+            np.testing.assert_array_equal(ev.times, block1.segments[0].events[0].times)
+            np.testing.assert_array_equal(ev.labels, block_eager.segments[0].events[0].labels)
+
+        # the file is not left open by the proxy objects
+        self.ioclass(filename, version='7.3').write_block(block1)
+        assert_same_sub_schema(block3.segments[0].analogsignals[0].load(),
+                               block1.segments[0].analogsignals[0])
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -5,6 +5,9 @@ Tests of neo.io.exampleio
 
 # needed for python 3 compatibility
 from __future__ import absolute_import, division
+import os
+import shutil
+import tempfile
 import warnings
 
 import unittest
@@ -807,5 +810,59 @@ class TestColumnIO(BaseTestIO, unittest.TestCase):
         assert all(np.diff(result[:, 0]) >= 0)
 
 
+class TestColumnIOGeneratedFile(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.mkdtemp()
+        self.filename = os.path.join(self.tmpdir, 'spikes-1-0.gdf')
+        gids = np.array([3, 1, 2, 1, 3, 3, 2, 1])
+        times = np.arange(1, 9) * 1.5
+        with open(self.filename, 'w') as f:
+            for gid, t in zip(gids, times):
+                f.write('%d\t%.1f\t\n' % (gid, t))
+        self.data = np.stack([gids, times], axis=1)
+
+    def tearDown(self):
+        shutil.rmtree(self.tmpdir)
+
+    def test_read_by_blocks(self):
+        testIO = ColumnIO(filename=self.filename, block_size=7)
+        np.testing.assert_array_equal(testIO.data, self.data)
+
+    def test_cache(self):
+        for i in range(2):
+            testIO = ColumnIO(filename=self.filename, use_cache=True)
+            np.testing.assert_array_equal(testIO.data, self.data)
+        cache_files = [f for f in os.listdir(self.tmpdir) if f.endswith('.npy')]
+        self.assertEqual(len(cache_files), 1)
+
+    def test_comments(self):
+        with open(self.filename, 'w') as f:
+            f.write('# gid\ttime\n1\t1.5\n\n2\t2.5  # last\n')
+        for block_size in (7, 2 ** 24):
+            testIO = ColumnIO(filename=self.filename, block_size=block_size)
+            np.testing.assert_array_equal(testIO.data, [[1., 1.5], [2., 2.5]])
+
+    def test_lines_of_other_lengths(self):
+        # same number of values as two lines of two columns
+        with open(self.filename, 'w') as f:
+            f.write('1 2\n3\n4 5 6\n')
+        self.assertRaises(ValueError, ColumnIO, filename=self.filename)
+
+    def test_condition_on_single_values(self):
+        testIO = ColumnIO(filename=self.filename)
+        result = testIO.get_columns(condition=lambda x: x in [1, 2],
+                                    condition_column=0)
+        np.testing.assert_array_equal(result, self.data[self.data[:, 0] < 3])
+
+    def test_read_all_spiketrains(self):
+        r = NestIO(filenames=self.filename)
+        seg = r.read_segment(gid_list=[], t_start=2. * pq.ms, t_stop=10. * pq.ms)
+        self.assertEqual([st.annotations['id'] for st in seg.spiketrains], [1, 2, 3])
+        for st in seg.spiketrains:
+            mask = (self.data[:, 0] == st.annotations['id']) & (self.data[:, 1] >= 2.) \
+                & (self.data[:, 1] < 10.)
+            np.testing.assert_array_equal(st.magnitude, self.data[mask, 1])
+
+
 if __name__ == "__main__":
     unittest.main()
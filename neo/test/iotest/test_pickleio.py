@@ -7,6 +7,7 @@ Tests of the neo.io.pickleio.PickleIO class
 from __future__ import absolute_import, division
 
 import os
+import pickle
 
 import unittest
 
@@ -115,6 +116,44 @@ class TestPickleIO(unittest.TestCase):
         self.assertIsInstance(r_seg.irregularlysampledsignals[0].segment, Segment)
         os.remove('blk.pkl')
 
+    @unittest.skipIf(pickle.HIGHEST_PROTOCOL < 5, "requires pickle protocol 5")
+    def test_npy_buffers(self):
+        signal = AnalogSignal(np.random.rand(1000, 4), units='mV', sampling_rate=1 * pq.kHz)
+        train = SpikeTrain([3, 4, 5] * pq.s, t_stop=10.0,
+                           waveforms=np.random.rand(3, 1, 10) * pq.uV)
+        blk = Block()
+        seg = Segment()
+        seg.analogsignals.append(signal)
+        seg.spiketrains.append(train)
+        blk.segments.append(seg)
+
+        PickleIO(filename="blk.pkl", npy_buffers=True).write_block(blk)
+        buffer_files = [f for f in os.listdir('.') if f.startswith('blk.pkl_')]
+        self.assertGreater(len(buffer_files), 0)
+        # the signals are not in the pickle file
+        self.assertLess(os.path.getsize('blk.pkl'), signal.nbytes)
+
+        r_blk = PickleIO(filename="blk.pkl", npy_buffers=True).read_block()
+        r_seg = r_blk.segments[0]
+        assert_array_equal(r_seg.analogsignals[0], signal)
+        # the signal is a view of a memory map of its .npy file
+        base = r_seg.analogsignals[0]
+        while base is not None and not isinstance(base, np.memmap):
+            base = base.base
+        self.assertIsInstance(base, np.memmap)
+        assert_array_equal(r_seg.spiketrains[0], train)
+        assert_array_equal(r_seg.spiketrains[0].waveforms, train.waveforms)
+        self.assertEqual(r_seg.spiketrains[0].waveforms.units, pq.uV)
+        # the memory map is copy-on-write
+        r_seg.analogsignals[0][0, 0] = 10 * pq.V
+        r_blk = PickleIO(filename="blk.pkl", npy_buffers=True).read_block()
+        assert_array_equal(r_blk.segments[0].analogsignals[0], signal)
+
+        # the files of a previous write with more buffers are removed
+        PickleIO(filename="blk.pkl", npy_buffers=True).write_block(Block())
+        self.assertEqual([f for f in os.listdir('.') if f.startswith('blk.pkl_')], [])
+        os.remove('blk.pkl')
+
 
 if __name__ == '__main__':
     unittest.main()
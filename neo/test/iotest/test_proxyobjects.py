@@ -10,13 +10,13 @@ import numpy as np
 import quantities as pq
 from neo.rawio.examplerawio import ExampleRawIO
 from neo.io.proxyobjects import (AnalogSignalProxy, SpikeTrainProxy,
-                EventProxy, EpochProxy)
+                EventProxy, EpochProxy, ensure_second)
 
 from neo.core import (Segment, AnalogSignal,
                       Epoch, Event, SpikeTrain)
 
 
-from neo.test.tools import (assert_arrays_almost_equal,
+from neo.test.tools import (assert_arrays_almost_equal, assert_arrays_equal,
                             assert_neo_object_is_compliant,
                             assert_same_attributes)
 
@@ -132,12 +132,31 @@ class TestSpikeTrainProxy(BaseProxyTest):
         assert sptr_float.units == pq.s
 
         # magnitude mode raw
-        # TODO when raw mode implemented
-        # sptr_int = proxy_sptr.load(magnitude_mode='raw')
-        # assert sptr_int.dtype=='int64'
-        # assert sptr_int.units==pq.CompoundUnit('1/10000*s')
-
-        # assert_arrays_almost_equal(sptr_float, sptr_int.rescale('s'), 1e-9)
+        sptr_int = proxy_sptr.load(magnitude_mode='raw')
+        assert sptr_int.dtype == 'int64'
+        assert sptr_int.units == pq.CompoundUnit('0.0001*s')
+        assert_arrays_almost_equal(sptr_float, sptr_int.rescale('s'), 1e-9)
+        assert sptr_int.t_stop.rescale('s') == sptr_float.t_stop
+        # the limits have the units and dtype of the times
+        assert sptr_int.t_start.dtype == 'int64'
+        assert sptr_int.t_stop.dtype == 'int64'
+        assert sptr_int.t_start.units == sptr_int.units
+        sptr_int = proxy_sptr.load(magnitude_mode='raw',
+                                   time_slice=(0.25005 * pq.s, 0.49995 * pq.s))
+        assert sptr_int.t_start == 2500 * sptr_int.units
+        assert sptr_int.t_stop == 5000 * sptr_int.units
+
+        sptr_int = proxy_sptr.time_shift(1. * pq.s).load(magnitude_mode='raw')
+        assert sptr_int.dtype == 'int64'
+        assert_arrays_almost_equal(sptr_float + 1. * pq.s, sptr_int.rescale('s'), 1e-9)
+
+        sptr_int = proxy_sptr.load(magnitude_mode='raw', load_waveforms=True)
+        assert sptr_int.waveforms.dtype == 'int16'
+        assert sptr_int.waveforms.units == pq.dimensionless
+
+        # a shift which is not a whole number of ticks
+        with self.assertRaises(AssertionError):
+            proxy_sptr.time_shift(1e-5 * pq.s).load(magnitude_mode='raw')
 
         # Without waveforms
         sptr = proxy_sptr.load(load_waveforms=False)
@@ -153,6 +172,28 @@ class TestSpikeTrainProxy(BaseProxyTest):
         sptr = proxy_sptr.load(load_waveforms=True, time_slice=(250 * pq.ms, 500 * pq.ms))
         assert sptr.waveforms.shape == (6, 1, 50)
 
+    def test_time_slice_shape(self):
+        proxy_sptr = SpikeTrainProxy(rawio=self.reader, unit_index=0,
+                        block_index=0, seg_index=0)
+        sliced = proxy_sptr.time_slice(250 * pq.ms, 500 * pq.ms)
+        calls = []
+        method = self.reader.get_spike_raw_waveforms
+
+        def wrapper(*args, **kargs):
+            calls.append(kargs)
+            return method(*args, **kargs)
+        self.reader.get_spike_raw_waveforms = wrapper
+        # only the timestamps are read, once
+        assert sliced.shape == (6, )
+        assert sliced.shape == sliced.load().shape
+        assert len(calls) == 0
+
+        proxy_event = EventProxy(rawio=self.reader, event_channel_index=0,
+                        block_index=0, seg_index=0)
+        sliced = proxy_event.time_slice(1 * pq.s, 2 * pq.s)
+        assert sliced.shape == (2, )
+        assert sliced.shape == sliced.load().shape
+
 
 class TestEventProxy(BaseProxyTest):
     def test_EventProxy(self):
@@ -178,6 +219,12 @@ class TestEventProxy(BaseProxyTest):
             event = proxy_event.load(time_slice=(2 * pq.s, 15 * pq.s))
         event = proxy_event.load(time_slice=(2 * pq.s, 15 * pq.s), strict_slicing=False)
 
+        # magnitude mode raw
+        event = proxy_event.load(magnitude_mode='raw')
+        assert event.units == pq.CompoundUnit('1.0*s')
+        assert_arrays_almost_equal(full_event.times, event.times.rescale('s'), 1e-9)
+        assert_arrays_equal(full_event.labels, event.labels)
+
 
 class TestEpochProxy(BaseProxyTest):
     def test_EpochProxy(self):
@@ -204,6 +251,118 @@ class TestEpochProxy(BaseProxyTest):
             epoch = proxy_epoch.load(time_slice=(2 * pq.s, 15 * pq.s))
         epoch = proxy_epoch.load(time_slice=(2 * pq.s, 15 * pq.s), strict_slicing=False)
 
+        # magnitude mode raw
+        epoch = proxy_epoch.load(time_slice=(1 * pq.s, 4 * pq.s), magnitude_mode='raw')
+        assert epoch.shape == (3,)
+        assert_arrays_almost_equal(full_epoch.times[1:4], epoch.times.rescale('s'), 1e-9)
+        assert_arrays_almost_equal(full_epoch.durations[1:4], epoch.durations.rescale('s'),
+                                   1e-9)
+
+
+class TestLoadMany(BaseProxyTest):
+    time_slices = [(6. * pq.s, 7.5 * pq.s), (.25 * pq.s, .5 * pq.s), (None, 1. * pq.s),
+                   (7. * pq.s, 8. * pq.s), (3. * pq.s, 3. * pq.s), (9. * pq.s, None)]
+
+    def count_calls(self, method_name):
+        calls = []
+        method = getattr(self.reader, method_name)
+
+        def wrapper(*args, **kargs):
+            calls.append(kargs)
+            return method(*args, **kargs)
+        setattr(self.reader, method_name, wrapper)
+        return calls
+
+    def test_AnalogSignalProxy_load_many(self):
+        proxy_anasig = AnalogSignalProxy(rawio=self.reader, global_channel_indexes=None,
+                        block_index=0, seg_index=0)
+        calls = self.count_calls('get_analogsignal_chunk')
+        anasigs = proxy_anasig.load_many(self.time_slices, channel_indexes=[1, 3])
+
+        # the overlapping slices are read at once and in order
+        self.assertEqual([(c['i_start'], c['i_stop']) for c in calls],
+                         [(0, 10000), (30000, 30000), (60000, 80000), (90000, 100000)])
+        self.assertEqual(len(anasigs), len(self.time_slices))
+        for anasig, time_slice in zip(anasigs, self.time_slices):
+            target = proxy_anasig.load(time_slice=time_slice, channel_indexes=[1, 3])
+            assert_same_attributes(anasig, target)
+
+        with self.assertRaises(AssertionError):
+            proxy_anasig.load_many([(2. * pq.s, 15 * pq.s)])
+        anasig, = proxy_anasig.load_many([(2. * pq.s, 15 * pq.s)], strict_slicing=False)
+        assert anasig.t_stop == 10 * pq.s
+        self.assertEqual(proxy_anasig.load_many([]), [])
+
+    def test_AnalogSignalProxy_load_windows(self):
+        proxy_anasig = AnalogSignalProxy(rawio=self.reader, global_channel_indexes=None,
+                        block_index=0, seg_index=0)
+        t_starts = [5., 1.99999, 1.5] * pq.s
+        windows = proxy_anasig.load_windows(t_starts, 500 * pq.ms, channel_indexes=[0, 2, 4])
+        assert windows.shape == (3, 5000, 3)
+        assert windows.units == pq.uV
+        assert windows.dtype == 'float32'
+        for window, t_start in zip(windows, t_starts):
+            target = proxy_anasig.load(time_slice=(t_start, t_start + 500 * pq.ms),
+                                       channel_indexes=[0, 2, 4])
+            # load() can give one sample less because t_stop is rounded down
+            assert_arrays_almost_equal(window[:target.shape[0]], target.magnitude * target.units,
+                                       1e-9)
+
+        windows = proxy_anasig.load_windows(t_starts, 500 * pq.ms, magnitude_mode='raw')
+        assert windows.shape == (3, 5000, 16)
+        assert windows.dtype == 'int16'
+
+        with self.assertRaises(AssertionError):
+            proxy_anasig.load_windows([9.8] * pq.s, 500 * pq.ms)
+
+        # times without units are in s
+        windows = proxy_anasig.load_windows(np.array([5., 1.5]), .5, channel_indexes=[0])
+        target = proxy_anasig.load_windows([5., 1.5] * pq.s, 500 * pq.ms, channel_indexes=[0])
+        assert_arrays_equal(windows, target)
+
+    def test_ensure_second(self):
+        assert ensure_second(1.5) == 1.5 * pq.s
+        assert ensure_second(2) == 2. * pq.s
+        assert ensure_second(np.float32(1.5)) == 1.5 * pq.s
+        assert ensure_second(250 * pq.ms) == .25 * pq.s
+        assert_arrays_equal(ensure_second(np.array([1, 2])), [1., 2.] * pq.s)
+        with self.assertRaises(TypeError):
+            ensure_second('1 s')
+
+    def test_SpikeTrainProxy_load_many(self):
+        proxy_sptr = SpikeTrainProxy(rawio=self.reader, unit_index=0,
+                        block_index=0, seg_index=0)
+        # ExampleRawIO needs both limits of the time slice to select spikes
+        time_slices = self.time_slices[:2] + self.time_slices[3:5]
+        calls = self.count_calls('get_spike_timestamps')
+        sptrs = proxy_sptr.load_many(time_slices, load_waveforms=True)
+        self.assertEqual(len(calls), 3)
+        for sptr, time_slice in zip(sptrs, time_slices):
+            target = proxy_sptr.load(time_slice=time_slice, load_waveforms=True)
+            # ExampleRawIO gives random waveforms
+            assert_same_attributes(sptr, target, exclude=('waveforms',))
+            assert sptr.waveforms.shape == target.waveforms.shape
+
+        sptrs = proxy_sptr.load_windows([.25, 7.] * pq.s, 250 * pq.ms)
+        assert sptrs[0].shape == (6,)
+        assert sptrs[1].t_stop == 7.25 * pq.s
+
+    def test_EventProxy_load_many(self):
+        proxy_event = EventProxy(rawio=self.reader, event_channel_index=0,
+                        block_index=0, seg_index=0)
+        events = proxy_event.load_many(self.time_slices)
+        for event, time_slice in zip(events, self.time_slices):
+            target = proxy_event.load(time_slice=time_slice)
+            assert_same_attributes(event, target)
+
+    def test_EpochProxy_load_many(self):
+        proxy_epoch = EpochProxy(rawio=self.reader, event_channel_index=1,
+                        block_index=0, seg_index=0)
+        epochs = proxy_epoch.load_many(self.time_slices)
+        for epoch, time_slice in zip(epochs, self.time_slices):
+            target = proxy_epoch.load(time_slice=time_slice)
+            assert_same_attributes(epoch, target)
+
 
 class TestSegmentWithProxy(BaseProxyTest):
     def test_segment_with_proxy(self):
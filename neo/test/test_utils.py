@@ -3,7 +3,11 @@
 Tests of the neo.utils module
 """
 
+import pickle
 import unittest
+from unittest import mock
+import warnings
+from concurrent.futures import ProcessPoolExecutor
 
 import numpy as np
 import quantities as pq
@@ -21,7 +25,28 @@ from neo.test.tools import (assert_arrays_almost_equal,
                             assert_same_attributes,
                             assert_same_annotations)
 
-from neo.utils import (get_events, get_epochs, add_epoch, match_events, cut_block_by_epochs)
+from neo.utils import (get_events, get_epochs, add_epoch, add_epochs, match_events,
+                       cut_block_by_epochs, _match_times, _match_sorted_times,
+                       SharedNeoObject, HAVE_SHARED_MEMORY)
+
+
+def match_times_sequentially(times1, times2):
+    """
+    Reference pairing of match_events, stepping through both arrays.
+    """
+    id1, id2 = 0, 0
+    match_ev1, match_ev2 = [], []
+    while id1 < len(times1) and id2 < len(times2):
+        if times1[id1] >= times2[id2]:
+            id2 += 1
+        elif id1 + 1 < len(times1) and times1[id1 + 1] < times2[id2]:
+            id1 += 1
+        else:
+            match_ev1.append(id1)
+            match_ev2.append(id2)
+            id1 += 1
+            id2 += 1
+    return match_ev1, match_ev2, id1, id2
 
 
 class BaseProxyTest(unittest.TestCase):
@@ -319,6 +344,87 @@ class TestUtilsWithoutProxyObjects(unittest.TestCase):
         assert_same_attributes(matched_starts2, starts)
         assert_same_attributes(matched_stops2, stops)
 
+    def test__match_events_units(self):
+        starts = Event(times=[0.5, 10.0, 25.2] * pq.s)
+        stops = Event(times=[5500., 14900., 30100.] * pq.ms)
+
+        matched_starts, matched_stops = match_events(starts, stops)
+
+        assert_same_attributes(matched_starts, starts)
+        assert_same_attributes(matched_stops, stops)
+
+    def test__match_sorted_times(self):
+        np.random.seed(0)
+        for n1, n2 in [(0, 5), (5, 0), (1, 1), (20, 7), (7, 20), (50, 50)]:
+            # few distinct values so that ties are frequent
+            times1 = np.sort(np.random.randint(0, 30, n1)).astype(float)
+            times2 = np.sort(np.random.randint(0, 30, n2)).astype(float)
+
+            target = match_times_sequentially(times1, times2)
+            result = _match_sorted_times(times1, times2)
+
+            assert_arrays_equal(result[0], np.array(target[0], dtype=int))
+            assert_arrays_equal(result[1], np.array(target[1], dtype=int))
+            self.assertEqual(result[2:], target[2:])
+
+    def test__match_times(self):
+        np.random.seed(0)
+        for n1, n2 in [(0, 5), (5, 0), (1, 1), (20, 7), (7, 20), (50, 50), (300, 200)]:
+            # unsorted, with few distinct values so that ties are frequent
+            times1 = np.random.randint(0, 30, n1).astype(float)
+            times2 = np.random.randint(0, 30, n2).astype(float)
+
+            target = match_times_sequentially(times1, times2)
+            result = _match_times(times1, times2)
+
+            assert_arrays_equal(result[0], np.array(target[0], dtype=int))
+            assert_arrays_equal(result[1], np.array(target[1], dtype=int))
+            self.assertEqual(result[2:], target[2:])
+
+    def test__match_events_unsorted(self):
+        starts = Event(times=[10.0, 0.5, 25.2] * pq.s)
+        stops = Event(times=[14.9, 5.5, 30.1] * pq.s)
+
+        with warnings.catch_warnings(record=True):
+            warnings.simplefilter('always')
+            matched_starts, matched_stops = match_events(starts, stops)
+
+        assert_arrays_equal(matched_starts.times, [0.5, 25.2] * pq.s)
+        assert_arrays_equal(matched_stops.times, [14.9, 30.1] * pq.s)
+
+    def test__add_epochs(self):
+        starts = Event(times=[0.5, 10.0, 25.2] * pq.s)
+        starts.annotate(event_type='trial start')
+        stops = Event(times=[5.5, 14.9, 30.1] * pq.s)
+        cues = Event(times=[1.5, 12.0] * pq.s)
+        responses = Event(times=[2500., 13000.] * pq.ms)
+
+        seg = Segment()
+        epochs = add_epochs(seg, [(starts, stops), (cues, responses), (cues, None)],
+                            post=100 * pq.ms)
+
+        self.assertEqual(len(epochs), 3)
+        self.assertEqual(seg.epochs, epochs)
+        for epoch in epochs:
+            assert_neo_object_is_compliant(epoch)
+            self.assertIs(epoch.segment, seg)
+        assert_same_annotations(epochs[0], starts)
+        assert_arrays_almost_equal(epochs[1].times, cues.times, 1e-12)
+        assert_arrays_almost_equal(epochs[1].durations, [1.1, 1.1] * pq.s, 1e-12)
+        assert_arrays_almost_equal(epochs[2].durations, [0.1, 0.1] * pq.s, 1e-12)
+        assert_arrays_equal(epochs[1].labels, np.array([b'epoch_0', b'epoch_1']))
+
+        # the epochs are attached to the segment at once
+        seg = Segment()
+        with mock.patch.object(Segment, 'create_relationship') as create_relationship:
+            add_epochs(seg, [(starts, stops), (cues, responses), (cues, None)],
+                       post=100 * pq.ms)
+        create_relationship.assert_called_once_with()
+        self.assertEqual(len(seg.epochs), 3)
+
+        self.assertRaises(ValueError, add_epochs, seg, [(stops, starts)])
+        self.assertRaises(TypeError, add_epochs, Block(), [(starts, stops)])
+
     def test__cut_block_by_epochs(self):
         epoch = Epoch([0.5, 10.0, 25.2] * pq.s, durations=[5.1, 4.8, 5.0] * pq.s,
                       t_start=.1 * pq.s)
@@ -622,3 +728,148 @@ class TestUtilsWithProxyObjects(BaseProxyTest):
                                            Epoch))
                 assert_same_attributes(block2.segments[epoch_idx].epochs[0],
                                        sliced_epoch)
+
+    def _make_proxy_block(self):
+        seg = Segment()
+        seg.analogsignals.append(AnalogSignalProxy(rawio=self.reader,
+                                                   global_channel_indexes=None,
+                                                   block_index=0, seg_index=0))
+        seg.spiketrains.append(SpikeTrainProxy(rawio=self.reader, unit_index=0,
+                                               block_index=0, seg_index=0))
+        seg.events.append(EventProxy(rawio=self.reader, event_channel_index=0,
+                                     block_index=0, seg_index=0))
+        seg.epochs.append(Epoch([0.5, 2.2, 6.] * pq.s, durations=[1., 0.75, 2.] * pq.s,
+                                pick='me'))
+        block = Block()
+        block.segments = [seg]
+        block.create_many_to_one_relationship()
+        return block
+
+    def test__cut_block_by_epochs_lazy(self):
+        for reset_time in (False, True):
+            block = self._make_proxy_block()
+            lazy_block = self._make_proxy_block()
+
+            calls = []
+            for name in ('get_analogsignal_chunk', 'get_spike_timestamps',
+                         'get_event_timestamps'):
+                def wrapper(*args, **kargs):
+                    calls.append(kargs)
+                setattr(self.reader, name, wrapper)
+
+            cut_block_by_epochs(lazy_block, properties={'pick': 'me'}, reset_time=reset_time,
+                                lazy=True)
+            # nothing is read until the proxies are loaded
+            self.assertEqual(calls, [])
+            for name in ('get_analogsignal_chunk', 'get_spike_timestamps',
+                         'get_event_timestamps'):
+                delattr(self.reader, name)
+
+            cut_block_by_epochs(block, properties={'pick': 'me'}, reset_time=reset_time)
+
+            self.assertEqual(len(lazy_block.segments), 3)
+            for seg, lazy_seg in zip(block.segments, lazy_block.segments):
+                self.assertIsInstance(lazy_seg.analogsignals[0], AnalogSignalProxy)
+                self.assertIsInstance(lazy_seg.spiketrains[0], SpikeTrainProxy)
+                self.assertIsInstance(lazy_seg.events[0], EventProxy)
+                self.assertIs(lazy_seg.analogsignals[0].segment, lazy_seg)
+
+                assert_same_attributes(lazy_seg.analogsignals[0].load(), seg.analogsignals[0])
+                assert_same_attributes(lazy_seg.spiketrains[0].load(), seg.spiketrains[0])
+                self.assertEqual(lazy_seg.spiketrains[0].shape, seg.spiketrains[0].shape)
+                lazy_event = lazy_seg.events[0].load()
+                if len(seg.events):
+                    assert_arrays_almost_equal(lazy_event.times, seg.events[0].times, 1e-12)
+                else:
+                    self.assertEqual(len(lazy_event), 0)
+
+    def test__proxy_time_slice(self):
+        proxy_st = SpikeTrainProxy(rawio=self.reader, unit_index=0,
+                                   block_index=0, seg_index=0)
+        sliced = proxy_st.time_slice(1 * pq.s, 3 * pq.s)
+        self.assertEqual(sliced.t_start, 1 * pq.s)
+        self.assertEqual(sliced.t_stop, 3 * pq.s)
+        # load is restricted to the window of the proxy
+        sptr = sliced.load(time_slice=(0.5 * pq.s, 2 * pq.s), strict_slicing=False)
+        assert_arrays_equal(sptr.magnitude,
+                            proxy_st.load(time_slice=(1 * pq.s, 2 * pq.s)).magnitude)
+        self.assertRaises(AssertionError, sliced.load, time_slice=(0.5 * pq.s, 2 * pq.s))
+
+        shifted = sliced.time_shift(-1 * pq.s)
+        self.assertEqual(shifted.t_start, 0 * pq.s)
+        assert_arrays_almost_equal(shifted.load().times, sliced.load().times - 1 * pq.s, 1e-12)
+        sptrs = shifted.load_many([(0 * pq.s, 1 * pq.s), (1 * pq.s, 2 * pq.s)])
+        assert_arrays_almost_equal(sptrs[1].times,
+                                   proxy_st.load(time_slice=(2 * pq.s, 3 * pq.s)).times - 1 * pq.s,
+                                   1e-12)
+
+        proxy_anasig = AnalogSignalProxy(rawio=self.reader, global_channel_indexes=[0, 1],
+                                         block_index=0, seg_index=0)
+        sliced = proxy_anasig.time_slice(1 * pq.s, 3 * pq.s).time_slice(2 * pq.s, None)
+        self.assertEqual(sliced.shape, (10000, 2))
+        self.assertEqual(sliced.t_start, 2 * pq.s)
+        self.assertEqual(sliced.load().shape, (10000, 2))
+        anasigs = sliced.load_many([(2.5 * pq.s, 3 * pq.s)])
+        self.assertEqual(anasigs[0].t_start, 2.5 * pq.s)
+        self.assertEqual(anasigs[0].shape, (5000, 2))
+
+
+def _sum_of_first_signal(handle):
+    with SharedNeoObject.attach(handle) as shared:
+        return float(shared.object.segments[0].analogsignals[0].magnitude.sum())
+
+
+@unittest.skipUnless(HAVE_SHARED_MEMORY, "requires multiprocessing.shared_memory")
+class TestSharedNeoObject(unittest.TestCase):
+    def setUp(self):
+        self.block = Block()
+        for i in range(2):
+            seg = Segment()
+            seg.analogsignals.append(AnalogSignal(np.random.rand(1000, 3), units='mV',
+                                                  sampling_rate=1 * pq.kHz))
+            seg.spiketrains.append(SpikeTrain([1, 2, 3] * pq.s, t_stop=10 * pq.s,
+                                              waveforms=np.random.rand(3, 1, 4) * pq.uV))
+            seg.events.append(Event([1, 2] * pq.s, labels=np.array(['a', 'b'], dtype='S')))
+            self.block.segments.append(seg)
+        self.block.create_many_to_one_relationship()
+
+    def test__publish_and_attach(self):
+        with SharedNeoObject.publish(self.block) as shared:
+            # the handle does not contain the data
+            self.assertLess(len(pickle.dumps(shared.handle)),
+                            self.block.segments[0].analogsignals[0].nbytes)
+            attached = SharedNeoObject.attach(shared.handle)
+            block = attached.object
+            for seg, orig in zip(block.segments, self.block.segments):
+                assert_arrays_equal(seg.analogsignals[0], orig.analogsignals[0])
+                self.assertEqual(seg.analogsignals[0].sampling_rate, 1 * pq.kHz)
+                assert_arrays_equal(seg.spiketrains[0], orig.spiketrains[0])
+                assert_arrays_equal(seg.spiketrains[0].waveforms, orig.spiketrains[0].waveforms)
+                assert_arrays_equal(seg.events[0].labels, orig.events[0].labels)
+                self.assertIs(seg.block, block)
+            del seg
+            attached.close()
+            self.assertIsNone(attached.object)
+
+    def test__attached_data_is_copied_on_write(self):
+        with SharedNeoObject.publish(self.block) as shared:
+            with SharedNeoObject.attach(shared.handle) as attached:
+                signal = attached.object.segments[0].analogsignals[0]
+                self.assertFalse(signal.flags.writeable)
+                with self.assertRaises(ValueError):
+                    signal.magnitude[0, 0] = 10.
+                signal[0, 0] = 10 * pq.mV
+                self.assertEqual(signal[0, 0], 10 * pq.mV)
+            with SharedNeoObject.attach(shared.handle) as attached:
+                signal = attached.object.segments[0].analogsignals[0]
+                self.assertEqual(signal[0, 0], self.block.segments[0].analogsignals[0][0, 0])
+            # the memory is unmapped once the objects are not referenced anymore
+            del signal
+            attached.close()
+
+    def test__process_pool(self):
+        expected = float(self.block.segments[0].analogsignals[0].magnitude.sum())
+        with SharedNeoObject.publish(self.block) as shared:
+            with ProcessPoolExecutor(2) as pool:
+                results = list(pool.map(_sum_of_first_signal, [shared.handle] * 4))
+        self.assertEqual(results, [expected] * 4)
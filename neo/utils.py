@@ -5,12 +5,25 @@ etc. of neo.core objects.
 '''
 
 import neo
+import atexit
 import copy
+import gc
+import pickle
 import warnings
+import weakref
 import inspect
 import numpy as np
 import quantities as pq
 
+try:
+    from multiprocessing import shared_memory
+except ImportError:
+    HAVE_SHARED_MEMORY = False
+else:
+    HAVE_SHARED_MEMORY = True
+
+from neo.core.dataobject import DataObject, _share_data
+
 
 def get_events(container, **properties):
     """
@@ -378,14 +391,72 @@ def add_epoch(
     See also:
     ---------
     Event.to_epoch()
+    add_epochs()
     """
-    if event2 is None:
-        event2 = event1
+    return add_epochs(segment, [(event1, event2)], pre=pre, post=post,
+                      attach_result=attach_result, **kwargs)[0]
+
+
+def add_epochs(
+        segment, event_pairs, pre=0 * pq.s, post=0 * pq.s,
+        attach_result=True, **kwargs):
+    """
+    Create one Epoch for each (event1, event2) pair in event_pairs, as
+    :func:`add_epoch` does for a single pair.
+
+    All Epochs are built from the raw event times and attached to the segment
+    at once, which is much faster than calling :func:`add_epoch` repeatedly
+    when many Epochs are added to a segment with many children.
+
+    Parameters:
+    -----------
+    segment : Segment
+        The segment in which the final Epoch objects are added.
+    event_pairs : list of (Event, Event or None)
+        The start and stop events of each Epoch. If the stop event is None,
+        the Epoch is cut around the start event times.
+    pre, post: Quantity (time)
+        Time offsets to modify the start (pre) and end (post) of the resulting
+        Epochs, see :func:`add_epoch`.
+    attach_result: bool
+        If True, the resulting Epoch objects are added to segment.
+
+    Keyword Arguments:
+    ------------------
+    Passed to every Epoch object.
+
+    Returns:
+    --------
+    epochs: list of Epoch
+        One Epoch object per pair in event_pairs.
 
+    Example:
+    --------
+        >>> pairs = [match_events(starts, stops) for starts, stops in
+        ...          zip(start_events, stop_events)]
+        >>> epochs = add_epochs(seg, pairs, name='trial')
+    """
     if not isinstance(segment, neo.Segment):
         raise TypeError(
             'Segment has to be of type Segment, not %s' % type(segment))
 
+    epochs = [_epoch_from_events(event1, event2, pre, post, **kwargs)
+              for event1, event2 in event_pairs]
+
+    if attach_result:
+        segment.epochs.extend(epochs)
+        segment.create_relationship()
+
+    return epochs
+
+
+def _epoch_from_events(event1, event2, pre, post, **kwargs):
+    """
+    Internal function creating the Epoch of :func:`add_epoch`.
+    """
+    if event2 is None:
+        event2 = event1
+
     # load the full event if a proxy object has been given as an argument
     if isinstance(event1, neo.io.proxyobjects.EventProxy):
         event1 = event1.load()
@@ -404,14 +475,18 @@ def add_epoch(
             'events before generating epochs. Current event lengths '
             'are %i and %i' % (len(event1), len(event2)))
 
-    times = event1.times + pre
-    durations = event2.times + post - times
+    # work on the magnitudes in the units of event1
+    units = event1.units
+    times = event1.magnitude + pq.Quantity(pre).rescale(units).magnitude
+    stops = (event2.times.rescale(units).magnitude
+             + pq.Quantity(post).rescale(units).magnitude)
+    durations = stops - times
 
-    if any(durations < 0):
+    if np.any(durations < 0):
         raise ValueError(
             'Can not create epoch with negative duration. '
-            'Requested durations %s.' % durations)
-    elif any(durations == 0):
+            'Requested durations %s.' % (durations * units))
+    elif np.any(durations == 0):
         raise ValueError('Can not create epoch with zero duration.')
 
     if 'name' not in kwargs:
@@ -422,14 +497,11 @@ def add_epoch(
         kwargs['labels'] = [
             ('%s_%i' % (kwargs['name'], i)).encode('ascii') for i in range(len(times))]
 
-    ep = neo.Epoch(times=times, durations=durations, **kwargs)
+    ep = neo.Epoch(times=pq.Quantity(times, units, copy=False),
+                   durations=pq.Quantity(durations, units, copy=False), **kwargs)
 
     ep.annotate(**event1.annotations)
 
-    if attach_result:
-        segment.epochs.append(ep)
-        segment.create_relationship()
-
     return ep
 
 
@@ -458,27 +530,11 @@ def match_events(event1, event2):
     if isinstance(event2, neo.io.proxyobjects.EventProxy):
         event2 = event2.load()
 
-    id1, id2 = 0, 0
-    match_ev1, match_ev2 = [], []
-    while id1 < len(event1) and id2 < len(event2):
-        time1 = event1.times[id1]
-        time2 = event2.times[id2]
-
-        # wrong order of events
-        if time1 >= time2:
-            id2 += 1
+    # compare the raw times in the units of event1
+    times1 = event1.magnitude
+    times2 = event2.times.rescale(event1.units).magnitude
 
-        # shorter epoch possible by later event1 entry
-        elif id1 + 1 < len(event1) and event1.times[id1 + 1] < time2:
-            # there is no event in 2 until the next event in 1
-            id1 += 1
-
-        # found a match
-        else:
-            match_ev1.append(id1)
-            match_ev2.append(id2)
-            id1 += 1
-            id2 += 1
+    match_ev1, match_ev2, id1, id2 = _match_times(times1, times2)
 
     if id1 < len(event1):
         warnings.warn(
@@ -497,7 +553,54 @@ def match_events(event1, event2):
     return event1_matched, event2_matched
 
 
-def cut_block_by_epochs(block, properties=None, reset_time=False):
+def _match_times(times1, times2):
+    """
+    Internal function pairing the entries of two arrays of times.
+
+    Each entry of times2 is paired with the latest entry of times1 preceding
+    it, skipping entries which cannot be paired. Returns the indexes of the
+    paired entries and the positions reached in both arrays.
+
+    An entry smaller than an earlier entry of the same array is paired or
+    skipped as if it had the value of that earlier entry, so the unsorted
+    arrays are paired through their running maxima with
+    :func:`_match_sorted_times`.
+    """
+    return _match_sorted_times(np.maximum.accumulate(times1),
+                               np.maximum.accumulate(times2))
+
+
+def _match_sorted_times(times1, times2):
+    """
+    Internal function, the pairing of :func:`_match_times` for sorted times.
+
+    An entry of times2 is paired when it is the first entry following an
+    entry of times1, and then with the last entry of times1 preceding it.
+    """
+    n1, n2 = len(times1), len(times2)
+    if n1 == 0 or n2 == 0:
+        return np.array([], dtype=int), np.array([], dtype=int), 0, 0
+
+    # first entry of times2 strictly after each entry of times1
+    following = np.searchsorted(times2, times1, side='right')
+    # keep the last entry of times1 of each run following the same entry
+    last_of_run = np.append(following[1:] != following[:-1], True)
+    last_of_run &= following < n2
+    match_ev1 = np.nonzero(last_of_run)[0]
+    match_ev2 = following[match_ev1]
+
+    # positions at which the sequential matching would have stopped
+    if len(match_ev1) == 0:
+        id1, id2 = 0, n2
+    elif match_ev1[-1] + 1 < n1:
+        id1, id2 = match_ev1[-1] + 1, n2
+    else:
+        id1, id2 = n1, match_ev2[-1] + 1
+
+    return match_ev1, match_ev2, id1, id2
+
+
+def cut_block_by_epochs(block, properties=None, reset_time=False, lazy=False):
     """
     This function cuts Segments in a Block according to multiple Neo
     Epoch objects.
@@ -514,6 +617,11 @@ def cut_block_by_epochs(block, properties=None, reset_time=False):
     The resulting cut segments may either retain their original time stamps, or
     be shifted to a common starting time.
 
+    Call this function inside a :func:`neo.core.copy_on_write` context to let
+    the cut segments share the data of the original ones instead of copying
+    it. For a block read with lazy=True, use lazy=True to keep the cut
+    segments lazy.
+
     Parameters
     ----------
     block: Block
@@ -542,6 +650,11 @@ def cut_block_by_epochs(block, properties=None, reset_time=False):
         in the range from 0 to the duration of the epoch duration.
         If False, original time stamps are retained.
         Default is False.
+    lazy: bool
+        If True, proxy objects are cut into new proxy objects restricted to
+        the epoch, so no data is read until they are loaded. See
+        :func:`seg_time_slice`.
+        Default is False.
 
     Returns:
     --------
@@ -567,14 +680,14 @@ def cut_block_by_epochs(block, properties=None, reset_time=False):
 
         for epoch in epochs:
             new_segments = cut_segment_by_epoch(
-                seg, epoch=epoch, reset_time=reset_time)
+                seg, epoch=epoch, reset_time=reset_time, lazy=lazy)
             block.segments += new_segments
 
         block.segments.remove(seg)
     block.create_many_to_one_relationship(force=True)
 
 
-def cut_segment_by_epoch(seg, epoch, reset_time=False):
+def cut_segment_by_epoch(seg, epoch, reset_time=False, lazy=False):
     """
     Cuts a Segment according to an Epoch object
 
@@ -597,6 +710,10 @@ def cut_segment_by_epoch(seg, epoch, reset_time=False):
         in the range from 0 to the duration of the epoch duration.
         If False, original time stamps are retained.
         Default is False.
+    lazy: bool
+        If True, proxy objects are cut into new proxy objects, see
+        :func:`seg_time_slice`.
+        Default is False.
 
     Returns:
     --------
@@ -622,7 +739,7 @@ def cut_segment_by_epoch(seg, epoch, reset_time=False):
         subseg = seg_time_slice(seg,
                                 epoch.times[ep_id],
                                 epoch.times[ep_id] + epoch.durations[ep_id],
-                                reset_time=reset_time)
+                                reset_time=reset_time, lazy=lazy)
 
         # Add annotations of Epoch
         for a in epoch.annotations:
@@ -642,7 +759,8 @@ def cut_segment_by_epoch(seg, epoch, reset_time=False):
     return segments
 
 
-def seg_time_slice(seg, t_start=None, t_stop=None, reset_time=False, **kwargs):
+def seg_time_slice(seg, t_start=None, t_stop=None, reset_time=False, lazy=False,
+                   **kwargs):
     """
     Creates a time slice of a Segment containing slices of all child
     objects.
@@ -660,6 +778,13 @@ def seg_time_slice(seg, t_start=None, t_stop=None, reset_time=False, **kwargs):
         in the range from t_start to t_stop.
         If False, original time stamps are retained.
         Default is False.
+    lazy: bool
+        If True, the proxy objects of the Segment are not loaded but replaced
+        by new proxy objects restricted to the time window (see
+        BaseProxy.time_slice), so no data is read until they are loaded.
+        Event and Epoch proxies are kept even if they turn out to be empty.
+        If False, the proxy objects are loaded.
+        Default is False.
 
     Keyword Arguments:
     ------------------
@@ -687,7 +812,10 @@ def seg_time_slice(seg, t_start=None, t_stop=None, reset_time=False, **kwargs):
         if isinstance(seg.analogsignals[ana_id], neo.AnalogSignal):
             ana_time_slice = seg.analogsignals[ana_id].time_slice(t_start, t_stop)
         elif isinstance(seg.analogsignals[ana_id], neo.io.proxyobjects.AnalogSignalProxy):
-            ana_time_slice = seg.analogsignals[ana_id].load(time_slice=(t_start, t_stop))
+            if lazy:
+                ana_time_slice = seg.analogsignals[ana_id].time_slice(t_start, t_stop)
+            else:
+                ana_time_slice = seg.analogsignals[ana_id].load(time_slice=(t_start, t_stop))
         if reset_time:
             ana_time_slice.t_start = ana_time_slice.t_start + t_shift
         subseg.analogsignals.append(ana_time_slice)
@@ -697,7 +825,10 @@ def seg_time_slice(seg, t_start=None, t_stop=None, reset_time=False, **kwargs):
         if isinstance(seg.spiketrains[st_id], neo.SpikeTrain):
             st_time_slice = seg.spiketrains[st_id].time_slice(t_start, t_stop)
         elif isinstance(seg.spiketrains[st_id], neo.io.proxyobjects.SpikeTrainProxy):
-            st_time_slice = seg.spiketrains[st_id].load(time_slice=(t_start, t_stop))
+            if lazy:
+                st_time_slice = seg.spiketrains[st_id].time_slice(t_start, t_stop)
+            else:
+                st_time_slice = seg.spiketrains[st_id].load(time_slice=(t_start, t_stop))
         if reset_time:
             st_time_slice = shift_spiketrain(st_time_slice, t_shift)
         subseg.spiketrains.append(st_time_slice)
@@ -707,11 +838,14 @@ def seg_time_slice(seg, t_start=None, t_stop=None, reset_time=False, **kwargs):
         if isinstance(seg.events[ev_id], neo.Event):
             ev_time_slice = event_time_slice(seg.events[ev_id], t_start, t_stop)
         elif isinstance(seg.events[ev_id], neo.io.proxyobjects.EventProxy):
-            ev_time_slice = seg.events[ev_id].load(time_slice=(t_start, t_stop))
+            if lazy:
+                ev_time_slice = seg.events[ev_id].time_slice(t_start, t_stop)
+            else:
+                ev_time_slice = seg.events[ev_id].load(time_slice=(t_start, t_stop))
         if reset_time:
             ev_time_slice = shift_event(ev_time_slice, t_shift)
-        # appending only non-empty events
-        if len(ev_time_slice):
+        # appending only non-empty events, the size of proxies is not known
+        if _is_proxy(ev_time_slice) or len(ev_time_slice):
             subseg.events.append(ev_time_slice)
 
     # cut epochs
@@ -719,11 +853,14 @@ def seg_time_slice(seg, t_start=None, t_stop=None, reset_time=False, **kwargs):
         if isinstance(seg.epochs[ep_id], neo.Epoch):
             ep_time_slice = epoch_time_slice(seg.epochs[ep_id], t_start, t_stop)
         elif isinstance(seg.epochs[ep_id], neo.io.proxyobjects.EpochProxy):
-            ep_time_slice = seg.epochs[ep_id].load(time_slice=(t_start, t_stop))
+            if lazy:
+                ep_time_slice = seg.epochs[ep_id].time_slice(t_start, t_stop)
+            else:
+                ep_time_slice = seg.epochs[ep_id].load(time_slice=(t_start, t_stop))
         if reset_time:
             ep_time_slice = shift_epoch(ep_time_slice, t_shift)
-        # appending only non-empty epochs
-        if len(ep_time_slice):
+        # appending only non-empty epochs, the size of proxies is not known
+        if _is_proxy(ep_time_slice) or len(ep_time_slice):
             subseg.epochs.append(ep_time_slice)
 
     return subseg
@@ -747,6 +884,8 @@ def shift_spiketrain(spiketrain, t_shift):
         New instance of a SpikeTrain object starting at t_start (the original
         SpikeTrain is not modified).
     """
+    if _is_proxy(spiketrain):
+        return spiketrain.time_shift(t_shift)
     new_st = spiketrain.duplicate_with_new_data(
         signal=spiketrain.times.view(pq.Quantity) + t_shift,
         t_start=spiketrain.t_start + t_shift,
@@ -835,6 +974,8 @@ def shift_event(ev, t_shift):
         New instance of an Event object starting at t_shift later than the
         original Event (the original Event is not modified).
     """
+    if _is_proxy(ev):
+        return ev.time_shift(t_shift)
     return ev.duplicate_with_new_data(times=ev.times + t_shift,
                                       labels=ev.labels)
 
@@ -856,11 +997,20 @@ def shift_epoch(epoch, t_shift):
         New instance of an Epoch object starting at t_shift later than the
         original Epoch (the original Epoch is not modified).
     """
+    if _is_proxy(epoch):
+        return epoch.time_shift(t_shift)
     return epoch.duplicate_with_new_data(times=epoch.times + t_shift,
                                          durations=epoch.durations,
                                          labels=epoch.labels)
 
 
+def _is_proxy(obj):
+    """
+    Internal function
+    """
+    return isinstance(obj, neo.io.proxyobjects.BaseProxy)
+
+
 def _shift_time_signal(sig, t_shift):
     """
     Internal function.
@@ -871,3 +1021,175 @@ def _shift_time_signal(sig, t_shift):
             ' "times", not %s' % type(sig))
     new_sig = sig.duplicate_with_new_data(times=sig.times + t_shift)
     return new_sig
+
+
+class SharedNeoHandle(object):
+    """
+    Small picklable description of a neo object published in shared memory
+    by :meth:`SharedNeoObject.publish`, to send to worker processes.
+
+    Attributes:
+    -----------
+    name: str
+        Name of the shared memory block.
+    data: bytes
+        Pickle of the object, without its data buffers.
+    buffer_ranges: list of (int, int)
+        Start and stop of each data buffer in the shared memory block.
+    """
+
+    def __init__(self, name, data, buffer_ranges):
+        self.name = name
+        self.data = data
+        self.buffer_ranges = buffer_ranges
+
+
+# shared memory blocks attached in this process, by name: the SharedMemory
+# and weak references to the arrays of the block given to the attached objects.
+# The data of the attached objects are views of these arrays, so they are
+# alive as long as the block is used (memoryviews given to numpy are not).
+_attached_memory = {}
+
+
+def _close_attached_memory():
+    """
+    Unmap the attached shared memory blocks that are not used anymore.
+    A block still used by an array is kept for a later call.
+    """
+    # the neo objects of a tree reference each other
+    gc.collect()
+    for name in list(_attached_memory):
+        shm, array_refs = _attached_memory[name]
+        array_refs[:] = [ref for ref in array_refs if ref() is not None]
+        if array_refs:
+            continue
+        try:
+            shm.close()
+        except BufferError:
+            # an export of the block not made by attach, try again later
+            continue
+        del _attached_memory[name]
+
+
+# unmap the blocks before the SharedMemory objects are destroyed with the
+# module, which fails if the objects of a block are still referenced
+atexit.register(_close_attached_memory)
+
+
+class SharedNeoObject(object):
+    """
+    A neo object (e.g. a Block) whose data buffers are in a
+    :class:`multiprocessing.shared_memory.SharedMemory` block, to give it to
+    the processes of a pool without copying its signals for each task.
+
+    :meth:`publish` copies the data buffers of the object (signals, times,
+    waveforms, array annotations...) once in a new shared memory block. Its
+    :attr:`handle` is small and is what is sent to the workers, where
+    :meth:`attach` rebuilds the object with views of the shared memory
+    instead of copies. The data objects of an attached object are read-only
+    and, as in a :func:`neo.core.copy_on_write` context, get their own copy
+    of their data the first time they are modified by item assignment or an
+    in-place operator, so a worker never modifies the data seen by the others.
+
+    The lifetime of the shared memory is managed explicitly: each process
+    calls :meth:`close` when it does not use the object anymore, and the
+    publishing process calls :meth:`unlink` to free the memory once all the
+    workers are done. Both are done at the exit of a with block. A process
+    maps a shared memory block once, for all the objects it attaches from it,
+    and unmaps it when they are all closed and not referenced anymore.
+    This needs Python >= 3.8.
+
+    Example::
+
+        >>> def analyse(handle):
+        ...     with SharedNeoObject.attach(handle) as shared:
+        ...         return shared.object.segments[0].analogsignals[0].mean()
+
+        >>> with SharedNeoObject.publish(block) as shared:
+        ...     with ProcessPoolExecutor() as pool:
+        ...         means = list(pool.map(analyse, [shared.handle] * 10))
+    """
+    # start of the buffers in the shared memory block, in bytes
+    buffer_alignment = 64
+
+    def __init__(self, shm, handle, obj, owner):
+        self._shm = shm
+        self.handle = handle
+        self.object = obj
+        self.owner = owner
+
+    @classmethod
+    def publish(cls, obj):
+        """
+        Copy the data buffers of obj in a new shared memory block and return
+        the owner :class:`SharedNeoObject`, whose object is obj.
+        """
+        if not HAVE_SHARED_MEMORY:
+            raise ImportError("multiprocessing.shared_memory is not available")
+        buffers = []
+        data = pickle.dumps(obj, protocol=5, buffer_callback=buffers.append)
+        raws = [buf.raw() for buf in buffers]
+        buffer_ranges = []
+        size = 0
+        for raw in raws:
+            buffer_ranges.append((size, size + raw.nbytes))
+            size += -(-raw.nbytes // cls.buffer_alignment) * cls.buffer_alignment
+        # a shared memory block can not be empty
+        shm = shared_memory.SharedMemory(create=True, size=max(size, 1))
+        for raw, (start, stop) in zip(raws, buffer_ranges):
+            shm.buf[start:stop] = raw
+        handle = SharedNeoHandle(shm.name, data, buffer_ranges)
+        return cls(shm, handle, obj, owner=True)
+
+    @classmethod
+    def attach(cls, handle):
+        """
+        Rebuild the object published with handle (a :class:`SharedNeoHandle`)
+        with views of the shared memory and return the attached
+        :class:`SharedNeoObject`, whose object is the rebuilt object.
+        """
+        if not HAVE_SHARED_MEMORY:
+            raise ImportError("multiprocessing.shared_memory is not available")
+        if handle.name not in _attached_memory:
+            _attached_memory[handle.name] = (shared_memory.SharedMemory(name=handle.name), [])
+        shm, array_refs = _attached_memory[handle.name]
+        buf = shm.buf.toreadonly()
+        array = np.frombuffer(buf, dtype='uint8')
+        buf.release()
+        array_refs.append(weakref.ref(array))
+        obj = pickle.loads(handle.data,
+                           buffers=[array[start:stop] for start, stop in handle.buffer_ranges])
+        del array
+        for child in [obj] + list(getattr(obj, 'children_recur', [])):
+            if isinstance(child, DataObject):
+                _share_data(child)
+        return cls(shm, handle, obj, owner=False)
+
+    def close(self):
+        """
+        Close the access of this process to the shared memory. For an
+        attached object, :attr:`object` is released and the shared memory is
+        unmapped if none of the objects attached from it in this process is
+        still referenced, otherwise a later close does it (or the end of the
+        process).
+        """
+        if self.owner:
+            self._shm.close()
+            return
+        self.object = None
+        _close_attached_memory()
+
+    def unlink(self):
+        """
+        Free the shared memory block. Only the publishing process calls it,
+        once all the workers have closed their attached objects.
+        """
+        self._shm.unlink()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+        if self.owner:
+            self.unlink()